@@ -0,0 +1,44 @@
+# -*- coding: utf-8 -*-
+###########################################################################
+# Copyright (c), The AiiDA team. All rights reserved.                     #
+# This file is part of the AiiDA code.                                    #
+#                                                                         #
+# The code is hosted on GitHub at https://github.com/aiidateam/aiida_core #
+# For further information on the license, see the LICENSE.txt file        #
+# For further information please visit http://www.aiida.net               #
+###########################################################################
+from __future__ import unicode_literals
+
+from django.db import models, migrations
+import django.db.models.deletion
+from aiida.backends.djsite.db.migrations import update_schema_version
+
+
+SCHEMA_VERSION = "1.0.9"
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('db', '0008_code_hidden_to_extra'),
+    ]
+
+    operations = [
+        # The table is created empty and the index disabled: it is filled
+        # with 'verdi devel reachability rebuild'
+        migrations.CreateModel(
+            name='DbReachability',
+            fields=[
+                ('id', models.AutoField(verbose_name='ID', serialize=False, auto_created=True, primary_key=True)),
+                ('ancestor', models.ForeignKey(related_name='descendant_reachability', on_delete=django.db.models.deletion.CASCADE, to='db.DbNode')),
+                ('descendant', models.ForeignKey(related_name='ancestor_reachability', on_delete=django.db.models.deletion.CASCADE, to='db.DbNode')),
+            ],
+            options={
+            },
+            bases=(models.Model,),
+        ),
+        migrations.AlterUniqueTogether(
+            name='dbreachability',
+            unique_together=set([('ancestor', 'descendant')]),
+        ),
+        update_schema_version(SCHEMA_VERSION)
+    ]
@@ -0,0 +1,82 @@
+# -*- coding: utf-8 -*-
+###########################################################################
+# Copyright (c), The AiiDA team. All rights reserved.                     #
+# This file is part of the AiiDA code.                                    #
+#                                                                         #
+# The code is hosted on GitHub at https://github.com/aiidateam/aiida_core #
+# For further information on the license, see the LICENSE.txt file        #
+# For further information please visit http://www.aiida.net               #
+###########################################################################
+from __future__ import unicode_literals
+
+from django.db import models, migrations
+from aiida.backends.djsite.db.migrations import update_schema_version
+
+
+SCHEMA_VERSION = "1.0.10"
+
+# Number of consecutive node ids whose attributes are converted at once
+CHUNK_SIZE = 1000
+
+
+def fill_json_columns(apps, schema_editor):
+    """
+    Copy the attributes and extras of the existing nodes from the DbAttribute
+    and DbExtra tables to the new JSONB columns of the DbNode table.
+    """
+    from collections import defaultdict
+    from django.db import connection
+    from aiida.backends.djsite.db.models import (
+        DbAttribute, DbExtra, deserialize_attributes)
+
+    cursor = connection.cursor()
+    cursor.execute("SELECT MAX(id) FROM db_dbnode")
+    max_id = cursor.fetchone()[0] or 0
+
+    for start in range(0, max_id + 1, CHUNK_SIZE):
+        for table in (DbAttribute, DbExtra):
+            cursor.execute(
+                "SELECT dbnode_id, key, datatype, tval, fval, ival, bval, dval "
+                "FROM {} WHERE dbnode_id >= %s AND dbnode_id < %s".format(
+                    table._meta.db_table), [start, start + CHUNK_SIZE])
+
+            data = defaultdict(dict)
+            for (dbnode_id, key, datatype, tval, fval, ival, bval,
+                 dval) in cursor.fetchall():
+                data[dbnode_id][key] = {
+                    "datatype": datatype,
+                    "tval": tval,
+                    "fval": fval,
+                    "ival": ival,
+                    "bval": bval,
+                    "dval": dval,
+                }
+
+            table.set_json_values_for_nodes({
+                dbnode_id: deserialize_attributes(
+                    node_data, sep=table._sep, original_class=table,
+                    original_pk=dbnode_id)
+                for dbnode_id, node_data in data.iteritems()})
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('db', '0009_add_reachability_index'),
+    ]
+
+    operations = [
+        # The columns are not part of the Django DbNode model: they are
+        # written only by the DbAttribute and DbExtra classmethods, so that
+        # saving a DbNode never overwrites them with stale values
+        migrations.RunSQL("""
+            ALTER TABLE db_dbnode
+            ADD COLUMN attributes jsonb NOT NULL DEFAULT '{}'::jsonb,
+            ADD COLUMN extras jsonb NOT NULL DEFAULT '{}'::jsonb""",
+            reverse_sql="""
+            ALTER TABLE db_dbnode
+            DROP COLUMN attributes,
+            DROP COLUMN extras"""),
+        migrations.RunPython(fill_json_columns),
+        update_schema_version(SCHEMA_VERSION)
+    ]
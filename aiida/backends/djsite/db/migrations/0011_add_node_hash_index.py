@@ -0,0 +1,35 @@
+# -*- coding: utf-8 -*-
+###########################################################################
+# Copyright (c), The AiiDA team. All rights reserved.                     #
+# This file is part of the AiiDA code.                                    #
+#                                                                         #
+# The code is hosted on GitHub at https://github.com/aiidateam/aiida_core #
+# For further information on the license, see the LICENSE.txt file        #
+# For further information please visit http://www.aiida.net               #
+###########################################################################
+from __future__ import unicode_literals
+
+from django.db import models, migrations
+from aiida.backends.djsite.db.migrations import update_schema_version
+
+
+SCHEMA_VERSION = "1.0.11"
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('db', '0010_node_attributes_jsonb'),
+    ]
+
+    operations = [
+        # Index of the hash of the nodes, used to find the nodes to cache
+        # from. The expression must be the one generated by the QueryBuilder
+        # for a filter on 'extras._aiida_hash' for the index to be used.
+        migrations.RunSQL("""
+            CREATE INDEX ix_db_dbnode_extras_aiida_hash
+            ON db_dbnode ((extras #>> '{_aiida_hash}'))""",
+            reverse_sql="""
+            DROP INDEX ix_db_dbnode_extras_aiida_hash"""),
+        update_schema_version(SCHEMA_VERSION)
+    ]
@@ -223,14 +223,14 @@ class DbNode(m.Model):
         """
         Return all attributes of the given node as a single dictionary.
         """
-        return DbAttribute.get_all_values_for_node(self)
+        return DbAttribute.get_json_values_for_nodepk(self.pk)
 
     @property
     def extras(self):
         """
         Return all extras of the given node as a single dictionary.
         """
-        return DbExtra.get_all_values_for_node(self)
+        return DbExtra.get_json_values_for_nodepk(self.pk)
 
     def __str__(self):
         simplename = self.get_simple_name(invalid_result="Unknown")
@@ -286,6 +286,27 @@ class DbLink(m.Model):
             self.output.pk, )
 
 
+@python_2_unicode_compatible
+class DbReachability(m.Model):
+    """
+    Reachability index of the provenance graph: there is an entry for each
+    pair of nodes such that the descendant can be reached from the ancestor
+    following CREATE and INPUT links.
+
+    It is filled only if the index is enabled, see
+    :py:func:`aiida.backends.reachability.is_reachability_index_enabled`.
+    """
+    ancestor = m.ForeignKey('DbNode', related_name='descendant_reachability',
+                            on_delete=m.CASCADE)
+    descendant = m.ForeignKey('DbNode', related_name='ancestor_reachability',
+                              on_delete=m.CASCADE)
+
+    class Meta:
+        unique_together = ("ancestor", "descendant")
+
+    def __str__(self):
+        return "{} --> {}".format(self.ancestor_id, self.descendant_id)
+
 
 attrdatatype_choice = (
     ('float', 'float'),
@@ -568,6 +589,38 @@ def deserialize_attributes(data, sep, original_class=None, original_pk=None):
     return retval
 
 
+def serialize_json_values(values):
+    """
+    Serialize a dictionary of attributes to a JSON string, to be stored in
+    the JSONB columns of the DbNode table.
+
+    Datetime objects are stored in isoformat, always with the microseconds,
+    so that they are recognized and converted back to datetime objects by
+    :py:func:`aiida.backends.sqlalchemy.utils.loads_json`. Naive datetimes
+    are made aware in the current timezone, as in the rows of DbAttribute
+    and DbExtra.
+    """
+    import datetime
+    import json
+    from aiida.utils.timezone import is_naive, make_aware, get_current_timezone
+
+    def f(v):
+        if isinstance(v, (list, tuple)):
+            return [f(_) for _ in v]
+        elif isinstance(v, dict):
+            return {key: f(val) for key, val in v.iteritems()}
+        elif isinstance(v, datetime.datetime):
+            if is_naive(v):
+                v = make_aware(v, get_current_timezone())
+            isoformat = v.isoformat()
+            if not v.microsecond:
+                isoformat = "{}.000000{}".format(isoformat[:19], isoformat[19:])
+            return isoformat
+        return v
+
+    return json.dumps(f(values))
+
+
 class DbMultipleValueAttributeBaseClass(m.Model):
     """
     Abstract base class for tables storing attribute + value data, of
@@ -1052,6 +1105,17 @@ class DbAttributeBaseClass(DbMultipleValueAttributeBaseClass):
 
     _subspecifier_field_name = 'dbnode'
 
+    # The name of the JSONB column of the DbNode table that contains a copy of
+    # all the level-zero values of the node, kept in sync by the methods
+    # below, so that they can be read with a single column fetch.
+    # This is a transition: every write goes to both the rows of this table
+    # and the JSONB column, the reads and the QueryBuilder use the column,
+    # and the rows are only kept for the Django queries (and plugins) that
+    # still filter on them. They can be dropped once those queries use the
+    # column; until then, get_inconsistent_nodepks checks that the two
+    # representations agree. Set in the subclasses.
+    _json_column = None
+
     class Meta:
         unique_together = (("dbnode", "key"))
         abstract = True
@@ -1127,6 +1191,124 @@ class DbAttributeBaseClass(DbMultipleValueAttributeBaseClass):
             exc.original_exception = e
             raise exc
 
+    @classmethod
+    def get_json_values_for_nodepk(cls, dbnodepk):
+        """
+        Return a dictionary with all attributes for the dbnode with given PK,
+        read from the JSONB column of the node.
+
+        This gives the same result as get_all_values_for_nodepk, but with a
+        single column fetch instead of reassembling the values from the rows
+        of this table.
+
+        :return: a dictionary where each key is a level-0 attribute
+        """
+        from django.db import connection
+        from aiida.backends.sqlalchemy.utils import loads_json
+
+        cursor = connection.cursor()
+        cursor.execute(
+            "SELECT {}::text FROM db_dbnode WHERE id = %s".format(
+                cls._json_column), [dbnodepk])
+        row = cursor.fetchone()
+        if row is None or row[0] is None:
+            return {}
+        return loads_json(row[0])
+
+    @classmethod
+    def get_inconsistent_nodepks(cls, dbnodepks=None):
+        """
+        Return the PKs of the nodes for which the JSONB column and the rows
+        of this table do not contain the same values.
+
+        :param dbnodepks: the PKs of the nodes to check (by default, all the
+          nodes)
+        :return: a sorted list of PKs
+        """
+        def differ(dbnodepk):
+            try:
+                return (cls.get_json_values_for_nodepk(dbnodepk) !=
+                        cls.get_all_values_for_nodepk(dbnodepk))
+            except TypeError:
+                # E.g. a naive and an aware datetime cannot be compared
+                return True
+
+        if dbnodepks is None:
+            dbnodepks = DbNode.objects.values_list('pk', flat=True)
+
+        return sorted(
+            dbnodepk for dbnodepk in dbnodepks if differ(dbnodepk))
+
+    @classmethod
+    def set_json_values_for_nodes(cls, values):
+        """
+        Overwrite the JSONB column of several nodes with a single UPDATE.
+
+        :note: only the JSONB column is written, it is up to the caller to
+          store the same values also in the rows of this table.
+
+        :param values: a dictionary where the keys are dbnode PKs and the
+          values the dictionaries of all the level-zero attributes to store
+        """
+        from django.db import connection
+
+        if not values:
+            return
+
+        params = []
+        for dbnodepk, attributes in values.iteritems():
+            params.extend([dbnodepk, serialize_json_values(attributes)])
+
+        connection.cursor().execute(
+            "UPDATE db_dbnode SET {column} = new.value::jsonb "
+            "FROM (VALUES {values}) AS new(id, value) "
+            "WHERE db_dbnode.id = new.id".format(
+                column=cls._json_column,
+                values=", ".join(["(%s, %s)"] * len(values))), params)
+
+    @classmethod
+    def _update_json_values_for_node(cls, dbnode, attributes=None,
+                                     deleted_keys=()):
+        """
+        Set and delete some level-zero keys in the JSONB column of a node.
+
+        The new column is computed by the database in a single UPDATE, so
+        that concurrent changes to other keys are not lost.
+
+        :param dbnode: the dbnode, or its PK
+        :param attributes: a dictionary of key:value of the attributes to set
+        :param deleted_keys: the keys to delete
+        """
+        from django.db import connection
+
+        attributes = attributes or {}
+        # The old values of the keys that are set are also removed, so that
+        # the aggregated object has no duplicated keys
+        removed_keys = tuple(set(deleted_keys) | set(attributes.keys()))
+        if not removed_keys:
+            return
+
+        if isinstance(dbnode, (int, long)):
+            dbnodepk = dbnode
+        else:
+            dbnodepk = dbnode.pk
+
+        # PostgreSQL 9.4 has no operator to update a JSONB object in place:
+        # the new one is aggregated from the old keys and the new ones
+        connection.cursor().execute(
+            "UPDATE db_dbnode SET {column} = ("
+            "    SELECT COALESCE(json_object_agg(key, value), '{{}}')::jsonb"
+            "    FROM ("
+            "        SELECT key, value FROM jsonb_each(db_dbnode.{column})"
+            "        WHERE key NOT IN %(removed_keys)s"
+            "        UNION ALL"
+            "        SELECT key, value FROM jsonb_each(%(attributes)s::jsonb)"
+            "    ) AS items"
+            ") WHERE id = %(id)s".format(column=cls._json_column),
+            {'removed_keys': removed_keys,
+             'attributes': serialize_json_values(attributes),
+             'id': dbnodepk})
+
     @classmethod
     def reset_values_for_node(cls, dbnode, attributes, with_transaction=True,
                               return_not_store=False):
@@ -1161,6 +1343,8 @@ class DbAttributeBaseClass(DbMultipleValueAttributeBaseClass):
                 if nodes_to_store:
                     cls.objects.bulk_create(nodes_to_store)
 
+                cls.set_json_values_for_nodes({dbnode_node.pk: attributes})
+
             if with_transaction:
                 transaction.savepoint_commit(sid)
         except:
@@ -1209,6 +1393,164 @@ class DbAttributeBaseClass(DbMultipleValueAttributeBaseClass):
         cls.set_value(key, value, with_transaction=with_transaction,
                       subspecifier_value=dbnode_node,
                       stop_if_existing=stop_if_existing)
+        cls._update_json_values_for_node(dbnode_node, {key: value})
+
+    @classmethod
+    def set_values_for_node(cls, dbnode, attributes, with_transaction=True):
+        """
+        Set several attributes of a node at once: the old values of all the
+        given keys are removed with a single DELETE, and the new ones created
+        with a single bulk INSERT, instead of one DELETE and INSERT per key
+        as when calling set_value_for_node repeatedly.
+
+        :param dbnode: the dbnode for which the attributes should be stored;
+          if an integer is passed, this is used as the PK of the dbnode,
+          without any further check (for speed reasons)
+        :param attributes: a dictionary of key:value of the attributes to
+          store; the keys must be level-zero attributes
+        :param with_transaction: if True (default), do this within a
+          transaction, so that nothing gets stored if an item cannot be created.
+        """
+        from django.db import transaction
+
+        for key in attributes:
+            cls.validate_key(key)
+
+        if not attributes:
+            return
+
+        if isinstance(dbnode, (int, long)):
+            dbnode_node = DbNode(id=dbnode)
+        else:
+            dbnode_node = dbnode
+
+        try:
+            if with_transaction:
+                sid = transaction.savepoint()
+
+            to_store = []
+            for key, value in attributes.iteritems():
+                to_store.extend(cls.create_value(
+                    key, value, subspecifier_value=dbnode_node))
+
+            cls._del_values_query(dbnode_node, attributes.keys()).delete()
+            if to_store:
+                cls.objects.bulk_create(to_store)
+            cls._update_json_values_for_node(dbnode_node, attributes)
+
+            if with_transaction:
+                transaction.savepoint_commit(sid)
+        except:
+            if with_transaction:
+                transaction.savepoint_rollback(sid)
+            raise
+
+    @classmethod
+    def set_values_for_nodes(cls, values):
+        """
+        Set several attributes of several nodes at once, with a single DELETE
+        of the old values and a single bulk INSERT of the new ones.
+
+        :note: no transaction is opened, it is up to the caller to do so.
+
+        :param values: a dictionary where the keys are dbnode PKs and the
+          values the dictionaries of key:value of the attributes to store;
+          the keys must be level-zero attributes
+        """
+        from collections import defaultdict
+        from django.db.models import Q
+
+        values = {dbnodepk: attributes for dbnodepk, attributes
+                  in values.iteritems() if attributes}
+        if not values:
+            return
+
+        # The nodes with the same keys are grouped, to keep the query short
+        pks_by_keys = defaultdict(list)
+        to_store = []
+        for dbnodepk, attributes in values.iteritems():
+            for key in attributes:
+                cls.validate_key(key)
+            pks_by_keys[frozenset(attributes)].append(dbnodepk)
+            dbnode_node = DbNode(id=dbnodepk)
+            for key, value in attributes.iteritems():
+                to_store.extend(cls.create_value(
+                    key, value, subspecifier_value=dbnode_node))
+
+        query = Q()
+        for keys, dbnodepks in pks_by_keys.iteritems():
+            keys_query = Q()
+            for key in keys:
+                keys_query |= Q(key=key)
+                keys_query |= Q(key__startswith="{parentkey}{sep}".format(
+                    parentkey=key, sep=cls._sep))
+            query |= Q(dbnode_id__in=dbnodepks) & keys_query
+
+        cls.objects.filter(query).delete()
+        cls.objects.bulk_create(to_store)
+        cls._update_json_values_for_nodes(values)
+
+    @classmethod
+    def _update_json_values_for_nodes(cls, values):
+        """
+        Set some level-zero keys in the JSONB column of several nodes, with a
+        single UPDATE (see _update_json_values_for_node).
+
+        :param values: a dictionary where the keys are dbnode PKs and the
+          values the dictionaries of key:value of the attributes to set
+        """
+        from django.db import connection
+
+        params = []
+        for dbnodepk, attributes in values.iteritems():
+            params.extend([dbnodepk, serialize_json_values(attributes)])
+
+        connection.cursor().execute(
+            "UPDATE db_dbnode SET {column} = ("
+            "    SELECT COALESCE(json_object_agg(key, value), '{{}}')::jsonb"
+            "    FROM ("
+            "        SELECT key, value FROM jsonb_each(db_dbnode.{column})"
+            "        WHERE key NOT IN ("
+            "            SELECT jsonb_object_keys(new.value::jsonb))"
+            "        UNION ALL"
+            "        SELECT key, value FROM jsonb_each(new.value::jsonb)"
+            "    ) AS items"
+            ") FROM (VALUES {values}) AS new(id, value) "
+            "WHERE db_dbnode.id = new.id".format(
+                column=cls._json_column,
+                values=", ".join(["(%s, %s)"] * len(values))), params)
+
+    @classmethod
+    def del_values_for_node(cls, dbnode, keys):
+        """
+        Delete several attributes of the given dbnode with a single DELETE.
+
+        :note: no exception is raised if some of the keys are not found
+          in the DB.
+
+        :param dbnode: the dbnode for which you want to delete the keys.
+        :param keys: the keys to delete.
+        """
+        keys = list(keys)
+        if keys:
+            cls._del_values_query(dbnode, keys).delete()
+            cls._update_json_values_for_node(dbnode, deleted_keys=keys)
+
+    @classmethod
+    def _del_values_query(cls, dbnode, keys):
+        """
+        Return the queryset of all the entries (including the subitems of
+        lists and dictionaries) of the given level-zero keys of a dbnode.
+        """
+        from django.db.models import Q
+
+        query = Q()
+        for key in keys:
+            query |= Q(key=key)
+            query |= Q(key__startswith="{parentkey}{sep}".format(
+                parentkey=key, sep=cls._sep))
+
+        return cls.objects.filter(query, dbnode=dbnode)
 
     @classmethod
     def del_value_for_node(cls, dbnode, key):
@@ -1222,6 +1564,7 @@ class DbAttributeBaseClass(DbMultipleValueAttributeBaseClass):
         :param key: the key to delete.
         """
         cls.del_value(key, subspecifier_value=dbnode)
+        cls._update_json_values_for_node(dbnode, deleted_keys=[key])
 
     @classmethod
     def has_key(cls, dbnode, key):
@@ -1258,7 +1601,7 @@ class DbAttribute(DbAttributeBaseClass):
     This table stores attributes that uniquely define the content of the
     node. Therefore, their modification corrupts the data.
     """
-    pass
+    _json_column = 'attributes'
 
 
 class DbExtra(DbAttributeBaseClass):
@@ -1270,7 +1613,7 @@ class DbExtra(DbAttributeBaseClass):
     Could be useful to add "duplicate" information for easier querying, or
     for tagging nodes.
     """
-    pass
+    _json_column = 'extras'
 
 
 class DbCalcState(m.Model):
@@ -152,3 +152,87 @@ class TestDbExtrasDjango(AiidaTestCase):
         self.assertEquals(n1.get_extras(), new_attrs)
         # Also check that other nodes were not damaged
         self.assertEquals(n2.get_extras(), {'pippo2': [3, 4, 'b'], '_aiida_hash': n2.get_hash()})
+
+    def test_json_column(self):
+        """
+        Test that the JSONB column of the node is kept in sync with the
+        rows of the DbAttribute and DbExtra tables.
+        """
+        import datetime
+        from aiida.utils import timezone
+        from aiida.backends.djsite.db.models import DbAttribute, DbExtra
+        from aiida.orm.querybuilder import QueryBuilder
+
+        now = timezone.now().replace(microsecond=0)
+        n1 = Node()
+        n1._set_attr('a', 1)
+        n1._set_attr('b', {'c': [1.5, 'x'], 'd': now})
+        n1.store()
+        n1.set_extras({'e': True, 'f': now})
+        n1.del_extra('e')
+
+        for table in (DbAttribute, DbExtra):
+            self.assertEquals(
+                table.get_json_values_for_nodepk(n1.pk),
+                table.get_all_values_for_nodepk(n1.pk))
+        self.assertIsInstance(n1.get_attr('b')['d'], datetime.datetime)
+
+        qb = QueryBuilder().append(Node, filters={
+            'id': n1.pk, 'attributes.b.c': {'of_length': 2},
+            'extras.f': {'of_type': 'string'}}, project=['attributes.b.d'])
+        self.assertEquals(qb.all(), [[now]])
+
+    def test_json_column_consistency(self):
+        """
+        Test that the JSONB column and the rows of the DbAttribute and
+        DbExtra tables agree after each kind of write, and that a difference
+        between them is detected.
+        """
+        import datetime
+        from django.db import connection
+        from aiida.backends.djsite.db.models import DbAttribute, DbExtra
+        from aiida.orm.utils import store_many
+
+        def assert_consistent():
+            for table in (DbAttribute, DbExtra):
+                self.assertEquals(table.get_inconsistent_nodepks(), [])
+
+        # Naive datetimes are made aware in both representations
+        naive = datetime.datetime(2017, 3, 1, 12, 30)
+        values = {'int': 1, 'float': 1.5, 'str': 'a', 'bool': True,
+                  'none': None, 'date': naive,
+                  'nested': {'list': [1, 'b', [naive, {}]], 'dict': {}}}
+
+        n1 = Node()
+        n1._set_attrs(values)
+        n1.store()
+        assert_consistent()
+
+        nodes = [Node() for _ in range(3)]
+        for i, node in enumerate(nodes):
+            node._set_attr('index', i)
+            node._set_attr('nested', values['nested'])
+        store_many(nodes)
+        assert_consistent()
+
+        n1._set_attr('int', 2, stored_check=False)
+        n1._del_attr('str', stored_check=False)
+        n1._del_attrs(['float', 'bool'], stored_check=False)
+        n1.set_extra('date', naive)
+        n1.set_extras(values)
+        n1.del_extra('int')
+        n1.del_extras(['str', 'none'])
+        DbExtra.reset_values_for_node(nodes[0].dbnode, {'new': [1, 2]})
+        nodes[1].rehash()
+        nodes[2].clear_hash()
+        assert_consistent()
+
+        DbAttribute.reset_values_for_node(n1.dbnode, {'date': naive})
+        assert_consistent()
+
+        cursor = connection.cursor()
+        cursor.execute(
+            "UPDATE db_dbnode SET extras = '{\"other\": 1}' WHERE id = %s",
+            [nodes[0].pk])
+        self.assertEquals(DbExtra.get_inconsistent_nodepks(), [nodes[0].pk])
+        self.assertEquals(DbAttribute.get_inconsistent_nodepks(), [])
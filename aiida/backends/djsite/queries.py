@@ -276,11 +276,18 @@ class QueryManagerDjango(AbstractQueryManager):
         from aiida.backends.djsite.db import models
         from aiida.common.links import LinkType
 
+        from aiida.backends.reachability import is_reachability_index_enabled
+
         try:
             the_node_pks = list(node_pks)
         except TypeError:
             the_node_pks = [node_pks]
 
+        if is_reachability_index_enabled():
+            return models.DbNode.aiidaobjects.filter(
+                descendant_reachability__descendant__pk__in=the_node_pks
+            ).distinct().values_list(*return_values)
+
         parents = models.DbNode.objects.none()
         q_inputs = models.DbNode.aiidaobjects.filter(
                 outputs__pk__in=the_node_pks,
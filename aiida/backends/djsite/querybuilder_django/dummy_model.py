@@ -82,6 +82,12 @@ class DbLink(Base):
     output = relationship("DbNode", primaryjoin="DbLink.output_id == DbNode.id")
     label = Column(String(255), index=True, nullable=False)
 
+class DbReachability(Base):
+    __tablename__ = "db_dbreachability"
+    id = Column(Integer, primary_key=True)
+    ancestor_id = Column(Integer, ForeignKey('db_dbnode.id'))
+    descendant_id = Column(Integer, ForeignKey('db_dbnode.id'))
+
 class DbCalcState(Base):
     __tablename__ = "db_dbcalcstate"
     id = Column(Integer, primary_key=True)
@@ -279,8 +285,13 @@ class DbNode(Base):
 
     nodeversion = Column(Integer, default=1)
 
-    attributes = relationship('DbAttribute', uselist=True, backref='dbnode')
-    extras = relationship('DbExtra', uselist=True, backref='dbnode')
+    # Copies of the attributes and extras, kept in sync with the
+    # DbAttribute and DbExtra tables by the Django models
+    attributes = Column(JSONB)
+    extras = Column(JSONB)
+
+    dbattributes = relationship('DbAttribute', uselist=True, backref='dbnode')
+    dbextras = relationship('DbExtra', uselist=True, backref='dbnode')
 
 
 
@@ -441,6 +452,12 @@ def get_aldjemy_session():
     """
     from aldjemy.core import get_engine
     engine = get_engine()
+    # The pool of aldjemy does not run the first-connect initialization of
+    # the dialect, that detects that psycopg2 already decodes the JSONB
+    # columns: without this, their values would be decoded twice
+    dialect = engine.dialect
+    dialect._has_native_jsonb = (
+        dialect.psycopg2_version >= dialect.FEATURE_VERSION_MAP['native_jsonb'])
     _Session = sessionmaker(bind=engine)
     return _Session()
 
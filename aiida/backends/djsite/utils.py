@@ -222,3 +222,14 @@ def delete_nodes_and_connections_django(pks_to_delete):
             Q(output__in=pks_to_delete)).delete()
         # now delete nodes
         models.DbNode.objects.filter(pk__in=pks_to_delete).delete()
+
+
+def set_extras_of_nodes_django(extras):
+    """
+    Set some extras of several nodes at once.
+    :param extras: A dictionary {pk: {key: value}} of the extras to set.
+    """
+    from django.db import transaction
+    from aiida.backends.djsite.db.models import DbExtra
+    with transaction.atomic():
+        DbExtra.set_values_for_nodes(extras)
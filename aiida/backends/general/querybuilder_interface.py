@@ -32,6 +32,13 @@ class QueryBuilderInterface():
         """
         pass
 
+    @abstractmethod
+    def Reachability(self):
+        """
+        A property, decorated with @property. Returns the implementation for the DbReachability
+        """
+        pass
+
     @abstractmethod
     def Computer(self):
         """
@@ -189,4 +196,14 @@ class QueryBuilderInterface():
         """
         pass
 
+    @abstractmethod
+    def iterrows(self, query, batch_size, tag_to_index_dict):
+        """
+        Execute the query without the ORM, fetching the rows from a server-side
+        cursor in batches. Only columns and attributes can be projected.
+
+        :returns: An iterator over all the results as tuples.
+        """
+        pass
+
 
@@ -0,0 +1,99 @@
+# -*- coding: utf-8 -*-
+###########################################################################
+# Copyright (c), The AiiDA team. All rights reserved.                     #
+# This file is part of the AiiDA code.                                    #
+#                                                                         #
+# The code is hosted on GitHub at https://github.com/aiidateam/aiida_core #
+# For further information on the license, see the LICENSE.txt file        #
+# For further information please visit http://www.aiida.net               #
+###########################################################################
+"""
+Notifications of the nodes that finished, i.e. the job calculations that
+reached a final state and the nodes that were sealed, sent with the
+PostgreSQL NOTIFY command.
+
+The notifications are sent in the transaction of the change, so they are
+only delivered once the change is committed. The workflow engine listens to
+them to know which waiting processes to wake up, instead of checking the
+state of all the nodes they wait on at every tick.
+
+The same SQL is used for both backends, since both require PostgreSQL.
+"""
+from aiida.backends import settings
+from aiida.backends.profile import BACKEND_SQLA, BACKEND_DJANGO
+from aiida.common.exceptions import ConfigurationError
+
+NODE_FINISHED_CHANNEL = 'aiida_node_finished'
+
+# The payload of a notification is limited to 8000 bytes
+_MAX_PKS_PER_NOTIFICATION = 500
+
+
+def notify_nodes_finished(pks):
+    """
+    Notify the listeners that the given nodes finished, once the current
+    transaction is committed.
+
+    :param pks: the pks of the nodes
+    """
+    pks = list(pks)
+    for start in range(0, len(pks), _MAX_PKS_PER_NOTIFICATION):
+        payload = ','.join(
+            str(pk) for pk in pks[start:start + _MAX_PKS_PER_NOTIFICATION])
+        sql = "SELECT pg_notify(%(channel)s, %(payload)s)"
+        params = {'channel': NODE_FINISHED_CHANNEL, 'payload': payload}
+
+        if settings.BACKEND == BACKEND_SQLA:
+            from aiida.backends.sqlalchemy import get_scoped_session
+            session = get_scoped_session()
+            session.connection().execute(sql, params)
+            # The changes of the ORM are committed immediately, and the
+            # notification must be committed with them
+            session.commit()
+        elif settings.BACKEND == BACKEND_DJANGO:
+            from django.db import connection
+            connection.cursor().execute(sql, params)
+        else:
+            raise ConfigurationError("Invalid settings.BACKEND: {}".format(
+                settings.BACKEND))
+
+
+class NodeFinishedListener(object):
+    """
+    A listener of the notifications of the nodes that finished, on its own
+    connection to the database of the current profile.
+
+    Only the notifications sent after the listener is created are received.
+    """
+
+    def __init__(self):
+        import psycopg2
+        import psycopg2.extensions
+        from aiida.common.setup import get_profile_config
+
+        config = get_profile_config(settings.AIIDADB_PROFILE)
+        self._connection = psycopg2.connect(
+            user=config['AIIDADB_USER'], password=config['AIIDADB_PASS'],
+            host=config['AIIDADB_HOST'], port=config['AIIDADB_PORT'] or None,
+            database=config['AIIDADB_NAME'])
+        self._connection.set_isolation_level(
+            psycopg2.extensions.ISOLATION_LEVEL_AUTOCOMMIT)
+        self._connection.cursor().execute(
+            'LISTEN "{}"'.format(NODE_FINISHED_CHANNEL))
+
+    def poll(self):
+        """
+        Return the pks of the nodes that finished since the last call, without
+        blocking.
+
+        :return: a set of pks
+        """
+        self._connection.poll()
+        pks = set()
+        while self._connection.notifies:
+            notification = self._connection.notifies.pop(0)
+            pks.update(int(pk) for pk in notification.payload.split(','))
+        return pks
+
+    def close(self):
+        self._connection.close()
@@ -0,0 +1,266 @@
+# -*- coding: utf-8 -*-
+###########################################################################
+# Copyright (c), The AiiDA team. All rights reserved.                     #
+# This file is part of the AiiDA code.                                    #
+#                                                                         #
+# The code is hosted on GitHub at https://github.com/aiidateam/aiida_core #
+# For further information on the license, see the LICENSE.txt file        #
+# For further information please visit http://www.aiida.net               #
+###########################################################################
+"""
+Maintenance of the reachability index of the provenance graph, i.e. the
+db_dbreachability table containing all (ancestor, descendant) pairs of nodes
+connected by a path of CREATE and INPUT links.
+
+When the index is enabled, it is updated incrementally every time such links
+are created or removed, and the QueryBuilder uses it for the 'ancestor_of'
+and 'descendant_of' relationships instead of a recursive query over the whole
+db_dblink table. The index is disabled by default: it is built and enabled
+with 'verdi devel reachability rebuild'.
+
+The updates of the index are serialised with a lock on the
+db_dbreachability table (see _LOCK_SQL), held until the end of the
+transaction: the pairs added for a link are computed from the pairs already
+in the index, so under the READ COMMITTED isolation level two transactions
+creating consecutive links concurrently would otherwise each miss the pairs
+added by the other, and the transitive pairs through both links would be lost.
+
+The same SQL is used for both backends, since both require PostgreSQL.
+"""
+from contextlib import contextmanager
+
+from aiida.backends import settings
+from aiida.backends.profile import BACKEND_SQLA, BACKEND_DJANGO
+from aiida.common.exceptions import ConfigurationError
+from aiida.common.links import LinkType
+
+REACHABILITY_INDEX_SETTING = 'db|reachability_index'
+
+# The link types followed by the index (same as the recursive queries of the
+# QueryBuilder)
+INDEXED_LINK_TYPES = (LinkType.CREATE.value, LinkType.INPUT.value)
+
+# Taken before any update of the index. The mode conflicts with itself and
+# with the locks taken by INSERT and DELETE, but not with the reads of the
+# QueryBuilder
+_LOCK_SQL = "LOCK TABLE db_dbreachability IN SHARE ROW EXCLUSIVE MODE"
+
+_ADD_LINK_SQL = """
+    INSERT INTO db_dbreachability (ancestor_id, descendant_id)
+    SELECT ancestors.id, descendants.id
+    FROM (
+        SELECT %(input_id)s AS id
+        UNION
+        SELECT ancestor_id FROM db_dbreachability
+        WHERE descendant_id = %(input_id)s
+    ) AS ancestors, (
+        SELECT %(output_id)s AS id
+        UNION
+        SELECT descendant_id FROM db_dbreachability
+        WHERE ancestor_id = %(output_id)s
+    ) AS descendants
+    WHERE NOT EXISTS (
+        SELECT 1 FROM db_dbreachability
+        WHERE ancestor_id = ancestors.id AND descendant_id = descendants.id
+    )
+"""
+
+_GET_DESCENDANTS_SQL = """
+    SELECT descendant_id FROM db_dbreachability WHERE ancestor_id = %(id)s
+"""
+
+_DELETE_ANCESTORS_SQL = """
+    DELETE FROM db_dbreachability WHERE descendant_id IN %(ids)s
+"""
+
+_ADD_ANCESTORS_SQL = """
+    INSERT INTO db_dbreachability (ancestor_id, descendant_id)
+    WITH RECURSIVE ancestors(ancestor_id, descendant_id) AS (
+        SELECT input_id, output_id FROM db_dblink
+        WHERE output_id IN %(ids)s AND type IN %(types)s
+        UNION
+        SELECT db_dblink.input_id, ancestors.descendant_id
+        FROM ancestors
+        JOIN db_dblink ON db_dblink.output_id = ancestors.ancestor_id
+        WHERE db_dblink.type IN %(types)s
+    )
+    SELECT ancestor_id, descendant_id FROM ancestors
+"""
+
+_REBUILD_SQL = """
+    INSERT INTO db_dbreachability (ancestor_id, descendant_id)
+    WITH RECURSIVE closure(ancestor_id, descendant_id) AS (
+        SELECT input_id, output_id FROM db_dblink
+        WHERE type IN %(types)s
+        UNION
+        SELECT closure.ancestor_id, db_dblink.output_id
+        FROM closure
+        JOIN db_dblink ON db_dblink.input_id = closure.descendant_id
+        WHERE db_dblink.type IN %(types)s
+    )
+    SELECT ancestor_id, descendant_id FROM closure
+"""
+
+
+def is_reachability_index_enabled():
+    """
+    Return True if the reachability index is enabled (and therefore kept up
+    to date) in the current database, False otherwise.
+    """
+    from aiida.backends.utils import get_global_setting
+
+    try:
+        return bool(get_global_setting(REACHABILITY_INDEX_SETTING))
+    except KeyError:
+        return False
+
+
+def update_reachability_index(links):
+    """
+    Add to the reachability index the pairs of nodes connected through the
+    given new links, if the index is enabled.
+
+    To be called right after creating the links, in the same transaction.
+    Concurrent updates of the index wait for the end of the transaction.
+
+    :param links: an iterable of (input_id, output_id, link_type) tuples,
+        where link_type is a LinkType; links of types not followed by the
+        index are ignored
+    """
+    links = [(input_id, output_id) for input_id, output_id, link_type in links
+             if link_type.value in INDEXED_LINK_TYPES]
+    if not links or not is_reachability_index_enabled():
+        return
+
+    with _atomic():
+        _execute(_LOCK_SQL)
+        for input_id, output_id in links:
+            _execute(_ADD_LINK_SQL,
+                     {'input_id': input_id, 'output_id': output_id})
+
+
+def update_reachability_index_after_removal(output_id):
+    """
+    Update the reachability index after removing an input link of the given
+    node, if the index is enabled: the ancestors of the node and of all its
+    descendants are recomputed from the links.
+
+    To be called right after removing the link, in the same transaction.
+    Concurrent updates of the index wait for the end of the transaction.
+
+    :param output_id: the pk of the node whose input link was removed
+    """
+    if not is_reachability_index_enabled():
+        return
+
+    with _atomic():
+        _execute(_LOCK_SQL)
+        ids = tuple([output_id] + [row[0] for row in _execute(
+            _GET_DESCENDANTS_SQL, {'id': output_id}, fetch=True)])
+        _execute(_DELETE_ANCESTORS_SQL, {'ids': ids})
+        _execute(_ADD_ANCESTORS_SQL,
+                 {'ids': ids, 'types': INDEXED_LINK_TYPES})
+
+
+def rebuild_reachability_index():
+    """
+    Build the reachability index from scratch from the links in the
+    database, and enable it.
+
+    The links table is locked during the rebuild, so that no link is
+    created in the meantime without being indexed.
+    """
+    from aiida.backends.utils import set_global_setting
+
+    description = ("Whether the reachability index (db_dbreachability) "
+                   "is maintained and used by the QueryBuilder.")
+
+    if settings.BACKEND == BACKEND_SQLA:
+        from aiida.backends.sqlalchemy import get_scoped_session
+        session = get_scoped_session()
+        try:
+            _execute_rebuild()
+            # This also commits the transaction
+            set_global_setting(REACHABILITY_INDEX_SETTING, True, description)
+        except:
+            session.rollback()
+            raise
+    elif settings.BACKEND == BACKEND_DJANGO:
+        from django.db import transaction
+        with transaction.atomic():
+            _execute_rebuild()
+            set_global_setting(REACHABILITY_INDEX_SETTING, True, description)
+    else:
+        raise ConfigurationError("Invalid settings.BACKEND: {}".format(
+            settings.BACKEND))
+
+
+def disable_reachability_index():
+    """
+    Disable the reachability index and empty it: it will not be maintained
+    nor used by the QueryBuilder anymore.
+    """
+    from aiida.backends.utils import del_global_setting
+
+    try:
+        del_global_setting(REACHABILITY_INDEX_SETTING)
+    except KeyError:
+        pass
+    _execute("DELETE FROM db_dbreachability")
+    if settings.BACKEND == BACKEND_SQLA:
+        from aiida.backends.sqlalchemy import get_scoped_session
+        get_scoped_session().commit()
+
+
+def _execute_rebuild():
+    _execute("LOCK TABLE db_dblink IN SHARE MODE")
+    _execute(_LOCK_SQL)
+    _execute("DELETE FROM db_dbreachability")
+    _execute(_REBUILD_SQL, {'types': INDEXED_LINK_TYPES})
+
+
+def _execute(sql, params=None, fetch=False):
+    """
+    Execute the given SQL in the current transaction of the backend.
+
+    :param sql: the SQL statement, with parameters in the pyformat style
+    :param params: the dictionary of parameters
+    :param fetch: if True, return the list of rows returned by the statement
+    """
+    if settings.BACKEND == BACKEND_SQLA:
+        from aiida.backends.sqlalchemy import get_scoped_session
+        session = get_scoped_session()
+        # Make sure that the links added or removed with the ORM are visible
+        session.flush()
+        # A string is passed as is to the database driver
+        result = session.connection().execute(sql, params or {})
+        if fetch:
+            return result.fetchall()
+    elif settings.BACKEND == BACKEND_DJANGO:
+        from django.db import connection
+        cursor = connection.cursor()
+        cursor.execute(sql, params)
+        if fetch:
+            return cursor.fetchall()
+    else:
+        raise ConfigurationError("Invalid settings.BACKEND: {}".format(
+            settings.BACKEND))
+
+
+@contextmanager
+def _atomic():
+    """
+    Run the enclosed statements in a transaction, so that the locks they take
+    are held until its end: with Django, that may be in autocommit mode, a
+    new transaction (or a savepoint) is started; with SQLAlchemy the session
+    is always in a transaction.
+    """
+    if settings.BACKEND == BACKEND_SQLA:
+        yield
+    elif settings.BACKEND == BACKEND_DJANGO:
+        from django.db import transaction
+        with transaction.atomic():
+            yield
+    else:
+        raise ConfigurationError("Invalid settings.BACKEND: {}".format(
+            settings.BACKEND))
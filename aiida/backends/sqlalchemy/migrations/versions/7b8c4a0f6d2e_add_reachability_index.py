@@ -0,0 +1,51 @@
+# -*- coding: utf-8 -*-
+###########################################################################
+# Copyright (c), The AiiDA team. All rights reserved.                     #
+# This file is part of the AiiDA code.                                    #
+#                                                                         #
+# The code is hosted on GitHub at https://github.com/aiidateam/aiida_core #
+# For further information on the license, see the LICENSE.txt file        #
+# For further information please visit http://www.aiida.net               #
+###########################################################################
+"""Adding the db_dbreachability table
+
+The table is created empty and the index disabled: it is filled with
+'verdi devel reachability rebuild'.
+
+Revision ID: 7b8c4a0f6d2e
+Revises: 35d4ee9a1b0e
+Create Date: 2018-03-12 11:20:15.204317
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '7b8c4a0f6d2e'
+down_revision = '35d4ee9a1b0e'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('db_dbreachability',
+    sa.Column('id', sa.INTEGER(), nullable=False),
+    sa.Column('ancestor_id', sa.INTEGER(), nullable=True),
+    sa.Column('descendant_id', sa.INTEGER(), nullable=True),
+    sa.ForeignKeyConstraint(['ancestor_id'], [u'db_dbnode.id'], name=u'db_dbreachability_ancestor_id_fkey', ondelete=u'CASCADE', initially=u'DEFERRED', deferrable=True),
+    sa.ForeignKeyConstraint(['descendant_id'], [u'db_dbnode.id'], name=u'db_dbreachability_descendant_id_fkey', ondelete=u'CASCADE', initially=u'DEFERRED', deferrable=True),
+    sa.PrimaryKeyConstraint('id', name=u'db_dbreachability_pkey'),
+    sa.UniqueConstraint('ancestor_id', 'descendant_id', name=u'db_dbreachability_ancestor_id_descendant_id_key')
+    )
+    op.create_index('ix_db_dbreachability_ancestor_id', 'db_dbreachability',
+                    ['ancestor_id'])
+    op.create_index('ix_db_dbreachability_descendant_id', 'db_dbreachability',
+                    ['descendant_id'])
+
+
+def downgrade():
+    op.execute("DELETE FROM db_dbsetting WHERE key = 'db|reachability_index'")
+    op.drop_index('ix_db_dbreachability_descendant_id', 'db_dbreachability')
+    op.drop_index('ix_db_dbreachability_ancestor_id', 'db_dbreachability')
+    op.drop_table('db_dbreachability')
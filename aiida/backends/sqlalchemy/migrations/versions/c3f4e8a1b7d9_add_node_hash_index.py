@@ -0,0 +1,33 @@
+# -*- coding: utf-8 -*-
+###########################################################################
+# Copyright (c), The AiiDA team. All rights reserved.                     #
+# This file is part of the AiiDA code.                                    #
+#                                                                         #
+# The code is hosted on GitHub at https://github.com/aiidateam/aiida_core #
+# For further information on the license, see the LICENSE.txt file        #
+# For further information please visit http://www.aiida.net               #
+###########################################################################
+"""Adding an index on the hash of the nodes
+
+Revision ID: c3f4e8a1b7d9
+Revises: 7b8c4a0f6d2e
+Create Date: 2018-03-19 10:42:31.118205
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'c3f4e8a1b7d9'
+down_revision = '7b8c4a0f6d2e'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.execute("CREATE INDEX ix_db_dbnode_extras_aiida_hash "
+               "ON db_dbnode ((extras #>> '{_aiida_hash}'))")
+
+
+def downgrade():
+    op.drop_index('ix_db_dbnode_extras_aiida_hash', 'db_dbnode')
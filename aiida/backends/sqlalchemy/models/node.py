@@ -8,14 +8,14 @@
 # For further information please visit http://www.aiida.net               #
 ###########################################################################
 
-from sqlalchemy import ForeignKey, select, func, join, and_, case
+from sqlalchemy import ForeignKey, select, func, join, and_, case, text
 from sqlalchemy.orm import (
     relationship, backref, Query, mapper,
     foreign, aliased
 )
 from sqlalchemy.ext.hybrid import hybrid_property
 from sqlalchemy.orm.attributes import flag_modified
-from sqlalchemy.schema import Column, UniqueConstraint
+from sqlalchemy.schema import Column, UniqueConstraint, Index
 from sqlalchemy.types import Integer, String, Boolean, DateTime, Text
 # Specific to PGSQL. If needed to be agnostic
 # http://docs.sqlalchemy.org/en/rel_0_9/core/custom_types.html?highlight=guid#backend-agnostic-guid-type
@@ -83,6 +83,14 @@ class DbNode(Base):
     attributes = Column(JSONB)
     extras = Column(JSONB)
 
+    # Index of the hash of the nodes, used to find the nodes to cache from.
+    # The expression must be the one generated by the QueryBuilder for a
+    # filter on 'extras._aiida_hash' for the index to be used.
+    __table_args__ = (
+        Index('ix_db_dbnode_extras_aiida_hash',
+              text("(extras #>> '{_aiida_hash}')")),
+    )
+
     dbcomputer_id = Column(
         Integer,
         ForeignKey('db_dbcomputer.id', deferrable=True, initially="DEFERRED", ondelete="RESTRICT"),
@@ -212,6 +220,50 @@ class DbNode(Base):
         flag_modified(self, "extras")
         self.save()
 
+    def set_attrs(self, attrs):
+        """
+        Set several attributes with a single UPDATE of the JSONB column.
+
+        :param attrs: a dictionary of key:value of the attributes to set
+        """
+        for key, value in attrs.iteritems():
+            DbNode._set_attr(self.attributes, key, value)
+        flag_modified(self, "attributes")
+        self.save()
+
+    def set_extras(self, extras):
+        """
+        Set several extras with a single UPDATE of the JSONB column.
+
+        :param extras: a dictionary of key:value of the extras to set
+        """
+        for key, value in extras.iteritems():
+            DbNode._set_attr(self.extras, key, value)
+        flag_modified(self, "extras")
+        self.save()
+
+    def del_attrs(self, keys):
+        """
+        Delete several attributes with a single UPDATE of the JSONB column.
+
+        :param keys: the keys of the attributes to delete
+        """
+        for key in keys:
+            DbNode._del_attr(self.attributes, key)
+        flag_modified(self, "attributes")
+        self.save()
+
+    def del_extras(self, keys):
+        """
+        Delete several extras with a single UPDATE of the JSONB column.
+
+        :param keys: the keys of the extras to delete
+        """
+        for key in keys:
+            DbNode._del_attr(self.extras, key)
+        flag_modified(self, "extras")
+        self.save()
+
     @staticmethod
     def _set_attr(d, key, value):
         if '.' in key:
@@ -389,3 +441,44 @@ class DbLink(Base):
             self.output.pk
         )
 
+
+
+class DbReachability(Base):
+    """
+    Reachability index of the provenance graph: there is an entry for each
+    pair of nodes such that the descendant can be reached from the ancestor
+    following CREATE and INPUT links.
+
+    It is filled only if the index is enabled, see
+    :py:func:`aiida.backends.reachability.is_reachability_index_enabled`.
+    """
+    __tablename__ = "db_dbreachability"
+
+    id = Column(Integer, primary_key=True)
+    ancestor_id = Column(
+        Integer,
+        ForeignKey(
+            'db_dbnode.id',
+            ondelete="CASCADE",
+            deferrable=True,
+            initially="DEFERRED"
+        ),
+        index=True
+    )
+    descendant_id = Column(
+        Integer,
+        ForeignKey(
+            'db_dbnode.id',
+            ondelete="CASCADE",
+            deferrable=True,
+            initially="DEFERRED"
+        ),
+        index=True
+    )
+
+    __table_args__ = (
+        UniqueConstraint('ancestor_id', 'descendant_id'),
+    )
+
+    def __str__(self):
+        return "{} --> {}".format(self.ancestor_id, self.descendant_id)
@@ -103,6 +103,11 @@ class QueryBuilderImplSQLA(QueryBuilderInterface):
         import aiida.backends.sqlalchemy.models.node
         return aiida.backends.sqlalchemy.models.node.DbLink
 
+    @property
+    def Reachability(self):
+        import aiida.backends.sqlalchemy.models.node
+        return aiida.backends.sqlalchemy.models.node.DbReachability
+
     @property
     def Computer(self):
         import aiida.backends.sqlalchemy.models.computer
@@ -677,6 +682,28 @@ class QueryBuilderImplSQLA(QueryBuilderInterface):
 
 
 
+    def iterrows(self, query, batch_size, tag_to_index_dict):
+        # The statement is executed by the core of sqlalchemy, so that no
+        # ORM instance or named tuple is created for the rows
+        try:
+            keys = [tag_to_index_dict[index]
+                    for index in range(len(tag_to_index_dict))]
+            connection = self.get_session().connection().execution_options(
+                stream_results=True)
+            results = connection.execute(query.statement)
+            while True:
+                rows = results.fetchmany(batch_size)
+                if not rows:
+                    break
+                for row in rows:
+                    yield tuple(
+                        self.get_aiida_res(key, value)
+                        for key, value in zip(keys, row))
+        except Exception as e:
+            self.get_session().rollback()
+            raise e
+
+
     def iterdict(self, query, batch_size, tag_to_projected_entity_dict):
 
 
@@ -173,8 +173,15 @@ def loads_json(s):
     """
     Loads the json and try to parse each basestring as a datetime object
     """
+    return parse_json_datetimes(json_loads(s))
 
-    ret = json_loads(s)
+
+def parse_json_datetimes(ret):
+    """
+    Try to parse each basestring of an already decoded JSON object (as
+    returned e.g. by the database driver for JSONB columns) as a datetime
+    object
+    """
 
     def f(d):
         if isinstance(d, list):
@@ -535,6 +542,51 @@ def alembic_command(selected_command, *args, **kwargs):
             al_command(alembic_cfg, *args, **kwargs)
 
 
+def set_extras_of_nodes_sqla(extras):
+    """
+    Set some extras of several nodes at once.
+    :param extras: A dictionary {pk: {key: value}} of the extras to set.
+    """
+    from aiida.backends import sqlalchemy as sa
+
+    extras = {pk: node_extras for pk, node_extras in extras.iteritems()
+              if node_extras}
+    if not extras:
+        return
+
+    params = {}
+    values = []
+    for index, (pk, node_extras) in enumerate(extras.iteritems()):
+        params['id_{}'.format(index)] = pk
+        params['value_{}'.format(index)] = dumps_json(node_extras)
+        values.append("(%(id_{0})s, %(value_{0})s)".format(index))
+
+    session = sa.get_scoped_session()
+    try:
+        # Pending changes to the extras are written first, not after
+        session.flush()
+        # The new extras are merged by the database in a single statement
+        # (PostgreSQL 9.4 has no operator to update a JSONB object in place),
+        # so that concurrent changes to other extras are not lost
+        session.connection().execute(
+            "UPDATE db_dbnode SET extras = ("
+            "    SELECT COALESCE(json_object_agg(key, value), '{{}}')::jsonb"
+            "    FROM ("
+            "        SELECT key, value FROM jsonb_each(db_dbnode.extras)"
+            "        WHERE key NOT IN ("
+            "            SELECT jsonb_object_keys(new.value::jsonb))"
+            "        UNION ALL"
+            "        SELECT key, value FROM jsonb_each(new.value::jsonb)"
+            "    ) AS items"
+            ") FROM (VALUES {}) AS new(id, value) "
+            "WHERE db_dbnode.id = new.id".format(", ".join(values)), params)
+        # This also expires the extras of the nodes loaded in the session
+        session.commit()
+    except Exception as e:
+        session.rollback()
+        raise e
+
+
 def delete_nodes_and_connections_sqla(pks_to_delete):
     """
     Delete all nodes corresponding to pks in the input.
@@ -83,3 +83,134 @@ class TestDaemonBasic(AiidaTestCase):
         self.assertEquals(running_no, 0,
                           "At this point there should be "
                           "no running workflows.")
+
+
+class TestComputerUserPairs(AiidaTestCase):
+    """
+    Test the concurrent processing of (computer, user) pairs in the
+    execmanager.
+    """
+
+    class FakeEntity(object):
+        def __init__(self, pk, name):
+            self.pk = pk
+            self.name = name
+            self.email = name
+
+    def _run(self, properties, function, pairs):
+        import mock
+        from aiida.daemon.execmanager import run_for_computer_user_pairs
+
+        with mock.patch('aiida.common.setup.get_property',
+                        side_effect=lambda name: properties[name]):
+            run_for_computer_user_pairs(pairs, function)
+
+    def test_serial(self):
+        called = []
+        pairs = [(self.FakeEntity(i, 'computer{}'.format(i)),
+                  self.FakeEntity(1, 'user')) for i in range(3)]
+        self._run({'daemon.authinfo_workers': 0},
+                  lambda computer, user: called.append(computer.pk), pairs)
+        self.assertEquals(called, [0, 1, 2])
+
+    def test_hanging_computer_does_not_block_others(self):
+        import threading
+
+        release = threading.Event()
+        called = []
+
+        def function(computer, user):
+            if computer.pk == 0:
+                release.wait(10)
+            called.append(computer.pk)
+
+        pairs = [(self.FakeEntity(i, 'computer{}'.format(i)),
+                  self.FakeEntity(1, 'user')) for i in range(4)]
+        properties = {
+            'daemon.authinfo_workers': 4,
+            'daemon.authinfo_workers_per_computer': 1,
+            'daemon.authinfo_timeout': 1,
+        }
+        try:
+            self._run(properties, function, pairs)
+            self.assertEquals(sorted(called), [1, 2, 3])
+
+            # The hanging pair is skipped while its thread is still running
+            self._run(properties, function, pairs[:1])
+            self.assertEquals(sorted(called), [1, 2, 3])
+        finally:
+            release.set()
+
+    def test_hanging_thread_does_not_block_same_computer(self):
+        import threading
+        import time
+
+        release = threading.Event()
+        called = []
+
+        def function(computer, user):
+            if user.pk == 1:
+                release.wait(10)
+            called.append(user.pk)
+
+        computer = self.FakeEntity(100, 'computer100')
+        pairs = [(computer, self.FakeEntity(i, 'user{}'.format(i)))
+                 for i in range(1, 3)]
+        properties = {
+            'daemon.authinfo_workers': 4,
+            'daemon.authinfo_workers_per_computer': 1,
+            'daemon.authinfo_timeout': 1,
+        }
+        try:
+            # The second user waits for the semaphore of the computer held by
+            # the hanging thread, and gives up after the timeout
+            start = time.time()
+            self._run(properties, function, pairs)
+            self.assertLess(time.time() - start, 5)
+            self.assertEquals(called, [])
+
+            # The same in the following call, for a user that was skipped
+            start = time.time()
+            self._run(properties, function, pairs[1:])
+            self.assertLess(time.time() - start, 5)
+            self.assertEquals(called, [])
+        finally:
+            release.set()
+
+    def test_more_pairs_than_workers(self):
+        import threading
+        import time
+
+        release = threading.Event()
+        called = []
+
+        def function(computer, user):
+            if computer.pk < 2:
+                release.wait(10)
+            else:
+                time.sleep(0.4)
+            called.append(computer.pk)
+
+        pairs = [(self.FakeEntity(i, 'computer{}'.format(i)),
+                  self.FakeEntity(1, 'user')) for i in range(2, 10)]
+        properties = {
+            'daemon.authinfo_workers': 2,
+            'daemon.authinfo_workers_per_computer': 1,
+            'daemon.authinfo_timeout': 1,
+        }
+        # The timeout starts when a pair gets a slot: the pairs queued
+        # behind the busy workers are not skipped
+        self._run(properties, function, pairs)
+        self.assertEquals(sorted(called), range(2, 10))
+
+        # The slots of the hung threads are given to the following pairs
+        del called[:]
+        hanging = [(self.FakeEntity(i, 'computer{}'.format(i)),
+                    self.FakeEntity(1, 'user')) for i in range(2)]
+        try:
+            start = time.time()
+            self._run(properties, function, hanging + pairs[:2])
+            self.assertLess(time.time() - start, 5)
+            self.assertEquals(sorted(called), [2, 3])
+        finally:
+            release.set()
@@ -1766,6 +1766,54 @@ Ag 0 0
             with self.assertRaises(TypeError):
                 StructureData()._parse_xyz(xyz_string)
 
+    def test_bulk_sites(self):
+        """
+        Test the methods to get and set the positions and kinds of all the
+        sites at once.
+        """
+        from aiida.common.exceptions import ModificationNotAllowed
+        from aiida.orm.data.structure import StructureData, Kind
+        import numpy
+
+        s = StructureData(cell=((4., 0., 0.), (0., 4., 0.), (0., 0., 4.)))
+        self.assertEqual(s.get_positions().shape, (0, 3))
+        self.assertEqual(s.get_kind_indices().tolist(), [])
+
+        s.append_kind(Kind(symbols='Ba', name='Ba'))
+        s.append_kind(Kind(symbols='O', name='O'))
+        s.extend_sites(['Ba', 'O', 'O'], numpy.array([[0., 0., 0.],
+                                                      [2., 2., 0.],
+                                                      [2., 0., 2.]]))
+        s.extend_sites(['O'], [[0., 2., 2.]])
+        self.assertEqual(s.get_site_kindnames(), ['Ba', 'O', 'O', 'O'])
+        self.assertEqual(s.get_kind_indices().tolist(), [0, 1, 1, 1])
+        self.assertEqual(s.sites[3].position, (0., 2., 2.))
+        self.assertEqual(s.get_composition(), {'Ba': 1, 'O': 3})
+
+        with self.assertRaises(ValueError):
+            s.extend_sites(['Ti'], [[1., 1., 1.]])
+        with self.assertRaises(ValueError):
+            s.extend_sites(['O', 'O'], [[1., 1., 1.]])
+        with self.assertRaises(ValueError):
+            s.extend_sites(['O'], [[1., 1.]])
+
+        new_positions = s.get_positions() + 0.1
+        s.set_positions(new_positions)
+        self.assertAlmostEqual(abs(s.get_positions() - new_positions).max(), 0.)
+        self.assertEqual(s.get_site_kindnames(), ['Ba', 'O', 'O', 'O'])
+        with self.assertRaises(ValueError):
+            s.set_positions(new_positions[:2])
+
+        s.reset_sites_positions(new_positions.tolist())
+        self.assertAlmostEqual(abs(s.get_positions() - new_positions).max(), 0.)
+
+        s.store()
+        self.assertAlmostEqual(abs(s.get_positions() - new_positions).max(), 0.)
+        with self.assertRaises(ModificationNotAllowed):
+            s.set_positions(new_positions)
+        with self.assertRaises(ModificationNotAllowed):
+            s.extend_sites(['O'], [[1., 1., 1.]])
+
 
 class TestStructureDataLock(AiidaTestCase):
     """
@@ -2425,6 +2473,90 @@ class TestArrayData(AiidaTestCase):
             if name == 'third':
                 self.assertAlmostEquals(abs(third - array).max(), 0.)
 
+    def test_mmap_and_slices(self):
+        """
+        Check the memory-mapped and sliced access to the arrays, before and
+        after storing.
+        """
+        from aiida.orm.data.array import ArrayData
+        import numpy
+
+        n = ArrayData()
+        first = numpy.random.rand(5, 3, 4)
+        n.set_array('first', first)
+
+        for _ in range(2):
+            mapped = n.get_array('first', mmap=True)
+            self.assertAlmostEquals(abs(first - mapped).max(), 0.)
+            with self.assertRaises(ValueError):
+                mapped[0, 0, 0] = 1.
+
+            self.assertAlmostEquals(
+                abs(first[2] - n.get_array_slice('first', 2)).max(), 0.)
+            self.assertAlmostEquals(
+                abs(first[1:3, :, 0] - n.get_array_slice('first', (slice(1, 3), slice(None), 0))).max(), 0.)
+            self.assertEquals(n.get_array_slice('first', (1, 2, 3)), first[1, 2, 3])
+            self.assertIs(type(n.get_array_slice('first', 2)), numpy.ndarray)
+
+            with self.assertRaises(KeyError):
+                n.get_array('nonexistent_array', mmap=True)
+            with self.assertRaises(KeyError):
+                n.get_array_slice('nonexistent_array', 0)
+
+            if not n.is_stored:
+                n.store()
+
+        # The arrays read with mmap or slices are not cached
+        self.assertEquals(n._cached_arrays, {})
+        n.get_array('first')
+        self.assertIs(n.get_array('first', mmap=True), n.get_array('first'))
+
+    def test_chunked_storage(self):
+        """
+        Check the arrays stored in chunks, and appending to arrays in both
+        formats.
+        """
+        from aiida.common.exceptions import ModificationNotAllowed
+        from aiida.orm.data.array import ArrayData
+        import numpy
+
+        n = ArrayData()
+        n.set_array('npy', numpy.arange(6).reshape(3, 2))
+        n.set_array_storage('chunked', chunk_length=2)
+        first = numpy.random.rand(5, 3)
+        n.set_array('first', first)
+        n.set_array('scalar', numpy.array(1.))
+        self.assertEquals(set(n.get_folder_list()),
+                          set(['npy.npy', 'first.chunks', 'scalar.npy']))
+
+        n.append_to_array('first', first[:2])
+        n.append_to_array('npy', numpy.array([[6, 7]]))
+        self.assertEquals(n.get_shape('first'), (7, 3))
+        self.assertEquals(n.get_shape('npy'), (4, 2))
+        with self.assertRaises(ValueError):
+            n.append_to_array('first', numpy.zeros((1, 2)))
+
+        # Setting again an array replaces it, in the new format
+        n.set_array_storage('npy')
+        n.set_array('scalar', numpy.array(2.))
+        n.set_array_storage('chunked')
+        n.set_array('npy', n.get_array('npy'))
+        self.assertEquals(set(n.get_folder_list()),
+                          set(['npy.chunks', 'first.chunks', 'scalar.npy']))
+
+        n.store()
+        expected = numpy.concatenate([first, first[:2]])
+        self.assertAlmostEquals(abs(n.get_array('first') - expected).max(), 0.)
+        self.assertAlmostEquals(
+            abs(n.get_array_slice('first', slice(1, 6)) - expected[1:6]).max(), 0.)
+        self.assertEquals(n.get_array('npy').tolist(), [[0, 1], [2, 3], [4, 5], [6, 7]])
+        self.assertEquals(n.get_array('scalar'), 2.)
+        with self.assertRaises(ModificationNotAllowed):
+            n.append_to_array('first', first)
+
+        n2 = load_node(n.uuid)
+        self.assertAlmostEquals(abs(n2.get_array('first') - expected).max(), 0.)
+
 
 class TestTrajectoryData(AiidaTestCase):
     """
@@ -2754,6 +2886,92 @@ class TestTrajectoryData(AiidaTestCase):
         with self.assertRaises(ValueError):
             td = TrajectoryData(structurelist=structurelist)
 
+    def test_append_steps(self):
+        """
+        Check that steps can be appended to a trajectory, also stored in
+        chunks.
+        """
+        from aiida.orm.data.array.trajectory import TrajectoryData
+        import numpy
+
+        n = 10
+        stepids = numpy.arange(n)
+        times = stepids * 0.1
+        cells = numpy.array([numpy.eye(3) * (2. + i) for i in range(n)])
+        symbols = numpy.array(['H', 'O'])
+        positions = numpy.random.rand(n, 2, 3)
+
+        for storage_format in ['npy', 'chunked']:
+            td = TrajectoryData()
+            td.set_array_storage(storage_format, chunk_length=3)
+            td.set_trajectory(stepids[:4], cells[:4], symbols, positions[:4],
+                              times=times[:4])
+            for i in range(4, n, 2):
+                td.append_steps(stepids[i:i + 2], cells[i:i + 2],
+                                positions[i:i + 2], times=times[i:i + 2])
+
+            with self.assertRaises(ValueError):
+                td.append_steps(stepids[:1], cells[:1], positions[:1])
+            with self.assertRaises(ValueError):
+                td.append_steps(stepids[:1], cells[:1], positions[:1, :1],
+                                times=times[:1])
+
+            td.store()
+            self.assertEqual(td.numsteps, n)
+            self.assertEqual(td.get_stepids().tolist(), stepids.tolist())
+            self.assertAlmostEqual(abs(td.get_times() - times).max(), 0.)
+            self.assertAlmostEqual(abs(td.get_cells() - cells).max(), 0.)
+            self.assertAlmostEqual(abs(td.get_positions() - positions).max(), 0.)
+            self.assertEqual(td.get_step_data(7)[0], 7)
+
+    def test_get_step_structures(self):
+        """
+        Check the conversion of many steps at once to StructureData nodes,
+        and back.
+        """
+        from aiida.orm.data.array.trajectory import TrajectoryData
+        from aiida.orm.data.structure import Kind
+        import numpy
+
+        n = 6
+        cells = numpy.array([numpy.eye(3) * (2. + i) for i in range(n)])
+        symbols = numpy.array(['H', 'O', 'H'])
+        positions = numpy.random.rand(n, 3, 3)
+        td = TrajectoryData()
+        td.set_trajectory(numpy.arange(n), cells, symbols, positions)
+        td.store()
+
+        structures = td.get_step_structures([4, 1, -1])
+        self.assertEqual(len(structures), 3)
+        for struc, index in zip(structures, [4, 1, 5]):
+            self.assertFalse(struc.is_stored)
+            self.assertEqual(struc.get_kind_names(), ['H', 'O'])
+            self.assertEqual(struc.get_site_kindnames(), ['H', 'O', 'H'])
+            self.assertAlmostEqual(
+                abs(numpy.array(struc.cell) - cells[index]).max(), 0.)
+            self.assertAlmostEqual(
+                abs(struc.get_positions() - positions[index]).max(), 0.)
+            reference = td.get_step_structure(index)
+            self.assertEqual(struc.sites[2].position,
+                             reference.sites[2].position)
+
+        structures = td.get_step_structures(
+            custom_kinds=[Kind(name='H', symbols='He'),
+                          Kind(name='O', symbols='Os')], store=True)
+        self.assertEqual(len(structures), n)
+        self.assertTrue(all(struc.is_stored for struc in structures))
+        self.assertEqual(structures[0].get_kind('H').symbols, ('He',))
+
+        with self.assertRaises(IndexError):
+            td.get_step_structures([0, n])
+        self.assertEqual(td.get_step_structures([]), [])
+
+        # And back to a trajectory
+        td2 = TrajectoryData(structurelist=structures)
+        self.assertEqual(td2.get_symbols().tolist(), symbols.tolist())
+        self.assertAlmostEqual(abs(td2.get_cells() - cells).max(), 0.)
+        self.assertAlmostEqual(abs(td2.get_positions() - positions).max(), 0.)
+
     def test_export_to_file(self):
         """
         Export the band structure on a file, check if it is working
@@ -3648,3 +3866,76 @@ class TestBandsData(AiidaTestCase):
                 for file in files_created:
                     if os.path.exists(file):
                         os.remove(file)
+
+    def test_find_bandgap(self):
+        """
+        Check the band gap analysis, also on many nodes at once.
+        """
+        from aiida.orm.data.array.bands import (BandsData, find_bandgap,
+                                                find_bandgaps)
+        import numpy
+
+        kpoints = numpy.array([[0., 0., 0.], [0.25, 0., 0.], [0.5, 0., 0.]])
+        insulator = BandsData()
+        insulator.set_kpoints(kpoints)
+        insulator.set_bands(numpy.array([[-2., -1., 2., 3.],
+                                         [-1.5, -0.5, 1.5, 3.],
+                                         [-1., -0.8, 1., 2.5]]),
+                            occupations=numpy.array([[2., 2., 0., 0.]] * 3))
+        metal = BandsData()
+        metal.set_kpoints(kpoints)
+        metal.set_bands(numpy.array([[-2., -1., 2., 3.],
+                                     [-1.5, 0.5, 1.5, 3.],
+                                     [-1., 0.8, 1., 2.5]]),
+                        occupations=numpy.array([[2., 2., 0., 0.],
+                                                 [2., 2., 0., 0.],
+                                                 [2., 2., 2., 0.]]))
+
+        self.assertEqual(find_bandgap(insulator), (True, 1.5))
+        self.assertEqual(find_bandgap(insulator, number_electrons=4),
+                         (True, 1.5))
+        self.assertEqual(find_bandgap(insulator, fermi_energy=0.),
+                         (True, 1.5))
+        self.assertEqual(find_bandgap(insulator, number_electrons=3),
+                         (False, None))
+        self.assertEqual(find_bandgap(metal), (False, None))
+        self.assertEqual(find_bandgap(metal, fermi_energy=0.7),
+                         (False, None))
+        with self.assertRaises(ValueError):
+            find_bandgap(insulator, number_electrons=8)
+
+        insulator.store()
+        metal.store()
+        results = list(find_bandgaps(iter([insulator, metal])))
+        self.assertEqual([node.uuid for node, _ in results],
+                         [insulator.uuid, metal.uuid])
+        self.assertEqual([gap for _, gap in results],
+                         [(True, 1.5), (False, None)])
+        # The arrays are not kept in memory
+        self.assertEqual(insulator._cached_arrays, {})
+
+    def test_export_dat(self):
+        """
+        Check the content of the .dat exports.
+        """
+        from aiida.orm.data.array.bands import BandsData
+        import numpy
+
+        b = BandsData()
+        b.set_kpoints(numpy.array([[0., 0., 0.], [0.5, 0., 0.], [0.5, 0.5, 0.]]))
+        b.set_bands(numpy.array([[1., 2.], [1.5, 2.5], [-1., 3.]]))
+
+        multicolumn, _ = b._exportstring('dat_multicolumn', comments=False)
+        self.assertEqual(multicolumn,
+                         "0.00000000\t1.00000000\t2.00000000\n"
+                         "0.50000000\t1.50000000\t2.50000000\n"
+                         "1.00000000\t-1.00000000\t3.00000000\n")
+
+        blocks, _ = b._exportstring('dat_blocks', comments=False)
+        self.assertEqual(blocks,
+                         "0.00000000\t1.00000000\n"
+                         "0.50000000\t1.50000000\n"
+                         "1.00000000\t-1.00000000\n\n\n"
+                         "0.00000000\t2.00000000\n"
+                         "0.50000000\t2.50000000\n"
+                         "1.00000000\t3.00000000\n\n")
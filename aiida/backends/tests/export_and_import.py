@@ -1610,6 +1610,58 @@ class TestLinks(AiidaTestCase):
         finally:
             shutil.rmtree(tmp_folder, ignore_errors=True)
 
+    def test_batched_import(self):
+        """
+        Check that an import in batches gives the same nodes, attributes and
+        links as the export, and that importing the same file again (as to
+        resume an interrupted import) does not duplicate anything.
+        """
+        import os, shutil, tempfile
+
+        from aiida.orm import load_node
+        from aiida.orm.data.base import Int
+        from aiida.orm.calculation.work import WorkCalculation
+        from aiida.orm.importexport import export
+        from aiida.common.links import LinkType
+
+        tmp_folder = tempfile.mkdtemp()
+
+        try:
+            node_work = WorkCalculation().store()
+            inputs = [Int(i).store() for i in range(5)]
+            outputs = [Int(i).store() for i in range(10, 13)]
+            for i, node in enumerate(inputs):
+                node_work.add_link_from(node, 'input_{}'.format(i),
+                                        link_type=LinkType.INPUT)
+            for i, node in enumerate(outputs):
+                node.add_link_from(node_work, 'output_{}'.format(i),
+                                   link_type=LinkType.CREATE)
+            values = {node.uuid: node.value for node in inputs + outputs}
+
+            export_links = self.get_all_node_links()
+            export_file = os.path.join(tmp_folder, 'export.tar.gz')
+            export([node.dbnode for node in outputs], outfile=export_file,
+                   silent=True)
+
+            self.clean_db()
+            self.insert_data()
+
+            ret_dict = import_data(export_file, silent=True, batch_size=2)
+            self.assertEquals(len(ret_dict['Node']['new']), 9)
+            self.assertEquals(
+                {uuid: load_node(uuid).value for uuid in values}, values)
+            self.assertEquals(set(tuple(_) for _ in export_links),
+                              set(tuple(_) for _ in self.get_all_node_links()))
+
+            ret_dict = import_data(export_file, silent=True, batch_size=4)
+            self.assertEquals(ret_dict['Node']['new'], [])
+            self.assertEquals(len(ret_dict['Node']['existing']), 9)
+            self.assertNotIn('Link', ret_dict)
+            self.assertEquals(len(self.get_all_node_links()),
+                              len(export_links))
+        finally:
+            shutil.rmtree(tmp_folder, ignore_errors=True)
+
     def test_links_for_workflows(self):
         """
         Check that CALL links are not followed in the export procedure, and the only creation
@@ -130,6 +130,70 @@ class TestNodeHashing(AiidaTestCase):
         self.assertNotEquals(hash1, None)
         self.assertEquals(hash1, hash2)
 
+    def test_hash_lookup_uses_index(self):
+        """
+        Tests that the query used to find the nodes with the same hash can
+        use the index on the hash of the nodes.
+        """
+        from sqlalchemy.dialects import postgresql
+        from aiida.orm.querybuilder import QueryBuilder
+
+        n = self.create_simple_node(1.0)
+        n.store()
+
+        qb = QueryBuilder()
+        qb.append(Node, filters={'extras._aiida_hash': n.get_hash()})
+        query = qb.get_query()
+        statement = query.statement.compile(dialect=postgresql.dialect())
+
+        # On a small table the planner prefers a sequential scan
+        connection = query.session.connection()
+        connection.execute("SET enable_seqscan = off")
+        try:
+            plan = connection.execute(
+                "EXPLAIN " + str(statement), statement.params).fetchall()
+        finally:
+            connection.execute("RESET enable_seqscan")
+        self.assertIn('ix_db_dbnode_extras_aiida_hash',
+                      '\n'.join(row[0] for row in plan))
+
+    def test_rehash_nodes(self):
+        """
+        Tests that rehash_nodes stores the hashes, and skips the nodes which
+        did not change since the last rehash.
+        """
+        import os
+        import tempfile
+        from aiida.orm import load_node
+        from aiida.utils.rehash import rehash_nodes
+
+        f1 = self.create_folderdata_with_empty_file()
+        f1.store()
+        n1 = self.create_simple_node(1.0)
+        n1.store()
+        f1.del_extra('_aiida_hash')
+        pks = [f1.pk, n1.pk]
+
+        fd, checkpoint = tempfile.mkstemp()
+        os.close(fd)
+        os.remove(checkpoint)
+
+        self.assertEquals(
+            rehash_nodes(pks=pks, batch_size=1, checkpoint=checkpoint), (2, 0))
+        self.assertFalse(os.path.exists(checkpoint))
+        for node in (f1, n1):
+            node = load_node(node.pk)
+            self.assertEquals(node.get_extra('_aiida_hash'), node.get_hash())
+            self.assertIsNotNone(node.get_extra('_aiida_hash_fingerprint'))
+
+        self.assertEquals(rehash_nodes(pks=pks), (0, 2))
+        self.assertEquals(rehash_nodes(pks=pks, force=True), (2, 0))
+
+        with open(checkpoint, 'w') as f:
+            f.write('{{"last_pk": {}}}'.format(min(pks)))
+        self.assertEquals(
+            rehash_nodes(pks=pks, force=True, checkpoint=checkpoint), (1, 0))
+
 class TestDataNode(AiidaTestCase):
     """
     These tests check the features of Data nodes that differ from the base Node
@@ -1128,6 +1192,74 @@ class TestNodeBasic(AiidaTestCase):
             del all_extras[k]
             self.assertEquals({k: v for k, v in a.iterextras()}, all_extras)
 
+    def test_bulk_extras(self):
+        """
+        Checks setting and deleting several extras at once, with a single
+        increment of the node version.
+        """
+        a = Node().store()
+        extras_to_set = {
+            'bool': self.boolval,
+            'integer': self.intval,
+            'string': self.stringval,
+            'dict': self.dictval,
+            'list': self.listval,
+        }
+
+        version = a.dbnode.nodeversion
+        a.set_extras(extras_to_set)
+        self.assertEquals(a.dbnode.nodeversion, version + 1)
+        all_extras = dict(_aiida_hash=AnyValue(), **extras_to_set)
+        self.assertEquals({k: v for k, v in a.iterextras()}, all_extras)
+
+        # Nothing is deleted if one of the keys does not exist
+        with self.assertRaises(AttributeError):
+            a.del_extras(['dict', 'nonexisting'])
+        self.assertEquals({k: v for k, v in a.iterextras()}, all_extras)
+
+        a.del_extras(['dict', 'list'])
+        del all_extras['dict']
+        del all_extras['list']
+        self.assertEquals(a.dbnode.nodeversion, version + 2)
+        self.assertEquals({k: v for k, v in a.iterextras()}, all_extras)
+
+    def test_bulk_attributes(self):
+        """
+        Checks setting and deleting several attributes at once, before and
+        after storing.
+        """
+        attrs_to_set = {
+            'bool': self.boolval,
+            'integer': self.intval,
+            'dict': self.dictval,
+            'list': self.listval,
+        }
+
+        a = Node()
+        a._set_attrs(attrs_to_set)
+        self.assertEquals(dict(a.iterattrs()), attrs_to_set)
+        a._del_attrs(['bool'])
+        a.store()
+        del attrs_to_set['bool']
+        self.assertEquals(dict(a.iterattrs()), attrs_to_set)
+
+        with self.assertRaises(ModificationNotAllowed):
+            a._set_attrs({'integer': 1})
+        with self.assertRaises(ModificationNotAllowed):
+            a._del_attrs(['integer'])
+
+        version = a.dbnode.nodeversion
+        a._set_attrs({'integer': 1, 'new': 'value'}, stored_check=False)
+        attrs_to_set.update({'integer': 1, 'new': 'value'})
+        self.assertEquals(a.dbnode.nodeversion, version + 1)
+        self.assertEquals(dict(a.iterattrs()), attrs_to_set)
+
+        a._del_attrs(['dict', 'list'], stored_check=False)
+        del attrs_to_set['dict']
+        del attrs_to_set['list']
+        self.assertEquals(a.dbnode.nodeversion, version + 2)
+        self.assertEquals(dict(load_node(a.pk).iterattrs()), attrs_to_set)
+
     def test_replace_extras_1(self):
         """
         Checks the ability of replacing extras, removing the subkeys also when
@@ -2135,6 +2267,62 @@ class TestSubNodesAndLinks(AiidaTestCase):
         with self.assertRaises(ValueError):
             d1.add_link_from(calc2, link_type=LinkType.CREATE)
 
+    def test_store_many(self):
+        """
+        Test the bulk storage of nodes with links between them and from
+        stored nodes.
+        """
+        from aiida.orm.utils import store_many
+
+        stored = Node().store()
+        n1 = Node()
+        n1._set_attr('a', [1, 2, {'b': 3}])
+        n2 = Node()
+        n3 = Node()
+        n2.add_link_from(n1, 'N1', link_type=LinkType.INPUT)
+        n3.add_link_from(n2, 'N2', link_type=LinkType.CREATE)
+        n3.add_link_from(stored, 'S', link_type=LinkType.INPUT)
+
+        store_many([n3, n1, n2])
+
+        for node in [n1, n2, n3]:
+            self.assertTrue(node.is_stored)
+            self.assertFalse(node._has_cached_links())
+            self.assertEquals(load_node(node.pk).uuid, node.uuid)
+            self.assertIsNotNone(node.get_extra('_aiida_hash'))
+        self.assertEquals(load_node(n1.pk).get_attr('a'), [1, 2, {'b': 3}])
+        self.assertEquals(
+            set((label, node.uuid) for label, node
+                in n3.get_inputs(only_in_db=True, also_labels=True)),
+            set([('N2', n2.uuid), ('S', stored.uuid)]))
+        self.assertEquals(
+            [node.uuid for node in n2.get_inputs(only_in_db=True)], [n1.uuid])
+
+        # The nodes behave as if stored one by one
+        n3.set_extra('x', 1)
+        self.assertEquals(load_node(n3.pk).get_extra('x'), 1)
+
+        with self.assertRaises(ModificationNotAllowed):
+            store_many([n1])
+
+        # The source of a link must be stored or in the list
+        n4 = Node()
+        n5 = Node()
+        n5.add_link_from(n4, 'N4')
+        with self.assertRaises(ModificationNotAllowed):
+            store_many([n5])
+        self.assertFalse(n5.is_stored)
+
+        # Loops are detected
+        n6 = Node()
+        n4.add_link_from(n6, 'N6', link_type=LinkType.CREATE)
+        n6.add_link_from(n4, 'N4', link_type=LinkType.CREATE)
+        with self.assertRaises(ValueError):
+            store_many([n4, n6])
+        self.assertFalse(n4.is_stored)
+        self.assertFalse(n6.is_stored)
+
+
 class AnyValue(object):
     """
     Helper class that compares equal to everything.
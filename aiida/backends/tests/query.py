@@ -341,6 +341,42 @@ class TestQueryBuilder(AiidaTestCase):
         self.assertEqual(len(list(QueryBuilder().append(Node, project=['*', 'id']).iterdict())), 4)
         self.assertEqual(len(list(QueryBuilder().append(Node, project=['id']).iterdict())), 4)
 
+    def test_row_mode(self):
+        from aiida.orm import Node
+        from aiida.orm.querybuilder import QueryBuilder
+        from aiida.common.exceptions import InputValidationError
+
+        pks = []
+        for i in range(5):
+            n = Node()
+            n.label = 'row{}'.format(i)
+            n._set_attr('i', i)
+            n.store()
+            pks.append(n.pk)
+
+        def get_qb():
+            qb = QueryBuilder()
+            qb.append(Node, tag='node', filters={'id': {'in': pks}},
+                      project=['id', 'label', 'attributes.i'])
+            qb.order_by({'node': ['id']})
+            return qb
+
+        expected = [(pk, 'row{}'.format(i), i) for i, pk in enumerate(pks)]
+        self.assertEqual(list(get_qb().iterrows(batch_size=2)), expected)
+        self.assertEqual(
+            [tuple(row) for row in get_qb().all()], expected)
+
+        arrays = list(get_qb().iterarrays(batch_size=2))
+        self.assertEqual([len(array) for array in arrays], [2, 2, 1])
+        self.assertEqual(
+            sum([array['node.id'].tolist() for array in arrays], []), pks)
+        self.assertEqual(
+            sum([array['node.attributes.i'].tolist() for array in arrays], []),
+            range(5))
+
+        with self.assertRaises(InputValidationError):
+            list(QueryBuilder().append(Node).iterrows())
+
     def test_append_validation(self):
         from aiida.orm.querybuilder import QueryBuilder
         from aiida.orm.data.structure import StructureData
@@ -861,6 +897,100 @@ class QueryBuilderPath(AiidaTestCase):
         qb.add_filter('edge', {'depth':6})
         self.assertTrue(set(zip(*qb.all())[0]), set([6]))
 
+    def test_query_path_reachability_index(self):
+        from aiida.orm.querybuilder import QueryBuilder
+        from aiida.orm import Node
+        from aiida.common.links import LinkType
+        from aiida.backends.reachability import (
+            rebuild_reachability_index, disable_reachability_index,
+            is_reachability_index_enabled)
+
+        def descendants(node):
+            return set(pk for pk, in QueryBuilder().append(
+                Node, filters={'id': node.pk}, tag='anc').append(
+                Node, descendant_of='anc', project='id').all())
+
+        def ancestors(node):
+            return set(pk for pk, in QueryBuilder().append(
+                Node, filters={'id': node.pk}, tag='desc').append(
+                Node, ancestor_of='desc', project='id').all())
+
+        n1, n2, n3, n4, n5 = [Node().store() for _ in range(5)]
+        n2.add_link_from(n1, link_type=LinkType.INPUT)
+        n3.add_link_from(n2, link_type=LinkType.CREATE)
+
+        self.assertFalse(is_reachability_index_enabled())
+        rebuild_reachability_index()
+        try:
+            self.assertTrue(is_reachability_index_enabled())
+            self.assertEquals(descendants(n1), set([n2.pk, n3.pk]))
+            self.assertEquals(ancestors(n3), set([n1.pk, n2.pk]))
+
+            # The index is updated when links are added...
+            n4.add_link_from(n3, link_type=LinkType.INPUT)
+            n4.add_link_from(n2, label='second', link_type=LinkType.INPUT)
+            n5.add_link_from(n4, link_type=LinkType.CALL)
+            self.assertEquals(descendants(n1), set([n2.pk, n3.pk, n4.pk]))
+            self.assertEquals(ancestors(n4), set([n1.pk, n2.pk, n3.pk]))
+            self.assertEquals(ancestors(n5), set())
+
+            # ... also in bulk...
+            n6 = Node()
+            n7 = Node()
+            n6.add_link_from(n4, 'N4', link_type=LinkType.INPUT)
+            n7.add_link_from(n6, 'N6', link_type=LinkType.CREATE)
+            n6.store()
+            n7.store()
+            self.assertEquals(ancestors(n7),
+                              set([n1.pk, n2.pk, n3.pk, n4.pk, n6.pk]))
+
+            # ... and when they are removed
+            n2._remove_link_from(n2.get_inputs(also_labels=True)[0][0])
+            self.assertEquals(descendants(n1), set())
+            self.assertEquals(ancestors(n7),
+                              set([n2.pk, n3.pk, n4.pk, n6.pk]))
+
+            # The loop check uses the index
+            with self.assertRaises(ValueError):
+                n2.add_link_from(n7, link_type=LinkType.INPUT)
+
+            # The edge can still be projected, without the index
+            qb = QueryBuilder().append(
+                Node, filters={'id': n2.pk}, tag='anc').append(
+                Node, descendant_of='anc', filters={'id': n4.pk},
+                edge_project='depth')
+            self.assertEquals(set(depth for depth, in qb.all()), set([0, 1]))
+        finally:
+            disable_reachability_index()
+
+        self.assertFalse(is_reachability_index_enabled())
+
+    def test_reachability_index_update_lock(self):
+        from aiida.orm import Node
+        from aiida.common.links import LinkType
+        from aiida.backends.reachability import (
+            rebuild_reachability_index, disable_reachability_index,
+            _atomic, _execute)
+
+        locks_sql = """
+            SELECT mode FROM pg_locks
+            WHERE relation = 'db_dbreachability'::regclass
+            AND pid = pg_backend_pid() AND granted
+        """
+
+        n1, n2 = [Node().store() for _ in range(2)]
+        rebuild_reachability_index()
+        try:
+            # The updates of the index are serialised with a lock held until
+            # the end of the transaction, so that concurrent transactions
+            # see each other's pairs
+            with _atomic():
+                n2.add_link_from(n1, link_type=LinkType.INPUT)
+                modes = set(mode for mode, in _execute(locks_sql, fetch=True))
+            self.assertIn('ShareRowExclusiveLock', modes)
+        finally:
+            disable_reachability_index()
+
 
 
 class TestConsistency(AiidaTestCase):
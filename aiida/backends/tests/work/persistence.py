@@ -9,8 +9,10 @@
 ###########################################################################
 
 import tempfile
+import time
 
 import plum.process_monitor
+from plum.persistence.bundle import Bundle
 from aiida.backends.testbase import AiidaTestCase
 from aiida.work.persistence import Persistence
 import aiida.work.util as util
@@ -42,3 +44,63 @@ class TestProcess(AiidaTestCase):
         self.assertEqual(b, b2)
 
         dp.run_until_complete()
+
+    def test_runnable_pids(self):
+        from plum.wait_ons import Checkpoint, WaitOnAll, WaitOnAny, WaitOnProcess
+        from aiida.orm.calculation.work import WorkCalculation
+        from aiida.work.persistence import _get_wait_expression
+
+        dp = DummyProcess.new_instance()
+        self.persistence.save(dp)
+        self.assertEqual(self.persistence.get_runnable_pids([dp.pid]),
+                         {dp.pid})
+
+        running = WorkCalculation().store()
+        finished = WorkCalculation().store()
+        finished.seal()
+        wait_on = WaitOnAll('cb', [
+            WaitOnProcess('cb', finished.pk),
+            WaitOnAny('cb', [Checkpoint('cb'),
+                             WaitOnProcess('cb', running.pk)])])
+        bundle = Bundle()
+        wait_on.save_instance_state(bundle)
+        self.assertEqual(_get_wait_expression(bundle), {'all': [
+            {'node': finished.pk}, {'any': [True, {'node': running.pk}]}]})
+
+        # A process waiting on an unfinished node is not runnable
+        index = self.persistence._get_index()
+        with index:
+            index.execute(
+                "UPDATE checkpoints SET waiting_on = ? WHERE pid = ?",
+                ('{{"all": [{{"node": {}}}, {{"node": {}}}]}}'.format(
+                    finished.pk, running.pk), dp.pid))
+        index.close()
+        self.assertEqual(self.persistence.get_runnable_pids([dp.pid]), set())
+        running.seal()
+        # The notification of the sealed node is received asynchronously
+        for _ in range(50):
+            if self.persistence.get_runnable_pids([dp.pid]):
+                break
+            time.sleep(0.1)
+        self.assertEqual(self.persistence.get_runnable_pids([dp.pid]),
+                         {dp.pid})
+
+        dp.run_until_complete()
+
+    def test_node_finished_notifications(self):
+        from aiida.backends.notifications import NodeFinishedListener
+        from aiida.orm.calculation.work import WorkCalculation
+
+        listener = NodeFinishedListener()
+        try:
+            calc = WorkCalculation().store()
+            calc.seal()
+            finished = set()
+            for _ in range(50):
+                finished.update(listener.poll())
+                if calc.pk in finished:
+                    break
+                time.sleep(0.1)
+            self.assertEqual(finished, {calc.pk})
+        finally:
+            listener.close()
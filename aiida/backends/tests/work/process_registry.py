@@ -10,6 +10,51 @@
 
 
 from aiida.backends.testbase import AiidaTestCase
+from aiida.common.links import LinkType
+from aiida.orm.data.base import Int
+from aiida.orm.calculation.work import WorkCalculation
+from aiida.work.process_registry import ProcessRegistry
+
 
 class TestProcessRegistry(AiidaTestCase):
-    pass
\ No newline at end of file
+    def test_have_finished(self):
+        registry = ProcessRegistry()
+        running = WorkCalculation().store()
+        finished = WorkCalculation().store()
+        failed = WorkCalculation().store()
+        failed._set_attr(WorkCalculation.FAILED_KEY, True)
+        finished.seal()
+        failed.seal()
+        data = Int(1).store()
+
+        pids = [running.pk, finished.pk, failed.pk, data.pk]
+        self.assertEqual(registry.have_finished(pids), {
+            running.pk: False, finished.pk: True, failed.pk: True})
+        self.assertEqual(registry.have_failed(pids), {
+            running.pk: False, finished.pk: False, failed.pk: True})
+        self.assertTrue(registry.has_finished(finished.pk))
+
+        # The state of the unfinished processes is cached for a short time
+        running.seal()
+        self.assertFalse(registry.has_finished(running.pk))
+        registry.clear_cache()
+        self.assertTrue(registry.has_finished(running.pk))
+
+    def test_get_outputs_many(self):
+        registry = ProcessRegistry()
+        with_outputs = WorkCalculation().store()
+        without_outputs = WorkCalculation().store()
+        one, two = Int(1).store(), Int(2).store()
+        one.add_link_from(with_outputs, 'one', link_type=LinkType.RETURN)
+        two.add_link_from(with_outputs, 'two', link_type=LinkType.RETURN)
+        with_outputs.seal()
+        without_outputs.seal()
+
+        outputs = registry.get_outputs_many([with_outputs.pk, without_outputs.pk])
+        self.assertEqual(
+            {label: node.pk for label, node in outputs[with_outputs.pk].iteritems()},
+            {'one': one.pk, 'two': two.pk})
+        self.assertEqual(outputs[without_outputs.pk], {})
+        self.assertEqual(
+            {label: node.pk for label, node in registry.get_outputs(with_outputs.pk).iteritems()},
+            {'one': one.pk, 'two': two.pk})
@@ -82,6 +82,24 @@ def load_dbenv(process=None, profile=None, *args, **kwargs):
             settings.BACKEND))
 
 
+def close_thread_db_connection():
+    """
+    Release the database connection (Django) or scoped session (SQLAlchemy)
+    owned by the current thread. To be called at the end of any thread,
+    other than the main one, that accessed the database.
+    """
+    if settings.BACKEND == BACKEND_SQLA:
+        from aiida.backends import sqlalchemy as sa
+        if sa.scopedsessionclass is not None:
+            sa.scopedsessionclass.remove()
+    elif settings.BACKEND == BACKEND_DJANGO:
+        from django.db import connection
+        connection.close()
+    else:
+        raise ConfigurationError("Invalid settings.BACKEND: {}".format(
+            settings.BACKEND))
+
+
 def get_automatic_user():
     if settings.BACKEND == BACKEND_SQLA:
         from aiida.backends.sqlalchemy.utils import (
@@ -278,6 +296,25 @@ def delete_nodes_and_connections(pks):
     delete_nodes_backend(pks)
 
 
+def set_extras_of_nodes(extras):
+    """
+    Set some extras of several stored nodes at once, with a fixed number of
+    queries and in a single transaction. The other extras of the nodes are
+    left untouched.
+
+    :param extras: a dictionary where the keys are node PKs and the values
+        the dictionaries of key:value of the extras to set, already cleaned
+    """
+    if settings.BACKEND == BACKEND_DJANGO:
+        from aiida.backends.djsite.utils import set_extras_of_nodes_django as set_extras_backend
+    elif settings.BACKEND == BACKEND_SQLA:
+        from aiida.backends.sqlalchemy.utils import set_extras_of_nodes_sqla as set_extras_backend
+    else:
+        raise Exception("unknown backend {}".format(settings.BACKEND))
+
+    set_extras_backend(extras)
+
+
 def _get_column(colname, alias):
     """
     Return the column for a given projection. Needed by the QueryBuilder
@@ -113,7 +113,9 @@ class Devel(VerdiCommandWithSubcommands):
             'listislands': (self.run_listislands, self.complete_none),
             'play': (self.run_play, self.complete_none),
             'getresults': (self.calculation_getresults, self.complete_none),
-            'tickd': (self.tick_daemon, self.complete_none)
+            'tickd': (self.tick_daemon, self.complete_none),
+            'reachability': (self.run_reachability, self.complete_reachability),
+            'repository': (self.run_repository, self.complete_repository)
         }
 
         # The content of the dict is:
@@ -374,6 +376,89 @@ class Devel(VerdiCommandWithSubcommands):
         from aiida.daemon.tasks import manual_tick_all
         manual_tick_all()
 
+    def run_reachability(self, *args):
+        """
+        Manage the reachability index of the provenance graph, used by the
+        QueryBuilder for the ancestor_of and descendant_of relationships.
+        """
+        import argparse
+
+        parser = argparse.ArgumentParser(
+            prog=self.get_full_command_name(),
+            description="Manage the reachability index of the provenance "
+                        "graph. 'rebuild' builds it from scratch from the "
+                        "links and enables it (the links table is locked in "
+                        "the meantime); 'disable' empties and disables it; "
+                        "'status' tells whether it is enabled.")
+        parser.add_argument('action', choices=['rebuild', 'disable', 'status'])
+        parsed_args = parser.parse_args(args)
+
+        if not is_dbenv_loaded():
+            load_dbenv()
+        from aiida.backends.reachability import (
+            rebuild_reachability_index, disable_reachability_index,
+            is_reachability_index_enabled)
+
+        if parsed_args.action == 'rebuild':
+            rebuild_reachability_index()
+            print "Reachability index rebuilt and enabled."
+        elif parsed_args.action == 'disable':
+            disable_reachability_index()
+            print "Reachability index disabled."
+        else:
+            print "Reachability index {}.".format(
+                'enabled' if is_reachability_index_enabled() else 'disabled')
+
+    def complete_reachability(self, subargs_idx, subargs):
+        if subargs_idx == 0:
+            return " ".join(['rebuild', 'disable', 'status'])
+        else:
+            return ""
+
+    def run_repository(self, *args):
+        """
+        Manage the object store of the repository, where the files of the
+        nodes are deduplicated.
+        """
+        import argparse
+
+        parser = argparse.ArgumentParser(
+            prog=self.get_full_command_name(),
+            description="Manage the object store of the repository. "
+                        "'deduplicate' adds the files of all the nodes "
+                        "already stored to the object store, replacing the "
+                        "duplicates by hard links (it can be interrupted and "
+                        "run again); 'collect-garbage' removes the objects "
+                        "that no node uses anymore. Set the "
+                        "'repository.deduplicate' property to also "
+                        "deduplicate the files of the new nodes.")
+        parser.add_argument('action', choices=['deduplicate', 'collect-garbage'])
+        parsed_args = parser.parse_args(args)
+
+        if not is_dbenv_loaded():
+            load_dbenv()
+        from aiida.common.folders import _valid_sections
+        from aiida.common.objectstore import ObjectStore
+        from aiida.common.utils import get_repository_folder
+
+        store = ObjectStore()
+        if parsed_args.action == 'deduplicate':
+            num_added = 0
+            for section in _valid_sections:
+                section_folder = os.path.join(
+                    get_repository_folder('repository'), section)
+                num_added += store.add_folder(section_folder)
+            print "{} file(s) added to the object store.".format(num_added)
+        else:
+            num_removed = store.collect_garbage()
+            print "{} unused object(s) removed.".format(num_removed)
+
+    def complete_repository(self, subargs_idx, subargs):
+        if subargs_idx == 0:
+            return " ".join(['deduplicate', 'collect-garbage'])
+        else:
+            return ""
+
     def run_listproperties(self, *args):
         """
         List all found global AiiDA properties.
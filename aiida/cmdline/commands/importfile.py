@@ -42,6 +42,12 @@ class Import(VerdiCommand):
         parser.add_argument(nargs='*', type=str,
                             dest='files', metavar='URL_OR_PATH',
                             help="Import the given files or URLs")
+        parser.add_argument('-b', '--batch-size', type=int, default=None,
+                            help="Import the nodes and the links in batches "
+                                 "of this size, each in its own transaction, "
+                                 "without loading the whole file in memory. "
+                                 "An interrupted import can be resumed by "
+                                 "importing the same file again")
 
         parsed_args = parser.parse_args(args)
 
@@ -82,7 +88,7 @@ class Import(VerdiCommand):
         for filename in files:
             try:
                 print "**** Importing file {}".format(filename)
-                import_data(filename)
+                import_data(filename, batch_size=parsed_args.batch_size)
             except Exception:
                 traceback.print_exc()
 
@@ -107,7 +113,7 @@ class Import(VerdiCommand):
 
                     print " `-> File downloaded. Importing it..."
                     import_data(temp_download_folder.get_abs_path(
-                        download_file_name))
+                        download_file_name), batch_size=parsed_args.batch_size)
             except Exception:
                 traceback.print_exc()
 
@@ -27,10 +27,15 @@ class Rehash(VerdiCommand):
 @click.command('rehash')
 @click.option('--all', '-a', is_flag=True, help='Rehash all nodes of the given Node class.')
 @click.option('--class-name', type=str, default='aiida.orm.node.Node', help='Restrict nodes which are re-hashed to instances of this class.')
+@click.option('--processes', '-n', type=int, default=1, help='Number of processes computing the hashes.')
+@click.option('--batch-size', type=int, default=1000, help='Number of nodes hashed and stored at once.')
+@click.option('--checkpoint', type=click.Path(dir_okay=False), help='File where the progress is saved, to resume an interrupted rehash.')
+@click.option('--force', '-f', is_flag=True, help='Also rehash the nodes which did not change since they were last re-hashed.')
 @click.argument('pks', type=int, nargs=-1)
-def _rehash_cmd(all, class_name, pks):
+def _rehash_cmd(all, class_name, processes, batch_size, checkpoint, force, pks):
     try_load_dbenv()
     from aiida.orm.querybuilder import QueryBuilder
+    from aiida.utils.rehash import rehash_nodes
 
     # Get the Node class to match
     try:
@@ -52,8 +57,13 @@ def _rehash_cmd(all, class_name, pks):
     if not qb.count():
         click.echo('No matching nodes found.')
         return
-    for i, (node,) in enumerate(qb.iterall()):
-        if i % 100 == 0:
-            click.echo('.', nl=False)
-        node.rehash()
-    click.echo('\nAll done! {} node(s) re-hashed.'.format(i + 1))
+
+    def print_progress(num_rehashed, num_skipped):
+        click.echo('.', nl=False)
+
+    num_rehashed, num_skipped = rehash_nodes(
+        node_class, pks=pks or None, processes=processes,
+        batch_size=batch_size, force=force, checkpoint=checkpoint,
+        callback=print_progress)
+    click.echo('\nAll done! {} node(s) re-hashed, {} unchanged node(s) skipped.'.format(
+        num_rehashed, num_skipped))
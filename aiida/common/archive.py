@@ -7,6 +7,9 @@
 # For further information on the license, see the LICENSE.txt file        #
 # For further information please visit http://www.aiida.net               #
 ###########################################################################
+import re
+import sys
+
 
 def extract_zip(infile, folder, nodes_export_subfolder="nodes",
                 silent=False):
@@ -186,4 +189,425 @@ def extract_cif(infile, folder, nodes_export_subfolder="nodes",
             if sha1_file(folder.get_abs_path(dest_path)) != sha1:
                 raise ValidationError("SHA1 sum for extracted file '{}' is "
                                       "different from given in the CIF "
-                                      "file".format(dest_path))
\ No newline at end of file
+                                      "file".format(dest_path))
+
+def _compress_gzip_member(args):
+    """
+    Compress a block of data into a complete gzip member.
+
+    :param args: a tuple (data, compresslevel)
+    """
+    import zlib
+
+    data, compresslevel = args
+    # wbits=31: deflate with the gzip header and trailer
+    compressor = zlib.compressobj(compresslevel, zlib.DEFLATED, 31)
+    return compressor.compress(data) + compressor.flush()
+
+
+class ParallelGzipFile(object):
+    """
+    A write-only file object compressing the data with gzip, in blocks
+    compressed in parallel by a pool of threads (zlib releases the GIL).
+
+    Each block is written as a gzip member: the output is a valid multi-member
+    gzip file, that can be read by gzip, the gzip module and tarfile.
+    """
+
+    def __init__(self, fileobj, threads=None, block_size=2**20,
+                 compresslevel=6):
+        """
+        :param fileobj: the file object where the compressed data is written;
+            it is not closed by close()
+        :param threads: the number of compressing threads (default: the
+            number of CPUs)
+        :param block_size: the size in bytes of the blocks compressed
+            independently
+        :param compresslevel: the gzip compression level, from 1 to 9
+        """
+        import collections
+        import multiprocessing
+        from multiprocessing.pool import ThreadPool
+
+        if threads is None:
+            threads = multiprocessing.cpu_count()
+        self._fileobj = fileobj
+        self._block_size = block_size
+        self._compresslevel = compresslevel
+        self._pool = ThreadPool(threads)
+        # At most two blocks per thread are kept in memory
+        self._max_pending = 2 * threads
+        self._pending = collections.deque()
+        self._buffer = []
+        self._buffer_size = 0
+        self._closed = False
+
+    def write(self, data):
+        if self._closed:
+            raise ValueError("I/O operation on closed file")
+        self._buffer.append(data)
+        self._buffer_size += len(data)
+        if self._buffer_size >= self._block_size:
+            self._submit_buffer()
+
+    def _submit_buffer(self):
+        data = b''.join(self._buffer)
+        self._buffer = []
+        self._buffer_size = 0
+        for start in range(0, len(data), self._block_size):
+            self._pending.append(self._pool.apply_async(
+                _compress_gzip_member,
+                ((data[start:start + self._block_size], self._compresslevel),)))
+            while len(self._pending) > self._max_pending:
+                self._fileobj.write(self._pending.popleft().get())
+
+    def flush(self):
+        """
+        Compress and write all the data written so far.
+        """
+        if self._buffer_size:
+            self._submit_buffer()
+        while self._pending:
+            self._fileobj.write(self._pending.popleft().get())
+        self._fileobj.flush()
+
+    def close(self):
+        if self._closed:
+            return
+        try:
+            self.flush()
+        finally:
+            self._closed = True
+            self._pool.terminate()
+            self._pool.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+class TarFolderFile(object):
+    """
+    A file of a TarFolder, open for writing. The content is spooled (in
+    memory, or in a temporary file if large) and added to the tar file when
+    the file is closed, as the size of a tar member must be known before its
+    content.
+    """
+
+    def __init__(self, tar, name):
+        import tempfile
+
+        self._tar = tar
+        self._name = name
+        self._spool = tempfile.SpooledTemporaryFile(max_size=2**24)
+
+    def write(self, data):
+        self._spool.write(data)
+
+    def close(self):
+        import tarfile
+        import time
+
+        if self._spool is None:
+            return
+        info = tarfile.TarInfo(self._name)
+        info.size = self._spool.tell()
+        info.mtime = time.time()
+        info.mode = 0o644
+        self._spool.seek(0)
+        self._tar.addfile(info, self._spool)
+        self._spool.close()
+        self._spool = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+class TarFolder(object):
+    """
+    A write-only folder-like interface to a tar file, with the subset of the
+    :py:class:`Folder <aiida.common.folders.Folder>` API used by the export,
+    so that the export is written directly in the (possibly streamed) tar
+    file.
+    """
+
+    def __init__(self, tarfolder_or_tar, subfolder='.'):
+        """
+        :param tarfolder_or_tar: either another TarFolder, of which you want
+            to get a subfolder, or a tarfile.TarFile open for writing
+        :param subfolder: the path of the folder inside the tar file
+        """
+        import os
+
+        if isinstance(tarfolder_or_tar, TarFolder):
+            self._tar = tarfolder_or_tar._tar
+            self._pwd = os.path.join(tarfolder_or_tar.pwd, subfolder)
+        else:
+            self._tar = tarfolder_or_tar
+            self._pwd = subfolder
+
+    @property
+    def pwd(self):
+        return self._pwd
+
+    def _get_internal_path(self, filename):
+        import os
+        return os.path.normpath(os.path.join(self.pwd, filename))
+
+    def open(self, fname, mode='w'):
+        if mode != 'w':
+            raise ValueError("A TarFolder can only be written")
+        return TarFolderFile(self._tar, self._get_internal_path(fname))
+
+    def get_subfolder(self, subfolder, create=False, reset_limit=False):
+        # reset_limit: ignored
+        # create: ignored, the folders are created when files are added
+        return TarFolder(self, subfolder=subfolder)
+
+    def insert_path(self, src, dest_name=None, overwrite=True):
+        """
+        Add a file or (recursively) a folder to the tar file.
+
+        :param src: the absolute path of the file or folder to add
+        :param dest_name: the destination path, relative to this folder; if
+            None, the basename of src is used
+        :param overwrite: ignored, the tar file is only appended to
+        """
+        import os
+
+        if not os.path.isabs(src):
+            raise ValueError("src must be an absolute path in insert_file")
+        if dest_name is None:
+            dest_name = os.path.basename(src)
+        base_filename = self._get_internal_path(dest_name)
+
+        # Files and folders are added one by one, to keep the folders
+        # (also empty ones) but not their content twice
+        self._tar.add(src, arcname=base_filename, recursive=False)
+        if os.path.isdir(src):
+            for dirpath, dirnames, filenames in os.walk(src):
+                relpath = os.path.relpath(dirpath, src)
+                for fn in sorted(dirnames) + sorted(filenames):
+                    self._tar.add(
+                        os.path.join(dirpath, fn),
+                        arcname=os.path.normpath(
+                            os.path.join(base_filename, relpath, fn)),
+                        recursive=False)
+
+
+class JSONStreamReader(object):
+    """
+    A reader of large JSON documents, such as the data.json file of an
+    export, that decodes one entry at a time of the object or array found at
+    a given path, without loading the whole document in memory.
+
+    The parts of the document that are not needed are only scanned, and each
+    entry is decoded independently: only the current entry is kept in
+    memory. Each call of iter_object_items or iter_array_items reads the
+    file from the current position, so a new reader (on a file object
+    positioned at the beginning of the document) is needed for each call.
+    """
+    _non_whitespace = re.compile(r'\S')
+    _delimiters = re.compile(r'[\[\]{}"]')
+    # The content of a string, up to the closing quote (excluded)
+    _string_content = re.compile(r'[^"\\]*(?:\\.[^"\\]*)*', re.DOTALL)
+    _scalar_end = re.compile(r'[,\]}\s]')
+
+    def __init__(self, fileobj, chunk_size=2**20):
+        """
+        :param fileobj: a file object open for reading
+        :param chunk_size: the size in bytes of the chunks read from the file
+        """
+        self._fileobj = fileobj
+        self._chunk_size = chunk_size
+        self._buffer = ''
+        self._pos = 0
+        # The start of the value being read, that must be kept in the buffer
+        self._mark = None
+
+    def _fill(self):
+        """
+        Read the next chunk of the file into the buffer, discarding the part
+        of the buffer already consumed.
+
+        :return: False if the end of the file was reached
+        """
+        start = self._pos if self._mark is None else self._mark
+        self._buffer = self._buffer[start:]
+        self._pos -= start
+        if self._mark is not None:
+            self._mark -= start
+        chunk = self._fileobj.read(self._chunk_size)
+        if not chunk:
+            return False
+        self._buffer += chunk
+        return True
+
+    def _peek(self):
+        """
+        Skip the whitespace and return the next character, without consuming
+        it (None at the end of the document).
+        """
+        while True:
+            match = self._non_whitespace.search(self._buffer, self._pos)
+            if match is not None:
+                self._pos = match.start()
+                return self._buffer[self._pos]
+            self._pos = len(self._buffer)
+            if not self._fill():
+                return None
+
+    def _expect(self, characters):
+        """
+        Consume the next character, that must be one of the given ones.
+        """
+        character = self._peek()
+        if character is None or character not in characters:
+            raise ValueError("Invalid JSON document: expected one of '{}', "
+                             "found {!r}".format(characters, character))
+        self._pos += 1
+        return character
+
+    def _skip_string(self):
+        """
+        Skip the rest of a string, whose opening quote was consumed.
+        """
+        while True:
+            end = self._string_content.match(self._buffer, self._pos).end()
+            self._pos = end
+            if end < len(self._buffer) and self._buffer[end] == '"':
+                self._pos += 1
+                return
+            if not self._fill():
+                raise ValueError("Invalid JSON document: unterminated string")
+
+    def _skip_value(self):
+        """
+        Skip the next value, without decoding it.
+        """
+        character = self._peek()
+        if character is None:
+            raise ValueError("Invalid JSON document: expected a value")
+        if character == '"':
+            self._pos += 1
+            self._skip_string()
+        elif character in '[{':
+            depth = 0
+            while True:
+                match = self._delimiters.search(self._buffer, self._pos)
+                if match is None:
+                    self._pos = len(self._buffer)
+                    if not self._fill():
+                        raise ValueError("Invalid JSON document: unterminated "
+                                         "object or array")
+                    continue
+                self._pos = match.end()
+                delimiter = match.group()
+                if delimiter == '"':
+                    self._skip_string()
+                elif delimiter in '[{':
+                    depth += 1
+                else:
+                    depth -= 1
+                    if depth == 0:
+                        return
+        else:
+            # A number, true, false or null
+            while True:
+                match = self._scalar_end.search(self._buffer, self._pos)
+                if match is not None:
+                    self._pos = match.start()
+                    return
+                self._pos = len(self._buffer)
+                if not self._fill():
+                    return
+
+    def _read_value(self):
+        """
+        Decode and return the next value.
+        """
+        import json
+
+        self._peek()
+        self._mark = self._pos
+        try:
+            self._skip_value()
+            return json.loads(self._buffer[self._mark:self._pos])
+        finally:
+            self._mark = None
+
+    def _iter_keys(self):
+        """
+        Iterate over the keys of the next object: after each key, the caller
+        must consume the corresponding value.
+        """
+        self._expect('{')
+        if self._peek() == '}':
+            self._pos += 1
+            return
+        while True:
+            key = self._read_value()
+            self._expect(':')
+            yield key
+            if self._expect(',}') == '}':
+                return
+
+    def _iter_elements(self):
+        """
+        Iterate over the next array: at each iteration, the caller must
+        consume the element.
+        """
+        self._expect('[')
+        if self._peek() == ']':
+            self._pos += 1
+            return
+        while True:
+            yield
+            if self._expect(',]') == ']':
+                return
+
+    def _find(self, path):
+        """
+        Move to the value at the given path, skipping everything before it.
+
+        :return: False if the path is not in the document
+        """
+        for key in path:
+            if self._peek() != '{':
+                return False
+            for name in self._iter_keys():
+                if name == key:
+                    break
+                self._skip_value()
+            else:
+                return False
+        return True
+
+    def iter_object_items(self, path=()):
+        """
+        Iterate over the (key, value) pairs of an object of the document.
+
+        :param path: the keys leading from the document to the object; if the
+            object is not found, nothing is yielded
+        """
+        if not self._find(path) or self._peek() == 'n':
+            return
+        for key in self._iter_keys():
+            yield key, self._read_value()
+
+    def iter_array_items(self, path=()):
+        """
+        Iterate over the elements of an array of the document.
+
+        :param path: the keys leading from the document to the array; if the
+            array is not found, nothing is yielded
+        """
+        if not self._find(path) or self._peek() == 'n':
+            return
+        for _ in self._iter_elements():
+            yield self._read_value()
@@ -0,0 +1,268 @@
+# -*- coding: utf-8 -*-
+###########################################################################
+# Copyright (c), The AiiDA team. All rights reserved.                     #
+# This file is part of the AiiDA code.                                    #
+#                                                                         #
+# The code is hosted on GitHub at https://github.com/aiidateam/aiida_core #
+# For further information on the license, see the LICENSE.txt file        #
+# For further information please visit http://www.aiida.net               #
+###########################################################################
+"""
+A chunked and compressed on-disk format for numpy arrays.
+
+An array is stored in a folder, split along its first dimension in chunks of
+``chunk_length`` rows. Each chunk is a file with the raw bytes of the rows,
+byte-shuffled (the i-th bytes of all the items are stored together, that
+compresses much better for numerical data) and compressed with zlib. A
+'meta.json' file stores the dtype, the shape and the chunk length.
+
+Rows can be appended by rewriting only the last chunk, and the chunks can be
+read independently (and in parallel) to get a slice of the array.
+"""
+import io
+import json
+import numbers
+import os
+import zlib
+
+META_FILENAME = 'meta.json'
+FORMAT_VERSION = 1
+
+# The default size in bytes of the (uncompressed) chunks
+DEFAULT_CHUNK_BYTES = 2 ** 20
+
+
+def _descr_to_dtype(descr):
+    """
+    Return the dtype of a descr as returned by
+    numpy.lib.format.dtype_to_descr, after a JSON round trip (that turns the
+    tuples of structured dtypes into lists).
+    """
+    import numpy
+
+    def to_tuples(value):
+        if isinstance(value, list):
+            return [tuple(to_tuples(i) for i in field) if isinstance(field, list)
+                    else field for field in value]
+        return value
+
+    if isinstance(descr, list):
+        return numpy.dtype(to_tuples(descr))
+    return numpy.dtype(str(descr))
+
+
+class ChunkedArray(object):
+    """
+    A numpy array stored in the chunked format in a folder.
+    """
+
+    def __init__(self, abspath):
+        """
+        Open an array stored in the chunked format.
+
+        :param abspath: the absolute path of the folder of the array
+        :raise IOError: if the folder does not contain a chunked array
+        """
+        self._abspath = abspath
+        with io.open(os.path.join(abspath, META_FILENAME), encoding='utf8') as f:
+            meta = json.load(f)
+        if meta.get('format_version') != FORMAT_VERSION:
+            raise IOError("Unsupported version of the chunked array format "
+                          "in {}".format(abspath))
+        self._dtype = _descr_to_dtype(meta['descr'])
+        self._shape = tuple(meta['shape'])
+        self._chunk_length = meta['chunk_length']
+        self._compresslevel = meta['compresslevel']
+
+    @classmethod
+    def create(cls, abspath, array, chunk_length=None, compresslevel=6):
+        """
+        Store an array in the chunked format.
+
+        :param abspath: the absolute path of the folder of the array, that
+            must not exist
+        :param array: a numpy array, with at least one dimension and not of
+            Python objects
+        :param chunk_length: the number of rows (along the first dimension)
+            of each chunk; by default, the chunks are of about 1MB
+        :param compresslevel: the zlib compression level, from 0 to 9
+        :return: the ChunkedArray
+        """
+        import numpy
+        from numpy.lib.format import dtype_to_descr
+
+        if array.ndim == 0:
+            raise ValueError("Only arrays with at least one dimension can be "
+                             "stored in chunks")
+        if array.dtype.hasobject:
+            raise ValueError("Arrays of Python objects cannot be stored in "
+                             "chunks")
+        if chunk_length is None:
+            row_bytes = array.dtype.itemsize * int(numpy.prod(array.shape[1:]))
+            chunk_length = max(1, DEFAULT_CHUNK_BYTES // max(1, row_bytes))
+        if chunk_length < 1:
+            raise ValueError("The chunk length must be positive")
+
+        os.mkdir(abspath)
+        meta = {
+            'format_version': FORMAT_VERSION,
+            'descr': dtype_to_descr(array.dtype),
+            'shape': [0] + list(array.shape[1:]),
+            'chunk_length': chunk_length,
+            'compresslevel': compresslevel,
+        }
+        with io.open(os.path.join(abspath, META_FILENAME), 'w', encoding='utf8') as f:
+            f.write(unicode(json.dumps(meta)))
+
+        chunked_array = cls(abspath)
+        chunked_array.append(array)
+        return chunked_array
+
+    @property
+    def abspath(self):
+        return self._abspath
+
+    @property
+    def dtype(self):
+        return self._dtype
+
+    @property
+    def shape(self):
+        return self._shape
+
+    @property
+    def chunk_length(self):
+        return self._chunk_length
+
+    @property
+    def num_chunks(self):
+        return -(-self._shape[0] // self._chunk_length)
+
+    def _get_chunk_path(self, index):
+        return os.path.join(self._abspath, 'chunk-{:08d}'.format(index))
+
+    def _write_chunk(self, index, rows):
+        import numpy
+
+        data = numpy.ascontiguousarray(rows).view(numpy.uint8)
+        if self._dtype.itemsize > 1:
+            data = data.reshape(-1, self._dtype.itemsize).T
+        with open(self._get_chunk_path(index), 'wb') as f:
+            f.write(zlib.compress(data.tobytes(), self._compresslevel))
+
+    def read_chunk(self, index):
+        """
+        Return the rows of a chunk.
+
+        :param index: the index of the chunk, from 0 to num_chunks - 1
+        """
+        import numpy
+
+        num_rows = min(self._chunk_length,
+                       self._shape[0] - index * self._chunk_length)
+        with open(self._get_chunk_path(index), 'rb') as f:
+            data = numpy.frombuffer(zlib.decompress(f.read()), dtype=numpy.uint8)
+        if self._dtype.itemsize > 1:
+            data = data.reshape(self._dtype.itemsize, -1).T
+        return numpy.array(data, order='C').view(self._dtype).reshape(
+            (num_rows,) + self._shape[1:])
+
+    def append(self, array):
+        """
+        Append rows to the array: only the last chunk (if it is not full) is
+        rewritten.
+
+        :param array: a numpy array with the same dtype and the same shape
+            (except the first dimension) of the stored one
+        """
+        import numpy
+
+        array = numpy.asarray(array)
+        if array.shape[1:] != self._shape[1:]:
+            raise ValueError("Cannot append an array of shape {} to an array "
+                             "of shape {}".format(array.shape, self._shape))
+        if array.dtype != self._dtype:
+            raise TypeError("Cannot append an array of dtype {} to an array of "
+                            "dtype {}".format(array.dtype, self._dtype))
+
+        num_rows = self._shape[0]
+        last_length = num_rows % self._chunk_length
+        if last_length:
+            # Complete the last chunk
+            index = num_rows // self._chunk_length
+            array = numpy.concatenate([self.read_chunk(index), array])
+            num_rows -= last_length
+
+        for start in range(0, array.shape[0], self._chunk_length):
+            self._write_chunk((num_rows + start) // self._chunk_length,
+                              array[start:start + self._chunk_length])
+
+        self._shape = (num_rows + array.shape[0],) + self._shape[1:]
+        meta_path = os.path.join(self._abspath, META_FILENAME)
+        with io.open(meta_path, encoding='utf8') as f:
+            meta = json.load(f)
+        meta['shape'] = list(self._shape)
+        with io.open(meta_path, 'w', encoding='utf8') as f:
+            f.write(unicode(json.dumps(meta)))
+
+    def read(self, start=0, stop=None, threads=None):
+        """
+        Return the rows from start to stop, reading only the chunks that
+        contain them.
+
+        :param start: the first row
+        :param stop: the row after the last one; by default, the last row
+        :param threads: the number of threads used to read and decompress the
+            chunks; by default, up to 4
+        :return: a numpy array
+        """
+        import numpy
+        from multiprocessing.pool import ThreadPool
+
+        if stop is None or stop > self._shape[0]:
+            stop = self._shape[0]
+        if start >= stop:
+            return numpy.empty((0,) + self._shape[1:], dtype=self._dtype)
+
+        first_chunk = start // self._chunk_length
+        last_chunk = (stop - 1) // self._chunk_length
+        indices = range(first_chunk, last_chunk + 1)
+        if threads is None:
+            threads = min(4, len(indices))
+        if threads > 1:
+            pool = ThreadPool(threads)
+            try:
+                chunks = pool.map(self.read_chunk, indices)
+            finally:
+                pool.close()
+        else:
+            chunks = [self.read_chunk(index) for index in indices]
+
+        offset = first_chunk * self._chunk_length
+        return numpy.concatenate(chunks)[start - offset:stop - offset]
+
+    def __getitem__(self, index):
+        """
+        Return array[index], reading only the needed chunks when the index
+        selects rows with an integer or a slice with a positive step.
+        """
+        if isinstance(index, tuple) and index:
+            first, rest = index[0], index[1:]
+        else:
+            first, rest = index, ()
+
+        num_rows = self._shape[0]
+        if isinstance(first, numbers.Integral) and not isinstance(first, bool):
+            if first < 0:
+                first += num_rows
+            if not 0 <= first < num_rows:
+                raise IndexError("index {} is out of bounds for axis 0 with "
+                                 "size {}".format(index, num_rows))
+            return self.read(first, first + 1)[(0,) + rest]
+        elif isinstance(first, slice):
+            start, stop, step = first.indices(num_rows)
+            if step > 0:
+                rows = self.read(start, max(start, stop))
+                return rows[(slice(None, None, step),) + rest]
+
+        return self.read()[index]
@@ -36,6 +36,23 @@ _sorted_datastates = (
 # calc_states, instead, has a random order
 calc_states = CalcState(_sorted_datastates)
 
+# The states in which a calculation is running, and the final states
+running_calc_states = (
+    calc_states.TOSUBMIT,
+    calc_states.SUBMITTING,
+    calc_states.WITHSCHEDULER,
+    calc_states.COMPUTED,
+    calc_states.RETRIEVING,
+    calc_states.PARSING,
+)
+finished_calc_states = (
+    calc_states.FINISHED,
+    calc_states.SUBMISSIONFAILED,
+    calc_states.RETRIEVALFAILED,
+    calc_states.PARSINGFAILED,
+    calc_states.FAILED,
+)
+
 
 def sort_states(list_states, use_key=False):
     """
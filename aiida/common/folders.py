@@ -229,12 +229,18 @@ class Folder(object):
             a string called s, you can pass ``StringIO.StringIO(s)``)
         :param dest_name: the destination filename will have this file name.
         """
+        from aiida.common.objectstore import unshare_file
+
         filename = unicode(dest_name)
 
         # I get the full path of the filename, checking also that I don't
         # go beyond the folder limits
         dest_abs_path = self.get_abs_path(filename)
 
+        # The file could be a hard link to the object store, shared with
+        # other files: it is replaced rather than overwritten
+        unshare_file(dest_abs_path, keep_content=False)
+
         with open(dest_abs_path, 'w') as f:
             shutil.copyfileobj(src_filelike, f)
 
@@ -291,8 +297,17 @@ class Folder(object):
         """
         Open a file in the current folder and return the corresponding
         file object.
+
+        If the file is opened for writing and is a hard link to the object
+        store, shared with other files, it is replaced first, so that the
+        other files are not modified.
         """
-        return open(self.get_abs_path(name), mode)
+        from aiida.common.objectstore import unshare_file
+
+        abs_path = self.get_abs_path(name)
+        if any(char in mode for char in 'wa+'):
+            unshare_file(abs_path, keep_content='w' not in mode)
+        return open(abs_path, mode)
 
     @property
     def abspath(self):
@@ -379,7 +394,13 @@ class Folder(object):
             the files.
         :Raises:
             ValueError: if the section is not recognized.
+
+        :note: the moved files that are hard links to the object store (e.g.
+            when moving back the files of a node that failed to be stored)
+            are replaced by copies, so that they can be modified.
         """
+        from aiida.common.objectstore import unshare_file
+
         if not os.path.isabs(srcdir):
             raise ValueError('srcdir must be an absolute path')
         if overwrite:
@@ -410,6 +431,8 @@ class Folder(object):
                 # Toc check whether this is a big speed loss
                 full_file_path = os.path.join(dirpath, f)
                 if not os.path.islink(full_file_path):
+                    if move:
+                        unshare_file(full_file_path)
                     os.chmod(full_file_path, self.mode_file)
 
 
@@ -528,6 +551,19 @@ class RepositoryFolder(Folder):
         """
         return RepositoryFolder(self.section, self.uuid)
 
+    def replace_with_folder(self, srcdir, move=False, overwrite=False):
+        """
+        Same as :py:meth:`Folder.replace_with_folder`, but the files are also
+        added to the object store of the repository, if the
+        'repository.deduplicate' property is set.
+        """
+        from aiida.common.objectstore import ObjectStore, is_deduplication_enabled
+
+        super(RepositoryFolder, self).replace_with_folder(
+            srcdir, move=move, overwrite=overwrite)
+        if is_deduplication_enabled():
+            ObjectStore().add_folder(self.abspath)
+
 
         # NOTE! The get_subfolder method will return a Folder object, and not a RepositoryFolder object
 
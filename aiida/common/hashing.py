@@ -115,6 +115,11 @@ def get_random_string(length=12,
 
 
 
+# Number of bytes read at once from files, and number of elements of
+# arrays processed at once, when hashing them
+HASHING_CHUNK_SIZE = 2**16
+
+
 def make_hash_with_type(type_chr, string_to_hash):
     """
     Convention: type_chr should be a single char, lower case
@@ -123,6 +128,20 @@ def make_hash_with_type(type_chr, string_to_hash):
     """
     return hashlib.sha224("{}{}".format(type_chr, string_to_hash)).hexdigest()
 
+def make_hash_with_type_from_parts(type_chr, parts):
+    """
+    Same as ``make_hash_with_type(type_chr, ''.join(parts))``, but the parts
+    are fed one at a time to the hash object, without building the joined
+    string (that can be very large, e.g. for files and arrays).
+
+    :param parts: an iterable of strings, or of objects supporting the
+        buffer interface (e.g. C-contiguous numpy arrays)
+    """
+    hasher = hashlib.sha224(type_chr)
+    for part in parts:
+        hasher.update(part)
+    return hasher.hexdigest()
+
 @singledispatch
 def make_hash(object_to_hash, **kwargs):
     """
@@ -199,14 +218,14 @@ def make_hash(object_to_hash, **kwargs):
 @make_hash.register(abc.Sequence)
 def _(sequence, **kwargs):
     hashes = tuple([
-        make_hash(x, **kwargs) for x in sequence
+        _make_hash_fast(x, **kwargs) for x in sequence
     ])
     return make_hash_with_type('L', ",".join(hashes))
 
 @make_hash.register(abc.Set)
 def _(object_to_hash, **kwargs):
     hashes = tuple([
-            make_hash(x, **kwargs)
+            _make_hash_fast(x, **kwargs)
             for x
             in sorted(object_to_hash)
         ])
@@ -214,14 +233,22 @@ def _(object_to_hash, **kwargs):
 
 @make_hash.register(abc.Mapping)
 def _(mapping, **kwargs):
-    hashed_dictionary = {
-        k: make_hash(v, **kwargs)
+    hashed_items = sorted([
+        (k, _make_hash_fast(v, **kwargs))
         for k,v
         in mapping.items()
-    }
+    ])
+    # Same as make_hash(hashed_items): each (key, hash) tuple is hashed as a
+    # sequence, and each hash as a string
     return make_hash_with_type(
         'D',
-        make_hash(sorted(hashed_dictionary.items()), **kwargs)
+        make_hash_with_type('L', ",".join([
+            make_hash_with_type('L', "{},{}".format(
+                _make_hash_fast(k, **kwargs),
+                make_hash_with_type('s', value_hash)
+            ))
+            for k, value_hash in hashed_items
+        ]))
     )
 
 @make_hash.register(numbers.Real)
@@ -263,10 +290,11 @@ def _(object_to_hash, **kwargs):
 
 @make_hash.register(Folder)
 def _(folder, **kwargs):
-    # make sure file is closed after being read
-    def _read_file(folder, name):
+    # The file is read in chunks, and closed after being read
+    def _hash_file(folder, name):
         with folder.open(name) as f:
-            return f.read()
+            return make_hash_with_type_from_parts(
+                'pf', iter(lambda: f.read(HASHING_CHUNK_SIZE), ''))
 
     ignored_folder_content = kwargs.get('ignored_folder_content', [])
 
@@ -276,7 +304,7 @@ def _(folder, **kwargs):
             (
                 name,
                 folder.get_subfolder(name) if folder.isdir(name) else
-                make_hash_with_type('pf', _read_file(folder, name))
+                _hash_file(folder, name)
             )
             for name in sorted(folder.get_content_list())
             if name not in ignored_folder_content
@@ -285,10 +313,14 @@ def _(folder, **kwargs):
 
 @make_hash.register(np.ndarray)
 def _(object_to_hash, **kwargs):
+    # The hash of the bytes of the array (as returned by tobytes(), hashed
+    # as a string) is computed chunk by chunk, without copying the array
     if object_to_hash.dtype == np.float64:
         return make_hash_with_type(
             'af',
-            make_hash(truncate_array64(object_to_hash).tobytes(), **kwargs)
+            make_hash_with_type_from_parts(
+                's', (truncate_array64(chunk)
+                      for chunk in iter_array_chunks(object_to_hash)))
         )
     elif object_to_hash.dtype == np.complex128:
         return make_hash_with_type(
@@ -301,9 +333,55 @@ def _(object_to_hash, **kwargs):
     else:
         return make_hash_with_type(
             'ao',
-            make_hash(object_to_hash.tobytes(), **kwargs)
+            make_hash_with_type_from_parts(
+                's', iter_array_chunks(object_to_hash))
         )
 
+def iter_array_chunks(array, chunk_size=HASHING_CHUNK_SIZE):
+    """
+    Iterate over an array in C-contiguous one-dimensional chunks of at most
+    chunk_size elements (or of one row of the array, if larger), whose
+    concatenation gives the array flattened in C order.
+
+    The chunks are views of the array if it is C-contiguous, otherwise each
+    chunk is copied in turn.
+    """
+    if array.flags.c_contiguous:
+        flat = array.reshape(-1)
+        for start in range(0, flat.size, chunk_size):
+            yield flat[start:start + chunk_size]
+    elif array.ndim > 1 and array[0].size > chunk_size:
+        for row in array:
+            for chunk in iter_array_chunks(row, chunk_size):
+                yield chunk
+    else:
+        rows_per_chunk = max(1, chunk_size // max(1, array[0].size))
+        for start in range(0, len(array), rows_per_chunk):
+            yield np.ascontiguousarray(
+                array[start:start + rows_per_chunk]).reshape(-1)
+
+def _make_hash_fast(object_to_hash, **kwargs):
+    """
+    Same as make_hash, but objects of the most common builtin types are hashed
+    directly, without the overhead of the dispatch (that dominates the time
+    needed to hash large nested dictionaries and lists).
+    """
+    handler = _BUILTIN_TYPES_HANDLERS.get(type(object_to_hash))
+    if handler is None:
+        return make_hash(object_to_hash, **kwargs)
+    return handler(object_to_hash)
+
+# The handlers registered above for these exact types
+_BUILTIN_TYPES_HANDLERS = {
+    str: lambda x: make_hash_with_type('s', x),
+    unicode: lambda x: make_hash_with_type('s', x),
+    int: lambda x: make_hash_with_type('i', str(x)),
+    long: lambda x: make_hash_with_type('i', str(x)),
+    bool: lambda x: make_hash_with_type('b', str(x)),
+    float: lambda x: make_hash_with_type('f', truncate_float64(x).tobytes()),
+    type(None): lambda x: make_hash_with_type('n', str(x)),
+}
+
 def truncate_float64(x, num_bits=4):
     mask = ~(2**num_bits - 1)
     int_repr = np.float64(x).view(np.int64)
@@ -313,6 +391,6 @@ def truncate_float64(x, num_bits=4):
 
 def truncate_array64(x, num_bits=4):
     mask = ~(2**num_bits - 1)
-    int_array = np.array(x, dtype=np.float64).view(np.int64)
+    int_array = np.asarray(x, dtype=np.float64).view(np.int64)
     masked_array = int_array & mask
     return masked_array.view(np.float64)
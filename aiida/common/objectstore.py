@@ -0,0 +1,189 @@
+# -*- coding: utf-8 -*-
+###########################################################################
+# Copyright (c), The AiiDA team. All rights reserved.                     #
+# This file is part of the AiiDA code.                                    #
+#                                                                         #
+# The code is hosted on GitHub at https://github.com/aiidateam/aiida_core #
+# For further information on the license, see the LICENSE.txt file        #
+# For further information please visit http://www.aiida.net               #
+###########################################################################
+"""
+A content-addressed store of the files of the repository.
+
+Each distinct file content is stored once, in the 'objects' folder of the
+repository, under the SHA-256 of its content. The files of the nodes become
+hard links to these objects: the repository keeps its layout (and the Folder
+API keeps working on real paths), but identical files share a single inode
+and a single copy of their content.
+"""
+import errno
+import hashlib
+import os
+import stat
+
+from aiida.common.hashing import HASHING_CHUNK_SIZE
+
+
+def is_deduplication_enabled():
+    """
+    Return True if the files of the nodes are stored in the object store
+    when the nodes are stored (the 'repository.deduplicate' property).
+    """
+    from aiida.common.setup import get_property
+    return get_property('repository.deduplicate')
+
+
+def unshare_file(path, keep_content=True):
+    """
+    Make sure that a file can be written without modifying other files: if
+    it is a hard link shared with other files (e.g. to an object of the
+    store), it is replaced by a copy, or just removed.
+
+    :param path: the absolute path of the file; nothing is done if it is not
+        an existing regular file
+    :param keep_content: if False, the shared file is removed rather than
+        copied (e.g. because it is going to be truncated anyway)
+    """
+    import shutil
+
+    try:
+        file_stat = os.lstat(path)
+    except OSError:
+        return
+    if not stat.S_ISREG(file_stat.st_mode) or file_stat.st_nlink == 1:
+        return
+
+    if keep_content:
+        temp_path = '{}.objectstore-tmp'.format(path)
+        shutil.copy2(path, temp_path)
+        os.rename(temp_path, path)
+    else:
+        os.remove(path)
+
+
+class ObjectStore(object):
+    """
+    A content-addressed store of files, where the files are added as hard
+    links.
+
+    :note: the files added to the store must not be modified in place, as
+        this would modify all the files with the same content: the Folder
+        methods that write files replace them first (see
+        :py:func:`unshare_file`).
+    """
+
+    def __init__(self, abspath=None):
+        """
+        :param abspath: the folder of the objects; by default, the 'objects'
+            folder of the repository. It must be on the same filesystem as
+            the files to add.
+        """
+        if abspath is None:
+            from aiida.common.utils import get_repository_folder
+            abspath = get_repository_folder('objects')
+        self._abspath = os.path.abspath(abspath)
+
+    @property
+    def abspath(self):
+        """
+        The absolute path of the folder of the objects.
+        """
+        return self._abspath
+
+    def get_object_path(self, key):
+        """
+        Return the absolute path of the object with the given key (a sharding
+        of level 2 is used, as for the repository).
+        """
+        return os.path.join(self.abspath, key[:2], key[2:])
+
+    @staticmethod
+    def get_key(path):
+        """
+        Return the key of the content of the given file, i.e. its SHA-256.
+        """
+        sha = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(HASHING_CHUNK_SIZE), b''):
+                sha.update(chunk)
+        return sha.hexdigest()
+
+    def add_file(self, path):
+        """
+        Add a file to the store. If an object with the same content already
+        exists, the file is replaced by a hard link to it; otherwise, the
+        file becomes the object.
+
+        The files that are already hard links are assumed to be in the store
+        already, and are left untouched. The same happens if the hard link
+        cannot be created (e.g. the maximum number of links of the object is
+        reached, or the store is on another filesystem).
+
+        :param path: the absolute path of the file
+        :return: the key of the object, or None if the file was left untouched
+        """
+        file_stat = os.lstat(path)
+        if not stat.S_ISREG(file_stat.st_mode) or file_stat.st_nlink > 1:
+            return None
+
+        key = self.get_key(path)
+        object_path = self.get_object_path(key)
+        object_dir = os.path.dirname(object_path)
+        try:
+            os.makedirs(object_dir)
+        except OSError as e:
+            if e.errno != errno.EEXIST:
+                raise
+
+        try:
+            os.link(path, object_path)
+            return key
+        except OSError as e:
+            if e.errno != errno.EEXIST:
+                return None
+
+        if os.path.getsize(object_path) != file_stat.st_size:
+            # The object was corrupted: it is safer to keep the copy
+            return None
+
+        # The file is replaced atomically by a link to the existing object
+        temp_path = '{}.objectstore-tmp'.format(path)
+        try:
+            os.link(object_path, temp_path)
+        except OSError:
+            return None
+        os.rename(temp_path, path)
+        return key
+
+    def add_folder(self, abspath):
+        """
+        Add all the files in a folder (recursively) to the store. Symlinks
+        are not followed.
+
+        :param abspath: the absolute path of the folder
+        :return: the number of files added
+        """
+        num_added = 0
+        for dirpath, _, filenames in os.walk(abspath):
+            for filename in filenames:
+                if self.add_file(os.path.join(dirpath, filename)) is not None:
+                    num_added += 1
+        return num_added
+
+    def collect_garbage(self):
+        """
+        Remove the objects that are not linked by any file anymore (e.g.
+        because the nodes were deleted).
+
+        :return: the number of objects removed
+        """
+        num_removed = 0
+        if not os.path.isdir(self.abspath):
+            return num_removed
+        for dirpath, _, filenames in os.walk(self.abspath):
+            for filename in filenames:
+                object_path = os.path.join(dirpath, filename)
+                if os.lstat(object_path).st_nlink == 1:
+                    os.remove(object_path)
+                    num_removed += 1
+        return num_removed
@@ -907,7 +907,89 @@ _property_table = {
         "bool",
         "Boolean whether to print deprecation warnings",
         False,
-        None)
+        None),
+    "daemon.authinfo_workers": (
+        "daemon_authinfo_workers",
+        "int",
+        "Maximum number of (computer, user) pairs that the daemon submitter, "
+        "updater and retriever process concurrently, each in its own thread. "
+        "Set to 0 to process them serially",
+        0,
+        None),
+    "daemon.authinfo_workers_per_computer": (
+        "daemon_authinfo_workers_per_computer",
+        "int",
+        "Maximum number of concurrent daemon threads talking to the same "
+        "computer (relevant only if daemon.authinfo_workers is not 0)",
+        1,
+        None),
+    "daemon.authinfo_timeout": (
+        "daemon_authinfo_timeout",
+        "int",
+        "Time in seconds after which the daemon stops waiting for the thread "
+        "of a (computer, user) pair and moves on; the pair is skipped until "
+        "its thread finishes. Set to 0 to wait indefinitely (relevant only "
+        "if daemon.authinfo_workers is not 0)",
+        0,
+        None),
+    "repository.deduplicate": (
+        "repository_deduplicate",
+        "bool",
+        "Boolean whether the files of the nodes are deduplicated when the "
+        "nodes are stored: each distinct file content is kept once in the "
+        "object store of the repository, and the files of the nodes are "
+        "hard links to it",
+        False,
+        None),
+    "transport.pool_idle_ttl": (
+        "transport_pool_idle_ttl",
+        "int",
+        "Time in seconds for which the daemon keeps an unused transport "
+        "(e.g. an SSH connection) open, to reuse it in its following "
+        "iterations. Set to 0 to open a new transport every time",
+        0,
+        None),
+    "transport.put_archive": (
+        "transport_put_archive",
+        "bool",
+        "Boolean whether the daemon uploads the input files of a calculation "
+        "packed in a single tar archive, unpacked on the remote computer, "
+        "instead of one by one (it falls back to one by one if tar is not "
+        "available remotely)",
+        False,
+        None),
+    "transport.get_archive": (
+        "transport_get_archive",
+        "bool",
+        "Boolean whether the daemon retrieves the files of a calculation "
+        "packed in a single tar archive created on the remote computer, "
+        "instead of one by one (it falls back to one by one if tar is not "
+        "available remotely)",
+        False,
+        None),
+    "transport.get_archive_compress": (
+        "transport_get_archive_compress",
+        "bool",
+        "Boolean whether the archive of the retrieved files (see "
+        "transport.get_archive) is compressed with gzip on the remote computer",
+        False,
+        None),
+    "scheduler.poll_min_interval": (
+        "scheduler_poll_min_interval",
+        "int",
+        "Minimum time in seconds between two queries of the job states "
+        "(e.g. with squeue or qstat) on the same computer and for the same "
+        "user by the daemon",
+        0,
+        None),
+    "scheduler.poll_max_interval": (
+        "scheduler_poll_max_interval",
+        "int",
+        "Maximum time in seconds between two queries of the job states on the "
+        "same computer and for the same user: when the job states do not "
+        "change, the daemon doubles the time between queries up to this value",
+        120,
+        None),
 }
 
 
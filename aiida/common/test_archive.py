@@ -0,0 +1,125 @@
+# -*- coding: utf-8 -*-
+###########################################################################
+# Copyright (c), The AiiDA team. All rights reserved.                     #
+# This file is part of the AiiDA code.                                    #
+#                                                                         #
+# The code is hosted on GitHub at https://github.com/aiidateam/aiida_core #
+# For further information on the license, see the LICENSE.txt file        #
+# For further information please visit http://www.aiida.net               #
+###########################################################################
+import gzip
+import json
+import os
+import shutil
+import StringIO
+import tarfile
+import tempfile
+import unittest
+
+from aiida.common.archive import (JSONStreamReader, ParallelGzipFile,
+                                  TarFolder)
+
+
+class ParallelGzipFileTest(unittest.TestCase):
+    """
+    Tests for the ParallelGzipFile class.
+    """
+
+    def test_roundtrip(self):
+        data = ''.join(str(i) for i in range(100000))
+        output = StringIO.StringIO()
+        with ParallelGzipFile(output, threads=3, block_size=1000) as f:
+            for start in range(0, len(data), 777):
+                f.write(data[start:start + 777])
+
+        output.seek(0)
+        self.assertEqual(gzip.GzipFile(fileobj=output).read(), data)
+
+
+class TarFolderTest(unittest.TestCase):
+    """
+    Tests for the TarFolder class.
+    """
+
+    def test_write(self):
+        dirpath = tempfile.mkdtemp()
+        try:
+            os.makedirs(os.path.join(dirpath, 'src', 'empty'))
+            with open(os.path.join(dirpath, 'src', 'file.txt'), 'w') as f:
+                f.write('content')
+
+            outfile = os.path.join(dirpath, 'out.tar.gz')
+            with open(outfile, 'wb') as f:
+                with ParallelGzipFile(f, threads=2) as gzfile:
+                    with tarfile.open(fileobj=gzfile, mode='w|',
+                                      format=tarfile.PAX_FORMAT) as tar:
+                        folder = TarFolder(tar)
+                        with folder.open('data.json', 'w') as f:
+                            f.write('{}')
+                        folder.get_subfolder('nodes').get_subfolder(
+                            'ab').insert_path(
+                                os.path.join(dirpath, 'src'), dest_name='.')
+
+            with tarfile.open(outfile, 'r:*') as tar:
+                self.assertEqual(
+                    sorted(tar.getnames()),
+                    ['data.json', 'nodes/ab', 'nodes/ab/empty',
+                     'nodes/ab/file.txt'])
+                self.assertTrue(tar.getmember('nodes/ab/empty').isdir())
+                self.assertEqual(
+                    tar.extractfile('nodes/ab/file.txt').read(), 'content')
+                self.assertEqual(tar.extractfile('data.json').read(), '{}')
+        finally:
+            shutil.rmtree(dirpath)
+
+
+class JSONStreamReaderTest(unittest.TestCase):
+    """
+    Tests for the JSONStreamReader class.
+    """
+    document = {
+        'a': {'x': [1, 2.5e-3, None, True], 'y': 'q"uo\\te{['},
+        'node_attributes': {str(i): {'key': u'valè {}'.format(i),
+                                     'list': range(i)}
+                            for i in range(50)},
+        'links_uuid': [{'input': str(i), 'output': str(i + 1)}
+                       for i in range(30)],
+        'empty': {},
+        'null': None,
+        'z': -12,
+    }
+
+    def get_reader(self, chunk_size):
+        return JSONStreamReader(StringIO.StringIO(json.dumps(self.document)),
+                                chunk_size=chunk_size)
+
+    def test_object_items(self):
+        for chunk_size in (1, 3, 64, 2**20):
+            self.assertEqual(
+                dict(self.get_reader(chunk_size).iter_object_items(
+                    ('node_attributes',))),
+                self.document['node_attributes'])
+            self.assertEqual(
+                dict(self.get_reader(chunk_size).iter_object_items(
+                    ('a',))), self.document['a'])
+            self.assertEqual(
+                dict(self.get_reader(chunk_size).iter_object_items()),
+                self.document)
+
+    def test_array_items(self):
+        for chunk_size in (1, 5, 2**20):
+            self.assertEqual(
+                list(self.get_reader(chunk_size).iter_array_items(
+                    ('links_uuid',))),
+                self.document['links_uuid'])
+            self.assertEqual(
+                list(self.get_reader(chunk_size).iter_array_items(
+                    ('a', 'x'))),
+                self.document['a']['x'])
+
+    def test_missing(self):
+        reader = self.get_reader(7)
+        self.assertEqual(list(reader.iter_object_items(('missing',))), [])
+        for path in (('empty',), ('null',), ('z', 'w')):
+            self.assertEqual(
+                list(self.get_reader(7).iter_object_items(path)), [])
@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+###########################################################################
+# Copyright (c), The AiiDA team. All rights reserved.                     #
+# This file is part of the AiiDA code.                                    #
+#                                                                         #
+# The code is hosted on GitHub at https://github.com/aiidateam/aiida_core #
+# For further information on the license, see the LICENSE.txt file        #
+# For further information please visit http://www.aiida.net               #
+###########################################################################
+import os
+import shutil
+import tempfile
+import unittest
+
+import numpy
+
+from aiida.common.chunkedarray import ChunkedArray
+
+
+class ChunkedArrayTest(unittest.TestCase):
+    """
+    Tests for the ChunkedArray class.
+    """
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmpdir, 'array.chunks')
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def test_roundtrip(self):
+        array = numpy.arange(70.).reshape(7, 5, 2)
+        ChunkedArray.create(self.path, array, chunk_length=3)
+
+        chunked_array = ChunkedArray(self.path)
+        self.assertEqual(chunked_array.shape, (7, 5, 2))
+        self.assertEqual(chunked_array.dtype, array.dtype)
+        self.assertEqual(chunked_array.num_chunks, 3)
+        self.assertTrue(numpy.array_equal(chunked_array.read(), array))
+        self.assertTrue(numpy.array_equal(chunked_array.read(threads=1), array))
+
+        for dtype in ['int32', 'S3', [('a', 'i4'), ('b', 'f8')]]:
+            other = numpy.zeros(4, dtype=dtype)
+            path = os.path.join(self.tmpdir, 'other.chunks')
+            ChunkedArray.create(path, other, chunk_length=3)
+            self.assertTrue(numpy.array_equal(ChunkedArray(path).read(), other))
+            self.assertEqual(ChunkedArray(path).dtype, other.dtype)
+            shutil.rmtree(path)
+
+        with self.assertRaises(ValueError):
+            ChunkedArray.create(self.path + '0d', numpy.array(1.))
+
+    def test_indexing(self):
+        array = numpy.arange(70).reshape(7, 10)
+        chunked_array = ChunkedArray.create(self.path, array, chunk_length=3)
+
+        for index in [0, 4, -1, slice(2, 5), slice(None, None, 2),
+                      slice(5, 2), slice(None, None, -1), (3, 4),
+                      (slice(1, 6), slice(2, 3)), Ellipsis]:
+            self.assertTrue(numpy.array_equal(chunked_array[index],
+                                              array[index]))
+        self.assertEqual(chunked_array.read(2, 5).shape, (3, 10))
+        with self.assertRaises(IndexError):
+            chunked_array[7]
+
+    def test_append(self):
+        array = numpy.arange(20.).reshape(10, 2)
+        chunked_array = ChunkedArray.create(self.path, array[:4],
+                                            chunk_length=3)
+        chunked_array.append(array[4:5])
+        chunked_array.append(array[5:])
+        self.assertEqual(chunked_array.shape, (10, 2))
+        self.assertEqual(chunked_array.num_chunks, 4)
+        self.assertTrue(numpy.array_equal(ChunkedArray(self.path).read(),
+                                          array))
+
+        with self.assertRaises(ValueError):
+            chunked_array.append(numpy.zeros((1, 3)))
+        with self.assertRaises(TypeError):
+            chunked_array.append(numpy.zeros((1, 2), dtype=int))
@@ -0,0 +1,82 @@
+# -*- coding: utf-8 -*-
+###########################################################################
+# Copyright (c), The AiiDA team. All rights reserved.                     #
+# This file is part of the AiiDA code.                                    #
+#                                                                         #
+# The code is hosted on GitHub at https://github.com/aiidateam/aiida_core #
+# For further information on the license, see the LICENSE.txt file        #
+# For further information please visit http://www.aiida.net               #
+###########################################################################
+import datetime
+import os
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+
+from aiida.common.folders import Folder
+from aiida.common.hashing import make_hash, iter_array_chunks
+
+
+class MakeHashTest(unittest.TestCase):
+    """
+    Tests for the make_hash function. The expected hashes must not change,
+    otherwise the hashes of the nodes already stored are invalidated.
+    """
+
+    def test_nested(self):
+        self.assertEqual(
+            make_hash({
+                'a': [1, 2.5, 'x', None, True],
+                'b': {'c': set([3, 'd']), 'e': (1j, 2 + 3j)},
+                3: datetime.datetime(2018, 3, 12, 11, 20, 15, 204317)}),
+            'd0c8b2719320483a586c560d3770fdcd4792fb8f841505f37cc84541')
+
+    def test_arrays(self):
+        array = np.linspace(0., 1., 1000).reshape(10, 100)
+        self.assertEqual(
+            make_hash(array),
+            'a73d56ff2894a9bf7888d7edd35e1b697a389799c9c3c7619f8400b3')
+        self.assertEqual(
+            make_hash(array.T),
+            '33eb1eb46b853d2686666e38ec6d74bb2f7a3198a06d65aebf2b3e78')
+        self.assertEqual(
+            make_hash(np.linspace(0., 1., 30) * (1 + 2j)),
+            'aad7192aeabb5b1d41bd4d045af9b97f58071a11db50b17f78d67b54')
+        self.assertEqual(
+            make_hash(np.arange(1000).reshape(10, 10, 10)[:, ::2]),
+            'e1854f0d888e85b37a5ce05af106fa7b187b21c683adb013d63523d2')
+        self.assertEqual(
+            make_hash(np.zeros((0, 3))),
+            'da76fd3e3befce7884a8140ce415e5cb7d5eb55adb75173aec9e1faf')
+
+    def test_folder(self):
+        dirpath = tempfile.mkdtemp()
+        try:
+            with open(os.path.join(dirpath, 'file.txt'), 'w') as f:
+                f.write('content\n' * 1000)
+            os.mkdir(os.path.join(dirpath, 'sub'))
+            with open(os.path.join(dirpath, 'sub', 'b'), 'w') as f:
+                f.write('b')
+
+            folder = Folder(dirpath)
+            self.assertEqual(
+                make_hash(folder),
+                '8a505098dd728690b8c939c24bf6cdc189d4badb090087fff2e35a28')
+            self.assertEqual(
+                make_hash(folder, ignored_folder_content=['sub']),
+                'cafb27c00ece342ab90c4940a4ecd5056e69ea81fa1cb90ded88bf6c')
+        finally:
+            shutil.rmtree(dirpath)
+
+    def test_iter_array_chunks(self):
+        array = np.arange(600.).reshape(10, 6, 10)
+        for subarray in (array, array.T, array[:, ::2], array[3, :, 1]):
+            for chunk_size in (1, 7, 50, 1000):
+                chunks = list(iter_array_chunks(subarray, chunk_size))
+                self.assertTrue(all(
+                    chunk.flags.c_contiguous for chunk in chunks))
+                self.assertEqual(
+                    ''.join(chunk.tobytes() for chunk in chunks),
+                    subarray.tobytes())
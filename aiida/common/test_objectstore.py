@@ -0,0 +1,111 @@
+# -*- coding: utf-8 -*-
+###########################################################################
+# Copyright (c), The AiiDA team. All rights reserved.                     #
+# This file is part of the AiiDA code.                                    #
+#                                                                         #
+# The code is hosted on GitHub at https://github.com/aiidateam/aiida_core #
+# For further information on the license, see the LICENSE.txt file        #
+# For further information please visit http://www.aiida.net               #
+###########################################################################
+import os
+import shutil
+import tempfile
+import unittest
+
+from aiida.common.objectstore import ObjectStore
+
+
+class ObjectStoreTest(unittest.TestCase):
+    """
+    Tests for the ObjectStore class.
+    """
+
+    def setUp(self):
+        self.dirpath = tempfile.mkdtemp()
+        self.store = ObjectStore(os.path.join(self.dirpath, 'objects'))
+        for folder in ('a', 'b', os.path.join('b', 'sub')):
+            os.mkdir(os.path.join(self.dirpath, folder))
+
+    def tearDown(self):
+        shutil.rmtree(self.dirpath)
+
+    def write_file(self, relpath, content):
+        path = os.path.join(self.dirpath, relpath)
+        with open(path, 'w') as f:
+            f.write(content)
+        return path
+
+    def test_add_folder(self):
+        a_same = self.write_file(os.path.join('a', 'same'), 'content')
+        a_other = self.write_file(os.path.join('a', 'other'), 'other content')
+        b_same = self.write_file(os.path.join('b', 'sub', 'same2'), 'content')
+
+        self.assertEqual(
+            self.store.add_folder(os.path.join(self.dirpath, 'a')), 2)
+        self.assertEqual(
+            self.store.add_folder(os.path.join(self.dirpath, 'b')), 1)
+        # The files already in the store are skipped
+        self.assertEqual(
+            self.store.add_folder(os.path.join(self.dirpath, 'a')), 0)
+
+        self.assertEqual(os.stat(a_same).st_ino, os.stat(b_same).st_ino)
+        self.assertEqual(os.stat(a_same).st_nlink, 3)
+        self.assertEqual(os.stat(a_other).st_nlink, 2)
+        with open(b_same) as f:
+            self.assertEqual(f.read(), 'content')
+
+        key = ObjectStore.get_key(a_same)
+        self.assertEqual(
+            os.stat(self.store.get_object_path(key)).st_ino,
+            os.stat(a_same).st_ino)
+
+    def test_collect_garbage(self):
+        self.write_file(os.path.join('a', 'same'), 'content')
+        self.write_file(os.path.join('b', 'same'), 'content')
+        self.write_file(os.path.join('b', 'other'), 'other content')
+        self.store.add_folder(os.path.join(self.dirpath, 'a'))
+        self.store.add_folder(os.path.join(self.dirpath, 'b'))
+
+        shutil.rmtree(os.path.join(self.dirpath, 'a'))
+        self.assertEqual(self.store.collect_garbage(), 0)
+        shutil.rmtree(os.path.join(self.dirpath, 'b'))
+        self.assertEqual(self.store.collect_garbage(), 2)
+
+    def test_modify_shared_file(self):
+        import StringIO
+        from aiida.common.folders import Folder
+
+        for name in ('open_w', 'open_a', 'filelike', 'insert', 'moved'):
+            self.write_file(os.path.join('a', name), 'content')
+            self.write_file(os.path.join('b', name), 'content')
+        self.store.add_folder(os.path.join(self.dirpath, 'a'))
+        self.store.add_folder(os.path.join(self.dirpath, 'b'))
+        source = self.write_file('source', 'new content')
+
+        # The files of b are modified with the methods of Folder...
+        folder = Folder(os.path.join(self.dirpath, 'b'))
+        with folder.open('open_w', 'w') as f:
+            f.write('new content')
+        with folder.open('open_a', 'a') as f:
+            f.write(' appended')
+        folder.create_file_from_filelike(
+            StringIO.StringIO('new content'), 'filelike')
+        folder.insert_path(source, 'insert')
+
+        # ... or directly, after being moved to another folder (as when a
+        # node fails to be stored)
+        moved = Folder(os.path.join(self.dirpath, 'moved'))
+        moved.replace_with_folder(folder.abspath, move=True)
+        with open(moved.get_abs_path('moved'), 'w') as f:
+            f.write('new content')
+
+        with open(moved.get_abs_path('open_a')) as f:
+            self.assertEqual(f.read(), 'content appended')
+        for name in ('open_w', 'filelike', 'insert', 'moved'):
+            with open(moved.get_abs_path(name)) as f:
+                self.assertEqual(f.read(), 'new content')
+
+        # The files of a, with the same content, are not modified
+        for name in ('open_w', 'open_a', 'filelike', 'insert', 'moved'):
+            with open(os.path.join(self.dirpath, 'a', name)) as f:
+                self.assertEqual(f.read(), 'content')
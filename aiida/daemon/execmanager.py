@@ -13,6 +13,9 @@ results. These are general and contain only the main logic; where appropriate,
 the routines make reference to the suitable plugins for all
 plugin-specific operations.
 """
+import threading
+import time
+
 from aiida.common.datastructures import calc_states
 from aiida.scheduler.datastructures import job_states
 from aiida.common.exceptions import (
@@ -23,6 +26,7 @@ from aiida.common.exceptions import (
 from aiida.common import aiidalogger
 from aiida.common.links import LinkType
 from aiida.orm import load_node
+from aiida.transport.pool import get_transport_pool
 
 
 
@@ -33,18 +37,20 @@ def update_running_calcs_status(authinfo):
     """
     Update the states of calculations in WITHSCHEDULER status belonging
     to user and machine as defined in the 'dbauthinfo' table.
+
+    The scheduler is queried only as often as the job status cache allows,
+    and only the calculations whose job state changed are updated.
     """
     from aiida.orm import JobCalculation, Computer
     from aiida.scheduler.datastructures import JobInfo
+    from aiida.scheduler.status_cache import get_job_status_cache
     from aiida.common.log import get_dblogger_extra
     from aiida.backends.utils import QueryFactory
     
     if not authinfo.enabled:
         return
 
-    execlogger.debug("Updating running calc status for user {} "
-                     "and machine {}".format(
-        authinfo.aiidauser.email, authinfo.dbcomputer.name))
+    status_cache = get_job_status_cache()
 
     qmanager = QueryFactory()()
     calcs_to_inquire = qmanager.query_jobcalculations_by_computer_user_state(
@@ -62,7 +68,6 @@ def update_running_calcs_status(authinfo):
     # NOTE: no further check is done that machine and
     # aiidauser are correct for each calc in calcs
     s = Computer(dbcomputer=authinfo.dbcomputer).get_scheduler()
-    t = authinfo.get_transport()
 
     computed = []
 
@@ -71,8 +76,21 @@ def update_running_calcs_status(authinfo):
     if len(calcs_to_inquire):
         jobids_to_inquire = [str(c.get_job_id()) for c in calcs_to_inquire]
 
+        # The calculations are fetched before checking the cache, so that
+        # newly submitted jobs are inquired without waiting for the back-off
+        if not status_cache.should_query(authinfo.id, jobids_to_inquire):
+            execlogger.debug("Skipping the update of the running calc status "
+                             "for user {} and machine {}: queried "
+                             "recently".format(authinfo.aiidauser.email,
+                                               authinfo.dbcomputer.name))
+            return []
+
+        execlogger.debug("Updating running calc status for user {} "
+                         "and machine {}".format(
+            authinfo.aiidauser.email, authinfo.dbcomputer.name))
+
         # Open connection
-        with t:
+        with get_transport_pool().request_transport(authinfo) as t:
             s.set_transport(t)
             # TODO: Check if we are ok with filtering by job (to make this work,
             # I had to remove the check on the retval for getJobs,
@@ -88,6 +106,9 @@ def update_running_calcs_status(authinfo):
             else:
                 found_jobs = s.getJobs(jobs=jobids_to_inquire, as_dict=True)
 
+            changed_jobids = status_cache.update(
+                authinfo.id, jobids_to_inquire, found_jobs)
+
             # I update the status of jobs
 
             for c in calcs_to_inquire:
@@ -102,6 +123,10 @@ def update_running_calcs_status(authinfo):
                             c.pk), extra=logger_extra)
                         continue
 
+                    # The job state did not change since the last query
+                    if str(jobid) not in changed_jobids:
+                        continue
+
                     # I check if the calculation to be checked (c)
                     # is in the output of qstat
                     if jobid in found_jobs:
@@ -125,9 +150,8 @@ def update_running_calcs_status(authinfo):
                         # else:
                         # c._set_state(calc_states.WITHSCHEDULER)
 
-                        c._set_scheduler_state(jobinfo.job_state)
-
-                        c._set_last_jobinfo(jobinfo)
+                        c._set_scheduler_state(jobinfo.job_state,
+                                               last_jobinfo=jobinfo)
                     else:
                         execlogger.debug("Inquirying calculation {} (jobid "
                                          "{}): not found, assuming "
@@ -146,14 +170,34 @@ def update_running_calcs_status(authinfo):
                         "calculation {} ({}): {}".format(
                             c.pk, e.__class__.__name__, e.message
                         ), extra=logger_extra)
+                    # Update all the calculations again at the next query
+                    status_cache.forget(authinfo.id)
                     continue
 
+            # The detailed jobinfo of all the computed jobs is fetched at
+            # once; the jobs missing from it are inquired one by one below
+            detailed_jobinfos = {}
+            if computed:
+                try:
+                    detailed_jobinfos = s.get_detailed_jobinfo_many(
+                        [c.get_job_id() for c in computed
+                         if c.get_job_id() is not None])
+                except NotImplementedError:
+                    pass
+                except Exception as e:
+                    execlogger.warning("There was an exception while "
+                                       "retrieving the detailed jobinfo "
+                                       "of {} calculations ({}): {}".format(
+                        len(computed), e.__class__.__name__, e.message))
+
             for c in computed:
                 try:
                     logger_extra = get_dblogger_extra(c)
+                    detailed_jobinfo = detailed_jobinfos.get(c.get_job_id())
                     try:
-                        detailed_jobinfo = s.get_detailed_jobinfo(
-                            jobid=c.get_job_id())
+                        if detailed_jobinfo is None:
+                            detailed_jobinfo = s.get_detailed_jobinfo(
+                                jobid=c.get_job_id())
                     except NotImplementedError:
                         detailed_jobinfo = (
                             u"AiiDA MESSAGE: This scheduler does not implement "
@@ -189,8 +233,7 @@ def update_running_calcs_status(authinfo):
 
 
 def retrieve_jobs():
-    from aiida.orm import JobCalculation, Computer
-    from aiida.backends.utils import get_authinfo, QueryFactory
+    from aiida.backends.utils import QueryFactory
 
     qmanager = QueryFactory()()
     # I create a unique set of pairs (computer, aiidauser)
@@ -208,22 +251,31 @@ def retrieve_jobs():
             #~ only_enabled=True)
     #~ )
 
-    for computer, aiidauser in computers_users_to_check:
-        execlogger.debug("({},{}) pair to check".format(
-            aiidauser.email, computer.name))
-        try:
-            authinfo = get_authinfo(computer.dbcomputer, aiidauser._dbuser)
-            retrieve_computed_for_authinfo(authinfo)
-        except Exception as e:
-            msg = ("Error while retrieving calculation status for "
-                   "aiidauser={} on computer={}, "
-                   "error type is {}, error message: {}".format(
-                aiidauser.email,
-                computer.name,
-                e.__class__.__name__, e.message))
-            execlogger.error(msg)
-            # Continue with next computer
-            continue
+    run_for_computer_user_pairs(computers_users_to_check,
+                                _retrieve_jobs_for_computer_user)
+    get_transport_pool().close_idle()
+
+
+def _retrieve_jobs_for_computer_user(computer, aiidauser):
+    """
+    Retrieve the COMPUTED calculations of a single (computer, aiidauser) pair,
+    logging (and not raising) any error.
+    """
+    from aiida.backends.utils import get_authinfo
+
+    execlogger.debug("({},{}) pair to check".format(
+        aiidauser.email, computer.name))
+    try:
+        authinfo = get_authinfo(computer.dbcomputer, aiidauser._dbuser)
+        retrieve_computed_for_authinfo(authinfo)
+    except Exception as e:
+        msg = ("Error while retrieving calculation status for "
+               "aiidauser={} on computer={}, "
+               "error type is {}, error message: {}".format(
+            aiidauser.email,
+            computer.name,
+            e.__class__.__name__, e.message))
+        execlogger.error(msg)
 
 
 # in daemon
@@ -231,8 +283,7 @@ def update_jobs():
     """
     calls an update for each set of pairs (machine, aiidauser)
     """
-    from aiida.orm import JobCalculation, Computer, User
-    from aiida.backends.utils import get_authinfo, QueryFactory
+    from aiida.backends.utils import QueryFactory
 
     qmanager = QueryFactory()()
     # I create a unique set of pairs (computer, aiidauser)
@@ -242,34 +293,39 @@ def update_jobs():
             only_enabled=True
         )
 
-    for computer, aiidauser in computers_users_to_check:
+    run_for_computer_user_pairs(computers_users_to_check,
+                                _update_jobs_for_computer_user)
+    get_transport_pool().close_idle()
 
-        execlogger.debug("({},{}) pair to check".format(
-            aiidauser.email, computer.name))
 
-        try:
-            authinfo = get_authinfo(computer.dbcomputer, aiidauser._dbuser)
-            computed_calcs = update_running_calcs_status(authinfo)
-        except Exception as e:
-            msg = ("Error while updating calculation status "
-                   "for aiidauser={} on computer={}, "
-                   "error type is {}, error message: {}".format(
-                aiidauser.email,
-                computer.name,
-                e.__class__.__name__, e.message))
-            execlogger.error(msg)
-            # Continue with next computer
-            continue
+def _update_jobs_for_computer_user(computer, aiidauser):
+    """
+    Update the WITHSCHEDULER calculations of a single (computer, aiidauser)
+    pair, logging (and not raising) any error.
+    """
+    from aiida.backends.utils import get_authinfo
+
+    execlogger.debug("({},{}) pair to check".format(
+        aiidauser.email, computer.name))
+
+    try:
+        authinfo = get_authinfo(computer.dbcomputer, aiidauser._dbuser)
+        computed_calcs = update_running_calcs_status(authinfo)
+    except Exception as e:
+        msg = ("Error while updating calculation status "
+               "for aiidauser={} on computer={}, "
+               "error type is {}, error message: {}".format(
+            aiidauser.email,
+            computer.name,
+            e.__class__.__name__, e.message))
+        execlogger.error(msg)
 
 
 def submit_jobs():
     """
     Submit all jobs in the TOSUBMIT state.
     """
-    from aiida.orm import JobCalculation, Computer, User
-    from aiida.common.log import get_dblogger_extra
-    from aiida.backends.utils import get_authinfo, QueryFactory
-
+    from aiida.backends.utils import QueryFactory
 
     qmanager = QueryFactory()()
     # I create a unique set of pairs (computer, aiidauser)
@@ -279,55 +335,245 @@ def submit_jobs():
             only_enabled=True
         )
 
-    for computer, aiidauser in computers_users_to_check:
+    run_for_computer_user_pairs(computers_users_to_check,
+                                _submit_jobs_for_computer_user)
+    get_transport_pool().close_idle()
+
+
+def _submit_jobs_for_computer_user(computer, aiidauser):
+    """
+    Submit the TOSUBMIT calculations of a single (computer, aiidauser) pair,
+    logging (and not raising) any error.
+    """
+    from aiida.common.log import get_dblogger_extra
+    from aiida.backends.utils import get_authinfo, QueryFactory
 
-        execlogger.debug("({},{}) pair to submit".format(
-            aiidauser.email, computer.name))
+    execlogger.debug("({},{}) pair to submit".format(
+        aiidauser.email, computer.name))
 
+    try:
         try:
-            try:
-                authinfo = get_authinfo(computer.dbcomputer, aiidauser._dbuser)
-            except AuthenticationError:
-                # TODO!!
-                # Put each calculation in the SUBMISSIONFAILED state because
-                # I do not have AuthInfo to submit them
-                calcs_to_inquire = qmanager.query_jobcalculations_by_computer_user_state(
-                        state=calc_states.TOSUBMIT,
-                        computer=computer, user=aiidauser
-                    )
-                #~ calcs_to_inquire = JobCalculation._get_all_with_state(
-                    #~ state=calc_states.TOSUBMIT,
-                    #~ computer=computer, user=aiidauser)
-                for calc in calcs_to_inquire:
-                    try:
-                        calc._set_state(calc_states.SUBMISSIONFAILED)
-                    except ModificationNotAllowed:
-                        # Someone already set it, just skip
-                        pass
-                    logger_extra = get_dblogger_extra(calc)
-                    execlogger.error("Submission of calc {} failed, "
-                                     "computer pk= {} ({}) is not configured "
-                                     "for aiidauser {}".format(
-                        calc.pk, computer.pk, computer.get_name(),
-                        aiidauser.email),
-                                     extra=logger_extra)
-                # Go to the next (dbcomputer,aiidauser) pair
-                continue
+            authinfo = get_authinfo(computer.dbcomputer, aiidauser._dbuser)
+        except AuthenticationError:
+            # TODO!!
+            # Put each calculation in the SUBMISSIONFAILED state because
+            # I do not have AuthInfo to submit them
+            qmanager = QueryFactory()()
+            calcs_to_inquire = qmanager.query_jobcalculations_by_computer_user_state(
+                    state=calc_states.TOSUBMIT,
+                    computer=computer, user=aiidauser
+                )
+            #~ calcs_to_inquire = JobCalculation._get_all_with_state(
+                #~ state=calc_states.TOSUBMIT,
+                #~ computer=computer, user=aiidauser)
+            for calc in calcs_to_inquire:
+                try:
+                    calc._set_state(calc_states.SUBMISSIONFAILED)
+                except ModificationNotAllowed:
+                    # Someone already set it, just skip
+                    pass
+                logger_extra = get_dblogger_extra(calc)
+                execlogger.error("Submission of calc {} failed, "
+                                 "computer pk= {} ({}) is not configured "
+                                 "for aiidauser {}".format(
+                    calc.pk, computer.pk, computer.get_name(),
+                    aiidauser.email),
+                                 extra=logger_extra)
+            # Go to the next (dbcomputer,aiidauser) pair
+            return
+
+        submitted_calcs = submit_jobs_with_authinfo(authinfo)
+    except Exception as e:
+        import traceback
 
-            submitted_calcs = submit_jobs_with_authinfo(authinfo)
+        msg = ("Error while submitting jobs "
+               "for aiidauser={} on computer={}, "
+               "error type is {}, traceback: {}".format(
+            aiidauser.email,
+            computer.name,
+            e.__class__.__name__, traceback.format_exc()))
+        print msg
+        execlogger.error(msg)
+
+
+# Keys (computer pk, user pk) of the pairs whose daemon thread is still
+# running, possibly from a previous daemon iteration if it timed out
+_running_computer_user_pairs = set()
+_running_computer_user_pairs_lock = threading.Lock()
+# One semaphore per computer pk, limiting the concurrent threads that talk
+# to the same computer; kept across daemon iterations for the same reason
+_computer_semaphores = {}
+
+
+def _acquire_before(semaphore, deadline):
+    """
+    Acquire a semaphore, waiting at most until the given deadline.
+
+    :param deadline: a time.time() value, or None to wait forever
+    :return: True if the semaphore was acquired, False otherwise
+    """
+    if deadline is None:
+        return semaphore.acquire()
+    while not semaphore.acquire(False):
+        if time.time() >= deadline:
+            return False
+        time.sleep(0.1)
+    return True
+
+
+class _ComputerUserWorker(threading.Thread):
+    """
+    Daemon thread calling ``function(computer, aiidauser)`` for one
+    (computer, aiidauser) pair, within the per-computer and the global
+    concurrency limits.
+
+    If a timeout is given, it starts when the thread gets one of the global
+    slots: the thread waits at most that long for the semaphore of its
+    computer (that may be held by a hung thread, possibly from a previous
+    daemon iteration), and skips the pair if it could not acquire it.
+    """
+
+    def __init__(self, function, computer, aiidauser, global_semaphore,
+                 computer_semaphore, timeout=0):
+        super(_ComputerUserWorker, self).__init__(
+            name="aiida-daemon-{}-{}".format(computer.name, aiidauser.email))
+        self.daemon = True
+        self.key = (computer.pk, aiidauser.pk)
+        self.label = "aiidauser={} on computer={}".format(
+            aiidauser.email, computer.name)
+        # Set once the global semaphore is acquired, so that the timeout
+        # does not count the time spent waiting for a free slot
+        self.started_at = None
+        self._function = function
+        self._computer = computer
+        self._aiidauser = aiidauser
+        self._global_semaphore = global_semaphore
+        self._computer_semaphore = computer_semaphore
+        self._timeout = timeout
+        # The global slot is released either by the thread when it is done,
+        # or by abandon() if it times out, whichever comes first
+        self._global_slot_lock = threading.Lock()
+        self._holds_global_slot = False
+
+    def abandon(self):
+        """
+        Give back the global slot of a thread that timed out, so that the
+        pairs waiting for a slot are not blocked by a hung thread.
+        """
+        with self._global_slot_lock:
+            if self._holds_global_slot:
+                self._holds_global_slot = False
+                self._global_semaphore.release()
+
+    def run(self):
+        from aiida.backends.utils import close_thread_db_connection
+
+        try:
+            self._global_semaphore.acquire()
+            with self._global_slot_lock:
+                self._holds_global_slot = True
+            try:
+                self.started_at = time.time()
+                deadline = (self.started_at + self._timeout
+                            if self._timeout > 0 else None)
+                if not _acquire_before(self._computer_semaphore, deadline):
+                    execlogger.error("Timeout of {} s reached while waiting "
+                                     "for the other daemon threads on the "
+                                     "same computer for {}, skipping "
+                                     "it".format(self._timeout, self.label))
+                    return
+                try:
+                    self._function(self._computer, self._aiidauser)
+                finally:
+                    self._computer_semaphore.release()
+            finally:
+                self.abandon()
         except Exception as e:
-            import traceback
+            # The functions already log their errors; this is a last resort
+            execlogger.error("Unexpected error in the daemon thread for {} "
+                             "({}): {}".format(self.label,
+                                               e.__class__.__name__, e.message))
+        finally:
+            close_thread_db_connection()
+            with _running_computer_user_pairs_lock:
+                _running_computer_user_pairs.discard(self.key)
+
+
+def run_for_computer_user_pairs(computers_users, function):
+    """
+    Call ``function(computer, aiidauser)`` for each (computer, aiidauser) pair.
+
+    If the ``daemon.authinfo_workers`` property is 0 (the default), the pairs
+    are processed serially in the current thread. Otherwise each pair gets its
+    own thread, with at most ``daemon.authinfo_workers`` threads running at
+    the same time and at most ``daemon.authinfo_workers_per_computer`` of them
+    for the same computer, so that a slow or unreachable computer delays only
+    its own calculations. If ``daemon.authinfo_timeout`` is set, this function
+    stops waiting for a thread after that many seconds from the moment it got
+    one of the ``daemon.authinfo_workers`` slots: the thread keeps running in
+    the background, without its slot, and its pair is skipped by the
+    following calls until it finishes. A thread that cannot get the semaphore
+    of its computer within that many seconds (e.g. because a hung thread
+    holds it) skips its pair.
+
+    :param computers_users: an iterable of (computer, aiidauser) tuples, as
+        returned by ``query_jobcalculations_by_computer_user_state`` with
+        ``only_computer_user_pairs=True``
+    :param function: the function to call for each pair; it should take care
+        of logging its own errors
+    """
+    from aiida.common.setup import get_property
 
-            msg = ("Error while submitting jobs "
-                   "for aiidauser={} on computer={}, "
-                   "error type is {}, traceback: {}".format(
-                aiidauser.email,
-                computer.name,
-                e.__class__.__name__, traceback.format_exc()))
-            print msg
-            execlogger.error(msg)
-            # Continue with next computer
-            continue
+    max_workers = get_property('daemon.authinfo_workers')
+    if max_workers <= 0:
+        for computer, aiidauser in computers_users:
+            function(computer, aiidauser)
+        return
+
+    per_computer = max(get_property('daemon.authinfo_workers_per_computer'), 1)
+    timeout = get_property('daemon.authinfo_timeout')
+    global_semaphore = threading.BoundedSemaphore(max_workers)
+
+    workers = []
+    for computer, aiidauser in computers_users:
+        key = (computer.pk, aiidauser.pk)
+        with _running_computer_user_pairs_lock:
+            if key in _running_computer_user_pairs:
+                execlogger.warning(
+                    "The daemon thread for aiidauser={} on computer={} from "
+                    "a previous iteration is still running, skipping "
+                    "it".format(aiidauser.email, computer.name))
+                continue
+            _running_computer_user_pairs.add(key)
+            computer_semaphore = _computer_semaphores.setdefault(
+                computer.pk, threading.BoundedSemaphore(per_computer))
+
+        worker = _ComputerUserWorker(function, computer, aiidauser,
+                                     global_semaphore, computer_semaphore,
+                                     timeout=timeout)
+        worker.start()
+        workers.append(worker)
+
+    while workers:
+        still_running = []
+        for worker in workers:
+            worker.join(0.1)
+            if not worker.is_alive():
+                continue
+            # A worker still waiting for a global slot has not started its
+            # timeout yet: the slots are freed by the workers that finish or
+            # time out
+            if (timeout > 0 and worker.started_at is not None and
+                    time.time() - worker.started_at > timeout):
+                # The thread cannot be killed: it is left running in the
+                # background (and will release the semaphore of its computer
+                # when done), while its global slot goes to the next pairs
+                execlogger.error("Timeout of {} s reached for {}, moving "
+                                 "on".format(timeout, worker.label))
+                worker.abandon()
+                continue
+            still_running.append(worker)
+        workers = still_running
 
 
 def submit_jobs_with_authinfo(authinfo):
@@ -363,7 +609,7 @@ def submit_jobs_with_authinfo(authinfo):
         # Open connection
         try:
             # I do it here so that the transport is opened only once per computer
-            with authinfo.get_transport() as t:
+            with get_transport_pool().request_transport(authinfo) as t:
                 for c in calcs_to_inquire:
                     logger_extra = get_dblogger_extra(c)
                     t._set_logger_extra(logger_extra)
@@ -420,6 +666,7 @@ def submit_calc(calc, authinfo, transport=None):
     """
     from aiida.orm import Code, Computer
     from aiida.common.folders import SandboxFolder
+    from aiida.common.setup import get_property
     from aiida.common.exceptions import (
         InputValidationError)
     from aiida.orm.data.remote import RemoteData
@@ -541,19 +788,21 @@ def submit_calc(calc, authinfo, transport=None):
             # default files to be overwritten by the plugin itself.
             # Still, beware! The code file itself could be overwritten...
             # But I checked for this earlier.
+            # The local files are collected in the order in which they
+            # are put, since later files overwrite earlier ones
+            files_to_put = []
             for code in input_codes:
                 if code.is_local():
                     # Note: this will possibly overwrite files
                     for f in code.get_folder_list():
-                        t.put(code.get_abs_path(f), f)
-                    t.chmod(code.get_local_executable(), 0755)  # rwxr-xr-x
+                        files_to_put.append((code.get_abs_path(f), f))
 
             # copy all files, recursively with folders
             for f in folder.get_content_list():
                 execlogger.debug("[submission of calc {}] "
                                  "copying file/folder {}...".format(calc.pk, f),
                                  extra=logger_extra)
-                t.put(folder.get_abs_path(f), f)
+                files_to_put.append((folder.get_abs_path(f), f))
 
             # local_copy_list is a list of tuples,
             # each with (src_abs_path, dest_rel_path)
@@ -569,7 +818,17 @@ def submit_calc(calc, authinfo, transport=None):
                                      "copying local file/folder to {}".format(
                         calc.pk, dest_rel_path),
                                      extra=logger_extra)
-                    t.put(src_abs_path, dest_rel_path)
+                    files_to_put.append((src_abs_path, dest_rel_path))
+
+            if get_property('transport.put_archive'):
+                t.put_archive(files_to_put)
+            else:
+                for localpath, remotepath in files_to_put:
+                    t.put(localpath, remotepath)
+
+            for code in input_codes:
+                if code.is_local():
+                    t.chmod(code.get_local_executable(), 0755)  # rwxr-xr-x
 
             if remote_copy_list is not None:
                 for (remote_computer_uuid, remote_abs_path,
@@ -689,7 +948,7 @@ def retrieve_computed_for_authinfo(authinfo):
     if len(calcs_to_retrieve):
 
         # Open connection
-        with authinfo.get_transport() as t:
+        with get_transport_pool().request_transport(authinfo) as t:
             for calc in calcs_to_retrieve:
                 logger_extra = get_dblogger_extra(calc)
                 t._set_logger_extra(logger_extra)
@@ -729,13 +988,15 @@ def retrieve_computed_for_authinfo(authinfo):
                     # Second, retrieve the singlefiles
                     with SandboxFolder() as folder:
                         singlefile_list = []
+                        singlefiles_to_get = []
                         for (linkname, subclassname, filename) in retrieve_singlefile_list:
                             execlogger.debug("[retrieval of calc {}] Trying "
                                              "to retrieve remote singlefile '{}'".format(
                                 calc.pk, filename), extra=logger_extra)
                             localfilename = os.path.join(folder.abspath, os.path.split(filename)[1])
-                            t.get(filename, localfilename, ignore_nonexisting=True)
+                            singlefiles_to_get.append((filename, localfilename))
                             singlefile_list.append((linkname, subclassname, localfilename))
+                        _get_files(t, singlefiles_to_get)
 
                         # ignore files that have not been retrieved
                         singlefile_list = [i for i in singlefile_list if
@@ -865,6 +1126,7 @@ def retrieve_files_from_list(calculation, transport, folder, retrieve_list):
     """
     import os
 
+    items_to_get = []
     for item in retrieve_list:
         if isinstance(item, list):
             tmp_rname, tmp_lname, depth = item
@@ -896,4 +1158,22 @@ def retrieve_files_from_list(calculation, transport, folder, retrieve_list):
 
         for rem, loc in zip(remote_names, local_names):
             transport.logger.debug("[retrieval of calc {}] Trying to retrieve remote item '{}'".format(calculation.pk, rem))
-            transport.get(rem, os.path.join(folder.abspath, loc), ignore_nonexisting=True)
\ No newline at end of file
+            items_to_get.append((rem, os.path.join(folder.abspath, loc)))
+
+    _get_files(transport, items_to_get)
+
+
+def _get_files(transport, items):
+    """
+    Get the (remotepath, localpath) items through the transport, ignoring
+    the remote paths that do not exist: with a single archive if the
+    'transport.get_archive' property is set, one by one otherwise.
+    """
+    from aiida.common.setup import get_property
+
+    if get_property('transport.get_archive'):
+        transport.get_archive(
+            items, compress=get_property('transport.get_archive_compress'))
+    else:
+        for remotepath, localpath in items:
+            transport.get(remotepath, localpath, ignore_nonexisting=True)
\ No newline at end of file
@@ -7,6 +7,7 @@
 # For further information on the license, see the LICENSE.txt file        #
 # For further information please visit http://www.aiida.net               #
 ###########################################################################
+from aiida.common.chunkedarray import ChunkedArray
 from aiida.orm import Data
 
 
@@ -25,9 +26,21 @@ class ArrayData(Data):
       the array is cached in memory after the first read, and the cached array
       is used thereafter.
       If too much RAM memory is used, you can clear the
-      cache with the :py:meth:`.clear_internal_cache` method.
+      cache with the :py:meth:`.clear_internal_cache` method, or read the
+      arrays memory-mapped (``get_array(name, mmap=True)``) or by slices
+      (:py:meth:`.get_array_slice`), that are not cached.
+
+    :note: With :py:meth:`.set_array_storage`, the arrays can instead be
+      stored compressed and split in chunks along their first dimension (see
+      :py:mod:`aiida.common.chunkedarray`), so that rows can be appended with
+      :py:meth:`.append_to_array` and slices read without reading the whole
+      array.
     """
     array_prefix = "array|"
+    # The attribute with the format in which the arrays are stored
+    array_storage_key = "array_storage"
+    _npy_suffix = ".npy"
+    _chunked_suffix = ".chunks"
 
     def __init__(self, *args, **kwargs):
         super(ArrayData, self).__init__(*args, **kwargs)
@@ -39,13 +52,7 @@ class ArrayData(Data):
 
         :param name: The name of the array to delete from the node.
         """
-        import numpy
-
-        fname = '{}.npy'.format(name)
-        if fname not in self.get_folder_list():
-            raise KeyError(
-                "Array with name '{}' not found in node pk= {}".format(
-                    name, self.pk))
+        fname = self._get_array_filename(name)
 
         # remove both file and attribute
         self.remove_path(fname)
@@ -85,7 +92,9 @@ class ArrayData(Data):
         Return a list of all arrays stored in the node, listing the files (and
         not relying on the properties).
         """
-        return [i[:-4] for i in self.get_folder_list() if i.endswith('.npy')]
+        return [i[:-len(suffix)] for i in self.get_folder_list()
+                for suffix in [self._npy_suffix, self._chunked_suffix]
+                if i.endswith(suffix)]
 
     def _arraynames_from_properties(self):
         """
@@ -112,25 +121,38 @@ class ArrayData(Data):
         for name in self.get_arraynames():
             yield (name, self.get_array(name))
 
-    def get_array(self, name):
+    def get_array(self, name, mmap=False):
         """
         Return an array stored in the node
 
         :param name: The name of the array to return.
+        :param mmap: if True, and the array is not cached in memory already,
+            return a read-only array memory-mapped on its file, that reads
+            from disk only the parts that are accessed (and is not cached).
+            Arrays that cannot be memory-mapped (e.g. of Python objects)
+            are read as usual.
         """
         import numpy
 
         # raw function used only internally
-        def get_array_from_file(self, name):
-            fname = '{}.npy'.format(name)
-            if fname not in self.get_folder_list():
-                raise KeyError(
-                    "Array with name '{}' not found in node pk= {}".format(
-                        name, self.pk))
-
-            array = numpy.load(self.get_abs_path(fname))
+        def get_array_from_file(self, name, mmap_mode=None):
+            fname = self._get_array_filename(name)
+            if fname.endswith(self._chunked_suffix):
+                return self._get_chunked_array(name).read()
+
+            try:
+                array = numpy.load(self.get_abs_path(fname), mmap_mode=mmap_mode)
+            except ValueError:
+                if mmap_mode is None:
+                    raise
+                array = numpy.load(self.get_abs_path(fname))
             return array
 
+        if mmap:
+            if name in self._cached_arrays:
+                return self._cached_arrays[name]
+            return get_array_from_file(self, name, mmap_mode='r')
+
         # Return with proper caching, but only after storing. Before, instead,
         # always re-read from disk
         if not self.is_stored:
@@ -140,6 +162,29 @@ class ArrayData(Data):
                 self._cached_arrays[name] = get_array_from_file(self, name)
             return self._cached_arrays[name]
 
+    def get_array_slice(self, name, index):
+        """
+        Return a slice of an array stored in the node, reading from disk only
+        the needed part of the array (unless it is cached in memory already).
+
+        :param name: The name of the array.
+        :param index: anything that can index a numpy array, e.g. an integer
+            for the first dimension, a slice or a tuple of them.
+        :return: a numpy array (or a numpy scalar), in memory, that does not
+            keep the file open.
+        """
+        import numpy
+
+        if name not in self._cached_arrays and \
+                self._get_array_filename(name).endswith(self._chunked_suffix):
+            # Only the chunks with the rows of the slice are read
+            value = self._get_chunked_array(name)[index]
+        else:
+            value = self.get_array(name, mmap=True)[index]
+        if isinstance(value, numpy.ndarray):
+            return numpy.array(value)
+        return value
+
     def clear_internal_cache(self):
         """
         Clear the internal memory cache where the arrays are stored after being
@@ -155,15 +200,17 @@ class ArrayData(Data):
         Store a new numpy array inside the node. Possibly overwrite the array
         if it already existed.
 
-        Internally, it stores a name.npy file in numpy format.
+        Internally, it stores a name.npy file in numpy format, or a
+        name.chunks folder if the node uses the chunked storage (see
+        :py:meth:`.set_array_storage`).
 
         :param name: The name of the array.
         :param array: The numpy array to store.
         """
         import re
-        import tempfile
 
         import numpy
+        from aiida.common.exceptions import ModificationNotAllowed
 
         if not (isinstance(array, numpy.ndarray)):
             raise TypeError("ArrayData can only store numpy arrays. Convert "
@@ -174,20 +221,124 @@ class ArrayData(Data):
             raise ValueError("The name assigned to the array ({}) is not valid,"
                              "it can only contain digits, letters or underscores")
 
-        fname = "{}.npy".format(name)
+        if self.is_stored:
+            raise ModificationNotAllowed(
+                "Cannot set an array after storing the node")
+
+        # Remove the array if it exists, possibly in another format
+        try:
+            self.remove_path(self._get_array_filename(name))
+        except KeyError:
+            pass
 
-        with tempfile.NamedTemporaryFile() as f:
-            # Store in a temporary file, and then add to the node
-            numpy.save(f, array)
-            f.flush()  # Important to flush here, otherwise the next copy command
-            # will just copy an empty file
-            self.add_path(f.name, fname)
+        storage = self.get_attr(self.array_storage_key, None)
+        folder = self._get_folder_pathsubfolder
+        if storage is not None and storage['format'] == 'chunked' and \
+                array.ndim > 0 and not array.dtype.hasobject:
+            ChunkedArray.create(
+                folder.get_abs_path(name + self._chunked_suffix), array,
+                chunk_length=storage['chunk_length'],
+                compresslevel=storage['compresslevel'])
+        else:
+            # The node is not stored, so its folder is a sandbox where the
+            # file can be written directly
+            with folder.open(name + self._npy_suffix, 'wb') as f:
+                numpy.save(f, array)
 
         # Mainly for convenience, for querying purposes (both stores the fact
         # that there is an array with that name, and its shape)
         self._set_attr("{}{}".format(self.array_prefix, name),
                        list(array.shape))
 
+    def set_array_storage(self, storage_format, chunk_length=None,
+                          compresslevel=6):
+        """
+        Set the format in which the arrays set afterwards are stored.
+
+        :param storage_format: 'npy' (the default) to store each array in a
+            .npy file, or 'chunked' to store each array compressed and split
+            in chunks along its first dimension (0-dimensional arrays and
+            arrays of Python objects are always stored in .npy files).
+        :param chunk_length: the number of rows of each chunk; by default,
+            the chunks are of about 1MB
+        :param compresslevel: the zlib compression level of the chunks, from
+            0 to 9
+        """
+        if storage_format not in ['npy', 'chunked']:
+            raise ValueError("The array storage format must be 'npy' or "
+                             "'chunked', not '{}'".format(storage_format))
+        if chunk_length is not None and chunk_length < 1:
+            raise ValueError("The chunk length must be positive")
+        if not 0 <= compresslevel <= 9:
+            raise ValueError("The compression level must be between 0 and 9")
+
+        self._set_attr(self.array_storage_key, {
+            'format': storage_format,
+            'chunk_length': chunk_length,
+            'compresslevel': compresslevel})
+
+    def append_to_array(self, name, array):
+        """
+        Append rows to an array stored in the node, along its first
+        dimension. Can only be called before storing.
+
+        Arrays stored in chunks are not rewritten, only their last chunk (if
+        it is not full); arrays stored in .npy files are rewritten.
+
+        :param name: The name of the array.
+        :param array: a numpy array with the same dtype and the same shape
+            (except the first dimension) of the stored one.
+        """
+        import numpy
+        from aiida.common.exceptions import ModificationNotAllowed
+
+        if self.is_stored:
+            raise ModificationNotAllowed(
+                "Cannot append to an array after storing the node")
+
+        if self._get_array_filename(name).endswith(self._chunked_suffix):
+            chunked_array = self._get_chunked_array(name)
+            chunked_array.append(array)
+            shape = chunked_array.shape
+        else:
+            stored = self.get_array(name)
+            if array.shape[1:] != stored.shape[1:]:
+                raise ValueError("Cannot append an array of shape {} to an "
+                                 "array of shape {}".format(array.shape,
+                                                            stored.shape))
+            if array.dtype != stored.dtype:
+                raise TypeError("Cannot append an array of dtype {} to an "
+                                "array of dtype {}".format(array.dtype,
+                                                           stored.dtype))
+            new_array = numpy.concatenate([stored, array])
+            with self._get_folder_pathsubfolder.open(
+                    name + self._npy_suffix, 'wb') as f:
+                numpy.save(f, new_array)
+            shape = new_array.shape
+
+        self._set_attr("{}{}".format(self.array_prefix, name), list(shape))
+
+    def _get_array_filename(self, name):
+        """
+        Return the name of the file (or folder) of an array in the folder of
+        the node.
+
+        :raise KeyError: if the array does not exist
+        """
+        folder_list = self.get_folder_list()
+        for suffix in [self._npy_suffix, self._chunked_suffix]:
+            if name + suffix in folder_list:
+                return name + suffix
+        raise KeyError(
+            "Array with name '{}' not found in node pk= {}".format(
+                name, self.pk))
+
+    def _get_chunked_array(self, name):
+        """
+        Return the ChunkedArray of an array stored in chunks.
+        """
+        return ChunkedArray(self.get_abs_path(name + self._chunked_suffix))
+
     def _validate(self):
         """
         Check if the list of .npy files stored inside the node and the
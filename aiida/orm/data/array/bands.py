@@ -35,6 +35,23 @@ def prepare_header_comment(uuid, plot_info, comment_char='#'):
 
     return "\n".join("{} {}".format(comment_char, l) for l in filetext)
 
+
+def _format_rows(array):
+    """
+    Format a 2D array as lines of tab-separated values with 8 decimal digits
+    (each line terminated by a newline), with a single string formatting
+    operation for the whole array rather than one per value.
+
+    :param array: a 2D array (or list of lists) of floats
+    :return: a string
+    """
+    array = numpy.asarray(array, dtype=float)
+    if array.size == 0:
+        return ""
+    num_rows, num_columns = array.shape
+    line = "\t".join(["%.8f"] * num_columns) + "\n"
+    return (line * num_rows) % tuple(array.ravel().tolist())
+
 # TODO: set and get bands could have more functionalities: how do I know the number of bands for example?
 
 def find_bandgap(bandsdata, number_electrons=None, fermi_energy=None):
@@ -67,15 +84,6 @@ def find_bandgap(bandsdata, number_electrons=None, fermi_energy=None):
              equal to the lumo (e.g. in semi-metals).
     """
 
-    def nint(num):
-        """
-        Stable rounding function
-        """
-        if (num > 0):
-            return int(num + .5)
-        else:
-            return int(num - .5)
-
     if fermi_energy and number_electrons:
         raise ValueError("Specify either the number of electrons or the "
                          "Fermi energy, but not both")
@@ -90,7 +98,7 @@ def find_bandgap(bandsdata, number_electrons=None, fermi_energy=None):
         # spin up and spin down array
 
         # put all spins on one band per kpoint
-        bands = numpy.concatenate([_ for _ in stored_bands], axis=1)
+        bands = numpy.concatenate(list(stored_bands), axis=1)
     else:
         bands = stored_bands
 
@@ -112,7 +120,7 @@ def find_bandgap(bandsdata, number_electrons=None, fermi_energy=None):
                 # spin up and spin down array
 
                 # put all spins on one band per kpoint
-                occupations = numpy.concatenate([_ for _ in stored_occupations], axis=1)
+                occupations = numpy.concatenate(list(stored_occupations), axis=1)
             else:
                 occupations = stored_occupations
 
@@ -121,22 +129,30 @@ def find_bandgap(bandsdata, number_electrons=None, fermi_energy=None):
 
             # sort the bands by energy, and reorder the occupations accordingly
             # since after joining the two spins, I might have unsorted stuff
-            bands, occupations = [numpy.array(y) for y in zip(*[zip(*j) for j in
-                                                                [sorted(zip(i[0].tolist(), i[1].tolist()),
-                                                                        key=lambda x: x[0])
-                                                                 for i in zip(bands, occupations)]])]
-            number_electrons = int(round(sum([sum(i) for i in occupations]) / num_kpoints))
-
-            homo_indexes = [numpy.where(numpy.array([nint(_) for _ in x]) > 0)[0][-1] for x in occupations]
-            if len(set(homo_indexes)) > 1:  # there must be intersections of valence and conduction bands
+            order = numpy.argsort(bands, axis=1, kind='mergesort')
+            rows = numpy.arange(num_kpoints)[:, numpy.newaxis]
+            bands = bands[rows, order]
+            occupations = occupations[rows, order]
+            number_electrons = int(round(occupations.sum() / num_kpoints))
+
+            # the occupied bands are those with an occupation that rounds
+            # to a positive integer, i.e. of at least 0.5
+            occupied = occupations >= 0.5
+            if not occupied.any(axis=1).all():
+                raise ValueError("There are k-points without occupied bands")
+            # index of the last occupied band at each kpoint
+            homo_indexes = occupied.shape[1] - 1 - numpy.argmax(
+                occupied[:, ::-1], axis=1)
+            if (homo_indexes != homo_indexes[0]).any():
+                # there must be intersections of valence and conduction bands
                 return False, None
             else:
-                homo = [_[0][_[1]] for _ in zip(bands, homo_indexes)]
-                try:
-                    lumo = [_[0][_[1] + 1] for _ in zip(bands, homo_indexes)]
-                except IndexError:
+                homo_index = homo_indexes[0]
+                homo = bands[:, homo_index]
+                if homo_index + 1 >= bands.shape[1]:
                     raise ValueError("To understand if it is a metal or insulator, "
                                      "need more bands than n_band=number_electrons")
+                lumo = bands[:, homo_index + 1]
 
         else:
             bands = numpy.sort(bands)
@@ -146,10 +162,10 @@ def find_bandgap(bandsdata, number_electrons=None, fermi_energy=None):
             # calculation, 2 otherwise)
             number_electrons_per_band = 4 - len(stored_bands.shape)  # 1 or 2
             # gather the energies of the homo band, for every kpoint
-            homo = [i[number_electrons / number_electrons_per_band - 1] for i in bands]  # take the nth level
+            homo = bands[:, number_electrons / number_electrons_per_band - 1]  # take the nth level
             try:
                 # gather the energies of the lumo band, for every kpoint
-                lumo = [i[number_electrons / number_electrons_per_band] for i in bands]  # take the n+1th level
+                lumo = bands[:, number_electrons / number_electrons_per_band]  # take the n+1th level
             except IndexError:
                 raise ValueError("To understand if it is a metal or insulator, "
                                  "need more bands than n_band=number_electrons")
@@ -160,7 +176,7 @@ def find_bandgap(bandsdata, number_electrons=None, fermi_energy=None):
             return False, None
 
         # if the nth band crosses the (n+1)th, it is an insulator
-        gap = min(lumo) - max(homo)
+        gap = float(lumo.min() - homo.max())
         if gap == 0.:
             return False, 0.
         elif gap < 0.:
@@ -173,10 +189,11 @@ def find_bandgap(bandsdata, number_electrons=None, fermi_energy=None):
         # reorganize the bands, rather than per kpoint, per energy level
 
         # I need the bands sorted by energy
-        bands.sort()
+        bands = numpy.sort(bands)
 
-        levels = bands.transpose()
-        max_mins = [(max(i), min(i)) for i in levels]
+        # maximum and minimum of each energy level
+        maxs = bands.max(axis=0)
+        mins = bands.min(axis=0)
 
         if fermi_energy > bands.max():
             raise ValueError("The Fermi energy is above all band energies, "
@@ -186,27 +203,53 @@ def find_bandgap(bandsdata, number_electrons=None, fermi_energy=None):
                              "don't know what to do.")
 
         # one band is crossed by the fermi energy
-        if any(i[1] < fermi_energy and fermi_energy < i[0] for i in max_mins):
+        if ((mins < fermi_energy) & (fermi_energy < maxs)).any():
             return False, None
 
         # case of semimetals, fermi energy at the crossing of two bands
         # this will only work if the dirac point is computed!
-        elif (any(i[0] == fermi_energy for i in max_mins) and
-                  any(i[1] == fermi_energy for i in max_mins)):
+        elif (maxs == fermi_energy).any() and (mins == fermi_energy).any():
             return False, 0.
         # insulating case
         else:
             # take the max of the band maxima below the fermi energy
-            homo = max([i[0] for i in max_mins if i[0] < fermi_energy])
+            homo = maxs[maxs < fermi_energy].max()
             # take the min of the band minima above the fermi energy
-            lumo = min([i[1] for i in max_mins if i[1] > fermi_energy])
-            gap = lumo - homo
+            lumo = mins[mins > fermi_energy].min()
+            gap = float(lumo - homo)
             if gap <= 0.:
                 raise Exception("Something wrong has been implemented. "
                                 "Revise the code!")
             return True, gap
 
 
+def find_bandgaps(bandsdata_list, number_electrons=None, fermi_energy=None):
+    """
+    Run :py:func:`find_bandgap` on many BandsData nodes, e.g. to screen the
+    results of many calculations.
+
+    The nodes are processed one at a time, as they are yielded by
+    ``bandsdata_list`` (that can be a generator, e.g. the ``iterall()`` of a
+    QueryBuilder, so that the nodes are not all loaded at once), and their
+    arrays are read from disk only when they are processed and not cached,
+    so that the memory used does not grow with the number of nodes.
+
+    :param bandsdata_list: an iterable of BandsData nodes
+    :param number_electrons: (optional) passed to :py:func:`find_bandgap`
+        for each node
+    :param fermi_energy: (optional) passed to :py:func:`find_bandgap` for
+        each node
+    :return: a generator of tuples ``(bandsdata, (is_insulator, gap))``
+    """
+    for bandsdata in bandsdata_list:
+        # QueryBuilder.iterall() yields lists with the projected entities
+        if isinstance(bandsdata, (list, tuple)):
+            bandsdata = bandsdata[0]
+        yield bandsdata, find_bandgap(bandsdata,
+                                      number_electrons=number_electrons,
+                                      fermi_energy=fermi_energy)
+
+
 class BandsData(KpointsData):
     """
     Class to handle bands data
@@ -397,7 +440,7 @@ class BandsData(KpointsData):
         Default = False
         """
         try:
-            bands = numpy.array(self.get_array('bands'))
+            bands = numpy.array(self.get_array('bands', mmap=True))
         except KeyError:
             raise AttributeError("No stored bands has been found")
 
@@ -405,7 +448,7 @@ class BandsData(KpointsData):
 
         if also_occupations:
             try:
-                occupations = numpy.array(self.get_array('occupations'))
+                occupations = numpy.array(self.get_array('occupations', mmap=True))
             except KeyError:
                 raise AttributeError('No occupations were set')
             to_return.append(occupations)
@@ -447,11 +490,11 @@ class BandsData(KpointsData):
         stored_bands = self.get_bands()
         if len(stored_bands.shape) == 2:
             bands = stored_bands
-            band_type_idx = numpy.array([0]*stored_bands.shape[1])
+            band_type_idx = numpy.zeros(stored_bands.shape[1], dtype=int)
             two_band_types = False
         elif len(stored_bands.shape) == 3:
-            bands = numpy.concatenate([_ for _ in stored_bands], axis=1)
-            band_type_idx = numpy.array([0] * stored_bands.shape[2] + [1] * stored_bands.shape[2])
+            bands = numpy.concatenate(list(stored_bands), axis=1)
+            band_type_idx = numpy.repeat([0, 1], stored_bands.shape[2])
             two_band_types = True
         else:
             raise ValueError("Unexpected shape of bands")
@@ -478,10 +521,11 @@ class BandsData(KpointsData):
         # since I can have discontinuous paths, I set on those points the distance to zero
         # as a result, where there are discontinuities in the path,
         # I have two consecutive points with the same x coordinate
-        distances = [numpy.linalg.norm(kpoints[i] - kpoints[i - 1]) if not
-        (i in labels_indices and i - 1 in labels_indices) else 0.
-                     for i in range(1, len(kpoints))]
-        x = [float(sum(distances[:i])) for i in range(len(distances) + 1)]
+        distances = numpy.linalg.norm(numpy.diff(kpoints, axis=0), axis=1)
+        is_label = numpy.zeros(len(kpoints), dtype=bool)
+        is_label[labels_indices] = True
+        distances[is_label[1:] & is_label[:-1]] = 0.
+        x = numpy.concatenate([[0.], numpy.cumsum(distances)]).tolist()
 
         # transform the index of the labels in the coordinates of x
         raw_labels = [(x[i[0]], i[1]) for i in labels]
@@ -659,15 +703,13 @@ class BandsData(KpointsData):
         bands = plot_info['y']
         x = plot_info['x']
 
-        return_text = []
+        return_text = ""
         if comments:
-            return_text.append(prepare_header_comment(self.uuid, plot_info, comment_char="#"))
+            return_text += prepare_header_comment(self.uuid, plot_info, comment_char="#") + "\n"
 
-        for i in zip(x, bands):
-            line = ["{:.8f}".format(i[0])] + ["{:.8f}".format(j) for j in i[1]]
-            return_text.append("\t".join(line))
+        return_text += _format_rows(numpy.column_stack([x, bands]))
 
-        return ("\n".join(return_text) + '\n').encode('utf-8'), {}
+        return return_text.encode('utf-8'), {}
 
     def _prepare_dat_2(self, *args, **kwargs):
         """
@@ -701,18 +743,15 @@ class BandsData(KpointsData):
 
         return_text = []
         if comments:
-            return_text.append(prepare_header_comment(self.uuid, plot_info, comment_char="#"))
+            return_text.append(prepare_header_comment(self.uuid, plot_info, comment_char="#") + "\n")
 
+        # One block per band, followed by two empty lines
         the_bands = numpy.transpose(bands)
-
         for b in the_bands:
-            for i in zip(x, b):
-                line = ["{:.8f}".format(i[0]), "{:.8f}".format(i[1])]
-                return_text.append("\t".join(line))
-            return_text.append("")
-            return_text.append("")
+            return_text.append(_format_rows(numpy.column_stack([x, b])) + "\n\n")
 
-        return ("\n".join(return_text)).encode('utf-8'), {}
+        # No newline at the end of the last line
+        return "".join(return_text)[:-1].encode('utf-8'), {}
 
     def _matplotlib_get_dict(self, main_file_name="", comments=True, title="", legend=None, legend2=None,
                             y_max_lim=None, y_min_lim=None,
@@ -1194,13 +1233,8 @@ class BandsData(KpointsData):
                                                 )
 
         # build the arrays with the xy coordinates
-        all_sets = []
-        for b in the_bands:
-            this_set = ""
-            for i in zip(x, b):
-                line = "{:.8f}".format(i[0]) + '\t' + "{:.8f}".format(i[1]) + "\n"
-                this_set += line
-            all_sets.append(this_set)
+        all_sets = [_format_rows(numpy.column_stack([x, b]))
+                    for b in the_bands]
 
         set_descriptions = ""
         for i, (this_set, band_type) in enumerate(zip(all_sets, plot_info['band_type_idx'])):
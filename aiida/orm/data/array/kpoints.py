@@ -259,7 +259,7 @@ class KpointsData(ArrayData):
         # check that there is no list of kpoints saved already
         # I cannot have both of them at the same time
         try:
-            _ = self.get_array('kpoints')
+            _ = self.get_array('kpoints', mmap=True)
             raise ModificationNotAllowed("KpointsData has already a kpoint-"
                                          "list stored")
         except KeyError:
@@ -490,7 +490,7 @@ class KpointsData(ArrayData):
             otherwise, returns in crystal coordinates. Default = False.
         """
         try:
-            kpoints = numpy.array(self.get_array('kpoints'))
+            kpoints = numpy.array(self.get_array('kpoints', mmap=True))
         except KeyError:
             raise AttributeError("Before the get, first set a list of kpoints")
 
@@ -499,7 +499,7 @@ class KpointsData(ArrayData):
 
         if also_weights:
             try:
-                the_weights = self.get_array('weights')
+                the_weights = self.get_array('weights', mmap=True)
             except KeyError:
                 raise AttributeError('No weights were set')
 
@@ -165,18 +165,54 @@ class TrajectoryData(ArrayData):
         """
         import numpy
 
-        stepids = numpy.array(range(0, len(structurelist)))
-        cells = numpy.array([x.cell for x in structurelist])
-        symbols_first = [str(s.kind_name) for s in structurelist[0].sites]
-        for symbols_now in [[str(s.kind_name) for s in structurelist[i].sites]
-                            for i in stepids]:
-            if symbols_first != symbols_now:
+        # The sites are read as arrays, without creating Site objects
+        stepids = numpy.arange(len(structurelist))
+        cells = numpy.array([x.cell for x in structurelist], dtype=float)
+        symbols_first = [str(s) for s in structurelist[0].get_site_kindnames()]
+        for structure in structurelist[1:]:
+            if structure.get_site_kindnames() != symbols_first:
                 raise ValueError("Symbol lists have to be the same for "
                                  "all of the supplied structures")
         symbols = numpy.array(symbols_first)
-        positions = numpy.array([[list(s.position) for s in x.sites] for x in structurelist])
+        positions = numpy.array([x.get_positions() for x in structurelist],
+                                dtype=float).reshape(
+            len(structurelist), len(symbols_first), 3)
         self.set_trajectory(stepids, cells, symbols, positions)
 
+    def append_steps(self, stepids, cells, positions, times=None, velocities=None):
+        """
+        Append steps to the trajectory, that must have been set already (e.g.
+        with :py:meth:`.set_trajectory`). Can only be called before storing.
+
+        The arguments are the same of :py:meth:`.set_trajectory`, for the new
+        steps only (the symbols cannot change). Times and velocities must be
+        given if and only if the trajectory has them.
+
+        If the node stores its arrays in chunks (see
+        :py:meth:`~aiida.orm.data.array.ArrayData.set_array_storage`), the
+        steps already stored are not rewritten, so that a long trajectory can
+        be built incrementally, e.g. while parsing the output of a simulation
+        frame by frame.
+        """
+        has_times = 'times' in self.get_arraynames()
+        has_velocities = 'velocities' in self.get_arraynames()
+        if has_times != (times is not None):
+            raise ValueError("Times must be given if and only if the "
+                             "trajectory has times")
+        if has_velocities != (velocities is not None):
+            raise ValueError("Velocities must be given if and only if the "
+                             "trajectory has velocities")
+
+        self._internal_validate(stepids, cells, self.get_symbols(), positions,
+                                times, velocities)
+        self.append_to_array('steps', stepids)
+        self.append_to_array('cells', cells)
+        self.append_to_array('positions', positions)
+        if times is not None:
+            self.append_to_array('times', times)
+        if velocities is not None:
+            self.append_to_array('velocities', velocities)
+
     def _validate(self):
         """
         Verify that the required arrays are present and that their type and
@@ -348,14 +384,18 @@ class TrajectoryData(ArrayData):
             raise IndexError("You have only {} steps, but you are looking beyond"
                              " (index={})".format(self.numsteps, index))
 
-        vel = self.get_velocities()
-        if vel is not None:
-            vel = vel[index, :, :]
-        time = self.get_times()
-        if time is not None:
-            time = time[index]
-        return (self.get_stepids()[index], time, self.get_cells()[index, :, :],
-                self.get_symbols(), self.get_positions()[index, :, :], vel)
+        # Only the arrays of the step are read from disk
+        try:
+            vel = self.get_array_slice('velocities', index)
+        except (AttributeError, KeyError):
+            vel = None
+        try:
+            time = self.get_array_slice('times', index)
+        except (AttributeError, KeyError):
+            time = None
+        return (self.get_array_slice('steps', index), time,
+                self.get_array_slice('cells', index), self.get_symbols(),
+                self.get_array_slice('positions', index), vel)
 
 
     def step_to_structure(self, index, custom_kinds=None):
@@ -392,11 +432,45 @@ class TrajectoryData(ArrayData):
           meaning that the strings in the ``symbols`` array must be valid
           chemical symbols.
         """
-        from aiida.orm.data.structure import StructureData, Kind, Site
+        return self.get_step_structures([index], custom_kinds=custom_kinds)[0]
+
+    def get_step_structures(self, indices=None, custom_kinds=None,
+                            store=False):
+        """
+        Return a list of AiiDA
+        :py:class:`aiida.orm.data.structure.StructureData` nodes with the
+        coordinates of the given steps, as :py:meth:`.get_step_structure`
+        does for a single step, but much faster for many steps: only the
+        requested steps are read from disk, the kinds are created only once,
+        and the sites of each structure are set at once from the arrays.
 
-        # ignore step, time, and velocities
-        _, _, cell, symbols, positions, _ = self.get_step_data(index)
+        .. note:: The periodic boundary conditions are always set to True.
 
+        :param indices: a list of indices of the steps, from 0 to
+           ``self.numsteps - 1``; by default, all the steps.
+        :param custom_kinds: (Optional) a list of
+          :py:class:`aiida.orm.data.structure.Kind` objects, see
+          :py:meth:`.get_step_structure`.
+        :param store: if True, store the structures, all at once (see
+          :py:func:`aiida.orm.utils.store_many`).
+        :return: a list of StructureData nodes, in the order of ``indices``.
+        :raises IndexError: if you require an index beyond the limits.
+        """
+        import numpy
+        from aiida.orm.data.structure import StructureData, Kind
+
+        numsteps = self.numsteps
+        if indices is None:
+            indices = numpy.arange(numsteps)
+        else:
+            indices = numpy.array(indices, dtype=int).reshape(-1)
+            if indices.size and (indices.max() >= numsteps or
+                                 indices.min() < -numsteps):
+                raise IndexError("You have only {} steps, but you are looking "
+                                 "beyond (indices={})".format(numsteps,
+                                                              indices.tolist()))
+
+        symbols = [unicode(s) for s in self.get_symbols()]
         if custom_kinds is not None:
             kind_names = []
             for k in custom_kinds:
@@ -413,19 +487,36 @@ class TrajectoryData(ArrayData):
                                  "that is present in the trajectory. You "
                                  "passed {}, but the symbols are {}".format(
                     sorted(kind_names), sorted(symbols)))
-
-        struc = StructureData(cell=cell)
-        if custom_kinds is not None:
-            for k in custom_kinds:
-                struc.append_kind(k)
-            for s, p in zip(symbols, positions):
-                struc.append_site(Site(kind_name=s, position=p))
+            kinds = custom_kinds
+            site_kind_names = symbols
         else:
-            for s, p in zip(symbols, positions):
-                # Automatic species generation
-                struc.append_atom(symbols=s, position=p)
+            # Automatic species generation, done once for all the structures
+            # with the same logic of StructureData.append_atom
+            template = StructureData()
+            kind_names_by_symbol = {}
+            for s in symbols:
+                if s not in kind_names_by_symbol:
+                    kind = template._append_kind_if_new(Kind(symbols=s))
+                    kind_names_by_symbol[s] = kind.name
+            kinds = template.kinds
+            site_kind_names = [kind_names_by_symbol[s] for s in symbols]
+
+        cells = self.get_array_slice('cells', indices)
+        positions = self.get_array_slice('positions', indices)
+
+        structures = []
+        for cell, step_positions in zip(cells, positions):
+            struc = StructureData(cell=cell)
+            for k in kinds:
+                struc.append_kind(k)
+            struc.extend_sites(site_kind_names, step_positions)
+            structures.append(struc)
 
-        return struc
+        if store:
+            from aiida.orm.utils import store_many
+            store_many(structures)
+
+        return structures
 
     def _prepare_xsf(self, index=None, main_file_name=""):
         """
@@ -443,8 +534,9 @@ class TrajectoryData(ArrayData):
         if structure.is_alloy() or structure.has_vacancies():
             raise NotImplementedError("XSF for alloys or systems with "
                                       "vacancies not implemented.")
-        cells = self.get_cells()
-        positions = self.get_positions()
+        # The steps are read from disk one at a time
+        cells = self.get_array('cells', mmap=True)
+        positions = self.get_array('positions', mmap=True)
         symbols = self.get_symbols()
         atomic_numbers_list = [_atomic_numbers[s] for s in symbols]
         nat = len(symbols)
@@ -706,12 +706,94 @@ def _get_cif_ase_inline(struct=None, parameters=None):
     return {'cif': cif}
 
 
+def _get_valid_positions(positions):
+    """
+    Return the positions of a list of sites as a numpy float array of shape
+    (number of sites, 3).
+
+    :raise ValueError: if the positions are not a list of lists of three
+        floats
+    """
+    import numpy
+
+    try:
+        positions = numpy.array(positions, dtype=float)
+    except (ValueError, TypeError):
+        raise ValueError("Expecting a list of lists of three floats. Found "
+                         "instead {}".format(positions))
+    if positions.size == 0:
+        return positions.reshape(0, 3)
+    if positions.ndim != 2 or positions.shape[1] != 3:
+        raise ValueError("Expecting a list of lists of length 3, found "
+                         "instead an array of shape {}".format(positions.shape))
+    return positions
+
+
+def _get_ase_tags(kinds):
+    """
+    Return the ASE tags of a list of kinds: None if no tag should be set,
+    otherwise the integer tag, derived from the kind name when it is of the
+    form symbol + number (e.g., 'Fe2' has tag 2).
+
+    :param kinds: the list of kinds from the StructureData object.
+    :return: a list with the same length of ``kinds``.
+    """
+    from collections import defaultdict
+
+    # I create the list of tags
+    tag_list = []
+    used_tags = defaultdict(list)
+    for k in kinds:
+        # Skip alloys and vacancies
+        if k.is_alloy() or k.has_vacancies():
+            tag_list.append(None)
+        # If the kind name is equal to the specie name,
+        # then no tag should be set
+        elif unicode(k.name) == unicode(k.symbols[0]):
+            tag_list.append(None)
+        else:
+            # Name is not the specie name
+            if k.name.startswith(k.symbols[0]):
+                try:
+                    new_tag = int(k.name[len(k.symbols[0])])
+                    tag_list.append(new_tag)
+                    used_tags[k.symbols[0]].append(new_tag)
+                    continue
+                except ValueError:
+                    pass
+            tag_list.append(k.symbols[0])  # I use a string as a placeholder
+
+    for i in range(len(tag_list)):
+        # If it is a string, it is the name of the element,
+        # and I have to generate a new integer for this element
+        # and replace tag_list[i] with this new integer
+        if isinstance(tag_list[i], basestring):
+            # I get a list of used tags for this element
+            existing_tags = used_tags[tag_list[i]]
+            if existing_tags:
+                new_tag = max(existing_tags) + 1
+            else:  # empty list
+                new_tag = 1
+            # I store it also as a used tag!
+            used_tags[tag_list[i]].append(new_tag)
+            # I update the tag
+            tag_list[i] = new_tag
+
+    return tag_list
+
+
 class StructureData(Data):
     """
     This class contains the information about a given structure, i.e. a
     collection of sites together with a cell, the
     boundary conditions (whether they are periodic or not) and other
     related useful information.
+
+    The positions and the kinds of all the sites can also be read and set at
+    once as arrays, without creating a Site object for each of them (see
+    :py:meth:`.get_positions`, :py:meth:`.get_kind_indices`,
+    :py:meth:`.set_positions` and :py:meth:`.extend_sites`), that is much
+    faster for large structures.
     """
     _set_incompatibilities = [("ase", "cell"), ("ase", "pbc"),
                               ("ase", "pymatgen"), ("ase", "pymatgen_molecule"),
@@ -780,13 +862,28 @@ class StructureData(Data):
         """
         Load the structure from a ASE object
         """
+        import numpy
+
         if is_ase_atoms(aseatoms):
             # Read the ase structure
             self.cell = aseatoms.cell
             self.pbc = aseatoms.pbc
             self.clear_kinds()  # This also calls clear_sites
-            for atom in aseatoms:
-                self.append_atom(ase=atom)
+
+            # One kind is created for each different (symbol, mass, tag),
+            # as append_atom(ase=atom) would do, but the sites are then all
+            # added at once
+            masses = [None if numpy.isnan(m) else m
+                      for m in aseatoms.get_masses().tolist()]
+            keys = zip(aseatoms.get_chemical_symbols(), masses,
+                       aseatoms.get_tags().tolist())
+            kind_names_by_key = {}
+            for index, key in enumerate(keys):
+                if key not in kind_names_by_key:
+                    kind = self._append_kind_if_new(Kind(ase=aseatoms[index]))
+                    kind_names_by_key[key] = kind.name
+            self.extend_sites([kind_names_by_key[key] for key in keys],
+                              aseatoms.get_positions())
         else:
             raise TypeError("The value is not an ase.Atoms object")
 
@@ -836,11 +933,21 @@ class StructureData(Data):
         self.cell = struct.lattice.matrix.tolist()
         self.pbc = [True, True, True]
         self.clear_kinds()
-        for site in struct.sites:
-            self.append_atom(
-                symbols=[x[0].symbol for x in site.species_and_occu.items()],
-                weights=[x[1] for x in site.species_and_occu.items()],
-                position=site.coords.tolist())
+
+        # One kind is created for each different composition of the sites,
+        # and the sites are then all added at once
+        keys = [tuple((x[0].symbol, x[1])
+                      for x in site.species_and_occu.items())
+                for site in struct.sites]
+        kind_names_by_key = {}
+        for key in keys:
+            if key not in kind_names_by_key:
+                kind = self._append_kind_if_new(
+                    Kind(symbols=[x[0] for x in key],
+                         weights=[x[1] for x in key]))
+                kind_names_by_key[key] = kind.name
+        self.extend_sites([kind_names_by_key[key] for key in keys],
+                          struct.cart_coords)
 
     def _validate(self):
         """
@@ -885,14 +992,15 @@ class StructureData(Data):
             raise ValidationError(
                 "Unable to validate the sites: {}".format(e.message))
 
+        kind_names = set(k.name for k in kinds)
         for site in sites:
-            if site.kind_name not in [k.name for k in kinds]:
+            if site.kind_name not in kind_names:
                 raise ValidationError(
                     "A site has kind {}, but no specie with that name exists"
                     "".format(site.kind_name))
 
         kinds_without_sites = (
-            set(k.name for k in kinds) - set(s.kind_name for s in sites))
+            kind_names - set(s.kind_name for s in sites))
         if kinds_without_sites:
             raise ValidationError("The following kinds are defined, but there "
                                   "are no sites with that kind: {}".format(
@@ -1108,7 +1216,7 @@ class StructureData(Data):
 
         :return: a list of strings
         """
-        return [this_site.kind_name for this_site in self.sites]
+        return [site['kind_name'] for site in self.get_attr('sites', [])]
 
     def get_composition(self):
         """
@@ -1120,13 +1228,13 @@ class StructureData(Data):
 
         :returns: a dictionary with the composition
         """
-        symbols_list = [self.get_kind(s.kind_name).get_symbols_string()
-                        for s in self.sites]
-        composition = {
-            symbol: symbols_list.count(symbol)
-            for symbol
-            in set(symbols_list)
-            }
+        from collections import Counter
+
+        symbols_list = [k.get_symbols_string() for k in self.kinds]
+        composition = {}
+        for index, count in Counter(self.get_kind_indices().tolist()).items():
+            symbol = symbols_list[index]
+            composition[symbol] = composition.get(symbol, 0) + count
         return composition
 
     def get_ase(self):
@@ -1199,7 +1307,7 @@ class StructureData(Data):
 
         new_kind = Kind(kind=kind)  # So we make a copy
 
-        if kind.name in [k.name for k in self.kinds]:
+        if kind.name in self.get_kind_names():
             raise ValueError("A kind with the same name ({}) already exists."
                              "".format(kind.name))
 
@@ -1229,66 +1337,28 @@ class StructureData(Data):
 
         new_site = Site(site=site)  # So we make a copy
 
-        if site.kind_name not in [k.name for k in self.kinds]:
+        kind_names = self.get_kind_names()
+        if site.kind_name not in kind_names:
             raise ValueError("No kind with name '{}', available kinds are: "
-                             "{}".format(site.kind_name,
-                                         [k.name for k in self.kinds]))
+                             "{}".format(site.kind_name, kind_names))
 
         # If here, no exceptions have been raised, so I add the site.
         self._append_to_attr('sites', new_site.get_raw())
 
-    def append_atom(self, **kwargs):
+    def _append_kind_if_new(self, kind, name=None):
         """
-        Append an atom to the Structure, taking care of creating the
-        corresponding kind.
-
-        :param ase: the ase Atom object from which we want to create a new atom
-                (if present, this must be the only parameter)
-        :param position: the position of the atom (three numbers in angstrom)
-        :param symbols: passed to the constructor of the Kind object.
-        :param weights: passed to the constructor of the Kind object.
-        :param name: passed to the constructor of the Kind object. See also the note below.
-
-        .. note :: Note on the 'name' parameter (that is, the name of the kind):
+        Append a kind to the structure, unless an identical one exists
+        already, with the logic described in :py:meth:`.append_atom`.
 
-            * if specified, no checks are done on existing species. Simply,
-              a new kind with that name is created. If there is a name
-              clash, a check is done: if the kinds are identical, no error
-              is issued; otherwise, an error is issued because you are trying
-              to store two different kinds with the same name.
-
-            * if not specified, the name is automatically generated. Before
-              adding the kind, a check is done. If other species with the
-              same properties already exist, no new kinds are created, but
-              the site is added to the existing (identical) kind.
-              (Actually, the first kind that is encountered).
-              Otherwise, the name is made unique first, by adding to the string
-              containing the list of chemical symbols a number starting from 1,
-              until an unique name is found
-
-        .. note :: checks of equality of species are done using
-          the :py:meth:`~Kind.compare_with` method.
+        :param kind: a Kind object
+        :param name: the name of the kind, if it was explicitly specified
+        :return: the kind to use for the new sites (either ``kind`` or an
+            existing one)
         """
-        aseatom = kwargs.pop('ase', None)
-        if aseatom is not None:
-            if kwargs:
-                raise ValueError("If you pass 'ase' as a parameter to "
-                                 "append_atom, you cannot pass any further"
-                                 "parameter")
-            position = aseatom.position
-            kind = Kind(ase=aseatom)
-        else:
-            position = kwargs.pop('position', None)
-            if position is None:
-                raise ValueError("You have to specify the position of the "
-                                 "new atom")
-            # all remaining parameters
-            kind = Kind(**kwargs)
-
         # I look for identical species only if the name is not specified
         _kinds = self.kinds
 
-        if 'name' not in kwargs:
+        if name is None:
             # If the kind is identical to an existing one, I use the existing
             # one, otherwise I replace it
             exists_already = False
@@ -1320,7 +1390,7 @@ class StructureData(Data):
         else:  # 'name' was specified
             old_kind = None
             for existing_kind in _kinds:
-                if existing_kind.name == kwargs['name']:
+                if existing_kind.name == name:
                     old_kind = existing_kind
                     break
             if old_kind is None:
@@ -1336,6 +1406,58 @@ class StructureData(Data):
                                      " (first difference: {})".format(
                         kind.name, firstdiff))
 
+        return kind
+
+    def append_atom(self, **kwargs):
+        """
+        Append an atom to the Structure, taking care of creating the
+        corresponding kind.
+
+        :param ase: the ase Atom object from which we want to create a new atom
+                (if present, this must be the only parameter)
+        :param position: the position of the atom (three numbers in angstrom)
+        :param symbols: passed to the constructor of the Kind object.
+        :param weights: passed to the constructor of the Kind object.
+        :param name: passed to the constructor of the Kind object. See also the note below.
+
+        .. note :: Note on the 'name' parameter (that is, the name of the kind):
+
+            * if specified, no checks are done on existing species. Simply,
+              a new kind with that name is created. If there is a name
+              clash, a check is done: if the kinds are identical, no error
+              is issued; otherwise, an error is issued because you are trying
+              to store two different kinds with the same name.
+
+            * if not specified, the name is automatically generated. Before
+              adding the kind, a check is done. If other species with the
+              same properties already exist, no new kinds are created, but
+              the site is added to the existing (identical) kind.
+              (Actually, the first kind that is encountered).
+              Otherwise, the name is made unique first, by adding to the string
+              containing the list of chemical symbols a number starting from 1,
+              until an unique name is found
+
+        .. note :: checks of equality of species are done using
+          the :py:meth:`~Kind.compare_with` method.
+        """
+        aseatom = kwargs.pop('ase', None)
+        if aseatom is not None:
+            if kwargs:
+                raise ValueError("If you pass 'ase' as a parameter to "
+                                 "append_atom, you cannot pass any further"
+                                 "parameter")
+            position = aseatom.position
+            kind = Kind(ase=aseatom)
+        else:
+            position = kwargs.pop('position', None)
+            if position is None:
+                raise ValueError("You have to specify the position of the "
+                                 "new atom")
+            # all remaining parameters
+            kind = Kind(**kwargs)
+
+        kind = self._append_kind_if_new(kind, name=kwargs.get('name', None))
+
         site = Site(kind_name=kind.name, position=position)
         self.append_site(site)
 
@@ -1496,7 +1618,107 @@ class StructureData(Data):
 
         :return: a list of strings.
         """
-        return [k.name for k in self.kinds]
+        return [k['name'] for k in self.get_attr('kinds', [])]
+
+    def get_positions(self):
+        """
+        Return the positions of all the sites, without creating Site objects.
+
+        :return: a numpy float array of shape (number of sites, 3), in
+            angstrom.
+        """
+        import numpy
+
+        return numpy.array(
+            [site['position'] for site in self.get_attr('sites', [])],
+            dtype=float).reshape(-1, 3)
+
+    def get_kind_indices(self):
+        """
+        Return, for each site, the index of its kind in the list returned by
+        :py:meth:`.get_kind_names` (and by the ``self.kinds`` property).
+
+        :return: a numpy integer array with length equal to the number of
+            sites.
+        """
+        import numpy
+
+        indices = {name: index
+                   for index, name in enumerate(self.get_kind_names())}
+        try:
+            return numpy.array([indices[site['kind_name']]
+                                for site in self.get_attr('sites', [])],
+                               dtype=int)
+        except KeyError as e:
+            raise ValueError("Kind name '{}' unknown".format(e.args[0]))
+
+    def set_positions(self, positions):
+        """
+        Set the positions of all the sites at once, keeping their kinds.
+
+        :param positions: an array (or a list of lists) of shape
+            (number of sites, 3), in angstrom, in the same order of the sites.
+
+        :raises ModificationNotAllowed: if object is stored already
+        :raises ValueError: if positions are invalid
+        """
+        from aiida.common.exceptions import ModificationNotAllowed
+
+        if self.is_stored:
+            raise ModificationNotAllowed(
+                "The StructureData object cannot be modified, "
+                "it has already been stored")
+
+        positions = _get_valid_positions(positions)
+        kind_names = self.get_site_kindnames()
+        if len(positions) != len(kind_names):
+            raise ValueError(
+                "the new positions should be as many as the previous structure.")
+
+        self._set_attr('sites', [
+            {'kind_name': kind_name, 'position': position}
+            for kind_name, position in zip(kind_names, positions.tolist())],
+            clean=False)
+
+    def extend_sites(self, kind_names, positions):
+        """
+        Append many sites at once, of kinds that already exist in the
+        structure (see :py:meth:`.append_kind`).
+
+        :param kind_names: a list with the kind name of each new site
+        :param positions: an array (or a list of lists) of shape
+            (number of new sites, 3), in angstrom
+
+        :raises ModificationNotAllowed: if object is stored already
+        :raises ValueError: if positions or kind names are invalid
+        """
+        from aiida.common.exceptions import ModificationNotAllowed
+
+        if self.is_stored:
+            raise ModificationNotAllowed(
+                "The StructureData object cannot be modified, "
+                "it has already been stored")
+
+        positions = _get_valid_positions(positions)
+        kind_names = [unicode(name) for name in kind_names]
+        if len(positions) != len(kind_names):
+            raise ValueError("The number of kind names ({}) and of positions "
+                             "({}) are different".format(len(kind_names),
+                                                         len(positions)))
+        existing_kind_names = self.get_kind_names()
+        unknown_kind_names = set(kind_names) - set(existing_kind_names)
+        if unknown_kind_names:
+            raise ValueError("No kind with name '{}', available kinds are: "
+                             "{}".format(sorted(unknown_kind_names)[0],
+                                         existing_kind_names))
+
+        # The positions are plain lists of floats, so there is nothing to
+        # clean (and the existing sites are clean already)
+        sites = self.get_attr('sites', [])
+        sites.extend({'kind_name': kind_name, 'position': position}
+                     for kind_name, position in zip(kind_names,
+                                                    positions.tolist()))
+        self._set_attr('sites', sites, clean=False)
 
     @property
     def cell(self):
@@ -1563,35 +1785,7 @@ class StructureData(Data):
             # TODO:
             raise NotImplementedError
         else:
-
-            # test consistency of th enew input
-            n_sites = len(self.sites)
-            if n_sites != len(new_positions) and conserve_particle:
-                raise ValueError(
-                    "the new positions should be as many as the previous structure.")
-
-            new_sites = []
-            for i in range(n_sites):
-                try:
-                    this_pos = [float(j) for j in new_positions[i]]
-                except ValueError:
-                    raise ValueError(
-                        "Expecting a list of floats. Found instead {}"
-                        .format(new_positions[i]))
-
-                if len(this_pos) != 3:
-                    raise ValueError("Expecting a list of lists of length 3. "
-                                     "found instead {}".format(len(this_pos)))
-
-                # now append this Site to the new_site list.
-                new_site = Site(site=self.sites[i])  # So we make a copy
-                new_site.position = copy.deepcopy(this_pos)
-                new_sites.append(new_site)
-
-            # now clear the old sites, and substitute with the new ones
-            self.clear_sites()
-            for this_new_site in new_sites:
-                self.append_site(this_new_site)
+            self.set_positions(new_positions)
 
     @property
     def pbc(self):
@@ -1719,10 +1913,10 @@ class StructureData(Data):
         """
         from phonopy.structure.atoms import Atoms as PhonopyAtoms
 
-        atoms = PhonopyAtoms(symbols=[_.kind_name for _ in self.sites])
+        atoms = PhonopyAtoms(symbols=self.get_site_kindnames())
         # Phonopy internally uses scaled positions, so you must store cell first!
         atoms.set_cell(self.cell)
-        atoms.set_positions([_.position for _ in self.sites])
+        atoms.set_positions(self.get_positions())
 
         return atoms
 
@@ -1735,12 +1929,29 @@ class StructureData(Data):
         :return: an ase.Atoms object
         """
         import ase
+        import numpy
 
-        asecell = ase.Atoms(cell=self.cell, pbc=self.pbc)
         _kinds = self.kinds
-
-        for site in self.sites:
-            asecell.append(site.get_ase(kinds=_kinds))
+        kind_indices = self.get_kind_indices()
+
+        for index in numpy.unique(kind_indices).tolist():
+            kind = _kinds[index]
+            if kind.is_alloy() or kind.has_vacancies():
+                raise ValueError("Cannot convert to ASE if the kind represents "
+                                 "an alloy or it has vacancies.")
+
+        symbols = [str(k.symbols[0]) for k in _kinds]
+        masses = numpy.array([k.mass for k in _kinds], dtype=float)
+        tags = _get_ase_tags(_kinds)
+
+        asecell = ase.Atoms(
+            symbols=[symbols[index] for index in kind_indices.tolist()],
+            positions=self.get_positions(),
+            masses=masses[kind_indices],
+            cell=self.cell, pbc=self.pbc)
+        if any(tag is not None for tag in tags):
+            asecell.set_tags(numpy.array([tag or 0 for tag in tags],
+                                         dtype=int)[kind_indices])
         return asecell
 
     def _get_object_pymatgen(self):
@@ -1781,12 +1992,11 @@ class StructureData(Data):
             raise ValueError("Periodic boundary conditions must apply in "
                              "all three dimensions of real space")
 
-        species = []
-        for s in self.sites:
-            k = self.get_kind(s.kind_name)
-            species.append({s: w for s, w in zip(k.symbols, k.weights)})
-
-        positions = [list(x.position) for x in self.sites]
+        kind_species = [{s: w for s, w in zip(k.symbols, k.weights)}
+                        for k in self.kinds]
+        species = [kind_species[index]
+                   for index in self.get_kind_indices().tolist()]
+        positions = self.get_positions()
         return Structure(self.cell, species, positions,
                          coords_are_cartesian=True)
 
@@ -1805,12 +2015,11 @@ class StructureData(Data):
         """
         from pymatgen.core.structure import Molecule
 
-        species = []
-        for s in self.sites:
-            k = self.get_kind(s.kind_name)
-            species.append({s: w for s, w in zip(k.symbols, k.weights)})
-
-        positions = [list(x.position) for x in self.sites]
+        kind_species = [{s: w for s, w in zip(k.symbols, k.weights)}
+                        for k in self.kinds]
+        species = [kind_species[index]
+                   for index in self.get_kind_indices().tolist()]
+        positions = self.get_positions()
         return Molecule(species, positions)
 
 
@@ -2297,47 +2506,9 @@ class Site(object):
         .. note:: If any site is an alloy or has vacancies, a ValueError
             is raised (from the site.get_ase() routine).
         """
-        from collections import defaultdict
         import ase
 
-        # I create the list of tags
-        tag_list = []
-        used_tags = defaultdict(list)
-        for k in kinds:
-            # Skip alloys and vacancies
-            if k.is_alloy() or k.has_vacancies():
-                tag_list.append(None)
-            # If the kind name is equal to the specie name,
-            # then no tag should be set
-            elif unicode(k.name) == unicode(k.symbols[0]):
-                tag_list.append(None)
-            else:
-                # Name is not the specie name
-                if k.name.startswith(k.symbols[0]):
-                    try:
-                        new_tag = int(k.name[len(k.symbols[0])])
-                        tag_list.append(new_tag)
-                        used_tags[k.symbols[0]].append(new_tag)
-                        continue
-                    except ValueError:
-                        pass
-                tag_list.append(k.symbols[0])  # I use a string as a placeholder
-
-        for i in range(len(tag_list)):
-            # If it is a string, it is the name of the element,
-            # and I have to generate a new integer for this element
-            # and replace tag_list[i] with this new integer
-            if isinstance(tag_list[i], basestring):
-                # I get a list of used tags for this element
-                existing_tags = used_tags[tag_list[i]]
-                if existing_tags:
-                    new_tag = max(existing_tags) + 1
-                else:  # empty list
-                    new_tag = 1
-                # I store it also as a used tag!
-                used_tags[tag_list[i]].append(new_tag)
-                # I update the tag
-                tag_list[i] = new_tag
+        tag_list = _get_ase_tags(kinds)
 
         found = False
         for k, t in zip(kinds, tag_list):
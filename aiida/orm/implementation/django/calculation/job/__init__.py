@@ -12,9 +12,11 @@ import datetime
 from django.db import transaction, IntegrityError
 from django.db.models import Q
 from aiida.common.utils import str_timedelta
-from aiida.common.datastructures import sort_states, calc_states
+from aiida.common.datastructures import (sort_states, calc_states,
+                                          finished_calc_states)
 from aiida.common.exceptions import ModificationNotAllowed, DbContentError
 from aiida.backends.djsite.utils import get_automatic_user
+from aiida.backends.notifications import notify_nodes_finished
 from aiida.orm.group import Group
 from aiida.orm.implementation.django.calculation import Calculation
 from aiida.orm.implementation.general.calculation.job import (
@@ -77,6 +79,10 @@ class JobCalculation(AbstractJobCalculation, Calculation):
         if state != calc_states.IMPORTED:
             self._set_attr('state', state)
 
+        # Wake up the processes waiting on this calculation
+        if state in finished_calc_states:
+            notify_nodes_finished([self.pk])
+
     def get_state(self, from_attribute=False):
         """
         Get the state of the calculation.
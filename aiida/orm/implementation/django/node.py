@@ -16,6 +16,8 @@ from django.db.models import F
 
 from aiida.backends.djsite.db.models import DbLink
 from aiida.backends.djsite.utils import get_automatic_user
+from aiida.backends.reachability import (
+    update_reachability_index, update_reachability_index_after_removal)
 from aiida.common.exceptions import (InternalError, ModificationNotAllowed,
                                      NotExistent, UniquenessError)
 from aiida.common.folders import RepositoryFolder
@@ -169,7 +171,9 @@ class Node(AbstractNode):
                 self._add_dblink_from(src, label, link_type)
 
     def _remove_dblink_from(self, label):
-        DbLink.objects.filter(output=self.dbnode, label=label).delete()
+        with transaction.atomic():
+            DbLink.objects.filter(output=self.dbnode, label=label).delete()
+            update_reachability_index_after_removal(self.pk)
 
     def _add_dblink_from(self, src, label=None, link_type=LinkType.UNSPECIFIED):
         from aiida.orm.querybuilder import QueryBuilder
@@ -242,6 +246,8 @@ class Node(AbstractNode):
                                   "name (raw message was {})"
                                   "".format(e.message))
 
+        update_reachability_index([(src.pk, self.pk, link_type)])
+
     def _get_db_input_links(self, link_type):
         from aiida.backends.djsite.db.models import DbLink
 
@@ -288,10 +294,25 @@ class Node(AbstractNode):
         DbAttribute.del_value_for_node(self.dbnode, key)
         self._increment_version_number_db()
 
+    def _set_db_attrs(self, attrs):
+        from aiida.backends.djsite.db.models import DbAttribute
+
+        DbAttribute.set_values_for_node(self.dbnode, attrs)
+        self._increment_version_number_db()
+
+    def _del_db_attrs(self, keys):
+        from aiida.backends.djsite.db.models import DbAttribute
+
+        DbAttribute.del_values_for_node(self.dbnode, keys)
+        self._increment_version_number_db()
+
     def _get_db_attr(self, key):
         from aiida.backends.djsite.db.models import DbAttribute
-        return DbAttribute.get_value_for_node(
-            dbnode=self.dbnode, key=key)
+        try:
+            return DbAttribute.get_json_values_for_nodepk(self.dbnode.pk)[key]
+        except KeyError:
+            raise AttributeError("DbAttribute with key {} for node {} not "
+                                 "found in db".format(key, self.dbnode.pk))
 
     def _set_db_extra(self, key, value, exclusive=False):
         from aiida.backends.djsite.db.models import DbExtra
@@ -300,14 +321,29 @@ class Node(AbstractNode):
                                    stop_if_existing=exclusive)
         self._increment_version_number_db()
 
+    def _set_db_extras(self, extras):
+        from aiida.backends.djsite.db.models import DbExtra
+
+        DbExtra.set_values_for_node(self.dbnode, extras)
+        self._increment_version_number_db()
+
+    def _del_db_extras(self, keys):
+        from aiida.backends.djsite.db.models import DbExtra
+
+        DbExtra.del_values_for_node(self.dbnode, keys)
+        self._increment_version_number_db()
+
     def _reset_db_extras(self, new_extras):
         raise NotImplementedError("Reset of extras has not been implemented"
                                   "for Django backend.")
 
     def _get_db_extra(self, key, *args):
         from aiida.backends.djsite.db.models import DbExtra
-        return DbExtra.get_value_for_node(dbnode=self.dbnode,
-                                          key=key)
+        try:
+            return DbExtra.get_json_values_for_nodepk(self.dbnode.pk)[key]
+        except KeyError:
+            raise AttributeError("DbExtra with key {} for node {} not "
+                                 "found in db".format(key, self.dbnode.pk))
 
     def _del_db_extra(self, key):
         from aiida.backends.djsite.db.models import DbExtra
@@ -319,26 +355,23 @@ class Node(AbstractNode):
 
     def _db_iterextras(self):
         from aiida.backends.djsite.db.models import DbExtra
-        extraslist = DbExtra.list_all_node_elements(self.dbnode)
-        for e in extraslist:
-            yield (e.key, e.getvalue())
+
+        all_extras = DbExtra.get_json_values_for_nodepk(self.dbnode.pk)
+        for extra in all_extras:
+            yield (extra, all_extras[extra])
 
     def _db_iterattrs(self):
         from aiida.backends.djsite.db.models import DbAttribute
 
-        all_attrs = DbAttribute.get_all_values_for_node(self.dbnode)
+        all_attrs = DbAttribute.get_json_values_for_nodepk(self.dbnode.pk)
         for attr in all_attrs:
             yield (attr, all_attrs[attr])
 
     def _db_attrs(self):
-        # Note: I "duplicate" the code from iterattrs and reimplement it
-        # here, rather than
-        # calling iterattrs from here, because iterattrs is slow on each call
-        # since it has to call .getvalue(). To improve!
         from aiida.backends.djsite.db.models import DbAttribute
-        attrlist = DbAttribute.list_all_node_elements(self.dbnode)
-        for attr in attrlist:
-            yield attr.key
+
+        for attr in DbAttribute.get_json_values_for_nodepk(self.dbnode.pk):
+            yield attr
 
     def add_comment(self, content, user=None):
         from aiida.backends.djsite.db.models import DbComment
@@ -622,3 +655,100 @@ class Node(AbstractNode):
         DbExtra.set_value_for_node(self.dbnode, _HASH_EXTRA_KEY, self.get_hash())
 
         return self
+
+    @classmethod
+    def _db_store_many(cls, nodes, with_transaction=True):
+        """
+        Store the given new nodes in the DB with a fixed number of queries:
+        the ids are taken from the sequence with a single query, then the
+        nodes, their attributes, their hash and all the cached links are
+        created with one bulk INSERT per table.
+
+        :param nodes: a list of unstored nodes, already validated by
+          _store_many
+        :parameter with_transaction: if False, no transaction is used. This
+          is meant to be used ONLY if the outer calling function has already
+          a transaction open!
+        """
+        from django.db import connection
+        from aiida.common.utils import EmptyContextManager
+        from aiida.backends.djsite.db.models import DbAttribute, DbExtra, DbNode
+
+        if with_transaction:
+            context_man = transaction.atomic()
+        else:
+            context_man = EmptyContextManager()
+
+        # The hash includes the files, so I compute it before moving them
+        hashes = [node.get_hash() for node in nodes]
+
+        # As in _db_store, I first store the files, then the DB entries
+        moved = []
+        try:
+            for node in nodes:
+                node._repository_folder.replace_with_folder(
+                    node._get_temp_folder().abspath, move=True, overwrite=True)
+                moved.append(node)
+
+            with context_man:
+                # With the ids already set, bulk_create does not need to
+                # fetch them back to create the attributes and the links
+                cursor = connection.cursor()
+                cursor.execute(
+                    "SELECT nextval('db_dbnode_id_seq') "
+                    "FROM generate_series(1, %s)", [len(nodes)])
+                # nextval returns a bigint, that psycopg2 gives as a long
+                for node, (pk,) in zip(nodes, cursor.fetchall()):
+                    node._dbnode.pk = int(pk)
+                DbNode.objects.bulk_create([node._dbnode for node in nodes])
+
+                attributes = []
+                extras = []
+                for node, node_hash in zip(nodes, hashes):
+                    attributes.extend(DbAttribute.reset_values_for_node(
+                        node._dbnode, attributes=node._attrs_cache,
+                        with_transaction=False, return_not_store=True))
+                    extras.extend(DbExtra.create_value(
+                        _HASH_EXTRA_KEY, node_hash,
+                        subspecifier_value=node._dbnode))
+                DbAttribute.objects.bulk_create(attributes)
+                DbExtra.objects.bulk_create(extras)
+                DbAttribute.set_json_values_for_nodes({
+                    node.pk: node._attrs_cache for node in nodes})
+                DbExtra.set_json_values_for_nodes({
+                    node.pk: {_HASH_EXTRA_KEY: node_hash}
+                    for node, node_hash in zip(nodes, hashes)})
+
+                DbLink.objects.bulk_create([
+                    DbLink(input_id=src.pk, output_id=node.pk, label=label,
+                           type=link_type.value)
+                    for node in nodes
+                    for label, (src, link_type)
+                    in node._inputlinks_cache.iteritems()])
+                update_reachability_index([
+                    (src.pk, node.pk, link_type)
+                    for node in nodes
+                    for src, link_type in node._inputlinks_cache.itervalues()])
+
+        # This is one of the few cases where it is ok to do a 'global'
+        # except, also because I am re-raising the exception
+        except:
+            for node in nodes:
+                node._dbnode.pk = None
+            # I put back the files in the sandbox folder since the
+            # transaction did not succeed
+            for node in moved:
+                node._get_temp_folder().replace_with_folder(
+                    node._repository_folder.abspath, move=True, overwrite=True)
+            raise
+
+        for node in nodes:
+            # bulk_create does not update the state of the instances
+            node._dbnode._state.adding = False
+            node._dbnode._state.db = 'default'
+            # This should not be used anymore: I delete it to
+            # possibly free memory
+            del node._attrs_cache
+            node._temp_folder = None
+            node._to_be_stored = False
+            node._inputlinks_cache.clear()
@@ -42,6 +42,8 @@ class AbstractJobCalculation(AbstractCalculation):
         'retrieve_list', 'retrieve_temporary_list', 'retrieve_singlefile_list')
     _cacheable = True
 
+    _hash_ignored_folder_content = (_input_subfolder,)
+
     @classproperty
     def _hash_ignored_attributes(cls):
         # _updatable_attributes are ignored automatically.
@@ -52,18 +54,6 @@ class AbstractJobCalculation(AbstractCalculation):
             'max_memory_kb',
         ]
 
-    def get_hash(
-        self,
-        ignore_errors=True,
-        ignored_folder_content=('raw_input',),
-        **kwargs
-    ):
-        return super(AbstractJobCalculation, self).get_hash(
-            ignore_errors=ignore_errors,
-            ignored_folder_content=ignored_folder_content,
-            **kwargs
-        )
-
     @classmethod
     def process(cls):
         from aiida.work.legacy.job_process import JobProcess
@@ -214,6 +204,8 @@ class AbstractJobCalculation(AbstractCalculation):
         :param folder_path: the path to the folder from which the content
                should be taken
         """
+        from aiida.common.objectstore import ObjectStore, is_deduplication_enabled
+
         # This function can be called only if the state is SUBMITTING
         if self.get_state() != calc_states.SUBMITTING:
             raise ModificationNotAllowed(
@@ -226,6 +218,8 @@ class AbstractJobCalculation(AbstractCalculation):
             _input_subfolder, create=True)
         _raw_input_folder.replace_with_folder(
             folder_path, move=False, overwrite=True)
+        if is_deduplication_enabled():
+            ObjectStore().add_folder(_raw_input_folder.abspath)
 
     @property
     def _raw_input_folder(self):
@@ -647,14 +641,8 @@ class AbstractJobCalculation(AbstractCalculation):
 
         :return: a boolean
         """
-        return self.get_state() in [
-            calc_states.TOSUBMIT,
-            calc_states.SUBMITTING,
-            calc_states.WITHSCHEDULER,
-            calc_states.COMPUTED,
-            calc_states.RETRIEVING,
-            calc_states.PARSING
-        ]
+        from aiida.common.datastructures import running_calc_states
+        return self.get_state() in running_calc_states
 
     def has_finished_ok(self):
         """
@@ -825,13 +813,26 @@ class AbstractJobCalculation(AbstractCalculation):
         """
         return self.get_attr('job_id', None)
 
-    def _set_scheduler_state(self, state):
+    def _set_scheduler_state(self, state, last_jobinfo=None):
+        """
+        Set the scheduler state of the calculation, and the time of this
+        check, with a single update of the DB.
+
+        :param state: the state, as returned by the scheduler
+        :param last_jobinfo: if given, a JobInfo object to be stored in the
+            same update (see ``_set_last_jobinfo``)
+        """
         # I don't do any test here on the possible valid values,
         # I just convert it to a string
         from aiida.utils import timezone
 
-        self._set_attr('scheduler_state', unicode(state))
-        self._set_attr('scheduler_lastchecktime', timezone.now())
+        attrs = {
+            'scheduler_state': unicode(state),
+            'scheduler_lastchecktime': timezone.now(),
+        }
+        if last_jobinfo is not None:
+            attrs['last_jobinfo'] = last_jobinfo.serialize()
+        self._set_attrs(attrs)
 
     def get_scheduler_state(self):
         """
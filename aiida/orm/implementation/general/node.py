@@ -146,6 +146,10 @@ class AbstractNode(object):
     # A list of attribute names that will be ignored when creating the hash.
     _hash_ignored_attributes = []
 
+    # The names of the files and folders of the repository (at any depth)
+    # that will be ignored when creating the hash.
+    _hash_ignored_folder_content = ()
+
     # Flag that determines whether the class can be cached.
     _cacheable = True
 
@@ -822,6 +826,36 @@ class AbstractNode(object):
         else:
             self._set_db_attr(key, clean_value(value))
 
+    def _set_attrs(self, attrs, clean=True, stored_check=True):
+        """
+        Set several attributes of the Node at once. For a stored node, all
+        of them are written to the DB with a single update, rather than one
+        per attribute as when calling :py:meth:`_set_attr` repeatedly.
+
+        :param attrs: a dictionary of key:value of the attributes to set
+        :param clean: whether to clean values.
+            WARNING: when set to False, storing will throw errors
+            for any data types not recognized by the db backend
+        :param stored_check: when set to False will disable the mutability check
+        :raise ModificationNotAllowed: if node is already stored
+        :raise ValidationError: if a key is not valid, e.g. it contains the separator symbol
+        """
+        if stored_check and self.is_stored:
+            raise ModificationNotAllowed('Cannot change the attributes of a stored node')
+
+        for key in attrs:
+            validate_attribute_key(key)
+
+        if self._to_be_stored:
+            for key, value in attrs.iteritems():
+                if clean:
+                    self._attrs_cache[key] = clean_value(value)
+                else:
+                    self._attrs_cache[key] = value
+        elif attrs:
+            self._set_db_attrs({key: clean_value(value)
+                                for key, value in attrs.iteritems()})
+
     def _append_to_attr(self, key, value, clean=True):
         """
         Append value to an attribute of the Node (in the DbAttribute table).
@@ -865,6 +899,18 @@ class AbstractNode(object):
         """
         pass
 
+    @abstractmethod
+    def _set_db_attrs(self, attrs):
+        """
+        Set several values directly in the DB with a single update, without
+        checking if the node is stored, or using the cache.
+
+        DO NOT USE DIRECTLY.
+
+        :param attrs: a dictionary of key:value of the attributes to set
+        """
+        pass
+
     def _del_attr(self, key, stored_check=True):
         """
         Delete an attribute.
@@ -897,6 +943,44 @@ class AbstractNode(object):
         """
         pass
 
+    def _del_attrs(self, keys, stored_check=True):
+        """
+        Delete several attributes at once. For a stored node, they are all
+        removed from the DB with a single update.
+
+        :param keys: an iterable with the attributes to delete
+        :param stored_check: when set to False will disable the mutability check
+        :raise AttributeError: if one of the keys does not exist; in this
+            case no attribute is deleted.
+        :raise ModificationNotAllowed: if node is already stored
+        """
+        if stored_check and self.is_stored:
+            raise ModificationNotAllowed('Cannot change the attributes of a stored node')
+
+        keys = list(keys)
+        existing = set(self.attrs())
+        for key in keys:
+            if key not in existing:
+                raise AttributeError(
+                    "DbAttribute {} does not exist".format(key))
+
+        if self._to_be_stored:
+            for key in keys:
+                del self._attrs_cache[key]
+        elif keys:
+            self._del_db_attrs(keys)
+
+    @abstractmethod
+    def _del_db_attrs(self, keys):
+        """
+        Delete several attributes directly from the DB with a single update
+
+        DO NOT USE DIRECTLY.
+
+        :param keys: a list with the keys of the attributes to delete
+        """
+        pass
+
     def _del_all_attrs(self):
         """
         Delete all attributes associated to this node.
@@ -1001,15 +1085,39 @@ class AbstractNode(object):
         No .store() to be called.
         Can be used *only* after saving.
 
+        All the extras are written with a single update of the DB.
+
         :param the_dict: a dictionary of key:value to be set as extras
         """
-
         try:
-            for key, value in the_dict.iteritems():
-                self.set_extra(key, value)
+            items = the_dict.items()
         except AttributeError:
             raise AttributeError("set_extras takes a dictionary as argument")
 
+        for key, _ in items:
+            validate_attribute_key(key)
+
+        if self._to_be_stored:
+            raise ModificationNotAllowed(
+                "The extras of a node can be set only after "
+                "storing the node")
+
+        if items:
+            self._set_db_extras({key: clean_value(value)
+                                 for key, value in items})
+
+    @abstractmethod
+    def _set_db_extras(self, extras):
+        """
+        Store several extras directly in the DB with a single update,
+        without checks.
+
+        DO NOT USE DIRECTLY.
+
+        :param extras: a dictionary of key:value of the extras to set
+        """
+        pass
+
     def reset_extras(self, new_extras):
         """
         Deletes existing extras and creates new ones.
@@ -1118,6 +1226,41 @@ class AbstractNode(object):
         """
         pass
 
+    def del_extras(self, keys):
+        """
+        Delete several extras, acting directly on the DB with a single
+        update. Can be used *only* after storing the node.
+
+        :param keys: an iterable with the names of the extras to delete
+        :raise: AttributeError: if one of the keys does not exist; in this
+            case no extra is deleted.
+        :raise: ModificationNotAllowed: if the node is not stored yet
+        """
+        if self._to_be_stored:
+            raise ModificationNotAllowed(
+                "The extras of a node can be set and deleted "
+                "only after storing the node")
+
+        keys = list(keys)
+        existing = set(self.extras())
+        for key in keys:
+            if key not in existing:
+                raise AttributeError("DbExtra {} does not exist".format(key))
+
+        if keys:
+            self._del_db_extras(keys)
+
+    @abstractmethod
+    def _del_db_extras(self, keys):
+        """
+        Delete several extras, directly on the DB with a single update.
+
+        DO NOT USE DIRECTLY.
+
+        :param keys: a list with the names of the extras to delete
+        """
+        pass
+
     # pylint: disable=unused-variable
     def extras(self):
         """
@@ -1641,6 +1784,141 @@ class AbstractNode(object):
         """
         pass
 
+    @classmethod
+    def _store_many(cls, nodes, with_transaction=True):
+        """
+        Store a list of new nodes in the DB, together with the input links
+        in their cache, using a fixed number of queries instead of a few
+        queries per node and per link as when calling store() on each node.
+
+        The input links of each node must come either from stored nodes or
+        from nodes in the list, and they are all stored.
+
+        :note: the caching mechanism is not used: all nodes are stored
+          as new nodes.
+
+        :note: nodes whose class overrides store() (e.g. JobCalculation,
+          CifData, UpfData) are not accepted, since that logic would be
+          skipped: store them with their own store() method.
+
+        :param nodes: a list of unstored nodes
+        :parameter with_transaction: if False, no transaction is used. This
+          is meant to be used ONLY if the outer calling function has already
+          a transaction open!
+        :return: the list of stored nodes
+        :raise ModificationNotAllowed: if a node is already stored, or if a
+          node has an input link from an unstored node not in the list
+        :raise ValueError: if the links would create a loop
+        """
+        nodes = list(nodes)
+        new_uuids = set()
+
+        for node in nodes:
+            if not node._to_be_stored:
+                raise ModificationNotAllowed(
+                    "Node with pk= {} was already stored".format(node.pk))
+            if node.uuid in new_uuids:
+                raise ValueError(
+                    "Node with uuid={} is present twice in the list of "
+                    "nodes to store".format(node.uuid))
+            if type(node).store.__func__ is not AbstractNode.store.__func__:
+                raise ValueError(
+                    "Nodes of class {} cannot be stored in bulk, since "
+                    "they define their own store() method".format(
+                        node.__class__.__name__))
+            new_uuids.add(node.uuid)
+
+        for node in nodes:
+            node._validate()
+            for label, (src, _) in node._inputlinks_cache.iteritems():
+                if src._to_be_stored and src.uuid not in new_uuids:
+                    raise ModificationNotAllowed(
+                        "Cannot store the input link '{}' of node {} because "
+                        "the source node is neither stored nor in the list "
+                        "of nodes to store".format(label, node.uuid))
+
+        cls._check_no_loops_in_batch(nodes)
+
+        if nodes:
+            # call implementation-dependent store method
+            cls._db_store_many(nodes, with_transaction)
+
+        # Set up autogrouping used by verdi run
+        from aiida.orm.autogroup import current_autogroup, Autogroup, VERDIAUTOGROUP_TYPE
+        from aiida.orm import Group
+
+        if current_autogroup is not None:
+            if not isinstance(current_autogroup, Autogroup):
+                raise ValidationError(
+                    "current_autogroup is not an AiiDA Autogroup")
+
+            to_group = [node for node in nodes
+                        if current_autogroup.is_to_be_grouped(node)]
+            group_name = current_autogroup.get_group_name()
+            if to_group and group_name is not None:
+                g = Group.get_or_create(
+                    name=group_name, type_string=VERDIAUTOGROUP_TYPE)[0]
+                g.add_nodes(to_group)
+
+        return nodes
+
+    @staticmethod
+    def _check_no_loops_in_batch(nodes):
+        """
+        Check that the cached CREATE and INPUT links between the given new
+        nodes do not form a loop.
+
+        New nodes have no descendants in the DB, so a loop can only be formed
+        by links between the nodes being stored: this replaces the per-link
+        query done by _add_dblink_from.
+
+        :raise ValueError: if a loop is found
+        """
+        # uuid -> uuids of the parents in the batch
+        parents = {node.uuid: set() for node in nodes}
+        for node in nodes:
+            for src, link_type in node._inputlinks_cache.itervalues():
+                if (link_type in (LinkType.CREATE, LinkType.INPUT) and
+                        src.uuid in parents):
+                    parents[node.uuid].add(src.uuid)
+
+        # Kahn's algorithm: if some nodes can never be reached starting from
+        # the nodes without parents, they are part of a loop
+        children = collections.defaultdict(list)
+        for uuid, node_parents in parents.iteritems():
+            for parent in node_parents:
+                children[parent].append(uuid)
+        missing = {uuid: len(node_parents)
+                   for uuid, node_parents in parents.iteritems()}
+        to_visit = [uuid for uuid, count in missing.iteritems() if count == 0]
+        visited = 0
+        while to_visit:
+            uuid = to_visit.pop()
+            visited += 1
+            for child in children[uuid]:
+                missing[child] -= 1
+                if missing[child] == 0:
+                    to_visit.append(child)
+
+        if visited != len(parents):
+            raise ValueError(
+                "The links you are attempting to create would generate a loop")
+
+    @abstractclassmethod
+    def _db_store_many(cls, nodes, with_transaction=True):
+        """
+        Store the given new nodes in the DB with a fixed number of queries,
+        also moving their repository directories and storing their
+        attributes, their hash and all the links in their cache.
+
+        All checks are done by _store_many, that should be used instead.
+
+        :param nodes: a list of unstored nodes
+        :parameter with_transaction: if False, no transaction is used. This
+          is meant to be used ONLY if the outer calling function has already
+          a transaction open!
+        """
+        pass
 
     def __del__(self):
         """
@@ -1657,6 +1935,8 @@ class AbstractNode(object):
         Making a hash based on my attributes
         """
         from aiida.common.hashing import make_hash
+        kwargs.setdefault(
+            'ignored_folder_content', self._hash_ignored_folder_content)
         try:
             return make_hash(self._get_objects_to_hash(), **kwargs)
         except Exception as e:
@@ -1728,10 +2008,13 @@ class AbstractNode(object):
         from aiida.orm.querybuilder import QueryBuilder
 
         hash_ = self.get_hash()
-        if hash_:
-            qb = QueryBuilder()
-            qb.append(self.__class__, filters={'extras._aiida_hash': hash_}, project='*', subclassing=False)
-            same_nodes = (n[0] for n in qb.iterall())
+        if not hash_:
+            return iter(())
+
+        # The filter on the hash uses the index on the hash of the nodes
+        qb = QueryBuilder()
+        qb.append(self.__class__, filters={'extras.{}'.format(_HASH_EXTRA_KEY): hash_}, project='*', subclassing=False)
+        same_nodes = (n[0] for n in qb.iterall())
         return (n for n in same_nodes if n._is_valid_cache())
 
     def _is_valid_cache(self):
@@ -15,12 +15,14 @@ from dateutil.parser import parse
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.orm import joinedload
 
-from aiida.common.datastructures import sort_states, calc_states
+from aiida.common.datastructures import (sort_states, calc_states,
+                                          finished_calc_states)
 from aiida.common.exceptions import ModificationNotAllowed, DbContentError
 from aiida.common.utils import str_timedelta
 
 from aiida.backends import sqlalchemy as sa
 from aiida.backends.sqlalchemy.utils import get_automatic_user
+from aiida.backends.notifications import notify_nodes_finished
 from aiida.backends.sqlalchemy.models.node import DbNode, DbCalcState
 from aiida.backends.sqlalchemy.models.group import DbGroup
 
@@ -82,6 +84,10 @@ class JobCalculation(AbstractJobCalculation, Calculation):
         if state != calc_states.IMPORTED:
             self._set_attr('state', state)
 
+        # Wake up the processes waiting on this calculation
+        if state in finished_calc_states:
+            notify_nodes_finished([self.pk])
+
     def get_state(self, from_attribute=False):
         """
         Get the state of the calculation.
@@ -163,15 +163,25 @@ class Group(AbstractGroup):
                 raise ValueError("At least one of the provided nodes is "
                                  "unstored, stopping...")
             if isinstance(node, Node):
-                to_add = node.dbnode
+                list_nodes.append(node.dbnode)
             else:
-                to_add = node
+                list_nodes.append(node)
 
-            if to_add not in self._dbgroup.dbnodes:
-                # ~ list_nodes.append(to_add)
+        # The nodes already in the group are found with a single query,
+        # rather than by loading all the members of the group for each node
+        existing = set()
+        ids = list(set(node.id for node in list_nodes))
+        if ids:
+            existing = set(_ for _, in session.query(
+                table_groups_nodes.c.dbnode_id).filter(
+                table_groups_nodes.c.dbgroup_id == self._dbgroup.id,
+                table_groups_nodes.c.dbnode_id.in_(ids)))
+
+        for to_add in list_nodes:
+            if to_add.id not in existing:
+                existing.add(to_add.id)
                 self._dbgroup.dbnodes.append(to_add)
         session.commit()
-        # ~ self._dbgroup.dbnodes.extend(list_nodes)
 
     @property
     def nodes(self):
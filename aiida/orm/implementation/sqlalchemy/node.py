@@ -17,6 +17,8 @@ from sqlalchemy.orm.exc import NoResultFound
 from sqlalchemy.orm.attributes import flag_modified
 
 from aiida.backends.utils import get_automatic_user
+from aiida.backends.reachability import (
+    update_reachability_index, update_reachability_index_after_removal)
 from aiida.backends.sqlalchemy.models.node import DbNode, DbLink
 from aiida.backends.sqlalchemy.models.comment import DbComment
 from aiida.backends.sqlalchemy.models.user import DbUser
@@ -189,9 +191,11 @@ class Node(AbstractNode):
     def _remove_dblink_from(self, label):
         from aiida.backends.sqlalchemy import get_scoped_session
         session = get_scoped_session()
-        link = DbLink.query.filter_by(label=label).first()
+        link = DbLink.query.filter_by(output_id=self.dbnode.id,
+                                      label=label).first()
         if link is not None:
             session.delete(link)
+            update_reachability_index_after_removal(self.pk)
 
     def _add_dblink_from(self, src, label=None, link_type=LinkType.UNSPECIFIED):
         from aiida.backends.sqlalchemy import get_scoped_session
@@ -266,6 +270,8 @@ class Node(AbstractNode):
                                   "name (raw message was {})"
                                   "".format(e))
 
+        update_reachability_index([(src.dbnode.id, self.dbnode.id, link_type)])
+
     def _get_db_input_links(self, link_type):
         link_filter = {'output': self.dbnode}
         if link_type is not None:
@@ -313,6 +319,28 @@ class Node(AbstractNode):
             session.rollback()
             raise
 
+    def _set_db_attrs(self, attrs):
+        try:
+            # The version is incremented in the same UPDATE (and commit)
+            # that writes the attributes
+            self._dbnode.nodeversion = DbNode.nodeversion + 1
+            self.dbnode.set_attrs(attrs)
+        except:
+            from aiida.backends.sqlalchemy import get_scoped_session
+            session = get_scoped_session()
+            session.rollback()
+            raise
+
+    def _del_db_attrs(self, keys):
+        try:
+            self._dbnode.nodeversion = DbNode.nodeversion + 1
+            self.dbnode.del_attrs(keys)
+        except:
+            from aiida.backends.sqlalchemy import get_scoped_session
+            session = get_scoped_session()
+            session.rollback()
+            raise
+
     def _get_db_attr(self, key):
         try:
             return get_attr(self.dbnode.attributes, key)
@@ -333,6 +361,16 @@ class Node(AbstractNode):
             session.rollback()
             raise
 
+    def _set_db_extras(self, extras):
+        try:
+            self._dbnode.nodeversion = DbNode.nodeversion + 1
+            self.dbnode.set_extras(extras)
+        except:
+            from aiida.backends.sqlalchemy import get_scoped_session
+            session = get_scoped_session()
+            session.rollback()
+            raise
+
     def _reset_db_extras(self, new_extras):
         try:
             self.dbnode.reset_extras(new_extras)
@@ -360,6 +398,16 @@ class Node(AbstractNode):
             session.rollback()
             raise
 
+    def _del_db_extras(self, keys):
+        try:
+            self._dbnode.nodeversion = DbNode.nodeversion + 1
+            self.dbnode.del_extras(keys)
+        except:
+            from aiida.backends.sqlalchemy import get_scoped_session
+            session = get_scoped_session()
+            session.rollback()
+            raise
+
 
     def _db_iterextras(self):
         if self.dbnode.extras is None:
@@ -661,6 +709,107 @@ class Node(AbstractNode):
         self.dbnode.set_extra(_HASH_EXTRA_KEY, self.get_hash())
         return self
 
+    @classmethod
+    def _db_store_many(cls, nodes, with_transaction=True):
+        """
+        Store the given new nodes in the DB with a fixed number of queries:
+        the ids are taken from the sequence with a single query, then all
+        nodes (with attributes and hash) are inserted with a single
+        multi-row INSERT, and all the cached links with another one.
+
+        :param nodes: a list of unstored nodes, already validated by
+          _store_many
+        :parameter with_transaction: if False, no transaction is used. This
+          is meant to be used ONLY if the outer calling function has already
+          a transaction open!
+        """
+        from sqlalchemy import func, inspect, select
+        from sqlalchemy.orm import make_transient_to_detached
+        from aiida.backends.sqlalchemy import get_scoped_session
+        session = get_scoped_session()
+        table = DbNode.__table__
+
+        # The hash includes the files, so I compute it before moving them
+        hashes = [node.get_hash() for node in nodes]
+
+        # As in _db_store, I first store the files, then the DB entries
+        moved = []
+        try:
+            for node in nodes:
+                node._repository_folder.replace_with_folder(
+                    node._get_temp_folder().abspath, move=True, overwrite=True)
+                moved.append(node)
+
+            # nextval returns a bigint, that psycopg2 gives as a long
+            ids = [int(row[0]) for row in session.execute(
+                select([func.nextval('db_dbnode_id_seq')]).select_from(
+                    func.generate_series(1, len(nodes))))]
+
+            rows = []
+            for node, pk, node_hash in zip(nodes, ids, hashes):
+                dbnode = node._dbnode
+                if inspect(dbnode).pending:
+                    session.expunge(dbnode)
+                dbnode.id = pk
+                dbnode.attributes = node._attrs_cache
+                dbnode.extras = dict(dbnode.extras or {})
+                dbnode.extras[_HASH_EXTRA_KEY] = node_hash
+                # The foreign keys are otherwise only set when flushing
+                if dbnode.user is not None:
+                    dbnode.user_id = dbnode.user.id
+                if dbnode.dbcomputer is not None:
+                    dbnode.dbcomputer_id = dbnode.dbcomputer.id
+                # Python-side defaults are otherwise only applied when flushing
+                for column in table.columns:
+                    default = column.default
+                    if getattr(dbnode, column.key) is None and default is not None:
+                        setattr(dbnode, column.key, default.arg(None)
+                                if default.is_callable else default.arg)
+                rows.append({column.key: getattr(dbnode, column.key)
+                             for column in table.columns})
+            session.execute(table.insert().values(rows))
+
+            links = [{'input_id': src.dbnode.id, 'output_id': node.dbnode.id,
+                      'label': label, 'type': link_type.value}
+                     for node in nodes
+                     for label, (src, link_type)
+                     in node._inputlinks_cache.iteritems()]
+            if links:
+                session.execute(DbLink.__table__.insert().values(links))
+                update_reachability_index([
+                    (src.dbnode.id, node.dbnode.id, link_type)
+                    for node in nodes
+                    for src, link_type in node._inputlinks_cache.itervalues()])
+
+            if with_transaction:
+                session.commit()
+
+        # This is one of the few cases where it is ok to do a 'global'
+        # except, also because I am re-raising the exception
+        except:
+            if with_transaction:
+                session.rollback()
+            for node in nodes:
+                node._dbnode.id = None
+            # I put back the files in the sandbox folder since the
+            # transaction did not succeed
+            for node in moved:
+                node._get_temp_folder().replace_with_folder(
+                    node._repository_folder.abspath, move=True, overwrite=True)
+            raise
+
+        for node in nodes:
+            # The rows are in the DB: attach the DbNodes to the session as
+            # if they had been loaded from it
+            make_transient_to_detached(node._dbnode)
+            session.add(node._dbnode)
+            # This should not be used anymore: I delete it to
+            # possibly free memory
+            del node._attrs_cache
+            node._temp_folder = None
+            node._to_be_stored = False
+            node._inputlinks_cache.clear()
+
 
     @property
     def uuid(self):
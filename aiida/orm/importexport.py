@@ -9,6 +9,7 @@
 ###########################################################################
 import HTMLParser
 import sys
+from contextlib import contextmanager
 
 from aiida.common.utils import (export_shard_uuid, get_class_string,
                                 get_object_from_string, grouper)
@@ -306,11 +307,24 @@ def deserialize_field(k, v, fields_info, import_unique_ids_mappings,
 
 
 def import_data(in_path,ignore_unknown_nodes=False,
-                silent=False):
+                silent=False, batch_size=None):
+    """
+    Import exported AiiDA environment to the AiiDA database.
 
+    :param in_path: the path to a file or folder that can be imported in AiiDA
+    :param batch_size: if given, the nodes and the links are imported in
+        batches of this size, each in its own transaction, without loading
+        the whole file in memory (see import_data_batched); otherwise,
+        everything is imported in a single transaction
+    """
     from aiida.backends.settings import BACKEND
     from aiida.backends.profile import BACKEND_DJANGO, BACKEND_SQLA
 
+    if batch_size is not None and BACKEND in (BACKEND_SQLA, BACKEND_DJANGO):
+        return import_data_batched(
+            in_path, ignore_unknown_nodes=ignore_unknown_nodes,
+            silent=silent, batch_size=batch_size)
+
     if BACKEND == BACKEND_SQLA:
         return import_data_sqla(in_path, ignore_unknown_nodes=ignore_unknown_nodes,
                          silent=silent)
@@ -344,6 +358,7 @@ def import_data_dj(in_path,ignore_unknown_nodes=False,
     from aiida.orm import Node, Group
     from aiida.common.archive import extract_tree, extract_tar, extract_zip, extract_cif
     from aiida.common.links import LinkType
+    from aiida.backends.reachability import update_reachability_index
     from aiida.common.exceptions import UniquenessError
     from aiida.common.folders import SandboxFolder, RepositoryFolder
     from aiida.backends.djsite.db import models
@@ -742,6 +757,9 @@ def import_data_dj(in_path,ignore_unknown_nodes=False,
                     print "   ({} new links...)".format(len(links_to_store))
 
                 models.DbLink.objects.bulk_create(links_to_store)
+                update_reachability_index([
+                    (link.input_id, link.output_id, LinkType(link.type))
+                    for link in links_to_store])
             else:
                 if not silent:
                     print "   (0 new links...)"
@@ -811,6 +829,897 @@ def import_data_dj(in_path,ignore_unknown_nodes=False,
     return ret_dict
 
 
+def import_data_batched(in_path, ignore_unknown_nodes=False, silent=False,
+                        batch_size=1000, copy_threads=None):
+    """
+    Import exported AiiDA environment to the AiiDA database, as
+    import_data_dj and import_data_sqla, but with transactions that do not
+    grow with the number of nodes, and without loading the whole file in
+    memory.
+
+    The data.json file is read incrementally: the users, computers and groups
+    are loaded at once, while the nodes and the links are imported in batches
+    of batch_size entries, each with a fixed number of queries and in its own
+    transaction, with bulk INSERTs (with both backends). The attributes of
+    the nodes are first indexed by pk in a temporary SQLite file, from which
+    those of each batch are fetched. The repository folders of each batch
+    are copied (or moved, when extracted from an archive) by a pool of
+    threads.
+
+    The memory usage still grows with the number of nodes, but only by their
+    UUIDs and pks: the mapping from the UUIDs to the pks is kept to import the
+    links, and the returned dictionary lists the new and existing nodes and
+    links.
+
+    As the nodes and the links already in the database are skipped, an
+    interrupted import is resumed by importing the same file again. However,
+    the links to unknown nodes are only detected after all the nodes are
+    imported.
+
+    :param in_path: the path to a file or folder that can be imported in AiiDA
+    :param batch_size: the number of nodes or links imported in each
+        transaction
+    :param copy_threads: the number of threads copying the repository folders
+        (default: the number of CPUs)
+    """
+    import json
+    import os
+    import tarfile
+    import zipfile
+    from multiprocessing.pool import ThreadPool
+
+    from aiida.backends.settings import BACKEND
+    from aiida.backends.profile import BACKEND_DJANGO, BACKEND_SQLA
+    from aiida.common.archive import (extract_tar, extract_zip, extract_cif,
+                                      JSONStreamReader)
+    from aiida.common.exceptions import ConfigurationError
+    from aiida.common.folders import Folder, SandboxFolder
+
+    if BACKEND == BACKEND_DJANGO:
+        from django.db.transaction import atomic
+        import_entries = _import_entries_dj
+        import_nodes_batch = _import_nodes_batch_dj
+        import_links_batch = _import_links_batch_dj
+        add_nodes_to_group = _add_nodes_to_group_dj
+    elif BACKEND == BACKEND_SQLA:
+        atomic = _sqla_transaction
+        import_entries = _import_entries_sqla
+        import_nodes_batch = _import_nodes_batch_sqla
+        import_links_batch = _import_links_batch_sqla
+        add_nodes_to_group = _add_nodes_to_group_sqla
+    else:
+        raise ConfigurationError("Invalid settings.BACKEND: {}".format(
+            BACKEND))
+
+    # This is the export version expected by this function
+    expected_export_version = '0.3'
+
+    # The name of the subfolder in which the node files are stored
+    nodes_export_subfolder = 'nodes'
+
+    # The returned dictionary with new and existing nodes and links
+    ret_dict = {}
+
+    with SandboxFolder() as sandbox:
+        # A folder is read in place and its files are copied, while the files
+        # extracted in the sandbox are moved to the repository
+        if os.path.isdir(in_path):
+            folder = Folder(os.path.abspath(in_path))
+            move = False
+        else:
+            folder = sandbox
+            move = True
+            if tarfile.is_tarfile(in_path):
+                extract_tar(in_path, folder, silent=silent,
+                            nodes_export_subfolder=nodes_export_subfolder)
+            elif zipfile.is_zipfile(in_path):
+                extract_zip(in_path, folder, silent=silent,
+                            nodes_export_subfolder=nodes_export_subfolder)
+            elif os.path.isfile(in_path) and in_path.endswith('.cif'):
+                extract_cif(in_path, folder, silent=silent,
+                            nodes_export_subfolder=nodes_export_subfolder)
+            else:
+                raise ValueError("Unable to detect the input file format, it "
+                                 "is neither a (possibly compressed) tar file, "
+                                 "nor a zip file.")
+
+        data_path = folder.get_abs_path('data.json')
+        try:
+            with open(folder.get_abs_path('metadata.json')) as f:
+                metadata = json.load(f)
+            open(data_path).close()
+        except IOError as e:
+            raise ValueError("Unable to find the file {} in the import "
+                             "file or folder".format(e.filename))
+
+        def iter_data_items(path, array=False):
+            with open(data_path) as f:
+                reader = JSONStreamReader(f)
+                if array:
+                    for item in reader.iter_array_items(path):
+                        yield item
+                else:
+                    for item in reader.iter_object_items(path):
+                        yield item
+
+        ######################
+        # PRELIMINARY CHECKS #
+        ######################
+        if metadata['export_version'] != expected_export_version:
+            raise ValueError("File export version is {}, but I can import only "
+                             "version {}".format(metadata['export_version'],
+                                                 expected_export_version))
+
+        model_order = (USER_ENTITY_NAME, COMPUTER_ENTITY_NAME,
+                       NODE_ENTITY_NAME, GROUP_ENTITY_NAME)
+        model_manual = (LINK_ENTITY_NAME, ATTRIBUTE_ENTITY_NAME)
+
+        for import_field_name in metadata['all_fields_info']:
+            if import_field_name not in model_order + model_manual:
+                raise NotImplementedError("Apparently, you are importing a "
+                                          "file with a model '{}', but this does not appear in "
+                                          "all_known_models!".format(import_field_name))
+
+        for idx, model_name in enumerate(model_order):
+            for field in metadata['all_fields_info'][model_name].values():
+                dependency = field.get('requires', None)
+                if dependency is not None and dependency not in model_order[:idx]:
+                    raise ValueError("Model {} requires {} but would be loaded "
+                                     "first; stopping...".format(model_name,
+                                                                 dependency))
+
+        ###################################
+        # IMPORT USERS, COMPUTERS, GROUPS #
+        ###################################
+        # These are few, and are loaded and imported at once
+        import_unique_ids_mappings = {}
+        foreign_ids_reverse_mappings = {NODE_ENTITY_NAME: {}}
+        with atomic():
+            for model_name in (USER_ENTITY_NAME, COMPUTER_ENTITY_NAME,
+                               GROUP_ENTITY_NAME):
+                entries = dict(iter_data_items(('export_data', model_name)))
+                unique_identifier = metadata['unique_identifiers'][model_name]
+                import_unique_ids_mappings[model_name] = {
+                    int(k): v[unique_identifier]
+                    for k, v in entries.iteritems()}
+                import_entries(
+                    model_name, entries, metadata,
+                    import_unique_ids_mappings, foreign_ids_reverse_mappings,
+                    ret_dict, silent)
+
+        ################
+        # IMPORT NODES #
+        ################
+        if not silent:
+            print "INDEXING NODE ATTRIBUTES..."
+        attributes_index = _index_node_attributes(
+            iter_data_items(('node_attributes',)),
+            iter_data_items(('node_attributes_conversion',)),
+            sandbox.get_abs_path('attributes.sqlite'))
+
+        import_group = None
+        pool = ThreadPool(copy_threads)
+        try:
+            for batch in grouper(
+                    batch_size, iter_data_items(('export_data', NODE_ENTITY_NAME))):
+                pks = import_nodes_batch(
+                    dict(batch), metadata, attributes_index,
+                    folder.get_subfolder(nodes_export_subfolder), move, pool,
+                    import_unique_ids_mappings, foreign_ids_reverse_mappings,
+                    ret_dict, silent)
+
+                # Put everything in a specific group
+                if import_group is None:
+                    import_group = _create_import_group()
+                add_nodes_to_group(import_group.uuid, pks)
+        finally:
+            pool.terminate()
+            pool.join()
+            attributes_index.close()
+
+        ################
+        # IMPORT LINKS #
+        ################
+        if not silent:
+            print "STORING NODE LINKS..."
+        dbnode_reverse_mappings = foreign_ids_reverse_mappings[NODE_ENTITY_NAME]
+        for links in grouper(batch_size,
+                             iter_data_items(('links_uuid',), array=True)):
+            import_links_batch(links, dbnode_reverse_mappings,
+                               ignore_unknown_nodes, ret_dict, silent)
+
+        if not silent:
+            print "STORING GROUP ELEMENTS..."
+        for group_uuid, group_nodes in iter_data_items(('groups_uuid',)):
+            for node_uuids in grouper(batch_size, group_nodes):
+                nodes_to_store = []
+                for node_uuid in node_uuids:
+                    try:
+                        nodes_to_store.append(dbnode_reverse_mappings[node_uuid])
+                    except KeyError:
+                        if not ignore_unknown_nodes:
+                            raise ValueError("The group {} contains a node "
+                                             "with unknown UUID={}, "
+                                             "stopping".format(group_uuid,
+                                                               node_uuid))
+                if nodes_to_store:
+                    add_nodes_to_group(group_uuid, nodes_to_store)
+
+    if not silent:
+        if import_group is not None:
+            print "IMPORTED NODES GROUPED IN IMPORT GROUP NAMED '{}'".format(
+                import_group.name)
+        else:
+            print "NO DBNODES TO IMPORT, SO NO GROUP CREATED"
+        print "DONE."
+
+    return ret_dict
+
+
+def _import_entries_dj(model_name, entries, metadata,
+                       import_unique_ids_mappings, foreign_ids_reverse_mappings,
+                       ret_dict, silent):
+    """
+    Import the given entries of a model (users, computers or groups) with a
+    bulk INSERT, skipping those already in the database.
+
+    :param entries: a dictionary with the entries of the model of data.json
+    """
+    import json
+    from aiida.backends.djsite.db import models
+
+    if not entries:
+        return
+
+    Model = get_object_from_string(entity_names_to_signatures[model_name])
+    fields_info = metadata['all_fields_info'].get(model_name, {})
+    unique_identifier = metadata['unique_identifiers'][model_name]
+    model_ret_dict = ret_dict.setdefault(model_name, {'new': [], 'existing': []})
+    reverse_mappings = foreign_ids_reverse_mappings.setdefault(model_name, {})
+
+    existing = dict(Model.objects.filter(
+        **{'{}__in'.format(unique_identifier):
+               [v[unique_identifier] for v in entries.itervalues()]}
+    ).values_list(unique_identifier, 'pk'))
+    reverse_mappings.update(existing)
+
+    objects_to_create = []
+    # This is needed later to associate the import entry with the new pk
+    import_entry_ids = {}
+    dupl_counter = 0
+    imported_comp_names = set()
+    for import_entry_id, entry_data in entries.iteritems():
+        unique_id = entry_data[unique_identifier]
+        if unique_id in existing:
+            model_ret_dict['existing'].append((import_entry_id,
+                                               existing[unique_id]))
+            if not silent:
+                print "existing %s: %s (%s->%s)" % (model_name, unique_id,
+                                                    import_entry_id,
+                                                    existing[unique_id])
+            continue
+
+        import_data = dict(deserialize_field(
+            k, v, fields_info=fields_info,
+            import_unique_ids_mappings=import_unique_ids_mappings,
+            foreign_ids_reverse_mappings=foreign_ids_reverse_mappings)
+                           for k, v in entry_data.iteritems())
+
+        if Model is models.DbComputer:
+            # Rename the new computer if there is already a computer with the
+            # same name in the database
+            orig_name = import_data['name']
+            while (import_data['name'] in imported_comp_names or
+                   Model.objects.filter(name=import_data['name']).exists()):
+                import_data['name'] = (
+                    orig_name + COMP_DUPL_SUFFIX.format(dupl_counter))
+                dupl_counter += 1
+            imported_comp_names.add(import_data['name'])
+
+            # In case the export file was generated with the SQLA export
+            for key in ('metadata', 'transport_params'):
+                if type(import_data[key]) is dict:
+                    import_data[key] = json.dumps(import_data[key])
+
+        objects_to_create.append(Model(**import_data))
+        import_entry_ids[unique_id] = import_entry_id
+
+    Model.objects.bulk_create(objects_to_create)
+
+    # Get back the just-saved entries
+    just_saved = Model.objects.filter(
+        **{"{}__in".format(unique_identifier): import_entry_ids.keys()}
+    ).values_list(unique_identifier, 'pk')
+    for unique_id, new_pk in just_saved:
+        import_entry_id = import_entry_ids[unique_id]
+        reverse_mappings[unique_id] = new_pk
+        model_ret_dict['new'].append((import_entry_id, new_pk))
+        if not silent:
+            print "NEW %s: %s (%s->%s)" % (model_name, unique_id,
+                                           import_entry_id, new_pk)
+
+
+def _index_node_attributes(attributes, attributes_conversion, index_path):
+    """
+    Store the (still serialized) attributes of the nodes in an SQLite table,
+    indexed by the pk of the nodes in the export.
+
+    :param attributes: an iterator over the (pk, attributes) of the
+        node_attributes of data.json
+    :param attributes_conversion: the same for node_attributes_conversion
+    :param index_path: the path of the SQLite file to create
+    :return: the connection to the SQLite file
+    """
+    import json
+    import sqlite3
+
+    index = sqlite3.connect(index_path)
+    index.execute("CREATE TABLE attributes "
+                  "(pk INTEGER PRIMARY KEY, data TEXT, conversion TEXT)")
+    index.executemany(
+        "INSERT INTO attributes (pk, data) VALUES (?, ?)",
+        ((int(k), json.dumps(v)) for k, v in attributes))
+    index.executemany(
+        "UPDATE attributes SET conversion = ? WHERE pk = ?",
+        ((json.dumps(v), int(k)) for k, v in attributes_conversion))
+    index.commit()
+    return index
+
+
+def _get_batch_node_attributes(attributes_index, nodes):
+    """
+    Get the deserialized attributes of a batch of new nodes from the index of
+    the attributes, with one query per 999 nodes (the maximum number of
+    parameters of an SQLite query).
+
+    :param attributes_index: the SQLite connection returned by
+        _index_node_attributes
+    :param nodes: a list of (import_entry_id, uuid) of the nodes
+    :return: a dictionary with the attributes of each import_entry_id
+    """
+    import json
+
+    serialized_attributes = {}
+    for import_entry_ids in grouper(999, [int(i) for i, _ in nodes]):
+        serialized_attributes.update(
+            (pk, (data, conversion)) for pk, data, conversion in
+            attributes_index.execute(
+                "SELECT pk, data, conversion FROM attributes "
+                "WHERE pk IN ({})".format(','.join('?' * len(import_entry_ids))),
+                import_entry_ids))
+    attributes = {}
+    for import_entry_id, uuid in nodes:
+        data, conversion = serialized_attributes.get(int(import_entry_id),
+                                                     (None, None))
+        if data is None or conversion is None:
+            raise ValueError("Unable to find attribute info "
+                             "for DbNode with UUID = {}".format(uuid))
+        attributes[import_entry_id] = deserialize_attributes(
+            json.loads(data), json.loads(conversion))
+    return attributes
+
+
+def _store_batch_node_files(uuids, nodes_folder, move, pool):
+    """
+    Copy (or move) the repository folders of a batch of new nodes to the
+    repository, with the given pool of threads.
+    """
+    from aiida.common.folders import RepositoryFolder
+
+    def store_node_files(uuid):
+        subfolder = nodes_folder.get_subfolder(export_shard_uuid(uuid))
+        if not subfolder.exists():
+            raise ValueError("Unable to find the repository folder for node "
+                             "with UUID={} in the exported "
+                             "file".format(uuid))
+        destdir = RepositoryFolder(section=Node._section_name, uuid=uuid)
+        destdir.replace_with_folder(subfolder.abspath, move=move,
+                                    overwrite=True)
+
+    pool.map(store_node_files, uuids)
+
+
+def _import_nodes_batch_dj(entries, metadata, attributes_index, nodes_folder,
+                           move, pool, import_unique_ids_mappings,
+                           foreign_ids_reverse_mappings, ret_dict, silent):
+    """
+    Import a batch of nodes with a fixed number of queries, in a single
+    transaction, skipping the nodes already in the database.
+
+    :param entries: a dictionary with the Node entries of data.json
+    :param attributes_index: the SQLite connection returned by
+        _index_node_attributes
+    :param nodes_folder: the folder with the repository folders of the nodes
+    :param move: whether the repository folders are moved, or copied
+    :param pool: the pool of threads copying the repository folders
+    :return: the list of the pks of the nodes, new and existing
+    """
+    from django.db import connection, transaction
+
+    from aiida.common.datastructures import calc_states
+    from aiida.backends.djsite.db import models
+
+    fields_info = metadata['all_fields_info'].get(NODE_ENTITY_NAME, {})
+    model_ret_dict = ret_dict.setdefault(NODE_ENTITY_NAME,
+                                         {'new': [], 'existing': []})
+    reverse_mappings = foreign_ids_reverse_mappings[NODE_ENTITY_NAME]
+
+    existing = dict(models.DbNode.objects.filter(
+        uuid__in=[v['uuid'] for v in entries.itervalues()]
+    ).values_list('uuid', 'pk'))
+    reverse_mappings.update(existing)
+
+    new_nodes = []
+    for import_entry_id, entry_data in entries.iteritems():
+        uuid = entry_data['uuid']
+        if uuid in existing:
+            model_ret_dict['existing'].append((import_entry_id,
+                                               existing[uuid]))
+            if not silent:
+                print "existing %s: %s (%s->%s)" % (
+                    NODE_ENTITY_NAME, uuid, import_entry_id, existing[uuid])
+            continue
+        import_data = dict(deserialize_field(
+            k, v, fields_info=fields_info,
+            import_unique_ids_mappings=import_unique_ids_mappings,
+            foreign_ids_reverse_mappings=foreign_ids_reverse_mappings)
+                           for k, v in entry_data.iteritems())
+        new_nodes.append((import_entry_id, models.DbNode(**import_data)))
+
+    if not new_nodes:
+        return existing.values()
+
+    attributes = _get_batch_node_attributes(
+        attributes_index,
+        [(import_entry_id, dbnode.uuid) for import_entry_id, dbnode in new_nodes])
+
+    # Before storing the nodes in the DB, I store their files
+    _store_batch_node_files([dbnode.uuid for _, dbnode in new_nodes],
+                            nodes_folder, move, pool)
+
+    with transaction.atomic():
+        # With the ids already set, bulk_create does not need to fetch them
+        # back to create the attributes and the states
+        cursor = connection.cursor()
+        cursor.execute("SELECT nextval('db_dbnode_id_seq') "
+                       "FROM generate_series(1, %s)", [len(new_nodes)])
+        # nextval returns a bigint, that psycopg2 gives as a long
+        for (_, dbnode), (pk,) in zip(new_nodes, cursor.fetchall()):
+            dbnode.pk = int(pk)
+        models.DbNode.objects.bulk_create([dbnode for _, dbnode in new_nodes])
+
+        # I set for all nodes, even if I should set it only for calculations
+        models.DbCalcState.objects.bulk_create([
+            models.DbCalcState(dbnode_id=dbnode.pk, state=calc_states.IMPORTED)
+            for _, dbnode in new_nodes])
+
+        attribute_rows = []
+        for import_entry_id, dbnode in new_nodes:
+            attribute_rows.extend(models.DbAttribute.reset_values_for_node(
+                dbnode=dbnode.pk, attributes=attributes[import_entry_id],
+                with_transaction=False, return_not_store=True))
+        models.DbAttribute.objects.bulk_create(attribute_rows)
+        models.DbAttribute.set_json_values_for_nodes({
+            dbnode.pk: attributes[import_entry_id]
+            for import_entry_id, dbnode in new_nodes})
+
+    for import_entry_id, dbnode in new_nodes:
+        reverse_mappings[dbnode.uuid] = dbnode.pk
+        model_ret_dict['new'].append((import_entry_id, dbnode.pk))
+        if not silent:
+            print "NEW %s: %s (%s->%s)" % (NODE_ENTITY_NAME, dbnode.uuid,
+                                           import_entry_id, dbnode.pk)
+
+    return existing.values() + [dbnode.pk for _, dbnode in new_nodes]
+
+
+def _import_links_batch_dj(links, dbnode_reverse_mappings,
+                           ignore_unknown_nodes, ret_dict, silent):
+    """
+    Import a batch of links of data.json in a single transaction, skipping
+    the links already in the database. Only the existing input links of the
+    output nodes of the batch are loaded, to check them.
+    """
+    from django.db import transaction
+
+    from aiida.common.links import LinkType
+    from aiida.backends.reachability import update_reachability_index
+    from aiida.backends.djsite.db import models
+
+    resolved_links = _resolve_batch_links(links, dbnode_reverse_mappings,
+                                          ignore_unknown_nodes)
+    existing_links = models.DbLink.objects.filter(
+        output__in=set(out_id for _, out_id, _ in resolved_links)
+    ).values_list('input', 'output', 'label')
+    links_to_store = _get_new_batch_links(resolved_links, existing_links,
+                                          ret_dict)
+
+    if not silent:
+        print "   ({} new links...)".format(len(links_to_store))
+    if links_to_store:
+        with transaction.atomic():
+            models.DbLink.objects.bulk_create(
+                [models.DbLink(**link) for link in links_to_store])
+            update_reachability_index([
+                (link['input_id'], link['output_id'], LinkType(link['type']))
+                for link in links_to_store])
+
+
+def _resolve_batch_links(links, dbnode_reverse_mappings, ignore_unknown_nodes):
+    """
+    Return the (input pk, output pk, link) of a batch of links of data.json.
+    """
+    resolved_links = []
+    for link in links:
+        try:
+            resolved_links.append((dbnode_reverse_mappings[link['input']],
+                                   dbnode_reverse_mappings[link['output']],
+                                   link))
+        except KeyError:
+            if ignore_unknown_nodes:
+                continue
+            else:
+                raise ValueError("Trying to create a link with one "
+                                 "or both unknown nodes, stopping "
+                                 "(in_uuid={}, out_uuid={}, "
+                                 "label={})".format(link['input'],
+                                                    link['output'],
+                                                    link['label']))
+    return resolved_links
+
+
+def _get_new_batch_links(resolved_links, existing_links, ret_dict):
+    """
+    Check a batch of links against the existing input links of their output
+    nodes, and return those to store, as dictionaries of the fields of the
+    link table.
+
+    :param resolved_links: as returned by _resolve_batch_links
+    :param existing_links: the (input pk, output pk, label) of the existing
+        input links of the output nodes
+    """
+    from aiida.common.links import LinkType
+
+    # Needed for fast checks of existing links
+    existing_links = list(existing_links)
+    existing_links_labels = {(l[0], l[1]): l[2] for l in existing_links}
+    existing_input_links = {(l[1], l[2]): l[0] for l in existing_links}
+
+    links_to_store = []
+    for in_id, out_id, link in resolved_links:
+        if (in_id, out_id) in existing_links_labels:
+            existing_label = existing_links_labels[in_id, out_id]
+            if existing_label != link['label']:
+                raise ValueError("Trying to rename an existing link "
+                                 "name, stopping (in={}, out={}, "
+                                 "old_label={}, new_label={})"
+                                 .format(in_id, out_id, existing_label,
+                                         link['label']))
+            # Do nothing, the link is already in place and has the correct
+            # name
+        elif (out_id, link['label']) in existing_input_links:
+            # If the existing input were the correct one, I would have found
+            # it already in the previous step!
+            raise ValueError("There exists already an input link "
+                             "to node {} with label {} but it "
+                             "does not come the expected input {}"
+                             .format(out_id, link['label'], in_id))
+        else:
+            links_to_store.append({
+                'input_id': in_id, 'output_id': out_id,
+                'label': link['label'], 'type': LinkType(link['type']).value})
+            ret_dict.setdefault(LINK_ENTITY_NAME, {'new': []})['new'].append(
+                (in_id, out_id))
+    return links_to_store
+
+
+def _add_nodes_to_group_dj(group_uuid, pks):
+    """
+    Add the nodes with the given pks to the group with the given UUID.
+    """
+    from aiida.backends.djsite.db import models
+
+    models.DbGroup.objects.get(uuid=group_uuid).dbnodes.add(*pks)
+
+
+@contextmanager
+def _sqla_transaction():
+    """
+    Commit the SQLAlchemy session at the end of the block, or roll it back
+    if an exception is raised (as django.db.transaction.atomic does for the
+    batched import with Django).
+    """
+    from aiida.backends.sqlalchemy import get_scoped_session
+
+    session = get_scoped_session()
+    try:
+        yield session
+        session.commit()
+    except:
+        session.rollback()
+        raise
+
+
+def _sqla_unique_id(unique_id):
+    """
+    Return a unique identifier read from the SQLAlchemy models as in the
+    export file (i.e., the UUIDs as strings).
+    """
+    from uuid import UUID
+
+    if isinstance(unique_id, UUID):
+        return str(unique_id)
+    return unique_id
+
+
+def _to_sqla_fields(model_name, import_data):
+    """
+    Rename in place the fields of an entry, as deserialized from the export
+    file, to the fields of the SQLAlchemy model.
+    """
+    for file_field, model_field in file_fields_to_model_fields.get(
+            model_name, {}).iteritems():
+        if file_field in import_data and model_field not in import_data:
+            import_data[model_field] = import_data.pop(file_field)
+
+
+def _import_entries_sqla(model_name, entries, metadata,
+                         import_unique_ids_mappings,
+                         foreign_ids_reverse_mappings, ret_dict, silent):
+    """
+    As _import_entries_dj, for the SQLAlchemy backend: the new entries are
+    flushed, and committed with the current transaction.
+
+    :param entries: a dictionary with the entries of the model of data.json
+    """
+    import json
+    from aiida.backends.sqlalchemy import get_scoped_session
+
+    if not entries:
+        return
+
+    session = get_scoped_session()
+    Model = get_object_from_string(entity_names_to_sqla_schema[model_name])
+    fields_info = metadata['all_fields_info'].get(model_name, {})
+    unique_identifier = metadata['unique_identifiers'][model_name]
+    model_ret_dict = ret_dict.setdefault(model_name, {'new': [], 'existing': []})
+    reverse_mappings = foreign_ids_reverse_mappings.setdefault(model_name, {})
+
+    unique_column = getattr(Model, unique_identifier)
+    existing = {
+        _sqla_unique_id(unique_id): pk for unique_id, pk in
+        session.query(unique_column, Model.id).filter(unique_column.in_(
+            [v[unique_identifier] for v in entries.itervalues()]))}
+    reverse_mappings.update(existing)
+
+    new_entries = []
+    dupl_counter = 0
+    imported_comp_names = set()
+    for import_entry_id, entry_data in entries.iteritems():
+        unique_id = entry_data[unique_identifier]
+        if unique_id in existing:
+            model_ret_dict['existing'].append((import_entry_id,
+                                               existing[unique_id]))
+            if not silent:
+                print "existing %s: %s (%s->%s)" % (model_name, unique_id,
+                                                    import_entry_id,
+                                                    existing[unique_id])
+            continue
+
+        import_data = dict(deserialize_field(
+            k, v, fields_info=fields_info,
+            import_unique_ids_mappings=import_unique_ids_mappings,
+            foreign_ids_reverse_mappings=foreign_ids_reverse_mappings)
+                           for k, v in entry_data.iteritems())
+
+        if model_name == COMPUTER_ENTITY_NAME:
+            # Rename the new computer if there is already a computer with the
+            # same name in the database
+            orig_name = import_data['name']
+            while (import_data['name'] in imported_comp_names or
+                   session.query(Model).filter(
+                       Model.name == import_data['name']).count()):
+                import_data['name'] = (
+                    orig_name + COMP_DUPL_SUFFIX.format(dupl_counter))
+                dupl_counter += 1
+            imported_comp_names.add(import_data['name'])
+
+            # In case the export file was generated with the Django export
+            for key in ('metadata', 'transport_params'):
+                if isinstance(import_data[key], basestring):
+                    import_data[key] = json.loads(import_data[key])
+
+        _to_sqla_fields(model_name, import_data)
+        new_entries.append((import_entry_id, unique_id, Model(**import_data)))
+
+    session.add_all([entry for _, _, entry in new_entries])
+    session.flush()
+
+    for import_entry_id, unique_id, entry in new_entries:
+        reverse_mappings[unique_id] = entry.id
+        model_ret_dict['new'].append((import_entry_id, entry.id))
+        if not silent:
+            print "NEW %s: %s (%s->%s)" % (model_name, unique_id,
+                                           import_entry_id, entry.id)
+
+
+def _import_nodes_batch_sqla(entries, metadata, attributes_index,
+                             nodes_folder, move, pool,
+                             import_unique_ids_mappings,
+                             foreign_ids_reverse_mappings, ret_dict, silent):
+    """
+    As _import_nodes_batch_dj, for the SQLAlchemy backend: the ids are taken
+    from the sequence with a single query, then the nodes (with their
+    attributes) are inserted with a single multi-row INSERT.
+
+    :return: the list of the pks of the nodes, new and existing
+    """
+    from sqlalchemy import func, select
+
+    from aiida.common.datastructures import calc_states
+    from aiida.backends.sqlalchemy import get_scoped_session
+    from aiida.backends.sqlalchemy.models.node import DbNode, DbCalcState
+
+    session = get_scoped_session()
+    table = DbNode.__table__
+    fields_info = metadata['all_fields_info'].get(NODE_ENTITY_NAME, {})
+    model_ret_dict = ret_dict.setdefault(NODE_ENTITY_NAME,
+                                         {'new': [], 'existing': []})
+    reverse_mappings = foreign_ids_reverse_mappings[NODE_ENTITY_NAME]
+
+    existing = {
+        str(uuid): pk for uuid, pk in
+        session.query(DbNode.uuid, DbNode.id).filter(DbNode.uuid.in_(
+            [v['uuid'] for v in entries.itervalues()]))}
+    reverse_mappings.update(existing)
+
+    new_nodes = []
+    for import_entry_id, entry_data in entries.iteritems():
+        uuid = entry_data['uuid']
+        if uuid in existing:
+            model_ret_dict['existing'].append((import_entry_id,
+                                               existing[uuid]))
+            if not silent:
+                print "existing %s: %s (%s->%s)" % (
+                    NODE_ENTITY_NAME, uuid, import_entry_id, existing[uuid])
+            continue
+        import_data = dict(deserialize_field(
+            k, v, fields_info=fields_info,
+            import_unique_ids_mappings=import_unique_ids_mappings,
+            foreign_ids_reverse_mappings=foreign_ids_reverse_mappings)
+                           for k, v in entry_data.iteritems())
+        _to_sqla_fields(NODE_ENTITY_NAME, import_data)
+        new_nodes.append((import_entry_id, import_data))
+
+    if not new_nodes:
+        return existing.values()
+
+    attributes = _get_batch_node_attributes(
+        attributes_index,
+        [(import_entry_id, import_data['uuid'])
+         for import_entry_id, import_data in new_nodes])
+
+    # Before storing the nodes in the DB, I store their files
+    _store_batch_node_files(
+        [import_data['uuid'] for _, import_data in new_nodes],
+        nodes_folder, move, pool)
+
+    with _sqla_transaction() as session:
+        # nextval returns a bigint, that psycopg2 gives as a long
+        ids = [int(row[0]) for row in session.execute(
+            select([func.nextval('db_dbnode_id_seq')]).select_from(
+                func.generate_series(1, len(new_nodes))))]
+
+        rows = []
+        for (import_entry_id, import_data), pk in zip(new_nodes, ids):
+            row = dict(import_data, id=pk, attributes=attributes[import_entry_id],
+                       extras={})
+            # Python-side defaults are otherwise only applied when flushing
+            for column in table.columns:
+                default = column.default
+                if row.get(column.key) is None and default is not None:
+                    row[column.key] = (default.arg(None) if default.is_callable
+                                       else default.arg)
+            rows.append({column.key: row.get(column.key)
+                         for column in table.columns})
+        session.execute(table.insert().values(rows))
+
+        # I set for all nodes, even if I should set it only for calculations
+        session.bulk_save_objects([
+            DbCalcState(dbnode_id=pk, state=calc_states.IMPORTED)
+            for pk in ids])
+
+    for (import_entry_id, import_data), pk in zip(new_nodes, ids):
+        reverse_mappings[import_data['uuid']] = pk
+        model_ret_dict['new'].append((import_entry_id, pk))
+        if not silent:
+            print "NEW %s: %s (%s->%s)" % (NODE_ENTITY_NAME, import_data['uuid'],
+                                           import_entry_id, pk)
+
+    return existing.values() + ids
+
+
+def _import_links_batch_sqla(links, dbnode_reverse_mappings,
+                             ignore_unknown_nodes, ret_dict, silent):
+    """
+    As _import_links_batch_dj, for the SQLAlchemy backend: the new links are
+    inserted with a single multi-row INSERT.
+    """
+    from aiida.common.links import LinkType
+    from aiida.backends.reachability import update_reachability_index
+    from aiida.backends.sqlalchemy import get_scoped_session
+    from aiida.backends.sqlalchemy.models.node import DbLink
+
+    session = get_scoped_session()
+
+    resolved_links = _resolve_batch_links(links, dbnode_reverse_mappings,
+                                          ignore_unknown_nodes)
+    output_ids = set(out_id for _, out_id, _ in resolved_links)
+    existing_links = []
+    if output_ids:
+        existing_links = session.query(
+            DbLink.input_id, DbLink.output_id, DbLink.label).filter(
+            DbLink.output_id.in_(output_ids)).all()
+    links_to_store = _get_new_batch_links(resolved_links, existing_links,
+                                          ret_dict)
+
+    if not silent:
+        print "   ({} new links...)".format(len(links_to_store))
+    if links_to_store:
+        with _sqla_transaction() as session:
+            session.execute(DbLink.__table__.insert().values(links_to_store))
+            update_reachability_index([
+                (link['input_id'], link['output_id'], LinkType(link['type']))
+                for link in links_to_store])
+
+
+def _add_nodes_to_group_sqla(group_uuid, pks):
+    """
+    Add the nodes with the given pks to the group with the given UUID,
+    skipping those already in the group.
+    """
+    from aiida.backends.sqlalchemy.models.group import (DbGroup,
+                                                         table_groups_nodes)
+
+    with _sqla_transaction() as session:
+        group_id = session.query(DbGroup.id).filter(
+            DbGroup.uuid == group_uuid).one()[0]
+        existing = set(pk for pk, in session.query(
+            table_groups_nodes.c.dbnode_id).filter(
+            table_groups_nodes.c.dbgroup_id == group_id,
+            table_groups_nodes.c.dbnode_id.in_(pks)))
+        rows = [{'dbgroup_id': group_id, 'dbnode_id': pk}
+                for pk in set(pks) - existing]
+        if rows:
+            session.execute(table_groups_nodes.insert().values(rows))
+
+
+def _create_import_group():
+    """
+    Create the group of the imported nodes, with a unique name based on the
+    current (local) time.
+    """
+    from aiida.utils import timezone
+    from aiida.orm.querybuilder import QueryBuilder
+
+    basename = timezone.localtime(timezone.now()).strftime("%Y%m%d-%H%M%S")
+    counter = 0
+    while True:
+        if counter == 0:
+            group_name = basename
+        else:
+            group_name = "{}_{}".format(basename, counter)
+        # The name is checked before storing, since with SQLAlchemy a failed
+        # store leaves the session unusable until it is rolled back
+        qb = QueryBuilder()
+        qb.append(Group, filters={'name': group_name,
+                                  'type': IMPORTGROUP_TYPE})
+        if qb.count() == 0:
+            return Group(name=group_name,
+                         type_string=IMPORTGROUP_TYPE).store()
+        counter += 1
+
+
 def validate_uuid(given_uuid):
     """
     A simple check for the UUID validity.
@@ -847,6 +1756,7 @@ def import_data_sqla(in_path, ignore_unknown_nodes=False, silent=False):
     from aiida.orm import Node, Group
     from aiida.common.archive import extract_tree, extract_tar, extract_zip, extract_cif
     from aiida.common.links import LinkType
+    from aiida.backends.reachability import update_reachability_index
     from aiida.common.folders import SandboxFolder, RepositoryFolder
     from aiida.common.utils import get_object_from_string
     from aiida.common.datastructures import calc_states
@@ -1337,6 +2247,9 @@ def import_data_sqla(in_path, ignore_unknown_nodes=False, silent=False):
                 if not silent:
                     print "   ({} new links...)".format(len(links_to_store))
                 session.add_all(links_to_store)
+                update_reachability_index([
+                    (link.input_id, link.output_id, LinkType(link.type))
+                    for link in links_to_store])
             else:
                 if not silent:
                     print "   (0 new links...)"
@@ -1940,7 +2853,10 @@ def export_tree(what, folder, also_parents=True, also_calc_outputs=True,
         uuid_query = QueryBuilder()
         uuid_query.append(Node, filters={"id": {"in": all_nodes_pk}},
                           project=["uuid"])
-        for res in uuid_query.all():
+        for index, res in enumerate(uuid_query.all()):
+            if not silent and index and index % 1000 == 0:
+                print "  {}/{} node folders stored".format(
+                    index, len(all_nodes_pk))
             uuid = str(res[0])
             sharded_uuid = export_shard_uuid(uuid)
 
@@ -2175,10 +3091,15 @@ def export_zip(what, outfile = 'testzip', overwrite = False,
         print "File written in {:10.3g} s.".format(time.time() - t)
 
 
-def export(what, outfile='export_data.aiida.tar.gz', overwrite=False, silent=False, **kwargs):
+def export(what, outfile='export_data.aiida.tar.gz', overwrite=False, silent=False,
+           compression_threads=None, **kwargs):
     """
     Export the DB entries passed in the 'what' list on a file.
 
+    The entities and the repository files are written directly in the
+    compressed tar file, without creating the file tree on disk first. The
+    compression runs in parallel with the export, in a pool of threads.
+
     :todo: limit the export to finished or failed calculations.
 
     :param what: a list of Django database entries; they can belong to different
@@ -2189,6 +3110,8 @@ def export(what, outfile='export_data.aiida.tar.gz', overwrite=False, silent=Fal
     :param overwrite: if True, overwrite the output file without asking.
         if False, raise an IOError in this case.
     :param silent: suppress debug print
+    :param compression_threads: the number of threads compressing the file
+        (default: the number of CPUs)
 
     :raise IOError: if overwrite==False and the filename already exists.
     """
@@ -2196,40 +3119,37 @@ def export(what, outfile='export_data.aiida.tar.gz', overwrite=False, silent=Fal
     import tarfile
     import time
 
-    from aiida.common.folders import SandboxFolder
+    from aiida.common.archive import ParallelGzipFile, TarFolder
 
     if not overwrite and os.path.exists(outfile):
         raise IOError("The output file '{}' already "
                       "exists".format(outfile))
 
-    folder = SandboxFolder()
     t1 = time.time()
-    export_tree(what, folder=folder, silent=silent, **kwargs)
-
-    t2 = time.time()
-
-    if not silent:
-        print "COMPRESSING..."
 
     # PAX_FORMAT: virtually no limitations, better support for unicode
     #   characters
-    # dereference=True: at the moment, we should not have any symlink or
-    #   hardlink in the AiiDA repository; therefore, do not store symlinks
-    #   or hardlinks, but store the actual destinations.
-    #   This also simplifies the checks on import.
-    t3 = time.time()
-    with tarfile.open(outfile, "w:gz", format=tarfile.PAX_FORMAT,
-                      dereference=True) as tar:
-        tar.add(folder.abspath, arcname="")
-
-        #        import shutil
-        #        shutil.make_archive(outfile, 'zip', folder.abspath)#, base_dir='aiida')
-    t4 = time.time()
+    # dereference=True: the files of the repository can be hard links (to
+    #   the object store); do not store symlinks or hardlinks, but store the
+    #   actual destinations. This also simplifies the checks on import.
+    try:
+        with open(outfile, 'wb') as f:
+            with ParallelGzipFile(f, threads=compression_threads) as gzfile:
+                with tarfile.open(fileobj=gzfile, mode='w|',
+                                  format=tarfile.PAX_FORMAT,
+                                  dereference=True) as tar:
+                    export_tree(what, folder=TarFolder(tar), silent=silent,
+                                **kwargs)
+    except Exception:
+        # Do not leave a truncated archive behind
+        if os.path.exists(outfile):
+            os.remove(outfile)
+        raise
+
+    t2 = time.time()
 
     if not silent:
-        filecr_time = t2-t1
-        filecomp_time = t4-t3
-        print "Exported in {:6.2g}s, compressed in {:6.2g}s, total: {:6.2g}s.".format(filecr_time, filecomp_time, filecr_time + filecomp_time)
+        print "Exported and compressed in {:6.2g}s.".format(t2 - t1)
 
     if not silent:
         print "DONE."
@@ -48,8 +48,13 @@ class Sealable(object):
         """
         Seal the node by setting the sealed attribute to True
         """
+        from aiida.backends.notifications import notify_nodes_finished
+
         if not self.is_sealed:
             self._set_attr(self.SEALED_KEY, True)
+            # Wake up the processes waiting on this node
+            if self.is_stored:
+                notify_nodes_finished([self.pk])
 
     @override
     def _set_attr(self, key, value, **kwargs):
@@ -69,6 +74,23 @@ class Sealable(object):
 
         super(Sealable, self)._set_attr(key, value, stored_check=False, **kwargs)
 
+    @override
+    def _set_attrs(self, attrs, **kwargs):
+        """
+        Set several attributes at once
+
+        :param attrs: a dictionary of key:value of the attributes to set
+        :raise ModificationNotAllowed: if the node is already sealed or if the node is already stored
+            and one of the attributes is not updatable
+        """
+        if self.is_sealed:
+            raise ModificationNotAllowed('Cannot change the attributes of a sealed node')
+
+        if self.is_stored and any(key not in self._updatable_attributes for key in attrs):
+            raise ModificationNotAllowed('Cannot change the immutable attributes of a stored node')
+
+        super(Sealable, self)._set_attrs(attrs, stored_check=False, **kwargs)
+
     @override
     def _del_attr(self, key):
         """
@@ -87,6 +109,26 @@ class Sealable(object):
 
         super(Sealable, self)._del_attr(key, stored_check=False)
 
+    @override
+    def _del_attrs(self, keys):
+        """
+        Delete several attributes at once
+
+        :param keys: the names of the attributes to delete
+        :raise AttributeError: if one of the keys does not exist
+        :raise ModificationNotAllowed: if the node is already sealed or if the node is already stored
+            and one of the attributes is not updatable
+        """
+        keys = list(keys)
+
+        if self.is_sealed:
+            raise ModificationNotAllowed('Cannot change the attributes of a sealed node')
+
+        if self.is_stored and any(key not in self._updatable_attributes for key in keys):
+            raise ModificationNotAllowed('Cannot change the immutable attributes of a stored node')
+
+        super(Sealable, self)._del_attrs(keys, stored_check=False)
+
     @override
     def copy(self, include_updatable_attrs=False):
         """
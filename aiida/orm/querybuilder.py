@@ -1360,6 +1360,48 @@ class QueryBuilder(object):
             )
         return ancestors_recursive.c
 
+    def _join_descendants_indexed(self, joined_entity, entity_to_join, isouterjoin):
+        """
+        joining descendants using the reachability index, see
+        :py:mod:`aiida.backends.reachability`
+        """
+        self._check_dbentities(
+                (joined_entity, self._impl.Node),
+                (entity_to_join, self._impl.Node),
+                'descendant_of'
+            )
+        aliased_reachability = aliased(self._impl.Reachability)
+        self._query = self._query.join(
+                aliased_reachability,
+                aliased_reachability.ancestor_id == joined_entity.id
+            ).join(
+                entity_to_join,
+                aliased_reachability.descendant_id == entity_to_join.id,
+                isouter=isouterjoin
+            )
+        return aliased_reachability
+
+    def _join_ancestors_indexed(self, joined_entity, entity_to_join, isouterjoin):
+        """
+        joining ancestors using the reachability index, see
+        :py:mod:`aiida.backends.reachability`
+        """
+        self._check_dbentities(
+                (joined_entity, self._impl.Node),
+                (entity_to_join, self._impl.Node),
+                'ancestor_of'
+            )
+        aliased_reachability = aliased(self._impl.Reachability)
+        self._query = self._query.join(
+                aliased_reachability,
+                aliased_reachability.descendant_id == joined_entity.id
+            ).join(
+                entity_to_join,
+                aliased_reachability.ancestor_id == entity_to_join.id,
+                isouter=isouterjoin
+            )
+        return aliased_reachability
+
 
     def _join_group_members(self, joined_entity, entity_to_join, isouterjoin):
         """
@@ -1707,6 +1749,11 @@ class QueryBuilder(object):
         #~ print '\n\n\n'
         #~ raw_input()
 
+        # Whether the reachability index can be used for the
+        # 'ancestor_of' and 'descendant_of' relationships: only checked if
+        # there are such relationships, since it costs a query
+        use_reachability_index = None
+
         for index, verticespec in  enumerate(self._path[1:], start=1):
             alias = self._tag_to_alias_map[verticespec['tag']]
             #looping through the queryhelp
@@ -1718,7 +1765,23 @@ class QueryBuilder(object):
             isouterjoin = verticespec.get('outerjoin')
             edge_tag = verticespec['edge_tag']
 
-            if ( verticespec['joining_keyword'] in ('descendant_of', 'ancestor_of')):
+            # The index has no depth nor path: it can only be used if
+            # the edge is neither filtered nor projected
+            index_usable = (
+                verticespec['joining_keyword'] in ('descendant_of', 'ancestor_of') and
+                not self._filters[edge_tag] and not self._projections[edge_tag]
+            )
+            if index_usable and use_reachability_index is None:
+                from aiida.backends.reachability import is_reachability_index_enabled
+                use_reachability_index = is_reachability_index_enabled()
+
+            if index_usable and use_reachability_index:
+                if verticespec['joining_keyword'] == 'descendant_of':
+                    connection_func = self._join_descendants_indexed
+                else:
+                    connection_func = self._join_ancestors_indexed
+                aliased_edge = connection_func(toconnectwith, alias, isouterjoin=isouterjoin)
+            elif ( verticespec['joining_keyword'] in ('descendant_of', 'ancestor_of')):
                 # I treat those two cases in a special way.
                 # I give them a filter_dict, to help the recursive function find a good
                 # starting point. TODO: document this!
@@ -2107,6 +2170,69 @@ class QueryBuilder(object):
         for item in self._impl.iterdict(query, batch_size, self.tag_to_projected_entity_dict):
             yield item
 
+    def iterrows(self, batch_size=1000):
+        """
+        Same as :meth:`.iterall`, but the rows are returned as tuples of the
+        values of the projected columns and attributes, without instantiating
+        the ORM. The rows are streamed from a server-side cursor, in batches.
+        Entities cannot be projected with '*': project their columns instead.
+
+        Usage::
+
+            qb = QueryBuilder()
+            qb.append(Node, project=['id', 'type', 'ctime'])
+            for pk, type_, ctime in qb.iterrows():
+                ...
+
+        :param int batch_size:
+            The number of rows fetched from the database at once.
+
+        :returns: a generator of tuples
+        """
+        query = self._get_query_for_rows()
+        for row in self._impl.iterrows(query, batch_size, self._attrkeys_as_in_sql_result):
+            yield row
+
+    def iterarrays(self, batch_size=10000):
+        """
+        Same as :meth:`.iterrows`, but the rows are returned in batches, as
+        numpy record arrays. The names of the fields are the projections,
+        prefixed by the tag of their vertice (e.g. ``node.id``).
+
+        :param int batch_size:
+            The (maximum) number of rows of the arrays.
+
+        :returns: a generator of numpy record arrays
+        """
+        import numpy as np
+
+        query = self._get_query_for_rows()
+        names = [None] * len(self._attrkeys_as_in_sql_result)
+        for tag, projected_entities_dict in self.tag_to_projected_entity_dict.items():
+            for attrkey, index_in_sql_result in projected_entities_dict.items():
+                names[index_in_sql_result] = '{}.{}'.format(tag, attrkey)
+
+        rows = []
+        for row in self._impl.iterrows(query, batch_size, self._attrkeys_as_in_sql_result):
+            rows.append(row)
+            if len(rows) == batch_size:
+                yield np.rec.fromrecords(rows, names=names)
+                rows = []
+        if rows:
+            yield np.rec.fromrecords(rows, names=names)
+
+    def _get_query_for_rows(self):
+        """
+        Return the query, checking that no entity is projected.
+        """
+        query = self.get_query()
+        if '*' in self._attrkeys_as_in_sql_result.values():
+            raise InputValidationError(
+                "Entities cannot be returned as rows\n"
+                "Project their columns or attributes instead of '*'"
+            )
+        return query
+
 
 
 
@@ -11,7 +11,8 @@ from abc import ABCMeta, abstractmethod
 from aiida.common.pluginloader import BaseFactory
 from aiida.common.utils import abstractclassmethod
 
-__all__ = ['CalculationFactory', 'DataFactory', 'WorkflowFactory', 'load_node', 'load_workflow']
+__all__ = ['CalculationFactory', 'DataFactory', 'WorkflowFactory', 'load_node', 'load_workflow',
+           'store_many']
 
 
 def CalculationFactory(module, from_abstract=False):
@@ -191,6 +192,30 @@ def load_node(node_id=None, pk=None, uuid=None, parent_class=None, query_with_da
         raise NotExistent("No node was found")
 
 
+def store_many(nodes, with_transaction=True):
+    """
+    Store a list of new nodes, together with the cached input links between
+    them and from already stored nodes, with a fixed number of queries
+    (bulk INSERTs) instead of a few queries per node and per link.
+
+    To be preferred to calling store() on each node when creating many
+    nodes at once; the caching mechanism is not used.
+
+    :param nodes: a list of unstored nodes; nodes of classes overriding
+        store() (e.g. JobCalculation) are not accepted
+    :param with_transaction: if False, no transaction is used. This
+        is meant to be used ONLY if the outer calling function has already
+        a transaction open!
+    :return: the list of stored nodes
+    :raise ModificationNotAllowed: if a node is already stored, or has an
+        input link from an unstored node that is not in the list
+    :raise ValueError: if the links between the nodes would create a loop
+    """
+    from aiida.orm.implementation import Node
+
+    return Node._store_many(nodes, with_transaction=with_transaction)
+
+
 def load_workflow(wf_id=None, pk=None, uuid=None):
     """
     Return an AiiDA workflow given PK or UUID.
@@ -53,6 +53,11 @@ class Scheduler(object):
     # The class to be used for the job resource.
     _job_resource_class = None
 
+    # The maximum number of jobs in a single command of
+    # get_detailed_jobinfo_many, and the separator between their outputs
+    _DETAILED_JOBINFO_MAX_JOBS = 100
+    _DETAILED_JOBINFO_SEPARATOR = 'AIIDA-DETAILED-JOBINFO'
+
     def __init__(self):
         self._transport = None
 
@@ -314,6 +319,90 @@ class Scheduler(object):
         retval, stdout, stderr = self.transport.exec_command_wait(
             command)
 
+        return self._format_detailed_jobinfo(command, retval, stdout, stderr)
+
+    def get_detailed_jobinfo_many(self, jobids):
+        """
+        Return the detailed jobinfo of many jobs, as get_detailed_jobinfo,
+        executing a single command for every _DETAILED_JOBINFO_MAX_JOBS jobs
+        rather than one per job.
+
+        :param jobids: a list of job ids
+        :return: a dictionary job id -> detailed jobinfo string
+        """
+        detailed_jobinfos = {}
+        jobids = list(jobids)
+        for start in range(0, len(jobids), self._DETAILED_JOBINFO_MAX_JOBS):
+            chunk = jobids[start:start + self._DETAILED_JOBINFO_MAX_JOBS]
+            command = self._get_detailed_jobinfo_many_command(jobids=chunk)
+            retval, stdout, stderr = self.transport.exec_command_wait(
+                command)
+            outputs = self._parse_detailed_jobinfo_many_output(
+                chunk, retval, stdout, stderr)
+            for jobid, (job_retval, job_stdout, job_stderr) in outputs.iteritems():
+                detailed_jobinfos[jobid] = self._format_detailed_jobinfo(
+                    self._get_detailed_jobinfo_command(jobid=jobid),
+                    job_retval, job_stdout, job_stderr)
+        return detailed_jobinfos
+
+    def _get_detailed_jobinfo_many_command(self, jobids):
+        """
+        Return a single command to run to get the detailed information on
+        many jobs.
+
+        By default, the commands of the single jobs are run one after the
+        other, each preceded and followed by a separator line with the job id
+        and the return code, that are parsed by
+        _parse_detailed_jobinfo_many_output. The plugins whose command accepts
+        many jobs can redefine both methods.
+        """
+        parts = []
+        for jobid in jobids:
+            parts.append("echo {}".format(escape_for_bash(
+                "{} START {}".format(self._DETAILED_JOBINFO_SEPARATOR, jobid))))
+            parts.append("{} 2>&1".format(
+                self._get_detailed_jobinfo_command(jobid=jobid)))
+            parts.append('echo "{} END $?"'.format(
+                self._DETAILED_JOBINFO_SEPARATOR))
+        return "; ".join(parts)
+
+    def _parse_detailed_jobinfo_many_output(self, jobids, retval, stdout, stderr):
+        """
+        Split the output of the command returned by
+        _get_detailed_jobinfo_many_command into the outputs of the single jobs.
+
+        :return: a dictionary job id -> (retval, stdout, stderr) with the jobs
+            found in the output; the stderr of the single jobs is merged in
+            their stdout
+        """
+        outputs = {}
+        jobid = None
+        lines = []
+        for line in stdout.splitlines():
+            fields = line.split()
+            if fields[:1] != [self._DETAILED_JOBINFO_SEPARATOR]:
+                if jobid is not None:
+                    lines.append(line)
+            elif fields[1:2] == ['START'] and len(fields) == 3:
+                jobid, lines = fields[2], []
+            elif fields[1:2] == ['END'] and len(fields) == 3 and jobid is not None:
+                try:
+                    job_retval = int(fields[2])
+                except ValueError:
+                    job_retval = retval
+                outputs[jobid] = (job_retval, "\n".join(lines), "")
+                jobid = None
+
+        if jobid is not None:
+            # The output of the last job was truncated
+            outputs[jobid] = (retval, "\n".join(lines), stderr)
+        return outputs
+
+    @staticmethod
+    def _format_detailed_jobinfo(command, retval, stdout, stderr):
+        """
+        Return the detailed jobinfo string for the output of a command.
+        """
         return u"""Detailed jobinfo obtained with command '{}'
 Return Code: {}
 -------------------------------------------------------------
@@ -106,6 +106,18 @@ _time_regexp = re.compile(
 # Separator between fields in the output of squeue
 _field_separator = "^^^"
 
+# The fields returned by sacct for the detailed jobinfo
+_detailed_jobinfo_fields = [
+    'AllocCPUS', 'Account', 'AssocID', 'AveCPU', 'AvePages', 'AveRSS',
+    'AveVMSize', 'Cluster', 'Comment', 'CPUTime', 'CPUTimeRAW',
+    'DerivedExitCode', 'Elapsed', 'Eligible', 'End', 'ExitCode', 'GID',
+    'Group', 'JobID', 'JobName', 'MaxRSS', 'MaxRSSNode', 'MaxRSSTask',
+    'MaxVMSize', 'MaxVMSizeNode', 'MaxVMSizeTask', 'MinCPU', 'MinCPUNode',
+    'MinCPUTask', 'NCPUS', 'NNodes', 'NodeList', 'NTasks', 'Priority',
+    'Partition', 'QOSRAW', 'ReqCPUS', 'Reserved', 'ResvCPU', 'ResvCPURAW',
+    'Start', 'State', 'Submit', 'Suspended', 'SystemCPU', 'Timelimit',
+    'TotalCPU', 'UID', 'User', 'UserCPU']
+
 class SlurmJobResource(NodeNumberJobResource):
     def __init__(self, *args, **kwargs):
         """
@@ -230,7 +242,46 @@ class SlurmScheduler(aiida.scheduler.Scheduler):
         --parsable split the fields with a pipe (|), adding a pipe also at 
         the end.
         """
-        return "sacct --format=AllocCPUS,Account,AssocID,AveCPU,AvePages,AveRSS,AveVMSize,Cluster,Comment,CPUTime,CPUTimeRAW,DerivedExitCode,Elapsed,Eligible,End,ExitCode,GID,Group,JobID,JobName,MaxRSS,MaxRSSNode,MaxRSSTask,MaxVMSize,MaxVMSizeNode,MaxVMSizeTask,MinCPU,MinCPUNode,MinCPUTask,NCPUS,NNodes,NodeList,NTasks,Priority,Partition,QOSRAW,ReqCPUS,Reserved,ResvCPU,ResvCPURAW,Start,State,Submit,Suspended,SystemCPU,Timelimit,TotalCPU,UID,User,UserCPU --parsable --jobs={}".format(jobid)
+        return self._get_detailed_jobinfo_many_command([jobid])
+
+    def _get_detailed_jobinfo_many_command(self, jobids):
+        """
+        Return a single sacct command to get the detailed information on
+        many jobs.
+        """
+        return "sacct --format={} --parsable --jobs={}".format(
+            ','.join(_detailed_jobinfo_fields), ','.join(jobids))
+
+    def _parse_detailed_jobinfo_many_output(self, jobids, retval, stdout, stderr):
+        """
+        Split the output of sacct for many jobs: each job gets the header line
+        and the lines of its steps (e.g. '123.batch') and, for job arrays, of
+        its tasks (e.g. '123_4').
+        """
+        lines = stdout.splitlines()
+        if not lines:
+            return {jobid: (retval, stdout, stderr) for jobid in jobids}
+
+        header = lines[0]
+        try:
+            jobid_index = header.split('|').index('JobID')
+        except ValueError:
+            # Not the expected output: every job gets all of it
+            return {jobid: (retval, stdout, stderr) for jobid in jobids}
+
+        job_lines = {jobid: [header] for jobid in jobids}
+        for line in lines[1:]:
+            fields = line.split('|')
+            if len(fields) <= jobid_index:
+                continue
+            line_jobid = fields[jobid_index].split('.')[0]
+            if line_jobid not in job_lines:
+                line_jobid = line_jobid.split('_')[0]
+            if line_jobid in job_lines:
+                job_lines[line_jobid].append(line)
+
+        return {jobid: (retval, "\n".join(job_lines[jobid]) + "\n", stderr)
+                for jobid in jobids}
 
     def _get_submit_script_header(self, job_tmpl):
         """
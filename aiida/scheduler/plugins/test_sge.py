@@ -201,6 +201,28 @@ class TestCommand(unittest.TestCase):
         self.assertTrue('123456' in sge_get_djobinfo_command)
         self.assertTrue('qacct' in sge_get_djobinfo_command)
         self.assertTrue('-j' in sge_get_djobinfo_command)
+
+    def test_detailed_jobinfo_many(self):
+        sge = SgeScheduler()
+
+        command = sge._get_detailed_jobinfo_many_command(['123', '456'])
+        self.assertTrue(sge._get_detailed_jobinfo_command('123') in command)
+        self.assertTrue(sge._get_detailed_jobinfo_command('456') in command)
+
+        stdout = "\n".join([
+            "AIIDA-DETAILED-JOBINFO START 123",
+            "jobnumber    123",
+            "exit_status  0",
+            "AIIDA-DETAILED-JOBINFO END 0",
+            "AIIDA-DETAILED-JOBINFO START 456",
+            "error: job id 456 not found",
+            "AIIDA-DETAILED-JOBINFO END 1",
+            ""])
+        outputs = sge._parse_detailed_jobinfo_many_output(
+            ['123', '456'], 1, stdout, "")
+        self.assertEquals(outputs, {
+            '123': (0, "jobnumber    123\nexit_status  0", ""),
+            '456': (1, "error: job id 456 not found", "")})
         
     def test_get_submit_command(self):
         sge=SgeScheduler()  
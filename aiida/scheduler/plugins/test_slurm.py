@@ -363,6 +363,34 @@ class TestSubmitScript(unittest.TestCase):
             )
 
 
+text_sacct_to_test = """AllocCPUS|JobID|State|
+2|123|COMPLETED|
+2|123.batch|COMPLETED|
+4|456_1|FAILED|
+4|456_1.batch|FAILED|
+1|789|COMPLETED|
+"""
+
+
+class TestDetailedJobinfo(unittest.TestCase):
+
+    def test_detailed_jobinfo_many(self):
+        scheduler = SlurmScheduler()
+
+        command = scheduler._get_detailed_jobinfo_many_command(['123', '456'])
+        self.assertTrue(command.startswith('sacct '))
+        self.assertTrue('--jobs=123,456' in command)
+        self.assertEquals(scheduler._get_detailed_jobinfo_command('123'),
+                          scheduler._get_detailed_jobinfo_many_command(['123']))
+
+        outputs = scheduler._parse_detailed_jobinfo_many_output(
+            ['123', '456', '999'], 0, text_sacct_to_test, "")
+        self.assertEquals(outputs['123'], (0, "AllocCPUS|JobID|State|\n"
+            "2|123|COMPLETED|\n2|123.batch|COMPLETED|\n", ""))
+        self.assertEquals(outputs['456'], (0, "AllocCPUS|JobID|State|\n"
+            "4|456_1|FAILED|\n4|456_1.batch|FAILED|\n", ""))
+        self.assertEquals(outputs['999'], (0, "AllocCPUS|JobID|State|\n", ""))
+
 
 if __name__ == '__main__':        
     unittest.main()
@@ -0,0 +1,150 @@
+# -*- coding: utf-8 -*-
+###########################################################################
+# Copyright (c), The AiiDA team. All rights reserved.                     #
+# This file is part of the AiiDA code.                                    #
+#                                                                         #
+# The code is hosted on GitHub at https://github.com/aiidateam/aiida_core #
+# For further information on the license, see the LICENSE.txt file        #
+# For further information please visit http://www.aiida.net               #
+###########################################################################
+"""
+A cache of the job states returned by the schedulers, that the daemon uses to
+limit how often it queries each computer (e.g. with squeue or qstat) and to
+update only the calculations whose job state changed.
+"""
+import threading
+import time
+
+
+class JobStatusCache(object):
+    """
+    Remember, for each authinfo (i.e. each (computer, user) pair), when the
+    scheduler was last queried and the job states it returned.
+
+    The scheduler of an authinfo is queried at most every ``min_interval``
+    seconds. When a query does not show any change, the interval until the
+    next one is doubled (it is at least the time elapsed since the previous
+    query, so that the back-off also works with a ``min_interval`` of 0), up
+    to ``max_interval`` seconds; it goes back to ``min_interval`` as soon as
+    a change is seen. Jobs that were not inquired by the previous query (e.g.
+    just submitted) are not delayed by the back-off: only ``min_interval``
+    applies to them.
+    """
+
+    def __init__(self, min_interval, max_interval):
+        """
+        :param min_interval: minimum time in seconds between two queries of
+            the scheduler of the same authinfo
+        :param max_interval: maximum time in seconds between two queries when
+            nothing changes; if not larger than ``min_interval``, there is no
+            back-off
+        """
+        self._min_interval = min_interval
+        self._max_interval = max(min_interval, max_interval)
+        self._lock = threading.Lock()
+        # authinfo id -> (time of the last query, interval until the next one)
+        self._query_times = {}
+        # authinfo id -> {job id: job state} of the jobs inquired last time
+        self._job_states = {}
+
+    @property
+    def min_interval(self):
+        return self._min_interval
+
+    @property
+    def max_interval(self):
+        return self._max_interval
+
+    def should_query(self, authinfo_id, jobids=(), now=None):
+        """
+        Return True if the scheduler of the given authinfo should be queried.
+
+        :param authinfo_id: the id of the authinfo
+        :param jobids: the ids of the jobs that would be inquired; if some of
+            them were not inquired by the previous query, the back-off is
+            ignored and only ``min_interval`` applies
+        :param now: the current time (by default, time.time())
+        """
+        if now is None:
+            now = time.time()
+        with self._lock:
+            try:
+                last_query, interval = self._query_times[authinfo_id]
+            except KeyError:
+                return True
+            previous_states = self._job_states.get(authinfo_id, {})
+            if any(jobid not in previous_states for jobid in jobids):
+                interval = self._min_interval
+        return now - last_query >= interval
+
+    def update(self, authinfo_id, jobids, found_jobs, now=None):
+        """
+        Record the result of a query of the scheduler and adapt the interval
+        until the next one.
+
+        :param authinfo_id: the id of the authinfo
+        :param jobids: the ids of the jobs that were inquired
+        :param found_jobs: the dictionary job id -> JobInfo returned by
+            Scheduler.getJobs (it may contain other jobs than the inquired
+            ones, e.g. when querying by user)
+        :param now: the time of the query (by default, time.time())
+        :return: the set of the inquired job ids whose calculations have to be
+            updated: the jobs that were not inquired last time, whose
+            job_state changed, or that are not found anymore.
+        """
+        if now is None:
+            now = time.time()
+
+        states = {}
+        for jobid in jobids:
+            jobinfo = found_jobs.get(jobid)
+            states[jobid] = None if jobinfo is None else jobinfo.job_state
+
+        with self._lock:
+            previous_states = self._job_states.get(authinfo_id, {})
+            changed = set(jobid for jobid, state in states.iteritems()
+                          if state is None or jobid not in previous_states
+                          or previous_states[jobid] != state)
+
+            if authinfo_id in self._query_times and not changed:
+                last_query, interval = self._query_times[authinfo_id]
+                interval = min(max(interval, now - last_query) * 2,
+                               self._max_interval)
+                interval = max(interval, self._min_interval)
+            else:
+                interval = self._min_interval
+
+            self._query_times[authinfo_id] = (now, interval)
+            self._job_states[authinfo_id] = states
+
+        return changed
+
+    def forget(self, authinfo_id):
+        """
+        Forget everything about the given authinfo, so that its scheduler is
+        queried again at the next update and all its calculations updated.
+        """
+        with self._lock:
+            self._query_times.pop(authinfo_id, None)
+            self._job_states.pop(authinfo_id, None)
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_job_status_cache():
+    """
+    Return the job status cache of the current process, creating it the first
+    time with the intervals set by the ``scheduler.poll_min_interval`` and
+    ``scheduler.poll_max_interval`` properties.
+    """
+    global _cache
+    from aiida.common.setup import get_property
+
+    with _cache_lock:
+        if _cache is None:
+            _cache = JobStatusCache(
+                min_interval=get_property('scheduler.poll_min_interval'),
+                max_interval=get_property('scheduler.poll_max_interval'))
+        return _cache
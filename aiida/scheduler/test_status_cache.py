@@ -0,0 +1,104 @@
+# -*- coding: utf-8 -*-
+###########################################################################
+# Copyright (c), The AiiDA team. All rights reserved.                     #
+# This file is part of the AiiDA code.                                    #
+#                                                                         #
+# The code is hosted on GitHub at https://github.com/aiidateam/aiida_core #
+# For further information on the license, see the LICENSE.txt file        #
+# For further information please visit http://www.aiida.net               #
+###########################################################################
+import unittest
+
+from aiida.scheduler.datastructures import JobInfo, job_states
+from aiida.scheduler.status_cache import JobStatusCache
+
+
+def _jobinfo(job_id, job_state):
+    jobinfo = JobInfo()
+    jobinfo.job_id = job_id
+    jobinfo.job_state = job_state
+    return jobinfo
+
+
+class TestJobStatusCache(unittest.TestCase):
+
+    def test_changed_jobs(self):
+        cache = JobStatusCache(min_interval=0, max_interval=0)
+        found_jobs = {'1': _jobinfo('1', job_states.QUEUED),
+                      '2': _jobinfo('2', job_states.RUNNING),
+                      '3': _jobinfo('3', job_states.RUNNING)}
+
+        # Everything is new at the first query
+        self.assertEquals(cache.update(1, ['1', '2'], found_jobs, now=0),
+                          set(['1', '2']))
+        self.assertEquals(cache.update(1, ['1', '2'], found_jobs, now=1),
+                          set())
+
+        # A job that changes state, a job that is newly inquired and a job
+        # that is not found anymore
+        found_jobs['1'] = _jobinfo('1', job_states.RUNNING)
+        del found_jobs['2']
+        self.assertEquals(cache.update(1, ['1', '2', '3'], found_jobs, now=2),
+                          set(['1', '2', '3']))
+
+        # Authinfos are independent
+        self.assertEquals(cache.update(2, ['3'], found_jobs, now=2), set(['3']))
+
+        cache.forget(1)
+        self.assertEquals(cache.update(1, ['3'], found_jobs, now=3), set(['3']))
+
+    def test_adaptive_interval(self):
+        cache = JobStatusCache(min_interval=10, max_interval=50)
+        found_jobs = {'1': _jobinfo('1', job_states.RUNNING)}
+
+        self.assertTrue(cache.should_query(1, now=0))
+        cache.update(1, ['1'], found_jobs, now=0)
+        self.assertFalse(cache.should_query(1, now=5))
+        self.assertTrue(cache.should_query(1, now=10))
+
+        # Without changes, the interval doubles up to max_interval
+        cache.update(1, ['1'], found_jobs, now=10)
+        self.assertFalse(cache.should_query(1, now=29))
+        self.assertTrue(cache.should_query(1, now=30))
+        cache.update(1, ['1'], found_jobs, now=30)
+        self.assertFalse(cache.should_query(1, now=69))
+        self.assertTrue(cache.should_query(1, now=80))
+        cache.update(1, ['1'], found_jobs, now=80)
+        self.assertFalse(cache.should_query(1, now=129))
+        self.assertTrue(cache.should_query(1, now=130))
+
+        # A change resets it to min_interval
+        found_jobs['1'] = _jobinfo('1', job_states.DONE)
+        cache.update(1, ['1'], found_jobs, now=130)
+        self.assertTrue(cache.should_query(1, now=140))
+
+    def test_backoff_without_min_interval(self):
+        cache = JobStatusCache(min_interval=0, max_interval=100)
+        found_jobs = {'1': _jobinfo('1', job_states.RUNNING)}
+
+        cache.update(1, ['1'], found_jobs, now=0)
+        self.assertTrue(cache.should_query(1, now=0))
+        # The back-off starts from the time elapsed between the queries
+        cache.update(1, ['1'], found_jobs, now=30)
+        self.assertFalse(cache.should_query(1, now=89))
+        self.assertTrue(cache.should_query(1, now=90))
+
+    def test_new_job_skips_backoff(self):
+        cache = JobStatusCache(min_interval=10, max_interval=120)
+        found_jobs = {'1': _jobinfo('1', job_states.RUNNING)}
+
+        cache.update(1, ['1'], found_jobs, now=0)
+        cache.update(1, ['1'], found_jobs, now=10)
+        cache.update(1, ['1'], found_jobs, now=30)
+        self.assertFalse(cache.should_query(1, ['1'], now=40))
+
+        # A newly submitted job is inquired after min_interval, whatever the
+        # back-off of the computer
+        self.assertFalse(cache.should_query(1, ['1', '2'], now=35))
+        self.assertTrue(cache.should_query(1, ['1', '2'], now=40))
+
+        # Once inquired, the job is seen as new and the back-off restarts
+        found_jobs['2'] = _jobinfo('2', job_states.QUEUED)
+        self.assertEquals(cache.update(1, ['1', '2'], found_jobs, now=40),
+                          set(['2']))
+        self.assertTrue(cache.should_query(1, ['1', '2'], now=50))
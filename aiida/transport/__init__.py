@@ -115,6 +115,15 @@ class Transport(object):
         """
         raise NotImplementedError
 
+    def is_alive(self):
+        """
+        Check whether the transport is open and its connection still usable,
+        e.g. before reusing a transport that has been kept open for a while.
+
+        :return: True if the transport can be used without reopening it
+        """
+        raise NotImplementedError
+
     def __repr__(self):
         return '<{}: {}>'.format(self.__class__.__name__, str(self))
 
@@ -324,6 +333,212 @@ class Transport(object):
                 transportdestination.put(os.path.join(sandbox.abspath,filename),
                                          remotedestination,**kwargs_put)
 
+    def put_archive(self, items):
+        """
+        Put many local files and folders in the current remote directory,
+        packed in a single tar archive that is unpacked remotely, instead of
+        putting them one by one (that is slow for many small files, e.g. over
+        a high-latency SFTP connection).
+
+        The archive is put with a single putfile, and unpacked (and removed)
+        with a single command. If this fails (e.g. tar is not available on
+        the remote computer), the items are put one by one with put.
+
+        :param items: a list of (localpath, remotepath) tuples, as they
+            would be passed to put (with localpath absolute, remotepath
+            relative to the current remote directory); when the same remote
+            path appears more than once, the last item wins, as with put.
+        :return: True if the items were put with the archive, False if they
+            were put one by one
+        """
+        import tarfile
+        import tempfile
+        import uuid
+        from aiida.common.utils import escape_for_bash
+
+        items = list(items)
+        if not items:
+            return True
+
+        archive_name = '.aiida-upload-{}.tar'.format(uuid.uuid4().hex)
+        handle, archive_path = tempfile.mkstemp(suffix='.tar')
+        os.close(handle)
+        try:
+            with tarfile.open(archive_path, 'w', dereference=True) as archive:
+                for localpath, remotepath in items:
+                    archive.add(localpath, arcname=os.path.normpath(remotepath))
+
+            self.putfile(archive_path, archive_name)
+        finally:
+            os.remove(archive_path)
+
+        # The script is run by sh, since the login shell may not be a
+        # Bourne shell
+        script = "tar -xf {0}; retval=$?; rm -f {0}; exit $retval".format(
+            escape_for_bash(archive_name))
+        retval, stdout, stderr = self.exec_command_wait(
+            "sh -c {}".format(escape_for_bash(script)))
+        if retval == 0:
+            return True
+
+        self.logger.warning("Unable to unpack the archive of the files to put "
+                            "(return code {}, stderr: {}); putting them one by "
+                            "one".format(retval, stderr.strip()))
+        for localpath, remotepath in items:
+            self.put(localpath, remotepath)
+        return False
+
+    def get_archive(self, items, compress=False):
+        """
+        Get many remote files and folders, packed on the remote computer in
+        a single tar archive that is retrieved with a single getfile and
+        unpacked locally, instead of getting them one by one (that is slow
+        for many files, e.g. over a high-latency SFTP connection).
+
+        As for get with ignore_nonexisting=True, the remote paths that do
+        not exist are skipped. The remote paths that are absolute, go up
+        the current directory or contain newlines or backslashes (that
+        cannot be listed in the file passed to tar), and all the items if
+        the archive cannot be created (e.g. tar is not available on the
+        remote computer), are retrieved one by one with get.
+
+        The members of the archive that are not regular files, folders or
+        links within the archive are not extracted.
+
+        :param items: a list of (remotepath, localpath) tuples, as they
+            would be passed to get (with remotepath relative to the current
+            remote directory, without patterns, and localpath absolute)
+        :param compress: if True, the archive is compressed with gzip
+        :return: True if the items were retrieved with the archive, False
+            if they were retrieved one by one
+        """
+        import shutil
+        import tarfile
+        import tempfile
+        import uuid
+        from aiida.common.utils import escape_for_bash
+
+        items = list(items)
+        archived = [(remotepath, localpath) for remotepath, localpath in items
+                    if not os.path.isabs(remotepath) and
+                    not os.path.normpath(remotepath).startswith(os.pardir) and
+                    '\n' not in remotepath and '\\' not in remotepath]
+        for remotepath, localpath in items:
+            if (remotepath, localpath) not in archived:
+                self.get(remotepath, localpath, ignore_nonexisting=True)
+        if not archived:
+            return True
+
+        prefix = '.aiida-retrieve-{}'.format(uuid.uuid4().hex)
+        archive_name = prefix + '.tar'
+        list_name = prefix + '.list'
+        existing_name = prefix + '.existing'
+        remote_names = sorted(set(os.path.normpath(remotepath)
+                                  for remotepath, _ in archived))
+
+        extract_dir = tempfile.mkdtemp()
+        try:
+            # The names are passed to tar in a file rather than on the
+            # command line, whose length is limited. They are prefixed with
+            # ./ so that none of them is taken as an option
+            list_path = os.path.join(extract_dir, list_name)
+            with open(list_path, 'w') as list_file:
+                for name in remote_names:
+                    if isinstance(name, unicode):
+                        name = name.encode('utf-8')
+                    list_file.write('./{}\n'.format(name))
+            self.putfile(list_path, list_name)
+
+            # The script is run by sh, since the login shell may not be a
+            # Bourne shell; it prints the number of the existing paths, and
+            # creates the archive only if there are any
+            script = (": > {existing}; while IFS= read -r f; do "
+                      "if [ -e \"$f\" ]; then printf '%s\\n' \"$f\" >> {existing}; "
+                      "fi; done < {list}; wc -l < {existing}; "
+                      "if [ -s {existing} ]; then tar -ch{z}f {archive} -T {existing}; "
+                      "fi".format(
+                          existing=escape_for_bash(existing_name),
+                          list=escape_for_bash(list_name),
+                          z='z' if compress else '',
+                          archive=escape_for_bash(archive_name)))
+            retval, stdout, stderr = self.exec_command_wait(
+                "sh -c {}".format(escape_for_bash(script)))
+            self.exec_command_wait("rm -f {} {}".format(
+                escape_for_bash(list_name), escape_for_bash(existing_name)))
+
+            if retval != 0:
+                self.logger.warning("Unable to create the archive of the files to "
+                                    "get (return code {}, stderr: {}); getting "
+                                    "them one by one".format(retval, stderr.strip()))
+                self.exec_command_wait("rm -f {}".format(escape_for_bash(archive_name)))
+                for remotepath, localpath in archived:
+                    self.get(remotepath, localpath, ignore_nonexisting=True)
+                return False
+
+            if stdout.strip() == '0':
+                # None of the remote paths exists
+                return True
+
+            archive_path = os.path.join(extract_dir, archive_name)
+            try:
+                self.getfile(archive_name, archive_path)
+            finally:
+                self.remove(archive_name)
+            with tarfile.open(archive_path, 'r:*') as archive:
+                archive.extractall(os.path.join(extract_dir, 'content'),
+                                   members=self._get_safe_tar_members(archive))
+
+            for remotepath, localpath in archived:
+                extracted_path = os.path.join(
+                    extract_dir, 'content', os.path.normpath(remotepath))
+                if os.path.isdir(extracted_path):
+                    for dirpath, _, filenames in os.walk(extracted_path):
+                        target = os.path.normpath(os.path.join(
+                            localpath, os.path.relpath(dirpath, extracted_path)))
+                        if not os.path.isdir(target):
+                            os.makedirs(target)
+                        for filename in filenames:
+                            shutil.copyfile(os.path.join(dirpath, filename),
+                                            os.path.join(target, filename))
+                elif os.path.exists(extracted_path):
+                    shutil.copyfile(extracted_path, localpath)
+        finally:
+            shutil.rmtree(extract_dir)
+        return True
+
+    def _get_safe_tar_members(self, archive):
+        """
+        Return the members of a tar archive that can be extracted without
+        writing outside the extraction folder: regular files, folders, and
+        links to members of the archive. The other members are skipped with
+        a warning.
+
+        :param archive: a tarfile.TarFile
+        """
+        def is_inside(path):
+            return not os.path.isabs(path) and path.split(os.sep)[0] != os.pardir
+
+        members = []
+        for member in archive.getmembers():
+            name = os.path.normpath(member.name)
+            if member.issym():
+                link_target = os.path.normpath(
+                    os.path.join(os.path.dirname(name), member.linkname))
+            elif member.islnk():
+                link_target = os.path.normpath(member.linkname)
+            else:
+                link_target = name
+            if (member.isfile() or member.isdir() or member.issym() or
+                    member.islnk()) and is_inside(name) and \
+                    is_inside(link_target):
+                members.append(member)
+            else:
+                self.logger.warning("Skipping the member '{}' of the archive "
+                                    "of the files to get, that would not be "
+                                    "extracted in the archive folder".format(
+                                        member.name))
+        return members
+
 
     def _exec_command_internal(self, command, **kwargs):
         """
@@ -76,6 +76,12 @@ class LocalTransport(aiida.transport.Transport):
                                    "it is already closed")
         self._is_open = False
 
+    def is_alive(self):
+        """
+        A local transport is usable as long as it is open.
+        """
+        return self._is_open
+
     def __str__(self):
         """
         Return a description as a string.
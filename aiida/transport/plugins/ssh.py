@@ -489,6 +489,24 @@ class SshTransport(aiida.transport.Transport):
         self._client.close()
         self._is_open = False
 
+    def is_alive(self):
+        """
+        Check that the SSH connection is still active, with a round trip
+        on the SFTP channel.
+        """
+        if not self._is_open:
+            return False
+
+        transport = self._client.get_transport()
+        if transport is None or not transport.is_active():
+            return False
+
+        try:
+            self._sftp.normalize('.')
+        except Exception:
+            return False
+        return True
+
     @property
     def sshclient(self):
         if not self._is_open:
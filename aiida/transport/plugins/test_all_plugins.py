@@ -818,6 +818,130 @@ class TestPutGetTree(unittest.TestCase):
             t.chdir('..')
             t.rmdir(directory)
 
+    @run_for_all_plugins
+    def test_put_archive(self, custom_transport):
+        import os
+        import shutil
+        import tempfile
+
+        local_dir = tempfile.mkdtemp()
+        remote_dir = tempfile.mkdtemp()
+        try:
+            os.mkdir(os.path.join(local_dir, 'folder'))
+            with open(os.path.join(local_dir, 'folder', 'a.txt'), 'w') as f:
+                f.write('a')
+            with open(os.path.join(local_dir, 'b.txt'), 'w') as f:
+                f.write('b')
+            with open(os.path.join(local_dir, 'c.txt'), 'w') as f:
+                f.write('c')
+
+            with custom_transport as t:
+                t.chdir(remote_dir)
+                self.assertTrue(t.put_archive([
+                    (os.path.join(local_dir, 'folder'), 'folder'),
+                    (os.path.join(local_dir, 'b.txt'), 'b.txt'),
+                    (os.path.join(local_dir, 'c.txt'), 'folder/b.txt'),
+                    # Later items overwrite earlier ones, as with put
+                    (os.path.join(local_dir, 'c.txt'), 'b.txt'),
+                ]))
+
+                self.assertEquals(sorted(t.listdir('.')), ['b.txt', 'folder'])
+                self.assertEquals(sorted(t.listdir('folder')),
+                                  ['a.txt', 'b.txt'])
+
+            with open(os.path.join(remote_dir, 'folder', 'a.txt')) as f:
+                self.assertEquals(f.read(), 'a')
+            with open(os.path.join(remote_dir, 'b.txt')) as f:
+                self.assertEquals(f.read(), 'c')
+        finally:
+            shutil.rmtree(local_dir)
+            shutil.rmtree(remote_dir)
+
+    @run_for_all_plugins
+    def test_get_archive(self, custom_transport):
+        import os
+        import shutil
+        import tempfile
+
+        local_dir = tempfile.mkdtemp()
+        remote_dir = tempfile.mkdtemp()
+        try:
+            os.makedirs(os.path.join(remote_dir, 'folder', 'sub'))
+            with open(os.path.join(remote_dir, 'folder', 'a.txt'), 'w') as f:
+                f.write('a')
+            with open(os.path.join(remote_dir, 'folder', 'sub', 'b.txt'), 'w') as f:
+                f.write('b')
+            with open(os.path.join(remote_dir, 'c.txt'), 'w') as f:
+                f.write('c')
+
+            with custom_transport as t:
+                t.chdir(remote_dir)
+                for compress in [False, True]:
+                    retrieved_dir = os.path.join(local_dir, str(compress))
+                    os.mkdir(retrieved_dir)
+                    self.assertTrue(t.get_archive([
+                        ('folder', os.path.join(retrieved_dir, 'retrieved')),
+                        ('c.txt', os.path.join(retrieved_dir, 'd.txt')),
+                        ('missing.txt', os.path.join(retrieved_dir, 'missing.txt')),
+                    ], compress=compress))
+
+                    self.assertEquals(sorted(os.listdir(retrieved_dir)),
+                                      ['d.txt', 'retrieved'])
+                    with open(os.path.join(retrieved_dir, 'retrieved', 'sub', 'b.txt')) as f:
+                        self.assertEquals(f.read(), 'b')
+                    with open(os.path.join(retrieved_dir, 'd.txt')) as f:
+                        self.assertEquals(f.read(), 'c')
+
+                # The archive is removed from the remote directory
+                self.assertEquals(sorted(t.listdir('.')), ['c.txt', 'folder'])
+
+                # The names are not passed on the command line, so that there
+                # is no limit to their number
+                names = ['-{}-{}.txt'.format(i, 'x' * 100) for i in range(2000)]
+                for name in names:
+                    with open(os.path.join(remote_dir, name), 'w') as f:
+                        f.write(name)
+                retrieved_dir = os.path.join(local_dir, 'many')
+                os.mkdir(retrieved_dir)
+                self.assertTrue(t.get_archive(
+                    [(name, os.path.join(retrieved_dir, name)) for name in names]))
+                self.assertEquals(sorted(os.listdir(retrieved_dir)), sorted(names))
+                with open(os.path.join(retrieved_dir, names[-1])) as f:
+                    self.assertEquals(f.read(), names[-1])
+        finally:
+            shutil.rmtree(local_dir)
+            shutil.rmtree(remote_dir)
+
+    @run_for_all_plugins
+    def test_get_archive_unsafe_members(self, custom_transport):
+        import StringIO
+        import tarfile
+
+        content = StringIO.StringIO()
+        with tarfile.open(fileobj=content, mode='w') as archive:
+            for name, member_type, linkname in [
+                    ('a.txt', tarfile.REGTYPE, ''),
+                    ('folder', tarfile.DIRTYPE, ''),
+                    ('folder/link', tarfile.SYMTYPE, '../a.txt'),
+                    ('folder/hardlink', tarfile.LNKTYPE, 'a.txt'),
+                    ('/etc/absolute', tarfile.REGTYPE, ''),
+                    ('folder/../../up', tarfile.REGTYPE, ''),
+                    ('outside', tarfile.SYMTYPE, '../outside'),
+                    ('absolute', tarfile.SYMTYPE, '/etc/passwd'),
+                    ('hardoutside', tarfile.LNKTYPE, '../outside'),
+                    ('fifo', tarfile.FIFOTYPE, '')]:
+                member = tarfile.TarInfo(name)
+                member.type = member_type
+                member.linkname = linkname
+                archive.addfile(member)
+        content.seek(0)
+
+        with tarfile.open(fileobj=content, mode='r') as archive:
+            self.assertEquals(
+                [member.name
+                 for member in custom_transport._get_safe_tar_members(archive)],
+                ['a.txt', 'folder', 'folder/link', 'folder/hardlink'])
+
     @run_for_all_plugins
     def test_put_and_get_overwrite(self, custom_transport):
         import os, shutil
@@ -0,0 +1,202 @@
+# -*- coding: utf-8 -*-
+###########################################################################
+# Copyright (c), The AiiDA team. All rights reserved.                     #
+# This file is part of the AiiDA code.                                    #
+#                                                                         #
+# The code is hosted on GitHub at https://github.com/aiidateam/aiida_core #
+# For further information on the license, see the LICENSE.txt file        #
+# For further information please visit http://www.aiida.net               #
+###########################################################################
+"""
+A pool of open transports, keyed by authinfo, that the daemon uses to keep
+connections alive between its submitter, updater and retriever runs instead
+of opening a new connection (e.g. a full SSH handshake) every time.
+"""
+import threading
+import time
+from contextlib import contextmanager
+
+import aiida.common
+
+poollogger = aiida.common.aiidalogger.getChild('transport').getChild('pool')
+
+
+class TransportPool(object):
+    """
+    Keep open transports, keyed by the id of the authinfo they were created
+    from, and hand them out again to later requests for the same authinfo.
+
+    A transport is handed out to one requester at a time; concurrent requests
+    for the same authinfo get additional transports, that are all pooled when
+    released. Before being reused, a transport is checked with
+    :py:meth:`aiida.transport.Transport.is_alive` and reopened if needed.
+    Transports that stayed unused for more than ``idle_ttl`` seconds are closed
+    by :py:meth:`close_idle`.
+
+    .. note:: the pool does not notice changes to the transport parameters of
+      a computer or authinfo: the daemon has to be restarted, or
+      :py:meth:`close_all` called, for them to be taken into account.
+    """
+
+    def __init__(self, idle_ttl):
+        """
+        :param idle_ttl: time in seconds after which an unused transport is
+            closed. If 0, transports are closed as soon as they are released,
+            i.e. no pooling is done.
+        """
+        self._idle_ttl = idle_ttl
+        self._lock = threading.Lock()
+        # authinfo id -> list of (transport, time it was released) tuples
+        self._idle = {}
+        # transport -> working directory right after it was opened, restored
+        # before pooling it so that later users (e.g. commands executed with
+        # 'cd <cwd> &&') are not affected by a previous chdir
+        self._initial_cwd = {}
+
+    @property
+    def idle_ttl(self):
+        return self._idle_ttl
+
+    @contextmanager
+    def request_transport(self, authinfo):
+        """
+        Context manager yielding an open transport for the given authinfo,
+        taken from the pool if possible, and giving it back to the pool at
+        the end of the ``with`` block.
+
+        If an exception escapes the ``with`` block, the transport is closed
+        rather than pooled, since its state is unknown.
+
+        :param authinfo: a DbAuthInfo instance of either backend
+        """
+        transport = self._acquire(authinfo)
+        try:
+            yield transport
+        except Exception:
+            self._close_transport(transport)
+            raise
+        else:
+            self._release(authinfo, transport)
+
+    def _acquire(self, authinfo):
+        """
+        Return an open transport for the authinfo, reusing an idle one if
+        it is still alive.
+        """
+        while True:
+            with self._lock:
+                idle = self._idle.get(authinfo.id)
+                if not idle:
+                    break
+                transport, _ = idle.pop()
+
+            if self._is_alive(transport):
+                poollogger.debug("Reusing pooled transport {}".format(
+                    transport))
+                return transport
+
+            poollogger.info("Pooled transport {} is no longer alive, "
+                            "discarding it".format(transport))
+            self._close_transport(transport)
+
+        transport = authinfo.get_transport()
+        transport.open()
+        poollogger.debug("Opened new transport {}".format(transport))
+        if self._idle_ttl > 0:
+            with self._lock:
+                self._initial_cwd[transport] = transport.getcwd()
+        return transport
+
+    def _release(self, authinfo, transport):
+        """
+        Give a transport back to the pool, or close it if pooling is disabled.
+        """
+        if self._idle_ttl <= 0:
+            self._close_transport(transport)
+            return
+
+        transport._set_logger_extra(None)
+        try:
+            transport.chdir(self._initial_cwd[transport])
+        except Exception:
+            self._close_transport(transport)
+            return
+
+        with self._lock:
+            self._idle.setdefault(authinfo.id, []).append(
+                (transport, time.time()))
+
+    def close_idle(self):
+        """
+        Close the pooled transports that have not been used for more than
+        ``idle_ttl`` seconds.
+        """
+        now = time.time()
+        to_close = []
+        with self._lock:
+            for authinfo_id, idle in self._idle.items():
+                still_valid = []
+                for transport, released_at in idle:
+                    if now - released_at > self._idle_ttl:
+                        to_close.append(transport)
+                    else:
+                        still_valid.append((transport, released_at))
+                if still_valid:
+                    self._idle[authinfo_id] = still_valid
+                else:
+                    del self._idle[authinfo_id]
+
+        for transport in to_close:
+            poollogger.debug("Closing idle transport {}".format(transport))
+            self._close_transport(transport)
+
+    def close_all(self):
+        """
+        Close all the pooled transports. Transports currently handed out are
+        not affected.
+        """
+        with self._lock:
+            to_close = [transport for idle in self._idle.values()
+                        for transport, _ in idle]
+            self._idle = {}
+
+        for transport in to_close:
+            self._close_transport(transport)
+
+    @staticmethod
+    def _is_alive(transport):
+        try:
+            return transport.is_alive()
+        except NotImplementedError:
+            # The plugin cannot tell: assume it is, as for a new transport
+            # any failure will surface when it is used
+            return True
+
+    def _close_transport(self, transport):
+        with self._lock:
+            self._initial_cwd.pop(transport, None)
+        try:
+            transport.close()
+        except Exception as e:
+            poollogger.debug("Error while closing transport {} ({}): "
+                             "{}".format(transport, e.__class__.__name__,
+                                         e.message))
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_transport_pool():
+    """
+    Return the transport pool of the current process, creating it the first
+    time with the idle time set by the ``transport.pool_idle_ttl`` property.
+    """
+    global _pool
+    from aiida.common.setup import get_property
+
+    with _pool_lock:
+        if _pool is None:
+            _pool = TransportPool(
+                idle_ttl=get_property('transport.pool_idle_ttl'))
+        return _pool
@@ -0,0 +1,123 @@
+# -*- coding: utf-8 -*-
+###########################################################################
+# Copyright (c), The AiiDA team. All rights reserved.                     #
+# This file is part of the AiiDA code.                                    #
+#                                                                         #
+# The code is hosted on GitHub at https://github.com/aiidateam/aiida_core #
+# For further information on the license, see the LICENSE.txt file        #
+# For further information please visit http://www.aiida.net               #
+###########################################################################
+import os
+import tempfile
+import unittest
+
+from aiida.transport.plugins.local import LocalTransport
+from aiida.transport.pool import TransportPool
+
+
+class FakeAuthInfo(object):
+    """
+    Minimal stand-in for a DbAuthInfo, creating local transports.
+    """
+
+    def __init__(self, id):
+        self.id = id
+        self.created = []
+
+    def get_transport(self):
+        transport = LocalTransport()
+        self.created.append(transport)
+        return transport
+
+
+class TestTransportPool(unittest.TestCase):
+
+    def test_reuse(self):
+        pool = TransportPool(idle_ttl=60)
+        authinfo = FakeAuthInfo(1)
+
+        with pool.request_transport(authinfo) as t1:
+            self.assertTrue(t1.is_alive())
+        with pool.request_transport(authinfo) as t2:
+            self.assertIs(t1, t2)
+        self.assertEquals(len(authinfo.created), 1)
+
+        # Different authinfos never share a transport
+        other = FakeAuthInfo(2)
+        with pool.request_transport(other) as t3:
+            self.assertIsNot(t1, t3)
+
+        pool.close_all()
+        self.assertFalse(t1.is_alive())
+        self.assertFalse(t3.is_alive())
+
+    def test_concurrent_requests(self):
+        pool = TransportPool(idle_ttl=60)
+        authinfo = FakeAuthInfo(1)
+
+        with pool.request_transport(authinfo) as t1:
+            with pool.request_transport(authinfo) as t2:
+                self.assertIsNot(t1, t2)
+        with pool.request_transport(authinfo) as t3:
+            self.assertIn(t3, [t1, t2])
+        self.assertEquals(len(authinfo.created), 2)
+        pool.close_all()
+
+    def test_no_pooling(self):
+        pool = TransportPool(idle_ttl=0)
+        authinfo = FakeAuthInfo(1)
+
+        with pool.request_transport(authinfo) as t1:
+            pass
+        self.assertFalse(t1.is_alive())
+        with pool.request_transport(authinfo) as t2:
+            self.assertIsNot(t1, t2)
+        self.assertFalse(t2.is_alive())
+
+    def test_dead_transport_replaced(self):
+        pool = TransportPool(idle_ttl=60)
+        authinfo = FakeAuthInfo(1)
+
+        with pool.request_transport(authinfo) as t1:
+            pass
+        t1.close()
+        with pool.request_transport(authinfo) as t2:
+            self.assertIsNot(t1, t2)
+            self.assertTrue(t2.is_alive())
+        pool.close_all()
+
+    def test_close_idle(self):
+        pool = TransportPool(idle_ttl=60)
+        authinfo = FakeAuthInfo(1)
+
+        with pool.request_transport(authinfo) as t1:
+            pass
+        pool.close_idle()
+        self.assertTrue(t1.is_alive())
+
+        pool._idle_ttl = -1
+        pool.close_idle()
+        self.assertFalse(t1.is_alive())
+
+    def test_exception_closes_transport(self):
+        pool = TransportPool(idle_ttl=60)
+        authinfo = FakeAuthInfo(1)
+
+        with self.assertRaises(ValueError):
+            with pool.request_transport(authinfo) as t1:
+                raise ValueError
+        self.assertFalse(t1.is_alive())
+
+    def test_cwd_restored(self):
+        pool = TransportPool(idle_ttl=60)
+        authinfo = FakeAuthInfo(1)
+        tmpdir = tempfile.mkdtemp()
+        try:
+            with pool.request_transport(authinfo) as t1:
+                initial_cwd = t1.getcwd()
+                t1.chdir(tmpdir)
+            with pool.request_transport(authinfo) as t2:
+                self.assertEquals(t2.getcwd(), initial_cwd)
+        finally:
+            pool.close_all()
+            os.rmdir(tmpdir)
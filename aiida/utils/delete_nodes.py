@@ -55,6 +55,16 @@ def delete_nodes(pks, follow_calls=False, follow_returns=False,
     # Operational set always includes the recently (in the last iteration added) nodes.
     operational_set = set().union(set(pks)) # Union to copy the set!
     pks_set_to_delete = set().union(set(pks))
+
+    # The reachability index, if enabled, gives all the descendants in one query;
+    # it only follows CREATE and INPUT links
+    from aiida.backends.reachability import is_reachability_index_enabled
+    if not follow_calls and not follow_returns and is_reachability_index_enabled():
+        pks_set_to_delete.update(_ for _, in QueryBuilder().append(
+                Node, filters={'id':{'in':operational_set}}, tag='ancestor').append(
+                Node, project='id', descendant_of='ancestor').iterall())
+        operational_set = set()
+
     while operational_set:
         # new_pks_set are the the pks of all nodes that are connected to the operational node set
         # with the links specified.
@@ -0,0 +1,203 @@
+# -*- coding: utf-8 -*-
+###########################################################################
+# Copyright (c), The AiiDA team. All rights reserved.                     #
+# This file is part of the AiiDA code.                                    #
+#                                                                         #
+# The code is hosted on GitHub at https://github.com/aiidateam/aiida_core #
+# For further information on the license, see the LICENSE.txt file        #
+# For further information please visit http://www.aiida.net               #
+###########################################################################
+"""
+Recompute the hashes of many stored nodes.
+
+The hashes are computed in a pool of processes, and stored in bulk with a
+fixed number of queries per batch of nodes. Together with the hash, a
+fingerprint of the node is stored: the hash of everything that enters the
+hash of the node, except that each file of the repository is only described
+by its size and modification time. The nodes whose fingerprint did not change
+since their last rehash are skipped, without reading their files.
+"""
+import json
+import os
+
+from aiida.common.hashing import make_hash
+from aiida.common.folders import Folder
+
+# The extra where the fingerprint of the node is stored by rehash_nodes
+_HASH_FINGERPRINT_EXTRA_KEY = '_aiida_hash_fingerprint'
+
+
+def rehash_nodes(node_class=None, pks=None, processes=1, batch_size=1000,
+                 force=False, checkpoint=None, callback=None):
+    """
+    Recompute and store the hashes of the given nodes.
+
+    The nodes are processed by increasing pk, in batches. The progress is
+    saved in the checkpoint file (if given) after each batch, so that an
+    interrupted rehash can be resumed by calling this function again with the
+    same arguments. The checkpoint file is removed once all nodes are done.
+
+    :param node_class: only rehash the instances of this Node subclass
+        (default: all nodes)
+    :param pks: if given, only rehash the nodes with these pks
+    :param int processes: the number of processes hashing the nodes; if 1,
+        the nodes are hashed in the current process
+    :param int batch_size: the number of nodes loaded, hashed and stored at
+        once
+    :param bool force: if True, also rehash the nodes whose fingerprint did
+        not change
+    :param str checkpoint: the path of the checkpoint file
+    :param callback: if given, a function called after each batch with the
+        number of nodes rehashed and skipped so far
+
+    :return: a tuple with the number of nodes rehashed and skipped
+    """
+    import multiprocessing
+    from aiida.orm.node import Node
+    from aiida.orm.querybuilder import QueryBuilder
+    from aiida.orm.implementation.general.node import _HASH_EXTRA_KEY
+    from aiida.backends.utils import set_extras_of_nodes
+
+    if node_class is None:
+        node_class = Node
+
+    last_pk = _read_checkpoint(checkpoint)
+    num_rehashed = 0
+    num_skipped = 0
+
+    pool = multiprocessing.Pool(processes) if processes > 1 else None
+    try:
+        while True:
+            filters = {'id': {'>': last_pk}}
+            if pks is not None:
+                filters = {'and': [filters, {'id': {'in': list(pks)}}]}
+            qb = QueryBuilder()
+            qb.append(node_class, tag='node', filters=filters, project=[
+                '*', 'extras.{}'.format(_HASH_EXTRA_KEY),
+                'extras.{}'.format(_HASH_FINGERPRINT_EXTRA_KEY)])
+            qb.order_by({'node': ['id']})
+            qb.limit(batch_size)
+            batch = qb.all()
+            if not batch:
+                break
+
+            tasks = []
+            fingerprints = {}
+            for node, old_hash, old_fingerprint in batch:
+                try:
+                    objects = node._get_objects_to_hash()
+                except Exception:
+                    # As in get_hash, the node gets a None hash
+                    objects = None
+                kwargs = {'ignored_folder_content':
+                          node._hash_ignored_folder_content}
+
+                fingerprint = _get_fingerprint(objects, kwargs)
+                if (not force and old_hash is not None and
+                        fingerprint == old_fingerprint):
+                    num_skipped += 1
+                    continue
+                fingerprints[node.pk] = fingerprint
+                tasks.append((node.pk, objects, kwargs))
+
+            if pool is None:
+                hashes = map(_hash_node_objects, tasks)
+            else:
+                hashes = pool.map(_hash_node_objects, tasks)
+
+            set_extras_of_nodes({
+                pk: {_HASH_EXTRA_KEY: node_hash,
+                     _HASH_FINGERPRINT_EXTRA_KEY: fingerprints[pk]}
+                for pk, node_hash in hashes})
+            num_rehashed += len(hashes)
+
+            last_pk = batch[-1][0].pk
+            _write_checkpoint(checkpoint, last_pk)
+            if callback is not None:
+                callback(num_rehashed, num_skipped)
+    finally:
+        if pool is not None:
+            pool.terminate()
+            pool.join()
+
+    if checkpoint is not None and os.path.exists(checkpoint):
+        os.remove(checkpoint)
+
+    return num_rehashed, num_skipped
+
+
+def _hash_node_objects(task):
+    """
+    Compute the hash of a node from the objects returned by its
+    _get_objects_to_hash method, as get_hash does.
+
+    Defined at the module level to be usable in a process pool.
+
+    :param task: a tuple (pk, objects, kwargs of make_hash)
+    :return: a tuple (pk, hash), with a None hash in case of errors
+    """
+    pk, objects, kwargs = task
+    if objects is None:
+        return pk, None
+    try:
+        return pk, make_hash(objects, **kwargs)
+    except Exception:
+        return pk, None
+
+
+def _get_fingerprint(objects, kwargs):
+    """
+    Return the hash of the given objects to hash of a node, where the
+    folders are replaced by the list of the sizes and modification times of
+    their files.
+    """
+    if objects is None:
+        return None
+
+    ignored_folder_content = kwargs.get('ignored_folder_content', ())
+    return make_hash([
+        _get_folder_stats(obj, ignored_folder_content)
+        if isinstance(obj, Folder) else obj
+        for obj in objects])
+
+
+def _get_folder_stats(folder, ignored_folder_content):
+    """
+    Return a list of (relative path, size, modification time) of all the
+    files in the given folder, skipping the files and folders with the
+    given names at any depth (as make_hash does).
+    """
+    stats = []
+    for dirpath, dirnames, filenames in os.walk(folder.abspath):
+        dirnames[:] = sorted(
+            name for name in dirnames if name not in ignored_folder_content)
+        for name in sorted(filenames):
+            if name in ignored_folder_content:
+                continue
+            path = os.path.join(dirpath, name)
+            stat = os.stat(path)
+            stats.append((os.path.relpath(path, folder.abspath),
+                          stat.st_size, stat.st_mtime))
+    return stats
+
+
+def _read_checkpoint(checkpoint):
+    """
+    Return the pk of the last node processed according to the checkpoint
+    file, or 0 if there is no checkpoint.
+    """
+    if checkpoint is None or not os.path.exists(checkpoint):
+        return 0
+    with open(checkpoint) as f:
+        return json.load(f)['last_pk']
+
+
+def _write_checkpoint(checkpoint, last_pk):
+    if checkpoint is None:
+        return
+    # The file is replaced atomically, not to lose the checkpoint if
+    # interrupted while writing it
+    temp_path = '{}.tmp'.format(checkpoint)
+    with open(temp_path, 'w') as f:
+        json.dump({'last_pk': last_pk}, f)
+    os.rename(temp_path, checkpoint)
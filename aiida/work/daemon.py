@@ -27,7 +27,10 @@ def tick_workflow_engine(storage=None, print_exceptions=True):
 
     more_work = False
 
-    for proc in storage.load_all_processes():
+    processes = storage.load_all_processes()
+    _prefetch_waited_on(processes)
+
+    for proc in processes:
 
         try:
             storage.persist_process(proc)
@@ -60,6 +63,30 @@ def tick_workflow_engine(storage=None, print_exceptions=True):
 
     return more_work
 
+
+def _prefetch_waited_on(processes):
+    """
+    Fetch with a single query the states of all the processes waited on by
+    the given processes, so that the registry answers from its cache while
+    they are ticked.
+    """
+    from plum.persistence.bundle import Bundle
+    from aiida.work.persistence import _get_wait_expression, _get_waited_on_pks
+
+    defaults.process_registry.clear_cache()
+
+    pids = set()
+    for proc in processes:
+        wait_on = proc.get_waiting_on()
+        if wait_on is None:
+            continue
+        bundle = Bundle()
+        wait_on.save_instance_state(bundle)
+        pids.update(_get_waited_on_pks(_get_wait_expression(bundle)))
+
+    if pids:
+        defaults.process_registry.have_finished(list(pids))
+
 if __name__ == "__main__":
     """
     A convenience method so that this module can be ran ticking the engine once.
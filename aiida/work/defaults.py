@@ -19,11 +19,12 @@ from aiida.work.process_registry import ProcessRegistry
 
 
 
+process_registry = ProcessRegistry()
 _kb = plum.knowledge_base.KnowledgeBase()
 #_kb.add_provider(
 #    plum.in_memory_database.InMemoryDatabase(
 #        retain_inputs=False, retain_outputs=False))
-_kb.add_provider(ProcessRegistry())
+_kb.add_provider(process_registry)
 plum.knowledge_provider.set_global_provider(_kb)
 
 # Have globals that can be used by all of AiiDA
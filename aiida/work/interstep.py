@@ -89,6 +89,17 @@ class UpdateContext(Interstep):
         self._action = action
         self._key = key
 
+    def _get_value(self):
+        """
+        Evaluate the action, unless its value was fetched already by
+        :func:`prefetch_intersteps`
+        """
+        try:
+            return self._prefetched_value
+        except AttributeError:
+            fn = get_object_from_string(self._action.fn)
+            return fn(self._action.running_info.pid)
+
     def __eq__(self, other):
         return (self._action == other._action and self._key == other._key)
 
@@ -165,9 +176,8 @@ class Assign(UpdateContext):
 
         :param workchain: instance of WorkChain whose context should be updated
         """
-        fn = get_object_from_string(self._action.fn)
         key = self._key
-        val = fn(self._action.running_info.pid)
+        val = self._get_value()
         workchain.ctx[key] = val
 
 
@@ -188,9 +198,8 @@ class Append(UpdateContext):
 
         :param workchain: instance of WorkChain whose context should be updated
         """
-        fn = get_object_from_string(self._action.fn)
         key = self._key
-        val = fn(self._action.running_info.pid)
+        val = self._get_value()
 
         if key in workchain.ctx and not isinstance(workchain.ctx[key], MutableSequence):
             raise TypeError("You are trying to append to an existing key that is not a list")
@@ -258,6 +267,59 @@ def _get_proc_outputs_from_registry(pid):
         raise ValueError("Cannot return outputs, calculation '{}' has failed".format(pid))
     return {e[0]: e[1] for e in calc.get_outputs(also_labels=True)}
 
+def _get_proc_outputs_many(pids):
+    """
+    Return a dictionary pid -> outputs for the calculations identified by
+    pids with a single query. The calculations that failed are left out, for
+    _get_proc_outputs_from_registry to raise.
+    """
+    from aiida.work.defaults import process_registry
+
+    failed = process_registry.have_failed(pids)
+    return process_registry.get_outputs_many(
+        [pid for pid in pids if not failed.get(pid, True)])
+
+def _load_nodes_many(pks):
+    """
+    Return a dictionary pk -> node for the nodes identified by pks with a
+    single query
+    """
+    from aiida.orm import Node
+    from aiida.orm.querybuilder import QueryBuilder
+
+    qb = QueryBuilder()
+    qb.append(Node, filters={'id': {'in': pks}}, project=['id', '*'])
+    return dict(qb.iterall())
+
+def prefetch_intersteps(intersteps):
+    """
+    Evaluate with a single query per kind of action the actions of the
+    intersteps that load nodes or the outputs of processes, instead of
+    one query per interstep when the next step is starting.
+
+    :param intersteps: the intersteps of a workchain
+    """
+    batch_functions = {
+        get_object_string(load_node): _load_nodes_many,
+        get_object_string(_get_proc_outputs_from_registry): _get_proc_outputs_many,
+    }
+
+    by_fn = {}
+    for interstep in intersteps:
+        if isinstance(interstep, UpdateContext) and interstep._action.fn in batch_functions:
+            by_fn.setdefault(interstep._action.fn, []).append(interstep)
+
+    for fn, group in by_fn.iteritems():
+        if len(group) < 2:
+            continue
+        values = batch_functions[fn](
+            list(set(interstep._action.running_info.pid for interstep in group)))
+        for interstep in group:
+            pid = interstep._action.running_info.pid
+            if pid in values:
+                value = values[pid]
+                interstep._prefetched_value = dict(value) if isinstance(value, dict) else value
+
 def _get_wf_outputs(pk):
     """
     Return the results dictionary of a legacy workflow
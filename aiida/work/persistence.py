@@ -19,14 +19,18 @@ from aiida.common.lang import override
 from aiida.work.defaults import class_loader
 
 import glob
+import json
 import os
 import os.path as path
 import portalocker
 import portalocker.utils
 import shutil
+import sqlite3
 import tempfile
 import pickle
 from plum.persistence.bundle import Bundle
+from plum.wait import WaitOn
+from plum.wait_ons import Checkpoint, WaitOnAll, WaitOnAny, WaitOnProcess
 from plum.process_listener import ProcessListener
 from plum.process_monitor import MONITOR, ProcessMonitorListener
 from plum.util import override, protected
@@ -36,6 +40,9 @@ _RUNNING_DIRECTORY = path.join(tempfile.gettempdir(), "running")
 _FINISHED_DIRECTORY = path.join(_RUNNING_DIRECTORY, "finished")
 _FAILED_DIRECTORY = path.join(_RUNNING_DIRECTORY, "failed")
 
+# The SQLite file, in the running directory, indexing what the processes wait on
+_INDEX_FILENAME = "index.sqlite"
+
 
 # If portalocker accepts my pull request to have this incorporated into the
 # library then this can be removed. https://github.com/WoLpH/portalocker/pull/34
@@ -78,6 +85,10 @@ class Persistence(plum.persistence.pickle_persistence.PicklePersistence):
     """
     Class that uses pickles stored in particular directories to persist the
     instance state of Processes.
+
+    The state of each running process and what it is waiting on are also
+    indexed in an SQLite file of the running directory, so that the processes
+    that are waiting on nodes that did not finish yet are not loaded.
     """
 
     @staticmethod
@@ -139,6 +150,12 @@ class Persistence(plum.persistence.pickle_persistence.PicklePersistence):
             failed_directory=failed_directory
         )
         self._filelocks = {}
+        self._index_path = path.join(running_directory, _INDEX_FILENAME)
+        # The listener of the notifications of the finished nodes, and the
+        # nodes waited on whose state is known
+        self._listener = None
+        self._checked_pks = set()
+        self._unfinished_pks = set()
 
         self._ensure_directory(running_directory)
         self._ensure_directory(finished_directory)
@@ -164,10 +181,21 @@ class Persistence(plum.persistence.pickle_persistence.PicklePersistence):
         destroyed. This is necessary to prevent another thread from loading up
         the same process.
 
+        The processes that, according to the index, are waiting on nodes that
+        did not finish yet are skipped, without reading their pickle.
+
         :return: a list of Process instances
         """
-        processes = []
+        pickles = {}
         for f in glob.glob(path.join(self._running_directory, "*.pickle")):
+            try:
+                pickles[int(path.splitext(path.basename(f))[0])] = f
+            except ValueError:
+                pickles[f] = f
+        runnable_pids = self.get_runnable_pids(pickles.keys())
+
+        processes = []
+        for f in (pickles[pid] for pid in sorted(runnable_pids)):
             try:
                 process = self.create_from_file_and_persist(f)
             except (portalocker.LockException, IOError):
@@ -295,6 +323,8 @@ class Persistence(plum.persistence.pickle_persistence.PicklePersistence):
                 raise
             f.flush()
 
+        self._index_process(process, checkpoint)
+
     # region ProcessListener messages
     @override
     def on_process_run(self, process):
@@ -368,6 +398,7 @@ class Persistence(plum.persistence.pickle_persistence.PicklePersistence):
                 raise ValueError(
                     "Cannot find pickle for process with pid '{}'".format(pid))
         finally:
+            self._unindex_process(pid)
             lock.release()
 
     def _save_noraise(self, process):
@@ -377,6 +408,113 @@ class Persistence(plum.persistence.pickle_persistence.PicklePersistence):
             LOGGER.error("Exception raised trying to pickle process (pid={})\n{}"
                          .format(process.pid, traceback.format_exc()))
 
+    def get_runnable_pids(self, pids):
+        """
+        Return the pids of the given processes that are not waiting on nodes
+        that did not finish yet, according to the index. The state of each
+        node waited on is queried once (with a single query for all the new
+        ones), and is then updated from the notifications of the nodes that
+        finished (see aiida.backends.notifications).
+
+        A process is considered runnable if it is not in the index, or if it
+        waits on something that is not indexed: the process itself decides
+        whether it can continue, once loaded.
+
+        :param pids: the pids of the running processes
+        :return: a set of pids
+        """
+        index = self._get_index()
+        try:
+            expressions = {
+                pid: json.loads(waiting_on) for pid, waiting_on in
+                index.execute("SELECT pid, waiting_on FROM checkpoints")}
+        finally:
+            index.close()
+
+        waited_on = set()
+        for pid in pids:
+            if pid in expressions:
+                waited_on.update(_get_waited_on_pks(expressions[pid]))
+        unfinished = self._get_unfinished_pks(waited_on)
+
+        return set(pid for pid in pids if pid not in expressions or
+                   _is_maybe_ready(expressions[pid], unfinished))
+
+    def _get_unfinished_pks(self, pks):
+        """
+        Return the pks of the given nodes that did not finish yet. Without a
+        listener of the notifications (e.g. if it cannot connect), the state
+        of all the nodes is queried at every call.
+        """
+        from aiida.backends.notifications import NodeFinishedListener
+
+        if self._listener is None:
+            try:
+                # The listener is created before querying the state of the
+                # nodes, not to miss the notifications sent in the meantime
+                self._listener = NodeFinishedListener()
+            except Exception:
+                LOGGER.warning("Unable to listen to the notifications of the "
+                               "finished nodes\n{}".format(
+                    traceback.format_exc()))
+                return _get_unfinished_pks(pks)
+            self._checked_pks = set()
+            self._unfinished_pks = set()
+
+        try:
+            finished = self._listener.poll()
+        except Exception:
+            LOGGER.warning("Lost the notifications of the finished "
+                           "nodes\n{}".format(traceback.format_exc()))
+            self._listener = None
+            return _get_unfinished_pks(pks)
+
+        # Only the nodes still waited on are tracked
+        pks = set(pks)
+        self._unfinished_pks = (self._unfinished_pks - finished) & pks
+        self._unfinished_pks.update(
+            _get_unfinished_pks(pks - self._checked_pks))
+        self._checked_pks = pks
+        return set(self._unfinished_pks)
+
+    def _get_index(self):
+        """
+        Return a new connection to the SQLite index of the running processes,
+        creating its table if needed.
+        """
+        self._ensure_directory(self._running_directory)
+        index = sqlite3.connect(self._index_path, timeout=60)
+        index.execute("CREATE TABLE IF NOT EXISTS checkpoints "
+                      "(pid INTEGER PRIMARY KEY, status TEXT, "
+                      "waiting_on TEXT NOT NULL)")
+        return index
+
+    def _index_process(self, process, checkpoint):
+        """
+        Store in the index the state of the process and what it is waiting
+        on, from its checkpoint.
+        """
+        waiting_on = checkpoint.get(Process.BundleKeys.WAITING_ON.value, None)
+        index = self._get_index()
+        try:
+            with index:
+                index.execute(
+                    "INSERT OR REPLACE INTO checkpoints "
+                    "(pid, status, waiting_on) VALUES (?, ?, ?)",
+                    (process.pid,
+                     process.state.name if process.state is not None else None,
+                     json.dumps(_get_wait_expression(waiting_on))))
+        finally:
+            index.close()
+
+    def _unindex_process(self, pid):
+        index = self._get_index()
+        try:
+            with index:
+                index.execute("DELETE FROM checkpoints WHERE pid = ?", (pid,))
+        finally:
+            index.close()
+
     def _load_checkpoint(self, pid):
         """
         Load a checkpoint from a pickle. Note that this will not properly check for
@@ -464,6 +602,93 @@ class Persistence(plum.persistence.pickle_persistence.PicklePersistence):
         fileobj.truncate()
 
 
+def _get_wait_expression(wait_on_bundle):
+    """
+    Return a JSON-serializable expression of the nodes that a process waits
+    on, from the saved state of its WaitOn: either True (the process can be
+    run, or it waits on something that is not indexed), {'node': pk}, or
+    {'all': [expressions]} or {'any': [expressions]} for compound WaitOns.
+    """
+    from plum.util import fullname
+    from aiida.work.legacy.wait_on import WaitOnJobCalculation
+
+    if not wait_on_bundle:
+        return True
+
+    class_name = wait_on_bundle[WaitOn.BundleKeys.CLASS_NAME.value]
+    if class_name == fullname(WaitOnJobCalculation):
+        return {'node': wait_on_bundle[WaitOnJobCalculation.PK]}
+    elif class_name == fullname(WaitOnProcess):
+        return {'node': wait_on_bundle[WaitOnProcess.WAIT_ON_PID]}
+    elif class_name in (fullname(WaitOnAll), fullname(WaitOnAny)):
+        key = 'all' if class_name == fullname(WaitOnAll) else 'any'
+        return {key: [_get_wait_expression(bundle)
+                      for bundle in wait_on_bundle[WaitOnAll.WAIT_LIST]]}
+    else:
+        # e.g. a Checkpoint, or a legacy workflow
+        return True
+
+
+def _get_waited_on_pks(expression):
+    """
+    Return the pks of all the nodes in a wait expression.
+    """
+    if expression is True:
+        return []
+    elif 'node' in expression:
+        return [expression['node']]
+    else:
+        return [pk for subexpression in expression.values()[0]
+                for pk in _get_waited_on_pks(subexpression)]
+
+
+def _is_maybe_ready(expression, unfinished):
+    """
+    Evaluate a wait expression, given the set of the pks of the nodes that
+    did not finish yet.
+    """
+    if expression is True:
+        return True
+    elif 'node' in expression:
+        return expression['node'] not in unfinished
+    elif 'all' in expression:
+        return all(_is_maybe_ready(e, unfinished) for e in expression['all'])
+    else:
+        return any(_is_maybe_ready(e, unfinished) for e in expression['any'])
+
+
+def _get_unfinished_pks(pks):
+    """
+    Return the pks of the given nodes that did not finish yet, with a single
+    query: the nodes that are not sealed and, for job calculations, whose
+    state is one of the running ones (as WaitOnJobCalculation checks). The
+    nodes that do not exist are considered finished.
+    """
+    from aiida.common.datastructures import running_calc_states
+    from aiida.orm import Node
+    from aiida.orm.mixins import Sealable
+    from aiida.orm.querybuilder import QueryBuilder
+
+    if not pks:
+        return set()
+
+    qb = QueryBuilder()
+    qb.append(Node, filters={'id': {'in': list(pks)}}, project=[
+        'id', 'type', 'attributes.state',
+        'attributes.{}'.format(Sealable.SEALED_KEY)])
+
+    unfinished = set()
+    for pk, node_type, state, sealed in qb.iterall():
+        if sealed:
+            continue
+        if node_type.startswith('calculation.job.'):
+            if state in running_calc_states:
+                unfinished.add(pk)
+        else:
+            unfinished.add(pk)
+    return unfinished
+
+
 _DEFAULT_STORAGE = None
 
 
@@ -8,6 +8,7 @@
 # For further information please visit http://www.aiida.net               #
 ###########################################################################
 
+import time
 import plum.process
 import plum.knowledge_provider
 import plum.in_memory_database
@@ -21,7 +22,29 @@ class ProcessRegistry(plum.knowledge_provider.KnowledgeProvider):
     """
     This class is a knowledge provider that uses the AiiDA database to answer
     questions related to processes.
+
+    The states of the processes and their outputs fetched in batch (see
+    :meth:`have_finished` and :meth:`get_outputs_many`) are cached, so that
+    the waits on many processes can be answered with a single query: the
+    daemon clears the cache at the start of each tick, and the states of the
+    processes that did not finish expire after UNFINISHED_LIFETIME seconds.
     """
+    UNFINISHED_LIFETIME = 5.
+
+    def __init__(self):
+        super(ProcessRegistry, self).__init__()
+        # pid -> (finished, failed, time of the query)
+        self._states = {}
+        # pid -> outputs of the finished processes
+        self._outputs = {}
+
+    def clear_cache(self):
+        """
+        Forget the states and the outputs of the processes fetched so far.
+        """
+        self._states = {}
+        self._outputs = {}
+
     @property
     def current_pid(self):
         return ProcessStack.top().pid
@@ -32,6 +55,10 @@ class ProcessRegistry(plum.knowledge_provider.KnowledgeProvider):
 
     @override
     def has_finished(self, pid):
+        state = self._get_cached_state(pid)
+        if state is not None:
+            return state[0]
+
         from aiida.orm import JobCalculation
         from aiida.orm.calculation.work import WorkCalculation
 
@@ -63,6 +90,9 @@ class ProcessRegistry(plum.knowledge_provider.KnowledgeProvider):
 
     @override
     def get_outputs(self, pid):
+        if pid in self._outputs:
+            return dict(self._outputs[pid])
+
         from aiida.orm import load_node
 
         try:
@@ -71,3 +101,109 @@ class ProcessRegistry(plum.knowledge_provider.KnowledgeProvider):
         except exceptions.NotExistent:
             raise plum.knowledge_provider.NotKnown(
                 "Can't find node with pk '{}'".format(pid))
+
+    def have_finished(self, pids):
+        """
+        Check with a single query whether the given processes have finished.
+
+        :param pids: the pids of the processes
+        :return: a dictionary pid -> bool, with the processes that are job or
+            work calculations (the others are not known to the registry)
+        """
+        self._fetch_states(pids)
+        return {pid: self._states[pid][0]
+                for pid in pids if pid in self._states}
+
+    def have_failed(self, pids):
+        """
+        Check with a single query whether the given processes have failed.
+
+        :param pids: the pids of the processes
+        :return: a dictionary pid -> bool, with the processes that are job or
+            work calculations (the others are not known to the registry)
+        """
+        self._fetch_states(pids)
+        return {pid: self._states[pid][1]
+                for pid in pids if pid in self._states}
+
+    def get_outputs_many(self, pids):
+        """
+        Get the outputs of many processes with a single query.
+
+        :param pids: the pids of the processes
+        :return: a dictionary pid -> {label: node}, with the job and work
+            calculations and the other processes that have outputs
+        """
+        from aiida.orm import Node
+        from aiida.orm.querybuilder import QueryBuilder
+
+        outputs = {pid: dict(self._outputs[pid])
+                   for pid in pids if pid in self._outputs}
+        missing = set(pids) - set(outputs)
+        if not missing:
+            return outputs
+
+        finished = self.have_finished(list(missing))
+        for pid in finished:
+            outputs[pid] = {}
+
+        qb = QueryBuilder()
+        qb.append(Node, tag='process', filters={'id': {'in': list(missing)}},
+                  project=['id'])
+        qb.append(Node, output_of='process', project=['*'],
+                  edge_project=['label'])
+        for pid, node, label in qb.iterall():
+            outputs.setdefault(pid, {})[label] = node
+
+        # Only the outputs of the finished processes are final
+        for pid, has_finished in finished.iteritems():
+            if has_finished:
+                self._outputs[pid] = dict(outputs[pid])
+        return outputs
+
+    def _get_cached_state(self, pid):
+        """
+        Return the cached (finished, failed) state of a process, or None if
+        it is not cached or expired.
+        """
+        try:
+            finished, failed, query_time = self._states[pid]
+        except KeyError:
+            return None
+        if not finished and time.time() - query_time > self.UNFINISHED_LIFETIME:
+            return None
+        return finished, failed
+
+    def _fetch_states(self, pids):
+        """
+        Fetch with a single query the (finished, failed) state of the given
+        processes that are job or work calculations, and cache it.
+        """
+        from aiida.common.datastructures import calc_states, \
+            finished_calc_states
+        from aiida.orm import Node
+        from aiida.orm.calculation.work import WorkCalculation
+        from aiida.orm.mixins import Sealable
+        from aiida.orm.querybuilder import QueryBuilder
+
+        missing = [pid for pid in set(pids)
+                   if self._get_cached_state(pid) is None]
+        if not missing:
+            return
+
+        qb = QueryBuilder()
+        qb.append(Node, filters={'id': {'in': missing}}, project=[
+            'id', 'type', 'attributes.state',
+            'attributes.{}'.format(Sealable.SEALED_KEY),
+            'attributes.{}'.format(WorkCalculation.FAILED_KEY)])
+
+        now = time.time()
+        for pid, node_type, state, sealed, failed in qb.iterall():
+            if node_type.startswith('calculation.job.'):
+                finished = state in finished_calc_states
+                self._states[pid] = (
+                    finished, finished and state != calc_states.FINISHED, now)
+            elif node_type.startswith('calculation.work.'):
+                self._states[pid] = (bool(sealed), bool(failed), now)
+            else:
+                self._states.pop(pid, None)
@@ -242,6 +242,7 @@ class WorkChain(Process):
         if self._aborted:
             return
 
+        prefetch_intersteps(self._intersteps)
         for interstep in self._intersteps:
             interstep.on_next_step_starting(self)
         self._intersteps = []
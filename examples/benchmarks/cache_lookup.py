@@ -0,0 +1,94 @@
+#!/usr/bin/env runaiida
+# -*- coding: utf-8 -*-
+###########################################################################
+# Copyright (c), The AiiDA team. All rights reserved.                     #
+# This file is part of the AiiDA code.                                    #
+#                                                                         #
+# The code is hosted on GitHub at https://github.com/aiidateam/aiida_core #
+# For further information on the license, see the LICENSE.txt file        #
+# For further information please visit http://www.aiida.net               #
+###########################################################################
+"""
+Benchmark of the lookup of a node to cache from: the database is grown up
+to each of the given numbers of stored nodes, and the time that
+_get_same_node takes to find a stored node with the same hash is measured
+with the index on the node hash, and with index scans disabled, that is
+the lookup without the index.
+
+The nodes are added to the database of the current profile: use a profile
+made for the purpose.
+
+Usage: runaiida cache_lookup.py [--repeat N] [NODES ...]
+"""
+import argparse
+import time
+
+from aiida.orm.data.base import Int
+from aiida.orm.querybuilder import QueryBuilder
+from aiida.orm.utils import store_many
+
+
+def grow_database(num_nodes, batch_size=10000):
+    """
+    Store Int nodes with distinct values until there are num_nodes of them.
+    """
+    qb = QueryBuilder()
+    qb.append(Int)
+    start = qb.count()
+    for first in range(start, num_nodes, batch_size):
+        last = min(first + batch_size, num_nodes)
+        store_many([Int(value) for value in range(first, last)])
+
+
+def set_index_scans(enabled):
+    session = QueryBuilder()._impl.get_session()
+    value = 'on' if enabled else 'off'
+    session.execute("SET enable_indexscan = {}".format(value))
+    session.execute("SET enable_bitmapscan = {}".format(value))
+
+
+def time_lookups(num_nodes, repeat):
+    """
+    Return the average time to find the node to cache from, for nodes
+    spread over the whole database.
+    """
+    values = [i * num_nodes // repeat for i in range(repeat)]
+    start = time.time()
+    for value in values:
+        assert Int(value)._get_same_node() is not None
+    return (time.time() - start) / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('nodes', type=int, nargs='*',
+                        default=[1000, 10000, 100000])
+    parser.add_argument('--repeat', type=int, default=20,
+                        help='number of lookups to average over')
+    parser.add_argument('--max-seqscan-nodes', type=int, default=100000,
+                        help='skip the lookup without the index above this '
+                             'number of nodes')
+    args = parser.parse_args()
+
+    row = '{:>8} {:>14} {:>14}'
+    print row.format('nodes', 'index', 'no index')
+    for num_nodes in sorted(args.nodes):
+        grow_database(num_nodes)
+
+        indexed = time_lookups(num_nodes, args.repeat)
+        if num_nodes <= args.max_seqscan_nodes:
+            set_index_scans(False)
+            try:
+                seqscan = time_lookups(num_nodes, args.repeat)
+            finally:
+                set_index_scans(True)
+            seqscan = '{:.2f}ms'.format(seqscan * 1000)
+        else:
+            seqscan = '-'
+
+        print row.format(num_nodes, '{:.2f}ms'.format(indexed * 1000),
+                         seqscan)
+
+
+if __name__ == '__main__':
+    main()
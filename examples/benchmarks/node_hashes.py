@@ -0,0 +1,248 @@
+#!/usr/bin/env runaiida
+# -*- coding: utf-8 -*-
+###########################################################################
+# Copyright (c), The AiiDA team. All rights reserved.                     #
+# This file is part of the AiiDA code.                                    #
+#                                                                         #
+# The code is hosted on GitHub at https://github.com/aiidateam/aiida_core #
+# For further information on the license, see the LICENSE.txt file        #
+# For further information please visit http://www.aiida.net               #
+###########################################################################
+"""
+Benchmark of make_hash against its implementation of AiiDA 0.11, kept
+below as old_make_hash: for large arrays, a large file, nested
+dictionaries and the objects hashed by get_hash for ArrayData,
+FolderData and ParameterData nodes, time both implementations and check
+that they give the same digest.
+
+The three nodes are stored in the database of the current profile, since
+the files of a node are hashed from its repository folder.
+
+Usage: runaiida node_hashes.py [--size N] [--repeat N]
+"""
+import argparse
+import collections as abc
+import hashlib
+import numbers
+import os
+import tempfile
+import time
+from datetime import datetime
+
+import numpy as np
+from singledispatch import singledispatch
+
+from aiida.common.folders import Folder
+from aiida.common.hashing import make_hash, truncate_float64, truncate_array64
+from aiida.orm.data.array import ArrayData
+from aiida.orm.data.folder import FolderData
+from aiida.orm.data.parameter import ParameterData
+
+
+def old_make_hash_with_type(type_chr, string_to_hash):
+    return hashlib.sha224("{}{}".format(type_chr, string_to_hash)).hexdigest()
+
+
+@singledispatch
+def old_make_hash(object_to_hash, **kwargs):
+    raise ValueError("Value of type {} cannot be hashed".format(
+        type(object_to_hash))
+    )
+
+
+@old_make_hash.register(abc.Sequence)
+def _(sequence, **kwargs):
+    hashes = tuple([
+        old_make_hash(x, **kwargs) for x in sequence
+    ])
+    return old_make_hash_with_type('L', ",".join(hashes))
+
+
+@old_make_hash.register(abc.Set)
+def _(object_to_hash, **kwargs):
+    hashes = tuple([
+        old_make_hash(x, **kwargs)
+        for x
+        in sorted(object_to_hash)
+    ])
+    return old_make_hash_with_type('S', ",".join(hashes))
+
+
+@old_make_hash.register(abc.Mapping)
+def _(mapping, **kwargs):
+    hashed_dictionary = {
+        k: old_make_hash(v, **kwargs)
+        for k, v
+        in mapping.items()
+    }
+    return old_make_hash_with_type(
+        'D',
+        old_make_hash(sorted(hashed_dictionary.items()), **kwargs)
+    )
+
+
+@old_make_hash.register(numbers.Real)
+def _(object_to_hash, **kwargs):
+    return old_make_hash_with_type(
+        'f',
+        truncate_float64(object_to_hash).tobytes()
+    )
+
+
+@old_make_hash.register(numbers.Complex)
+def _(object_to_hash, **kwargs):
+    return old_make_hash_with_type(
+        'c',
+        ','.join([
+            old_make_hash(object_to_hash.real, **kwargs),
+            old_make_hash(object_to_hash.imag, **kwargs)
+        ])
+    )
+
+
+@old_make_hash.register(numbers.Integral)
+def _(object_to_hash, **kwargs):
+    return old_make_hash_with_type('i', str(object_to_hash))
+
+
+@old_make_hash.register(basestring)
+def _(object_to_hash, **kwargs):
+    return old_make_hash_with_type('s', object_to_hash)
+
+
+@old_make_hash.register(bool)
+def _(object_to_hash, **kwargs):
+    return old_make_hash_with_type('b', str(object_to_hash))
+
+
+@old_make_hash.register(type(None))
+def _(object_to_hash, **kwargs):
+    return old_make_hash_with_type('n', str(object_to_hash))
+
+
+@old_make_hash.register(datetime)
+def _(object_to_hash, **kwargs):
+    return old_make_hash_with_type('d', str(object_to_hash))
+
+
+@old_make_hash.register(Folder)
+def _(folder, **kwargs):
+    def _read_file(folder, name):
+        with folder.open(name) as f:
+            return f.read()
+
+    ignored_folder_content = kwargs.get('ignored_folder_content', [])
+
+    return old_make_hash_with_type(
+        'pd',
+        old_make_hash([
+            (
+                name,
+                folder.get_subfolder(name) if folder.isdir(name) else
+                old_make_hash_with_type('pf', _read_file(folder, name))
+            )
+            for name in sorted(folder.get_content_list())
+            if name not in ignored_folder_content
+        ], **kwargs)
+    )
+
+
+@old_make_hash.register(np.ndarray)
+def _(object_to_hash, **kwargs):
+    if object_to_hash.dtype == np.float64:
+        return old_make_hash_with_type(
+            'af',
+            old_make_hash(truncate_array64(object_to_hash).tobytes(), **kwargs)
+        )
+    elif object_to_hash.dtype == np.complex128:
+        return old_make_hash_with_type(
+            'ac',
+            old_make_hash([
+                object_to_hash.real,
+                object_to_hash.imag
+            ], **kwargs)
+        )
+    else:
+        return old_make_hash_with_type(
+            'ao',
+            old_make_hash(object_to_hash.tobytes(), **kwargs)
+        )
+
+
+def get_nested_dict(depth, width):
+    if depth == 0:
+        return [1, 2.5, 'leaf', None, True]
+    return {'key{}'.format(i): get_nested_dict(depth - 1, width)
+            for i in range(width)}
+
+
+def get_objects(size, folder):
+    """
+    Return a list of (name, object to hash, keyword arguments of make_hash).
+    """
+    array = np.random.random(size)
+    with open(os.path.join(folder, 'large_file'), 'wb') as f:
+        f.write(os.urandom(8 * size))
+
+    array_node = ArrayData()
+    array_node.set_array('array', array)
+    folder_node = FolderData()
+    folder_node.replace_with_folder(folder)
+    parameter_node = ParameterData(dict=get_nested_dict(4, 8))
+
+    objects = [
+        ('float64 array', array, {}),
+        ('transposed array', array.reshape(-1, 2).T, {}),
+        ('complex array', array[:size // 2] + 1j * array[size // 2:], {}),
+        ('int64 array', np.arange(size), {}),
+        ('file', Folder(folder), {}),
+        ('nested dict', get_nested_dict(5, 8), {}),
+    ]
+    for node in (array_node, folder_node, parameter_node):
+        node.store()
+        objects.append((
+            '{} node'.format(node.__class__.__name__),
+            node._get_objects_to_hash(),
+            {'ignored_folder_content': node._hash_ignored_folder_content}))
+    return objects
+
+
+def timed(repeat, function, *args, **kwargs):
+    start = time.time()
+    for _ in range(repeat):
+        result = function(*args, **kwargs)
+    return (time.time() - start) / repeat, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--size', type=int, default=4000000,
+                        help='number of elements of the arrays; the file '
+                             'has the same size in bytes as the float64 '
+                             'array')
+    parser.add_argument('--repeat', type=int, default=3,
+                        help='number of hashes to average over')
+    args = parser.parse_args()
+
+    folder = tempfile.mkdtemp()
+    try:
+        objects = get_objects(args.size, folder)
+
+        row = '{:<22} {:>10} {:>10} {:>8}'
+        print row.format('object', 'old', 'new', 'speedup')
+        for name, object_to_hash, kwargs in objects:
+            old, old_hash = timed(args.repeat, old_make_hash, object_to_hash,
+                                  **kwargs)
+            new, new_hash = timed(args.repeat, make_hash, object_to_hash,
+                                  **kwargs)
+            assert old_hash == new_hash, (
+                "The digests of the {} differ".format(name))
+            print row.format(name, '{:.3f}s'.format(old),
+                             '{:.3f}s'.format(new),
+                             '{:.2f}x'.format(old / new))
+    finally:
+        Folder(folder).erase()
+
+
+if __name__ == '__main__':
+    main()
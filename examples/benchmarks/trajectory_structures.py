@@ -0,0 +1,85 @@
+#!/usr/bin/env runaiida
+# -*- coding: utf-8 -*-
+###########################################################################
+# Copyright (c), The AiiDA team. All rights reserved.                     #
+# This file is part of the AiiDA code.                                    #
+#                                                                         #
+# The code is hosted on GitHub at https://github.com/aiidateam/aiida_core #
+# For further information on the license, see the LICENSE.txt file        #
+# For further information please visit http://www.aiida.net               #
+###########################################################################
+"""
+Benchmark of the conversion between TrajectoryData and StructureData nodes:
+for trajectories from 10^3 to 10^5 frames, time the conversion of all the
+frames to structures one at a time (get_step_structure) and at once
+(get_step_structures), the conversion back to a trajectory
+(set_structurelist) and, optionally, the storing of the structures with
+store_many.
+
+Usage: runaiida trajectory_structures.py [--store] [--atoms N] [FRAMES ...]
+"""
+import argparse
+import time
+
+import numpy
+
+from aiida.orm.data.array.trajectory import TrajectoryData
+from aiida.orm.utils import store_many
+
+
+def get_trajectory(num_frames, num_atoms):
+    symbols = numpy.array(['Si', 'O', 'O'] * (num_atoms // 3) +
+                          ['Si'] * (num_atoms % 3))
+    cells = numpy.tile(numpy.eye(3) * 10., (num_frames, 1, 1))
+    positions = numpy.random.rand(num_frames, num_atoms, 3) * 10.
+    trajectory = TrajectoryData()
+    trajectory.set_trajectory(numpy.arange(num_frames), cells, symbols,
+                              positions)
+    return trajectory
+
+
+def timed(function, *args, **kwargs):
+    start = time.time()
+    result = function(*args, **kwargs)
+    return time.time() - start, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('frames', type=int, nargs='*',
+                        default=[1000, 10000, 100000])
+    parser.add_argument('--atoms', type=int, default=8,
+                        help='number of atoms of each frame')
+    parser.add_argument('--store', action='store_true',
+                        help='also store the structures with store_many')
+    parser.add_argument('--max-single-frames', type=int, default=10000,
+                        help='skip the frame-by-frame conversion above this '
+                             'number of frames')
+    args = parser.parse_args()
+
+    row = '{:>8} {:>14} {:>14} {:>14} {:>14}'
+    print row.format('frames', 'one by one', 'batch', 'structurelist',
+                     'store_many')
+    for num_frames in args.frames:
+        trajectory = get_trajectory(num_frames, args.atoms)
+
+        if num_frames <= args.max_single_frames:
+            single, _ = timed(lambda: [trajectory.get_step_structure(i)
+                                       for i in range(num_frames)])
+            single = '{:.2f}s'.format(single)
+        else:
+            single = '-'
+        batch, structures = timed(trajectory.get_step_structures)
+        back, _ = timed(TrajectoryData, structurelist=structures)
+        if args.store:
+            stored, _ = timed(store_many, structures)
+            stored = '{:.2f}s'.format(stored)
+        else:
+            stored = '-'
+
+        print row.format(num_frames, single, '{:.2f}s'.format(batch),
+                         '{:.2f}s'.format(back), stored)
+
+
+if __name__ == '__main__':
+    main()